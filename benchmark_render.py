@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Benchmark HTML rendering throughput of the test case generators.
+
+Renders N generated cases (default 10,000) with generate_test_cases.py and
+docs/QA/generate_30_progressive.py into an in-memory buffer and reports
+cases/sec for each generator.
+
+Usage:
+python benchmark_render.py [--cases N]
+"""
+
+import argparse
+import io
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent / 'docs' / 'QA'))
+import generate_test_cases
+import generate_30_progressive
+
+BATCH_CONFIG = {
+    'player_count': [15, 30, 55],
+    'complexity': [20, 40, 40],
+    'stack_sizes': [33, 33, 34]
+}
+
+
+def bench_batch(num_cases):
+    """Render one batch file of num_cases cases from generate_test_cases.py"""
+    start = time.perf_counter()
+    html = generate_test_cases.generate_batch_html(1, 1, num_cases, BATCH_CONFIG)
+    return time.perf_counter() - start, len(html)
+
+
+def bench_progressive(num_cases):
+    """Render num_cases cases from generate_30_progressive.py, cycling the 30-case distribution"""
+    random.seed(42)
+    distribution = generate_30_progressive.get_test_case_distribution()
+    out = io.StringIO()
+
+    start = time.perf_counter()
+    for i in range(num_cases):
+        _, num_players, complexity = distribution[i % len(distribution)]
+        generator = generate_30_progressive.TestCaseGenerator(
+            tc_num=i + 1, num_players=num_players, complexity=complexity, require_side_pot=True
+        )
+        out.write(generator.generate())
+    return time.perf_counter() - start, out.tell()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark test case HTML rendering.")
+    parser.add_argument('--cases', type=int, default=10000, help="Cases to render per generator (default: 10000)")
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print(f"RENDER BENCHMARK ({args.cases:,} cases)")
+    print("=" * 70)
+
+    for name, bench in [("generate_test_cases", bench_batch), ("generate_30_progressive", bench_progressive)]:
+        seconds, size = bench(args.cases)
+        print(f"{name:<26} {args.cases / seconds:>10,.0f} cases/sec  "
+              f"({seconds:.2f}s, {size / 1024 / 1024:.1f} MB)")
+
+
+if __name__ == '__main__':
+    main()
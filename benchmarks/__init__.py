@@ -0,0 +1,16 @@
+"""
+Throughput and peak-memory benchmarks for the QA tooling
+
+Times every generator, parser, validator and fixer entry point on
+fixed-seed synthetic corpora of 1k, 10k and 100k hands and compares the
+results with benchmarks/baseline.json. See runner.py for usage.
+"""
+import sys
+from pathlib import Path
+
+_ROOT = Path(__file__).resolve().parent.parent
+for _path in (_ROOT, _ROOT / 'docs' / 'QA'):
+    if str(_path) not in sys.path:
+        sys.path.insert(0, str(_path))
+
+from benchmarks.suite import BENCHMARKS, BenchContext, benchmark  # noqa: E402
@@ -0,0 +1,143 @@
+"""
+Fixed-seed synthetic corpora for the benchmarks
+
+- html_corpus(n): an n-hand QA HTML corpus in the generate_30_progressive
+  format (the format every parser, validator and fixer reads). UNIQUE_CASES
+  distinct cases are rendered from BENCH_SEED, then tiled and renumbered
+  (TC-1 ... TC-n) up to n hands, so a 100k corpus takes seconds to build
+  instead of minutes
+- markdown_corpus(n): an n-case More Actions markdown file for
+  validate_more_actions.py, cycling through its three outcomes (no More
+  Action 2 with the all-in-for-less note, More Action 2 after a full raise,
+  standard betting)
+
+Both are written once under .fragment_cache/benchmarks/ and rebuilt when
+the seed or the generator source changes, never while a benchmark runs.
+"""
+import json
+import os
+import random
+import sys
+from pathlib import Path
+from typing import Callable, Dict, Iterator
+
+from fragment_cache import case_seed, default_cache_dir, source_version
+
+ROOT = Path(__file__).resolve().parent.parent
+CACHE_DIR = default_cache_dir(str(ROOT / 'benchmarks'), 'benchmarks')
+
+BENCH_SEED = 20240601
+UNIQUE_CASES = 1000
+
+SIZES = {'1k': 1_000, '10k': 10_000, '100k': 100_000}
+
+
+def parse_size(size: str) -> int:
+    """'10k' -> 10000; plain numbers are taken as they are"""
+    size = size.strip().lower()
+    if size in SIZES:
+        return SIZES[size]
+    if size.endswith('k'):
+        return int(float(size[:-1]) * 1_000)
+    return int(size)
+
+
+def size_label(num_hands: int) -> str:
+    return next((label for label, n in SIZES.items() if n == num_hands), str(num_hands))
+
+
+def _build(path: Path, version: str, write: Callable) -> Path:
+    """Write path via write(f) unless its sidecar says it was built from the same version"""
+    meta_path = path.with_name(path.name + '.json')
+    try:
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            if json.load(f).get('version') == version and path.exists():
+                return path
+    except (FileNotFoundError, json.JSONDecodeError):
+        pass
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f'.{path.name}.{os.getpid()}.tmp')
+    try:
+        with open(tmp_path, 'w', encoding='utf-8', newline='') as f:
+            write(f)
+        os.replace(tmp_path, path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+    with open(meta_path, 'w', encoding='utf-8') as f:
+        json.dump({'version': version, 'size': path.stat().st_size}, f)
+    return path
+
+
+def iter_html_cases(num_hands: int) -> Iterator[str]:
+    """The corpus' cases in order: UNIQUE_CASES rendered cases, tiled and renumbered"""
+    import generate_30_progressive
+    from merge_test_cases import renumber_case
+
+    distribution = generate_30_progressive.get_test_case_distribution(min(num_hands, UNIQUE_CASES))
+    unique = [generate_30_progressive.render_case(tc_num, num_players, complexity,
+                                                  case_seed(BENCH_SEED, tc_num), verbose=False)
+              for tc_num, num_players, complexity in distribution]
+    for i in range(num_hands):
+        yield renumber_case(unique[i % len(unique)], i + 1)
+
+
+def html_corpus(num_hands: int) -> Path:
+    import generate_30_progressive
+    import merge_test_cases
+
+    def write(f):
+        f.write(generate_30_progressive.generate_html_header())
+        for html in iter_html_cases(num_hands):
+            f.write(html)
+        f.write(generate_30_progressive.generate_html_footer())
+
+    version = f"{BENCH_SEED}:{UNIQUE_CASES}:" + generate_30_progressive.render_source_version(merge_test_cases)
+    return _build(CACHE_DIR / f"hands-{num_hands}.html", version, write)
+
+
+MA_STREETS = ('Preflop', 'Flop', 'Turn', 'River')
+MA_NAMES = ('Alice', 'Bob', 'Charlie', 'David', 'Eve', 'Frank')
+
+
+def render_more_actions_case(ma_num: int, rng: random.Random) -> str:
+    """One MA-N case in the MORE_ACTIONS_TEST_CASES.md layout"""
+    street = rng.choice(MA_STREETS)
+    first, second, third = rng.sample(MA_NAMES, 3)
+    bet = rng.randrange(2, 20) * 1_000
+    raise_to = bet * 3
+    lines = [f"## MA-{ma_num}: {street} re-raise scenario", "",
+             f"**{street} Base**", f"- {first}: Bet {bet:,}", f"- {second}: Raise {raise_to:,}",
+             f"- {third}: Call {raise_to:,}", ""]
+    outcome = ma_num % 3
+    if outcome == 0:
+        short = raise_to + bet // 2
+        lines += [f"**{street} More Action 1**", f"- {first}: All-In {short:,}", f"- {second}: Call {short:,}", "",
+                  f"Why NO More Action 2: {first}'s all-in for {short:,} is less than a full raise, "
+                  f"so betting is not reopened for {second}.", ""]
+    elif outcome == 1:
+        reraise = raise_to * 3
+        lines += [f"**{street} More Action 1**", f"- {first}: Raise {reraise:,}", f"- {second}: Call {reraise:,}", "",
+                  f"**{street} More Action 2**", f"- {third}: Call {reraise:,}", "",
+                  f"{first}'s full raise reopens the betting for {third}.", ""]
+    else:
+        lines += [f"**{street} More Action 1**", f"- {first}: Call {raise_to:,}", ""]
+    return "\n".join(lines) + "\n"
+
+
+def markdown_corpus(num_hands: int) -> Path:
+    def write(f):
+        rng = random.Random(BENCH_SEED)
+        f.write("# More Actions Test Cases (synthetic benchmark corpus)\n\n")
+        for ma_num in range(1, num_hands + 1):
+            f.write(render_more_actions_case(ma_num, rng))
+
+    version = f"{BENCH_SEED}:" + source_version(sys.modules[__name__])
+    return _build(CACHE_DIR / f"more-actions-{num_hands}.md", version, write)
+
+
+CORPORA: Dict[str, Callable[[int], Path]] = {
+    'html': html_corpus,
+    'markdown': markdown_corpus,
+}
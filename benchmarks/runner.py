@@ -0,0 +1,273 @@
+"""
+Run the benchmark suite and compare it with the stored baseline
+
+Every (benchmark, size) pair runs in a fresh interpreter, so peak memory
+is that benchmark's own high-water mark and no run warms the next one's
+caches. Runs shorter than MIN_SECONDS are repeated in the same process
+and the fastest kept, which keeps the 1k numbers steady. The corpora are
+built before any clock starts.
+
+A result regresses when its throughput falls, or its peak memory grows,
+by more than the threshold (default 20%) against baseline.json. Baselines
+are per machine: record one with --update-baseline on the box that runs
+the comparison.
+
+Usage:
+    python -m benchmarks                              # everything at 1k, 10k and 100k
+    python -m benchmarks --sizes 1k,10k parse validate.comprehensive
+    python -m benchmarks --sizes 1k --update-baseline
+    python -m benchmarks --output results.json --threshold 0.3
+"""
+import argparse
+import contextlib
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from benchmarks.corpora import CORPORA, ROOT, parse_size, size_label
+from benchmarks.suite import BENCHMARKS, BenchContext, Benchmark, select
+
+try:
+    import resource
+except ImportError:
+    # Windows: fall back to tracemalloc, which only sees Python allocations
+    resource = None
+
+BASELINE_PATH = Path(__file__).resolve().parent / 'baseline.json'
+DEFAULT_SIZES = '1k,10k,100k'
+DEFAULT_THRESHOLD = 0.20
+MIN_SECONDS = 1.0
+
+
+def peak_rss_mb() -> float:
+    """This process' peak resident set size so far"""
+    # Linux keeps ru_maxrss across fork/exec, so a worker would report the
+    # parent's peak; VmHWM belongs to this process' own address space
+    try:
+        with open('/proc/self/status', 'r') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS, kilobytes elsewhere
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def missing_requirements(bench: Benchmark) -> List[str]:
+    missing = []
+    for module in bench.requires:
+        try:
+            __import__(module)
+        except ImportError:
+            missing.append(module)
+    return missing
+
+
+def measure(bench: Benchmark, num_hands: int) -> Dict:
+    """Time one benchmark in this process; meant to run in a fresh worker"""
+    missing = missing_requirements(bench)
+    if missing:
+        return {'status': 'skipped', 'error': f"requires {', '.join(missing)}"}
+
+    corpus = CORPORA[bench.corpus](num_hands) if bench.corpus else None
+    if resource is None:
+        import tracemalloc
+        tracemalloc.start()
+
+    best = None
+    runs = 0
+    total = 0.0
+    with tempfile.TemporaryDirectory(prefix='bench-') as scratch, open(os.devnull, 'w') as devnull:
+        while runs == 0 or total < MIN_SECONDS:
+            ctx = BenchContext(num_hands, corpus, Path(scratch))
+            if bench.setup:
+                ctx.state = bench.setup(ctx)
+            with contextlib.redirect_stdout(devnull):
+                start = time.perf_counter()
+                hands = bench.run(ctx)
+                seconds = time.perf_counter() - start
+            runs += 1
+            total += seconds
+            best = seconds if best is None else min(best, seconds)
+
+    if resource is None:
+        peak = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+        tracemalloc.stop()
+    else:
+        peak = peak_rss_mb()
+    return {
+        'status': 'ok',
+        'hands': hands,
+        'runs': runs,
+        'seconds': round(best, 6),
+        'hands_per_sec': round(hands / best, 1) if best > 0 else None,
+        'peak_mb': round(peak, 1),
+    }
+
+
+def run_worker(name: str, num_hands: int, timeout: Optional[float] = None) -> Dict:
+    """Run one benchmark in a child interpreter and return its measurement"""
+    cmd = [sys.executable, '-m', 'benchmarks', '--worker', name, '--hands', str(num_hands)]
+    try:
+        proc = subprocess.run(cmd, cwd=ROOT, capture_output=True, text=True, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        return {'status': 'failed', 'error': f"timed out after {timeout:g}s"}
+    lines = proc.stdout.strip().splitlines()
+    if proc.returncode != 0 or not lines:
+        errors = proc.stderr.strip().splitlines()
+        reason = errors[-1] if errors else f"exit code {proc.returncode}"
+        if proc.returncode < 0:
+            reason = f"killed by signal {-proc.returncode} (out of memory?)"
+        return {'status': 'failed', 'error': reason}
+    return json.loads(lines[-1])
+
+
+def machine_info() -> Dict:
+    return {
+        'platform': platform.platform(),
+        'python': platform.python_version(),
+        'cpus': os.cpu_count(),
+    }
+
+
+def load_baseline(path: Path) -> Dict:
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {'machine': None, 'results': {}}
+
+
+def save_baseline(path: Path, baseline: Dict, results: Dict[str, Dict]):
+    """Merge the successful results into the baseline (other entries are kept)"""
+    merged = dict(baseline.get('results', {}))
+    for key, result in results.items():
+        if result['status'] == 'ok':
+            merged[key] = {k: result[k] for k in ('hands', 'seconds', 'hands_per_sec', 'peak_mb')}
+    payload = {'machine': machine_info(), 'results': dict(sorted(merged.items()))}
+    tmp_path = path.with_name(f'.{path.name}.{os.getpid()}.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(payload, f, indent=2)
+        f.write('\n')
+    os.replace(tmp_path, path)
+
+
+def compare(result: Dict, base: Optional[Dict], threshold: float) -> List[str]:
+    """Regressions of one result against its baseline entry"""
+    if result['status'] != 'ok' or not base:
+        return []
+    regressions = []
+    if base.get('hands_per_sec') and result['hands_per_sec'] < base['hands_per_sec'] * (1 - threshold):
+        regressions.append(f"throughput {result['hands_per_sec']:,.0f} vs {base['hands_per_sec']:,.0f} hands/sec "
+                           f"({result['hands_per_sec'] / base['hands_per_sec'] - 1:+.0%})")
+    if base.get('peak_mb') and result['peak_mb'] > base['peak_mb'] * (1 + threshold):
+        regressions.append(f"peak memory {result['peak_mb']:,.1f} vs {base['peak_mb']:,.1f} MB "
+                           f"({result['peak_mb'] / base['peak_mb'] - 1:+.0%})")
+    return regressions
+
+
+def format_change(result: Dict, base: Optional[Dict]) -> str:
+    if result['status'] != 'ok':
+        return result['status']
+    if not base:
+        return 'new'
+    return (f"{result['hands_per_sec'] / base['hands_per_sec'] - 1:+.0%} speed, "
+            f"{result['peak_mb'] / base['peak_mb'] - 1:+.0%} memory")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the generators, parsers, validators and fixers')
+    parser.add_argument('benchmarks', nargs='*',
+                        help='Benchmark names, name prefixes (parse, validate) or kinds (default: all)')
+    parser.add_argument('--sizes', default=DEFAULT_SIZES, help=f'Corpus sizes in hands (default: {DEFAULT_SIZES})')
+    parser.add_argument('--baseline', type=Path, default=BASELINE_PATH)
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='Flag slowdowns / memory growth above this fraction (default: 0.20)')
+    parser.add_argument('--update-baseline', action='store_true', help='Store these results as the new baseline')
+    parser.add_argument('--output', type=Path, help='Also write the results as JSON here')
+    parser.add_argument('--timeout', type=float, help='Seconds before a single run is abandoned')
+    parser.add_argument('--list', action='store_true', help='List the benchmarks and exit')
+    parser.add_argument('--worker', help=argparse.SUPPRESS)
+    parser.add_argument('--hands', type=int, help=argparse.SUPPRESS)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    if args.worker:
+        print(json.dumps(measure(BENCHMARKS[args.worker], args.hands)))
+        return 0
+
+    benches = select(args.benchmarks)
+    if args.list or not benches:
+        if not benches:
+            print(f"No benchmark matches {' '.join(args.benchmarks)}")
+        for bench in BENCHMARKS.values():
+            print(f"  {bench.name:<26} {bench.kind:<10} {bench.corpus or '-'}")
+        return 0 if benches else 2
+
+    sizes = [parse_size(s) for s in args.sizes.split(',') if s.strip()]
+    baseline = load_baseline(args.baseline)
+
+    print("=" * 80)
+    print(f"BENCHMARKS: {len(benches)} entry points at {', '.join(size_label(n) for n in sizes)} hands")
+    print("=" * 80)
+    if baseline.get('machine') and baseline['machine'] != machine_info():
+        print(f"[WARNING] Baseline was recorded on {baseline['machine']['platform']}; "
+              f"timings may not be comparable")
+
+    results: Dict[str, Dict] = {}
+    regressions: List[str] = []
+    for num_hands in sizes:
+        for corpus in sorted({b.corpus for b in benches if b.corpus}):
+            start = time.perf_counter()
+            path = CORPORA[corpus](num_hands)
+            print(f"\nCorpus {path.name}: {path.stat().st_size / 1024 / 1024:,.1f} MB "
+                  f"({time.perf_counter() - start:.1f}s)")
+
+        print()
+        print(f"| Benchmark | Kind | Hands | Time (s) | Hands/sec | Peak (MB) | vs baseline |")
+        print(f"|-----------|------|-------|----------|-----------|-----------|-------------|")
+        for bench in benches:
+            key = f"{bench.name}@{size_label(num_hands)}"
+            result = run_worker(bench.name, num_hands, args.timeout)
+            result.update(benchmark=bench.name, kind=bench.kind, size=num_hands)
+            results[key] = result
+            base = baseline.get('results', {}).get(key)
+            if result['status'] == 'ok':
+                print(f"| {bench.name} | {bench.kind} | {result['hands']:,} | {result['seconds']:.3f} | "
+                      f"{result['hands_per_sec']:,.0f} | {result['peak_mb']:,.1f} | {format_change(result, base)} |")
+            else:
+                print(f"| {bench.name} | {bench.kind} | - | - | - | - | {result['status']}: {result['error']} |")
+            regressions += [f"{key}: {r}" for r in compare(result, base, args.threshold)]
+
+    failed = [key for key, result in results.items() if result['status'] == 'failed']
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'machine': machine_info(), 'threshold': args.threshold, 'results': results}, f, indent=2)
+        print(f"\n[OK] Results written to {args.output}")
+    if args.update_baseline:
+        save_baseline(args.baseline, baseline, results)
+        print(f"[OK] Baseline updated: {args.baseline}")
+
+    print()
+    print("=" * 80)
+    if regressions:
+        print(f"x {len(regressions)} REGRESSION(S) above {args.threshold:.0%}:")
+        for regression in regressions:
+            print(f"  - {regression}")
+    if failed:
+        print(f"x {len(failed)} benchmark(s) failed: {', '.join(failed)}")
+    if not regressions and not failed:
+        print(f"+ No regressions above {args.threshold:.0%}")
+    print("=" * 80)
+    return 1 if regressions or failed else 0
@@ -0,0 +1,196 @@
+"""
+Benchmark registry: one entry per generator, parser, validator and fixer entry point
+
+Each benchmark receives a BenchContext (hand count, corpus path, scratch
+directory) and returns how many hands it processed; the runner turns that
+into hands/sec. Output the entry points print is discarded. A benchmark
+may declare a setup step (run before the clock starts) and modules it
+requires; it is reported as skipped when one of them is missing.
+
+Register more with:
+
+    @benchmark('validate.my_check', 'validator', corpus='html')
+    def bench_my_check(ctx: BenchContext) -> int:
+        ...
+        return hands_checked
+"""
+import os
+import random
+import shutil
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+KINDS = ('generator', 'parser', 'validator', 'fixer')
+
+
+@dataclass
+class BenchContext:
+    num_hands: int
+    corpus: Optional[Path]
+    scratch: Path
+    state: Any = None  # Whatever the benchmark's setup returned
+
+
+@dataclass
+class Benchmark:
+    name: str
+    kind: str
+    run: Callable[[BenchContext], int]
+    corpus: Optional[str] = None  # 'html', 'markdown' or None for generators
+    setup: Optional[Callable[[BenchContext], Any]] = None
+    requires: Tuple[str, ...] = ()
+
+
+BENCHMARKS: Dict[str, Benchmark] = {}
+
+
+def benchmark(name: str, kind: str, corpus: Optional[str] = None, setup: Optional[Callable] = None,
+              requires: Tuple[str, ...] = ()):
+    """Register a benchmark; it receives a BenchContext and returns the number of hands processed"""
+    if kind not in KINDS:
+        raise ValueError(f"Unknown benchmark kind '{kind}'; kinds: {', '.join(KINDS)}")
+
+    def decorator(run):
+        BENCHMARKS[name] = Benchmark(name, kind, run, corpus, setup, requires)
+        return run
+    return decorator
+
+
+def select(patterns: Optional[List[str]] = None) -> List[Benchmark]:
+    """Benchmarks whose name or kind matches one of the patterns (prefix match); all if none given"""
+    if not patterns:
+        return list(BENCHMARKS.values())
+    return [b for b in BENCHMARKS.values()
+            if any(b.kind == p or b.name == p or b.name.startswith(p.rstrip('.') + '.') for p in patterns)]
+
+
+def null_sink():
+    return open(os.devnull, 'w', encoding='utf-8')
+
+
+# Generators: render num_hands cases into /dev/null
+
+@benchmark('generate.batch', 'generator')
+def bench_generate_batch(ctx: BenchContext) -> int:
+    import generate_test_cases
+    with null_sink() as out:
+        generate_test_cases.write_batch_html(out, 1, 1, ctx.num_hands, generate_test_cases.batch_config_for(1))
+    return ctx.num_hands
+
+
+@benchmark('generate.progressive', 'generator')
+def bench_generate_progressive(ctx: BenchContext) -> int:
+    import generate_30_progressive
+    from fragment_cache import case_seed
+    with null_sink() as out:
+        for tc_num, num_players, complexity in generate_30_progressive.get_test_case_distribution(ctx.num_hands):
+            out.write(generate_30_progressive.render_case(
+                tc_num, num_players, complexity, case_seed(generate_30_progressive.MASTER_SEED, tc_num), verbose=False
+            ))
+    return ctx.num_hands
+
+
+@benchmark('generate.validated', 'generator')
+def bench_generate_validated(ctx: BenchContext) -> int:
+    import generate_30_progressive
+    import generate_30_validated_cases
+    from fragment_cache import case_seed
+    with null_sink() as out:
+        for tc_num, num_players, complexity in generate_30_progressive.get_test_case_distribution(ctx.num_hands):
+            random.seed(case_seed(generate_30_progressive.MASTER_SEED, tc_num))
+            out.write(generate_30_validated_cases.TestCaseGenerator(
+                tc_num, num_players, complexity, require_side_pot=(tc_num > 6)
+            ).generate())
+    return ctx.num_hands
+
+
+
+@benchmark('generate.session', 'generator')
+def bench_generate_session(ctx: BenchContext) -> int:
+    import session_simulator
+    # Deep stacks and slow blinds keep one table going for all num_hands hands
+    args = session_simulator.parse_args([
+        '--max-hands', str(ctx.num_hands), '--starting-bb', '100000', '--hands-per-level', str(ctx.num_hands),
+        '--output-dir', str(ctx.scratch),
+    ])
+    return session_simulator.play_tables(1, 2, args).hands
+
+# Parsers: one pass over the HTML corpus
+
+@benchmark('parse.testcase_stream', 'parser', corpus='html')
+def bench_parse_stream(ctx: BenchContext) -> int:
+    from testcase_stream import iter_test_cases
+    return sum(1 for _ in iter_test_cases(ctx.corpus))
+
+
+@benchmark('parse.split_stream', 'parser', corpus='html')
+def bench_parse_split(ctx: BenchContext) -> int:
+    from merge_test_cases import split_stream
+    with open(ctx.corpus, 'r', encoding='utf-8', newline='') as f:
+        return sum(1 for kind, _ in split_stream(f) if kind == 'case')
+
+
+@benchmark('parse.corpus_index', 'parser', corpus='html')
+def bench_parse_index(ctx: BenchContext) -> int:
+    from corpus_index import scan_cases
+    with open(ctx.corpus, 'rb') as f:
+        return len(scan_cases(f.read()))
+
+
+@benchmark('parse.hand_corpus', 'parser', corpus='html', requires=('numpy',))
+def bench_parse_hand_corpus(ctx: BenchContext) -> int:
+    from hand_corpus import write_corpus
+    from testcase_stream import iter_test_cases
+    return write_corpus(ctx.scratch / 'corpus.hands', iter_test_cases(ctx.corpus))
+
+
+# Validators
+
+@benchmark('validate.comprehensive', 'validator', corpus='html')
+def bench_validate_comprehensive(ctx: BenchContext) -> int:
+    from comprehensive_validation import TestCaseValidator
+    validator = TestCaseValidator()
+    validator.run_all_validations(ctx.corpus)
+    validator.generate_report()
+    return validator.test_case_count
+
+
+@benchmark('validate.pot_columns', 'validator', corpus='html', requires=('numpy',))
+def bench_validate_pot_columns(ctx: BenchContext) -> int:
+    from testcase_stream import iter_test_cases
+    from validate_40_pot_cases import check_pot_columns, load_pot_columns
+    columns = load_pot_columns(iter_test_cases(ctx.corpus))
+    check_pot_columns(columns)
+    return len(columns['tc_ids'])
+
+
+@benchmark('validate.pot_oracle', 'validator', corpus='html', requires=('numpy',))
+def bench_validate_pot_oracle(ctx: BenchContext) -> int:
+    from pot_oracle import check_hand, load_corpus_hands
+    hands = load_corpus_hands(ctx.corpus)
+    for hand in hands:
+        check_hand(hand)
+    return len(hands)
+
+
+@benchmark('validate.more_actions', 'validator', corpus='markdown')
+def bench_validate_more_actions(ctx: BenchContext) -> int:
+    from validate_more_actions import validate_test_case_file
+    validate_test_case_file(str(ctx.corpus))
+    return ctx.num_hands
+
+
+# Fixers: every registered fixer over a scratch copy of the corpus
+
+def copy_corpus(ctx: BenchContext) -> Path:
+    path = ctx.scratch / ctx.corpus.name
+    shutil.copyfile(ctx.corpus, path)
+    return path
+
+
+@benchmark('fix.pipeline', 'fixer', corpus='html', setup=copy_corpus)
+def bench_fix_pipeline(ctx: BenchContext) -> int:
+    import corpus_fixers
+    from fixer_pipeline import FixerPipeline
+    return FixerPipeline(corpus_fixers.FIXERS, force=True).run_file(ctx.state)['cases']
@@ -2,299 +2,232 @@
 """
 Comprehensive validation of all 30 test cases against the complete spec.
 Checks ALL 21 rules defined in TEST_CASE_GENERATION_SPEC.md
+
+Rules live in a registry. Each rule declares which parsed TestCaseRecord
+fields it reads, and the validator makes a single streaming pass over the
+file, evaluating every applicable rule against each parsed test case.
+Per-rule timings and pass/fail counts are included in the report.
 """
 
 import re
+import sys
+import time
 from collections import defaultdict
-from typing import List, Dict, Tuple
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, List, Dict, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent / 'docs' / 'QA'))
+from testcase_stream import TestCaseRecord, iter_test_cases, parse_number
+
+# Compiled once at import time, shared by every rule and test case
+POT_WON_PATTERN = re.compile(r'^\+ (?:Main Pot|Side Pot \d+): ([\d,]+)')
+NEW_STACK_PATTERN = re.compile(r'^= New Stack: ([\d,]+)')
+
+FORBIDDEN_POSITIONS = ('UTG', 'UTG+1', 'UTG+2', 'MP', 'CO', 'HJ')
+
+
+@dataclass
+class Rule:
+    number: Optional[int]
+    name: str
+    fields: Tuple[str, ...] = ()
+    check: Optional[Callable[[TestCaseRecord], List[str]]] = None
+    missing: Optional[str] = None  # Failure message when a required field is empty
+    note: str = 'Not fully automated - manual review recommended'
+
+
+@dataclass
+class RuleStats:
+    passed: int = 0
+    failed: int = 0
+    skipped: int = 0
+    seconds: float = 0.0
+    failures: List[str] = field(default_factory=list)
+
+
+RULES: List[Rule] = []
+
+
+def rule(number: int, name: str, fields: Tuple[str, ...], missing: Optional[str] = None):
+    """Register a rule check; the check returns a list of issues for one test case"""
+    def decorator(check):
+        RULES.append(Rule(number, name, fields, check, missing))
+        return check
+    return decorator
+
+
+@rule(1, "Winners show NEW Stack in Next Hand Preview", fields=('results',))
+def check_winners_show_new_stack(tc: TestCaseRecord) -> List[str]:
+    """Rule 1: Winners show NEW Stack (Final + Won) in Next Hand Preview"""
+    issues = []
+    for row in tc.results:
+        if not row.is_winner:
+            continue
+
+        won = 0
+        new_stack = None
+        for line in row.breakdown:
+            pot_match = POT_WON_PATTERN.match(line)
+            if pot_match:
+                won += parse_number(pot_match.group(1))
+            new_match = NEW_STACK_PATTERN.match(line)
+            if new_match:
+                new_stack = parse_number(new_match.group(1))
+
+        if new_stack is not None and new_stack != row.final_stack + won:
+            issues.append(f"{row.name} - Expected New Stack {row.final_stack + won:,}, got {new_stack:,}")
+    return issues
+
+
+@rule(2, "ALL players appear in Next Hand Preview", fields=('results', 'next_hand'),
+      missing="No Next Hand Preview found")
+def check_all_players_in_preview(tc: TestCaseRecord) -> List[str]:
+    """Rule 2: ALL players appear in Next Hand Preview (including eliminated)"""
+    in_preview = {entry.name for entry in tc.next_hand}
+    missing = [row.name for row in tc.results if row.name not in in_preview]
+    if missing:
+        return [f"Missing players in preview: {', '.join(missing)}"]
+    return []
+
+
+@rule(3, "Position labels ONLY for Dealer, SB, BB", fields=('stack_setup',))
+def check_position_labels(tc: TestCaseRecord) -> List[str]:
+    """Rule 3: Position labels ONLY for Dealer, SB, BB"""
+    return [f"Found forbidden position label '{entry.position}' in Stack Setup"
+            for entry in tc.stack_setup if entry.position in FORBIDDEN_POSITIONS]
+
+
+@rule(7, "No negative final stacks", fields=('results',))
+def check_no_negative_stacks(tc: TestCaseRecord) -> List[str]:
+    """Rule 7: Players cannot have negative stacks"""
+    negatives = []
+    for row in tc.results:
+        for value in (row.starting_stack, row.final_stack, row.contributed, row.new_stack):
+            if value is not None and value < 0:
+                negatives.append(f"{value:,}")
+    if negatives:
+        return [f"Found negative values: {', '.join(negatives[:3])}"]
+    return []
+
+
+# Need deep action parsing - kept for manual review
+RULES.append(Rule(8, "All-in actions labeled correctly", note='Manual review recommended'))
+RULES.append(Rule(14, "Contribution calculation (no double-counting)", note='Manual review recommended'))
+
+
+@rule(15, "Contribution = Starting - Final", fields=('results',))
+def check_contribution_equals_stack_diff(tc: TestCaseRecord) -> List[str]:
+    """Rule 15: Total Contribution = Starting Stack - Final Stack"""
+    issues = []
+    for row in tc.results:
+        if row.contributed is None:
+            continue
+        expected_contribution = row.starting_stack - row.final_stack
+        if row.contributed != expected_contribution:
+            issues.append(
+                f"{row.name} - Starting {row.starting_stack:,} - Final {row.final_stack:,} = "
+                f"{expected_contribution:,}, but Contributed shows {row.contributed:,}"
+            )
+    return issues
+
+
+@rule(16, "Total Pot = Sum of contributions", fields=('total_pot', 'results'),
+      missing="No total pot found")
+def check_pot_equals_sum_of_contributions(tc: TestCaseRecord) -> List[str]:
+    """Rule 16: Total Pot = Sum of all contributions"""
+    sum_contributions = sum(row.contributed or 0 for row in tc.results)
+    if tc.total_pot != sum_contributions:
+        return [f"Total Pot {tc.total_pot:,} != Sum of Contributions {sum_contributions:,}"]
+    return []
+
+
+# Placeholders for other rules (manual review or not implemented yet)
+for _name in [
+    "Action order - Preflop 2-handed",
+    "Action order - Preflop 3-handed",
+    "Action order - Preflop 4+",
+    "Action order - Postflop 2-handed",
+    "Action order - Postflop 3+",
+    "Ante posting order (BB first)",
+    "Side pot calculation",
+    "BB Ante rules",
+    "Stack size requirements (10-60 BB)",
+    "Button rotation",
+    "Stack Setup starts with Dealer",
+    "Base vs More section assignment",
+    "All-in creates side pots",
+]:
+    RULES.append(Rule(None, _name))
+
 
 class TestCaseValidator:
-    def __init__(self):
+    def __init__(self, rules: Optional[List[Rule]] = None):
+        self.rules = rules if rules is not None else RULES
+        self.stats: Dict[str, RuleStats] = {r.name: RuleStats() for r in self.rules}
+        self.test_case_count = 0
         self.results = {
-            'total_rules': 21,
+            'total_rules': len(self.rules),
             'passed': 0,
             'failed': 0,
             'rule_results': {},
             'test_case_issues': defaultdict(list)
         }
 
-    def read_html(self, filepath):
-        with open(filepath, 'r', encoding='utf-8') as f:
-            return f.read()
-
-    def extract_test_cases(self, content):
-        """Extract all test case sections"""
-        test_cases = []
-        pattern = r'<div class="test-id">(TC-\d+)</div>.*?(?=<div class="test-id">TC-|\Z)'
-        matches = re.finditer(pattern, content, re.DOTALL)
-
-        for match in matches:
-            tc_id = match.group(1)
-            tc_content = match.group(0)
-            test_cases.append((tc_id, tc_content))
-
-        return test_cases
-
-    def validate_rule_1_winners_show_new_stack(self, test_cases):
-        """Rule 1: Winners show NEW Stack (Final + Won) in Next Hand Preview"""
-        rule_name = "Winners show NEW Stack in Next Hand Preview"
-        print(f"\nValidating Rule 1: {rule_name}")
-
-        failures = []
-
-        for tc_id, tc_content in test_cases:
-            # Find winners with breakdown
-            winner_pattern = r'<td>(\w+) \(([^)]+)\)</td>.*?<span class="winner-badge"[^>]*onclick[^>]*>.*?🏆.*?<div class="breakdown-line">Final Stack: ([\d,]+)</div>.*?<div class="breakdown-line">\+ (?:Main Pot|Side Pot \d+): ([\d,]+)</div>.*?<div class="breakdown-line total">= New Stack: ([\d,]+)</div>'
-            winners = re.findall(winner_pattern, tc_content, re.DOTALL)
-
-            for winner_name, position, final_str, won_str, new_stack_str in winners:
-                final = int(final_str.replace(',', ''))
-                won = int(won_str.replace(',', ''))
-                new_stack = int(new_stack_str.replace(',', ''))
-
-                expected_new = final + won
-
-                if new_stack != expected_new:
-                    failures.append(f"{tc_id}: {winner_name} - Expected New Stack {expected_new:,}, got {new_stack:,}")
-
-        if not failures:
-            self.results['passed'] += 1
-            self.results['rule_results'][rule_name] = ('PASS', [])
-            print(f"  + PASS")
-        else:
-            self.results['failed'] += 1
-            self.results['rule_results'][rule_name] = ('FAIL', failures)
-            print(f"  x FAIL - {len(failures)} issues")
-            for failure in failures[:3]:
-                print(f"    - {failure}")
-
-    def validate_rule_2_all_players_in_preview(self, test_cases):
-        """Rule 2: ALL players appear in Next Hand Preview (including eliminated)"""
-        rule_name = "ALL players appear in Next Hand Preview"
-        print(f"\nValidating Rule 2: {rule_name}")
-
-        failures = []
-
-        for tc_id, tc_content in test_cases:
-            # Count players in results table
-            player_rows = re.findall(r'<td>(\w+) \([^)]+\)</td>', tc_content)
-            unique_players_in_results = list(set([p for p in player_rows if not p.startswith('</') and len(p) > 1]))
-
-            # Count players in Next Hand Preview
-            next_hand_match = re.search(r'Stack Setup:(.*?)(?:`|</div>)', tc_content, re.DOTALL)
-            if not next_hand_match:
-                failures.append(f"{tc_id}: No Next Hand Preview found")
+    def evaluate(self, tc: TestCaseRecord):
+        """Evaluate every automated rule against one parsed test case"""
+        for r in self.rules:
+            if r.check is None:
                 continue
+            stats = self.stats[r.name]
+            start = time.perf_counter()
 
-            next_hand_text = next_hand_match.group(1)
-            players_in_preview = re.findall(r'^(\w+) (?:Dealer |SB |BB )?[\d,]+', next_hand_text, re.MULTILINE)
-
-            unique_players_in_preview = list(set(players_in_preview))
-
-            # Check if all players from results appear in preview
-            missing = set(unique_players_in_results) - set(unique_players_in_preview)
-            if missing:
-                failures.append(f"{tc_id}: Missing players in preview: {', '.join(missing)}")
-
-        if not failures:
-            self.results['passed'] += 1
-            self.results['rule_results'][rule_name] = ('PASS', [])
-            print(f"  + PASS")
-        else:
-            self.results['failed'] += 1
-            self.results['rule_results'][rule_name] = ('FAIL', failures)
-            print(f"  x FAIL - {len(failures)} issues")
-            for failure in failures[:3]:
-                print(f"    - {failure}")
-
-    def validate_rule_3_position_labels_only_for_button_blinds(self, test_cases):
-        """Rule 3: Position labels ONLY for Dealer, SB, BB"""
-        rule_name = "Position labels ONLY for Dealer, SB, BB"
-        print(f"\nValidating Rule 3: {rule_name}")
-
-        failures = []
-        forbidden_positions = ['UTG', 'UTG+1', 'UTG+2', 'MP', 'CO', 'HJ']
-
-        for tc_id, tc_content in test_cases:
-            # Check Stack Setup section
-            stack_setup_match = re.search(r'Stack Setup:(.*?)(?:</pre>|Actions)', tc_content, re.DOTALL)
-            if stack_setup_match:
-                stack_setup = stack_setup_match.group(1)
-
-                for pos in forbidden_positions:
-                    if re.search(rf'\w+ {pos} \d', stack_setup):
-                        failures.append(f"{tc_id}: Found forbidden position label '{pos}' in Stack Setup")
-
-        if not failures:
-            self.results['passed'] += 1
-            self.results['rule_results'][rule_name] = ('PASS', [])
-            print(f"  + PASS")
-        else:
-            self.results['failed'] += 1
-            self.results['rule_results'][rule_name] = ('FAIL', failures)
-            print(f"  x FAIL - {len(failures)} issues")
-            for failure in failures[:3]:
-                print(f"    - {failure}")
-
-    def validate_rule_7_no_negative_stacks(self, test_cases):
-        """Rule 7: Players cannot have negative stacks"""
-        rule_name = "No negative final stacks"
-        print(f"\nValidating Rule 7: {rule_name}")
-
-        failures = []
-
-        for tc_id, tc_content in test_cases:
-            # Check for negative values in table cells
-            negative_cells = re.findall(r'<td>(-[\d,]+)</td>', tc_content)
-            if negative_cells:
-                failures.append(f"{tc_id}: Found negative values: {', '.join(negative_cells[:3])}")
-
-        if not failures:
-            self.results['passed'] += 1
-            self.results['rule_results'][rule_name] = ('PASS', [])
-            print(f"  + PASS")
-        else:
-            self.results['failed'] += 1
-            self.results['rule_results'][rule_name] = ('FAIL', failures)
-            print(f"  x FAIL - {len(failures)} issues")
-            for failure in failures[:3]:
-                print(f"    - {failure}")
-
-    def validate_rule_8_all_in_labeled(self, test_cases):
-        """Rule 8: All-in actions labeled as 'All-In' (not 'Bet' or 'Call')"""
-        rule_name = "All-in actions labeled correctly"
-        print(f"\nValidating Rule 8: {rule_name}")
-
-        # This is complex - we need to check if a player's final stack is 0 and they have actions
-        # For now, we'll check if there are players with 0 final stack who might need All-In labels
-        # Full validation would require parsing all actions
-
-        self.results['passed'] += 1
-        self.results['rule_results'][rule_name] = ('PASS', ['Manual review recommended'])
-        print(f"  + PASS (manual review recommended)")
-
-    def validate_rule_14_contribution_calculation(self, test_cases):
-        """Rule 14: Raise TO X (not BY X) - no double-counting blinds"""
-        rule_name = "Contribution calculation (no double-counting)"
-        print(f"\nValidating Rule 14: {rule_name}")
-
-        # This requires deep action parsing - marking as manual review
-        self.results['passed'] += 1
-        self.results['rule_results'][rule_name] = ('PASS', ['Manual review recommended'])
-        print(f"  + PASS (manual review recommended)")
-
-    def validate_rule_15_contribution_equals_stack_diff(self, test_cases):
-        """Rule 15: Total Contribution = Starting Stack - Final Stack"""
-        rule_name = "Contribution = Starting - Final"
-        print(f"\nValidating Rule 15: {rule_name}")
-
-        failures = []
-
-        for tc_id, tc_content in test_cases:
-            # Find all player rows
-            table_rows = re.findall(
-                r'<td>(\w+) \([^)]+\)</td>\s*<td>([\d,]+)</td>\s*<td>([\d,]+)</td>\s*<td>([\d,]+)</td>',
-                tc_content
-            )
-
-            for player, starting_str, final_str, contributed_str in table_rows:
-                starting = int(starting_str.replace(',', ''))
-                final = int(final_str.replace(',', ''))
-                contributed = int(contributed_str.replace(',', ''))
-
-                expected_contribution = starting - final
-
-                if contributed != expected_contribution:
-                    failures.append(
-                        f"{tc_id}: {player} - Starting {starting:,} - Final {final:,} = {expected_contribution:,}, but Contributed shows {contributed:,}"
-                    )
-
-        if not failures:
-            self.results['passed'] += 1
-            self.results['rule_results'][rule_name] = ('PASS', [])
-            print(f"  + PASS")
-        else:
-            self.results['failed'] += 1
-            self.results['rule_results'][rule_name] = ('FAIL', failures)
-            print(f"  x FAIL - {len(failures)} issues")
-            for failure in failures[:3]:
-                print(f"    - {failure}")
-
-    def validate_rule_16_pot_equals_sum_of_contributions(self, test_cases):
-        """Rule 16: Total Pot = Sum of all contributions"""
-        rule_name = "Total Pot = Sum of contributions"
-        print(f"\nValidating Rule 16: {rule_name}")
-
-        failures = []
-
-        for tc_id, tc_content in test_cases:
-            # Find total pot
-            pot_match = re.search(r'<div class="pot-summary">Total Pot: ([\d,]+)</div>', tc_content)
-            if not pot_match:
-                failures.append(f"{tc_id}: No total pot found")
-                continue
-
-            total_pot = int(pot_match.group(1).replace(',', ''))
-
-            # Sum all contributions
-            contributions = re.findall(r'<td>(\w+) \([^)]+\)</td>\s*<td>[\d,]+</td>\s*<td>[\d,]+</td>\s*<td>([\d,]+)</td>', tc_content)
-            sum_contributions = sum(int(c[1].replace(',', '')) for c in contributions)
-
-            if total_pot != sum_contributions:
-                failures.append(f"{tc_id}: Total Pot {total_pot:,} != Sum of Contributions {sum_contributions:,}")
-
-        if not failures:
-            self.results['passed'] += 1
-            self.results['rule_results'][rule_name] = ('PASS', [])
-            print(f"  + PASS")
-        else:
-            self.results['failed'] += 1
-            self.results['rule_results'][rule_name] = ('FAIL', failures)
-            print(f"  x FAIL - {len(failures)} issues")
-            for failure in failures[:3]:
-                print(f"    - {failure}")
+            if any(not getattr(tc, f) and getattr(tc, f) != 0 for f in r.fields):
+                issues = [r.missing] if r.missing else None
+            else:
+                issues = r.check(tc)
+
+            stats.seconds += time.perf_counter() - start
+            if issues is None:
+                stats.skipped += 1
+            elif issues:
+                stats.failed += 1
+                for issue in issues:
+                    stats.failures.append(f"{tc.tc_id}: {issue}")
+                    self.results['test_case_issues'][tc.tc_id].append(f"Rule {r.number}: {issue}")
+            else:
+                stats.passed += 1
 
     def run_all_validations(self, filepath):
-        """Run all validation rules"""
+        """Run all validation rules in one pass over the file"""
         print("="*80)
         print("COMPREHENSIVE TEST CASE VALIDATION")
         print("="*80)
 
-        content = self.read_html(filepath)
-        test_cases = self.extract_test_cases(content)
-
-        print(f"\nFound {len(test_cases)} test cases\n")
-
-        # Run key validation rules
-        self.validate_rule_1_winners_show_new_stack(test_cases)
-        self.validate_rule_2_all_players_in_preview(test_cases)
-        self.validate_rule_3_position_labels_only_for_button_blinds(test_cases)
-        self.validate_rule_7_no_negative_stacks(test_cases)
-        self.validate_rule_8_all_in_labeled(test_cases)
-        self.validate_rule_14_contribution_calculation(test_cases)
-        self.validate_rule_15_contribution_equals_stack_diff(test_cases)
-        self.validate_rule_16_pot_equals_sum_of_contributions(test_cases)
-
-        # Add placeholders for other rules (manual review or not implemented yet)
-        remaining_rules = [
-            ("Action order - Preflop 2-handed", "PASS"),
-            ("Action order - Preflop 3-handed", "PASS"),
-            ("Action order - Preflop 4+", "PASS"),
-            ("Action order - Postflop 2-handed", "PASS"),
-            ("Action order - Postflop 3+", "PASS"),
-            ("Ante posting order (BB first)", "PASS"),
-            ("Side pot calculation", "PASS"),
-            ("BB Ante rules", "PASS"),
-            ("Stack size requirements (10-60 BB)", "PASS"),
-            ("Button rotation", "PASS"),
-            ("Stack Setup starts with Dealer", "PASS"),
-            ("Base vs More section assignment", "PASS"),
-            ("All-in creates side pots", "PASS"),
-        ]
-
-        for rule_name, status in remaining_rules:
-            self.results['passed'] += 1
-            self.results['rule_results'][rule_name] = (status, ['Not fully automated - manual review recommended'])
+        for tc in iter_test_cases(filepath):
+            self.test_case_count += 1
+            self.evaluate(tc)
+
+        print(f"\nFound {self.test_case_count} test cases\n")
+
+        for r in self.rules:
+            stats = self.stats[r.name]
+            if r.check is None:
+                self.results['passed'] += 1
+                self.results['rule_results'][r.name] = ('PASS', [r.note])
+                continue
+
+            print(f"\nValidating Rule {r.number}: {r.name}")
+            if not stats.failures:
+                self.results['passed'] += 1
+                self.results['rule_results'][r.name] = ('PASS', [])
+                print(f"  + PASS")
+            else:
+                self.results['failed'] += 1
+                self.results['rule_results'][r.name] = ('FAIL', stats.failures)
+                print(f"  x FAIL - {len(stats.failures)} issues")
+                for failure in stats.failures[:3]:
+                    print(f"    - {failure}")
 
     def generate_report(self):
         """Generate comprehensive validation report"""
@@ -307,6 +240,7 @@ class TestCaseValidator:
         # Summary
         pass_rate = (self.results['passed'] / self.results['total_rules']) * 100
         report.append("## SUMMARY")
+        report.append(f"- Test Cases Checked: {self.test_case_count}")
         report.append(f"- Total Rules Checked: {self.results['total_rules']}")
         report.append(f"- Rules Passed: {self.results['passed']}")
         report.append(f"- Rules Failed: {self.results['failed']}")
@@ -331,6 +265,19 @@ class TestCaseValidator:
 
             report.append("")
 
+        # Per-rule timings and counts for automated rules
+        report.append("## RULE TIMINGS")
+        report.append("")
+        report.append("| Rule | Passed | Failed | Skipped | Time (ms) |")
+        report.append("|------|--------|--------|---------|-----------|")
+        for r in self.rules:
+            if r.check is None:
+                continue
+            stats = self.stats[r.name]
+            report.append(f"| {r.number}. {r.name} | {stats.passed} | {stats.failed} | "
+                          f"{stats.skipped} | {stats.seconds * 1000:.2f} |")
+        report.append("")
+
         # Final status
         report.append("="*80)
         report.append("## FINAL STATUS")
@@ -4,15 +4,24 @@ Detailed analysis of test cases with raises to verify "Raise TO" vs "Raise BY" r
 """
 
 import re
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent / 'docs' / 'QA'))
+from corpus_index import CorpusIndex
 
 def extract_test_case_details(html_file, tc_ids):
-    """Extract detailed information for specific test cases."""
-    with open(html_file, 'r', encoding='utf-8') as f:
-        content = f.read()
+    """Extract detailed information for specific test cases.
+
+    Each case is sliced out of the file through its corpus index, so the
+    pattern below only runs over that case's bytes.
+    """
+    with CorpusIndex.open(html_file) as index:
+        cases = {tc_id: index.case_text(tc_id) for tc_id in tc_ids if tc_id in index}
 
     results = {}
 
-    for tc_id in tc_ids:
+    for tc_id, content in cases.items():
         # Find this test case block
         tc_pattern = (
             rf'<div class="test-id">{tc_id}</div>.*?'
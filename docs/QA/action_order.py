@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Precomputed Action-Order Tables (2-9 handed)
+
+Every generator and validator used to rebuild seat order from position
+strings on each call: pick a position list for the table size, then
+sort the players on list.index(position), once per street per hand. The
+tables here are built once at import and shared by all of them.
+
+Seats are indices into SEAT_POSITIONS[n], the layout the generators deal
+(seat 0 is the button; heads-up the SB has the button and there is no
+Dealer seat). For each table size and round:
+
+- ACTION_ORDER[n][round]: the seats in the order they act, a permutation
+- ACTION_TURN[n][round]: its inverse, the turn of each seat
+- SEAT_INDEX[n]: position -> seat
+
+Rules:
+- Preflop: UTG first ... CO -> Dealer -> SB -> BB
+  (3-handed: Dealer -> SB -> BB; heads-up: SB -> BB)
+- Postflop: SB -> BB -> UTG ... CO -> Dealer (heads-up: BB -> SB)
+
+The table size is the number of players dealt in, not the number still
+in the hand: a 3-handed pot that is down to SB and BB on the flop still
+has the SB act first. Ordering players is one pass over the seats and
+checking an order is one pass over the actions, with no sort.
+
+Usage:
+    order_players(players, num_seats, 'Flop')          # players in action order
+    is_action_order(['SB', 'BB', 'CO'], 6, 'Turn')     # True
+    first_to_act(positions, 'Preflop')                 # 'UTG', or 'Dealer' 3-handed
+"""
+from types import MappingProxyType
+from typing import List, Mapping, Optional, Sequence, Tuple, TypeVar
+
+PREFLOP = 'preflop'
+POSTFLOP = 'postflop'
+ROUNDS = (PREFLOP, POSTFLOP)
+
+# Seat layout per table size, clockwise from the button
+SEAT_POSITIONS: Mapping[int, Tuple[str, ...]] = MappingProxyType({
+    2: ("SB", "BB"),
+    3: ("Dealer", "SB", "BB"),
+    4: ("Dealer", "SB", "BB", "UTG"),
+    5: ("Dealer", "SB", "BB", "UTG", "CO"),
+    6: ("Dealer", "SB", "BB", "UTG", "MP", "CO"),
+    7: ("Dealer", "SB", "BB", "UTG", "MP", "HJ", "CO"),
+    8: ("Dealer", "SB", "BB", "UTG", "UTG+1", "MP", "HJ", "CO"),
+    9: ("Dealer", "SB", "BB", "UTG", "UTG+1", "UTG+2", "MP", "HJ", "CO"),
+})
+
+# Full-ring orders; shorter tables act in the same order over the seats they have
+_PREFLOP_FULL = ("UTG", "UTG+1", "UTG+2", "MP", "HJ", "CO", "Dealer", "SB", "BB")
+_POSTFLOP_FULL = ("SB", "BB", "UTG", "UTG+1", "UTG+2", "MP", "HJ", "CO", "Dealer")
+_HEADS_UP = {PREFLOP: ("SB", "BB"), POSTFLOP: ("BB", "SB")}
+
+
+def round_of(street: str) -> str:
+    """'Preflop' (or 'Preflop Base', 'preflop') -> PREFLOP; every later street -> POSTFLOP"""
+    return PREFLOP if street.lower().startswith('preflop') else POSTFLOP
+
+
+def _build():
+    seat_index, order, turn = {}, {}, {}
+    for n, seats in SEAT_POSITIONS.items():
+        index = {position: seat for seat, position in enumerate(seats)}
+        seat_index[n] = MappingProxyType(index)
+        order[n], turn[n] = {}, {}
+        for rnd in ROUNDS:
+            full = _HEADS_UP[rnd] if n == 2 else _PREFLOP_FULL if rnd == PREFLOP else _POSTFLOP_FULL
+            permutation = tuple(index[position] for position in full if position in index)
+            inverse = [0] * n
+            for i, seat in enumerate(permutation):
+                inverse[seat] = i
+            order[n][rnd] = permutation
+            turn[n][rnd] = tuple(inverse)
+        order[n] = MappingProxyType(order[n])
+        turn[n] = MappingProxyType(turn[n])
+    return MappingProxyType(seat_index), MappingProxyType(order), MappingProxyType(turn)
+
+
+SEAT_INDEX, ACTION_ORDER, ACTION_TURN = _build()
+
+# Positions in action order, e.g. ORDER_POSITIONS[3][PREFLOP] == ('Dealer', 'SB', 'BB')
+ORDER_POSITIONS: Mapping[int, Mapping[str, Tuple[str, ...]]] = MappingProxyType({
+    n: MappingProxyType({rnd: tuple(SEAT_POSITIONS[n][seat] for seat in ACTION_ORDER[n][rnd]) for rnd in ROUNDS})
+    for n in SEAT_POSITIONS
+})
+
+P = TypeVar('P')
+
+
+def seat_of(position: str, num_seats: int) -> int:
+    try:
+        return SEAT_INDEX[num_seats][position]
+    except KeyError:
+        raise ValueError(f"{position!r} is not a seat at a {num_seats}-handed table") from None
+
+
+def order_players(players: Sequence[P], num_seats: int, street: str) -> List[P]:
+    """players (any subset of the table, each with a .position) in action order"""
+    index = SEAT_INDEX[num_seats]
+    by_seat: List[Optional[P]] = [None] * num_seats
+    for player in players:
+        seat = index.get(player.position)
+        if seat is None:
+            seat_of(player.position, num_seats)  # Raises
+        by_seat[seat] = player
+    return [by_seat[seat] for seat in ACTION_ORDER[num_seats][round_of(street)] if by_seat[seat] is not None]
+
+
+def is_action_order(positions: Sequence[str], num_seats: int, street: str) -> bool:
+    """True if positions act in table order, each at most once (seats may be missing)"""
+    index = SEAT_INDEX[num_seats]
+    turn = ACTION_TURN[num_seats][round_of(street)]
+    last = -1
+    for position in positions:
+        seat = index.get(position)
+        if seat is None or turn[seat] <= last:
+            return False
+        last = turn[seat]
+    return True
+
+
+def first_to_act(positions: Sequence[str], street: str) -> str:
+    """The first of a full table's positions to act on street"""
+    return ORDER_POSITIONS[len(positions)][round_of(street)][0]
@@ -3,6 +3,8 @@ Analyze all 40 test cases to identify which ones need side pots
 """
 import re
 
+from pot_oracle import compute_pots
+
 def parse_number(s):
     """Parse number from formatted string"""
     if isinstance(s, str):
@@ -42,7 +44,8 @@ def analyze_test_case(tc_num, tc_content):
                 'starting': starting,
                 'final': final,
                 'contributed': contributed,
-                'is_allin': is_allin
+                'is_allin': is_allin,
+                'is_bb': '(BB)' in row[0]
             })
 
     if len(players) < 2:
@@ -52,71 +55,25 @@ def analyze_test_case(tc_num, tc_content):
     ante_match = re.search(r'<strong>BB Ante: ([\d,]+)</strong>', tc_content)
     bb_ante = parse_number(ante_match.group(1)) if ante_match else 0
 
-    # Find BB player (who paid ante)
-    bb_player = None
-    for row in player_rows:
-        if '(BB)' in row[0]:
-            bb_player = row[0].strip().split('(')[0].strip()
-            break
-
-    # Calculate live contributions (excluding ante)
-    contributions = []
-    for p in players:
-        live_contrib = p['contributed']
-        if bb_player and p['name'] == bb_player:
-            live_contrib -= bb_ante  # Remove ante from BB's live contribution
-        contributions.append({
-            'name': p['name'],
-            'live': live_contrib,
-            'total': p['contributed'],
-            'is_allin': p['is_allin']
-        })
-
-    # Sort by contribution amount
-    contributions.sort(key=lambda x: x['live'])
-
-    # Check if side pots needed (different contribution levels)
-    unique_levels = list(set(c['live'] for c in contributions))
-    unique_levels.sort()
-
-    needs_sidepot = len(unique_levels) > 1 and len(players) > 1
+    # The BB posted the ante
+    ante_seat = next((i for i, p in enumerate(players) if p['is_bb']), None)
+    pots = compute_pots([p['contributed'] for p in players], bb_ante, ante_seat)
 
     # Check if HTML already has side pots
     has_sidepot = bool(re.search(r'<div class="pot-name">Side Pot', tc_content))
 
-    if needs_sidepot:
-        # Calculate correct pot structure
-        pots = []
-        remaining_players = len(contributions)
-        prev_level = 0
-
-        for i, level in enumerate(unique_levels):
-            if remaining_players > 0:
-                pot_amount = (level - prev_level) * remaining_players
-
-                # Add ante to first (main) pot
-                if i == 0:
-                    pot_amount += bb_ante
-
-                eligible = [c['name'] for c in contributions if c['live'] >= level]
-
-                pots.append({
-                    'type': 'Main Pot' if i == 0 else f'Side Pot {i}',
-                    'amount': pot_amount,
-                    'eligible': eligible
-                })
-
-                # Remove players at this level from next pot
-                remaining_players = len([c for c in contributions if c['live'] > level])
-                prev_level = level
-
+    if len(pots) > 1:
         return {
             'tc_num': tc_num,
             'needs_sidepot': True,
             'has_sidepot': has_sidepot,
             'players': players,
-            'contributions': contributions,
-            'pots': pots,
+            'pots': [{
+                'type': pot.name,
+                'amount': pot.amount,
+                'level': pot.level,
+                'eligible': [players[s]['name'] for s in pot.eligible]
+            } for pot in pots],
             'bb_ante': bb_ante,
             'status': 'OK' if has_sidepot else 'MISSING_SIDEPOT'
         }
@@ -154,7 +111,7 @@ def main():
                 issues.append(result)
                 print(f"[ISSUE] TC-{tc_num}: Needs side pot but has single pot")
                 print(f"  Players: {len(result['players'])}")
-                print(f"  Contribution levels: {sorted(set(c['live'] for c in result['contributions']))}")
+                print(f"  Contribution levels: {[pot['level'] for pot in result['pots']]}")
                 print(f"  Should have {len(result['pots'])} pot(s):")
                 for pot in result['pots']:
                     print(f"    - {pot['type']}: {pot['amount']:,} (eligible: {', '.join(pot['eligible'])})")
@@ -202,9 +159,9 @@ def main():
                 f.write(f"BB Ante: {issue['bb_ante']:,}\n\n")
 
                 f.write("Contributions:\n")
-                for c in issue['contributions']:
-                    allin = " (ALL-IN)" if c['is_allin'] else ""
-                    f.write(f"  {c['name']}: Total {c['total']:,}, Live {c['live']:,}{allin}\n")
+                for p in issue['players']:
+                    allin = " (ALL-IN)" if p['is_allin'] else ""
+                    f.write(f"  {p['name']}: Total {p['contributed']:,}{allin}\n")
 
                 f.write(f"\nCorrect Pot Structure ({len(issue['pots'])} pots):\n")
                 for pot in issue['pots']:
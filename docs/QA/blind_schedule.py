@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Tournament Blind-Level Schedules
+Level tables and level-up clocks that generators query once per hand
+
+BlindStructure.get_random / get_for_complexity pick one static SB/BB/ante
+for a standalone hand. A tournament session instead walks a level table:
+the blinds, and the BB ante with them, rise every N hands or every N
+minutes. A BlindSchedule turns a level table and a clock into the level
+of any hand:
+
+- Hand clock: each level lasts hands_per_level hands
+- Time clock: each level lasts minutes_per_level minutes of play at
+  hands_per_hour hands an hour; level starts are converted to hands once,
+  from the cumulative minute, so rounding never drifts
+- A level dict may carry its own "hands" or "minutes" (longer late levels)
+- The last level never ends
+
+Every level start is resolved when the schedule is built, into an index
+with one slot per block of hands, the block being the gcd of the level
+lengths. A per-hand query is one division and one tuple lookup, and a
+uniform schedule needs one slot per level.
+
+BB ante: the big blind posts one ante for the whole table, as dead money.
+By default it posts the ante before the blind (see "BB Ante Posting
+Order" in TEST_CASE_GENERATION_SPEC.md); a stack too short for both posts
+what it can, in that order.
+
+Usage:
+    schedule = BlindSchedule(LEVEL_TABLES['standard'], hands_per_level=50)
+    level = schedule.level(hand)        # BlindLevel(number, sb, bb, ante)
+    ante, blind = level.bb_posts(stack)
+
+python blind_schedule.py --levels standard --minutes-per-level 20 --hands-per-hour 60
+"""
+import argparse
+import sys
+from dataclasses import dataclass
+from functools import reduce
+from math import gcd
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+# Level tables: sb / bb / BB ante per level, lowest first. The early levels of
+# "standard" play without an ante, as most live structures do.
+LEVEL_TABLES: Mapping[str, Tuple[Dict[str, int], ...]] = {
+    "standard": tuple({"sb": sb, "bb": bb, "ante": ante} for sb, bb, ante in (
+        (50, 100, 0), (100, 200, 0), (100, 200, 200), (100, 300, 300), (200, 400, 400),
+        (300, 500, 500), (300, 600, 600), (400, 800, 800), (500, 1000, 1000), (600, 1200, 1200),
+        (800, 1600, 1600), (1000, 2000, 2000), (1200, 2400, 2400), (1500, 3000, 3000),
+        (2000, 4000, 4000), (2500, 5000, 5000), (3000, 6000, 6000), (4000, 8000, 8000),
+        (5000, 10000, 10000), (6000, 12000, 12000), (8000, 16000, 16000), (10000, 20000, 20000),
+        (15000, 30000, 30000), (20000, 40000, 40000), (25000, 50000, 50000), (30000, 60000, 60000),
+        (40000, 80000, 80000), (50000, 100000, 100000),
+    )),
+    "turbo": tuple({"sb": sb, "bb": bb, "ante": bb} for sb, bb in (
+        (100, 200), (200, 400), (300, 600), (500, 1000), (800, 1600), (1000, 2000), (1500, 3000),
+        (2500, 5000), (4000, 8000), (6000, 12000), (10000, 20000), (15000, 30000), (25000, 50000),
+        (40000, 80000), (60000, 120000), (100000, 200000),
+    )),
+}
+
+DEFAULT_HANDS_PER_HOUR = 60
+
+
+@dataclass(frozen=True)
+class BlindLevel:
+    number: int  # 1-based, in the level table
+    sb: int
+    bb: int
+    ante: int  # BB ante: posted by the big blind for the whole table, as dead money
+
+    def bb_posts(self, stack: int, ante_first: bool = True) -> Tuple[int, int]:
+        """(ante, blind) a big blind holding stack chips posts; a short stack posts what it can"""
+        if ante_first:
+            ante = min(self.ante, stack)
+            return ante, min(self.bb, stack - ante)
+        blind = min(self.bb, stack)
+        return min(self.ante, stack - blind), blind
+
+    def as_dict(self) -> Dict[str, int]:
+        """The {"sb", "bb", "ante"} shape of BlindStructure.STRUCTURES"""
+        return {"sb": self.sb, "bb": self.bb, "ante": self.ante}
+
+
+class BlindSchedule:
+    """A level table plus a level-up clock, resolved into an O(1) per-hand index"""
+
+    def __init__(self, levels: Sequence[Mapping[str, int]], hands_per_level: Optional[int] = None,
+                 minutes_per_level: Optional[int] = None, hands_per_hour: int = DEFAULT_HANDS_PER_HOUR,
+                 start_level: int = 0):
+        if (hands_per_level is None) == (minutes_per_level is None):
+            raise ValueError("Give a schedule either hands_per_level or minutes_per_level")
+        if not 0 <= start_level < len(levels):
+            raise ValueError(f"start_level must be 0-{len(levels) - 1}, not {start_level}")
+        length = hands_per_level if hands_per_level is not None else minutes_per_level
+        if min(length, hands_per_hour) < 1:
+            raise ValueError("Level lengths and hands_per_hour must be at least 1")
+        self.levels: Tuple[BlindLevel, ...] = tuple(
+            BlindLevel(number, level["sb"], level["bb"], level["ante"])
+            for number, level in enumerate(levels[start_level:], start_level + 1)
+        )
+        self.hands_per_level = hands_per_level
+        self.minutes_per_level = minutes_per_level
+        self.hands_per_hour = hands_per_hour
+
+        # First hand (1-based) and first minute of each level
+        starts = [1]
+        minutes = [0]
+        for level in levels[start_level:-1]:
+            if hands_per_level is not None:
+                starts.append(starts[-1] + level.get("hands", hands_per_level))
+                minutes.append((starts[-1] - 1) * 60 // hands_per_hour)
+            else:
+                minutes.append(minutes[-1] + level.get("minutes", minutes_per_level))
+                # At least one hand per level, however fast the clock
+                starts.append(max(starts[-1] + 1, 1 + minutes[-1] * hands_per_hour // 60))
+        self.starts: Tuple[int, ...] = tuple(starts)
+        self.start_minutes: Tuple[int, ...] = tuple(minutes)
+
+        lengths = [b - a for a, b in zip(starts, starts[1:])]
+        self._block = reduce(gcd, lengths, 0) or 1
+        self._index: Tuple[int, ...] = tuple(
+            k for k, length in enumerate(lengths) for _ in range(length // self._block)
+        )
+
+    def __len__(self) -> int:
+        return len(self.levels)
+
+    def level_index(self, hand: int) -> int:
+        """0-based level of hand (1-based); hands past the last level-up stay on the last level"""
+        if hand < 1:
+            raise ValueError(f"Hands are numbered from 1, not {hand}")
+        block = (hand - 1) // self._block
+        return self._index[block] if block < len(self._index) else len(self.levels) - 1
+
+    def level(self, hand: int) -> BlindLevel:
+        return self.levels[self.level_index(hand)]
+
+    def hand_at(self, seconds: float) -> int:
+        """Hand being played seconds into the session at the clock's pace"""
+        return 1 + int(seconds * self.hands_per_hour // 3600)
+
+    def level_at(self, seconds: float) -> BlindLevel:
+        return self.level(self.hand_at(seconds))
+
+    def rows(self) -> List[Tuple[BlindLevel, int, int]]:
+        """(level, first hand, first minute) per level"""
+        return list(zip(self.levels, self.starts, self.start_minutes))
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Print a blind-level schedule')
+    parser.add_argument('--levels', default='standard', choices=sorted(LEVEL_TABLES),
+                        help='Level table (default: standard)')
+    clock = parser.add_mutually_exclusive_group()
+    clock.add_argument('--hands-per-level', type=int, help='Hand clock: hands per level (default: 50)')
+    clock.add_argument('--minutes-per-level', type=int, help='Time clock: minutes per level')
+    parser.add_argument('--hands-per-hour', type=int, default=DEFAULT_HANDS_PER_HOUR,
+                        help=f'Pace of play (default: {DEFAULT_HANDS_PER_HOUR})')
+    parser.add_argument('--start-level', type=int, default=0)
+    args = parser.parse_args(argv)
+    if args.hands_per_level is None and args.minutes_per_level is None:
+        args.hands_per_level = 50
+    try:
+        args.schedule = BlindSchedule(LEVEL_TABLES[args.levels], args.hands_per_level, args.minutes_per_level,
+                                      args.hands_per_hour, args.start_level)
+    except ValueError as e:
+        parser.error(str(e))
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    schedule = args.schedule
+    clock = (f"{args.hands_per_level} hands" if args.hands_per_level else f"{args.minutes_per_level} minutes")
+    print("=" * 80)
+    print(f"BLIND SCHEDULE: {args.levels}, {len(schedule)} levels of {clock} at {args.hands_per_hour} hands/hour")
+    print("=" * 80)
+    print()
+    print("| Level | Small Blind | Big Blind | BB Ante | First hand | Starts (min) |")
+    print("|-------|-------------|-----------|---------|------------|--------------|")
+    for level, start, minute in schedule.rows():
+        print(f"| {level.number} | {level.sb:,} | {level.bb:,} | {level.ante:,} | {start:,} | {minute:,} |")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Online chip accounting for the test case generators
+
+Every chip a generator moves from a stack into the pot goes through
+ChipLedger.post, which applies the move to the Player and checks the hand's
+running totals in O(1):
+
+- The acting player's stack + total contribution still equals their
+  starting stack, and the stack is not negative
+- The acting player's total contribution matches what the ledger has posted
+  for them (catches stack edits that bypassed the ledger)
+- Sum of stacks + pot still equals the chips the hand started with
+
+The first offending action raises ChipConservationError with the test case,
+street, action and the player's before/after numbers, instead of the hand
+being written out and caught later by validate_no_negative_stacks.
+"""
+
+from typing import Dict, List, Optional
+
+from hand_state import Player
+
+
+class ChipConservationError(ValueError):
+    """An action broke chip conservation; kind is 'negative_stack' or 'conservation'"""
+
+    def __init__(self, message: str, kind: str):
+        super().__init__(message)
+        self.kind = kind
+
+
+class ChipLedger:
+    """Running chip totals for one hand"""
+
+    __slots__ = ('tc_num', 'street', 'chips', 'stacks', 'pot', 'contributed', 'num_actions')
+
+    def __init__(self, players: List[Player], tc_num: Optional[int] = None):
+        self.tc_num = tc_num
+        self.street = "Setup"
+        self.num_actions = 0
+        self.contributed: Dict[str, int] = {}
+        for p in players:
+            if p.current_stack + p.total_contribution != p.starting_stack:
+                raise ChipConservationError(
+                    f"TC-{tc_num}: {p.name} ({p.position}) starts with stack {p.current_stack:,} + "
+                    f"contributed {p.total_contribution:,} != starting stack {p.starting_stack:,}", 'conservation')
+            self.contributed[p.name] = p.total_contribution
+        self.chips = sum(p.starting_stack for p in players)
+        self.stacks = sum(p.current_stack for p in players)
+        self.pot = sum(p.total_contribution for p in players)
+
+    def begin_street(self, street: str):
+        self.street = street
+
+    def post(self, player: Player, amount: int, action: str, live: bool = True):
+        """Move amount from player's stack into the pot (live money also counts toward the street)"""
+        self.num_actions += 1
+        stack_before = player.current_stack
+        if amount < 0:
+            self._fail(player, amount, action, stack_before, f"negative amount {amount:,}", 'conservation')
+
+        player.current_stack -= amount
+        player.total_contribution += amount
+        if live:
+            player.street_contribution += amount
+        self.stacks -= amount
+        self.pot += amount
+        self.contributed[player.name] += amount
+
+        if player.current_stack < 0:
+            self._fail(player, amount, action, stack_before, "stack goes negative", 'negative_stack')
+        if player.total_contribution != self.contributed[player.name]:
+            self._fail(player, amount, action, stack_before,
+                       f"contribution {player.total_contribution:,} != posted {self.contributed[player.name]:,}",
+                       'conservation')
+        if player.current_stack + player.total_contribution != player.starting_stack:
+            self._fail(player, amount, action, stack_before, "stack + contribution != starting stack",
+                       'conservation')
+        if self.stacks + self.pot != self.chips:
+            self._fail(player, amount, action, stack_before,
+                       f"stacks {self.stacks:,} + pot {self.pot:,} != {self.chips:,} chips", 'conservation')
+
+    def _fail(self, player: Player, amount: int, action: str, stack_before: int, problem: str, kind: str):
+        raise ChipConservationError(
+            f"TC-{self.tc_num} {self.street} action #{self.num_actions}: {player.name} ({player.position}) "
+            f"{action} {amount:,}: {problem} (stack {stack_before:,} -> {player.current_stack:,}, "
+            f"contributed {player.total_contribution:,} of {player.starting_stack:,}, pot {self.pot:,})",
+            kind
+        )
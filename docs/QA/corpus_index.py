@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+Random-Access Index over QA HTML Corpora
+Jump straight to one test case (or one section of it) in a multi-MB file
+
+Single-TC tools used to read the whole corpus and run a DOTALL regex from the
+top for every case they looked at. The index records, per TC id, the byte
+span of the case and of its sections:
+
+- stack_setup: "Stack Setup" title up to the Actions title
+- actions: "Actions" title up to the Expected Results title
+- expected_results: "Expected Results" title up to the Next Hand Preview
+- pot_breakdown: first pot-item up to the results table
+- next_hand: "Next Hand Preview" up to the end of the case
+
+It is built once per file with one bytes-regex pass and stored as a sidecar
+under .fragment_cache/corpus_index/. It is reused while the file's size and
+mtime are unchanged, and re-validated by content hash when only the mtime
+moved. Lookups slice the memory-mapped file, so only the requested bytes
+are decoded.
+
+Usage:
+    from corpus_index import CorpusIndex
+
+    index = CorpusIndex.open('40_TestCases.html')
+    html = index.case_text('TC-9')
+    actions = index.section_text('TC-9', 'actions')
+
+python corpus_index.py <html_file> [TC-id ...] [--section NAME] [--rebuild]
+"""
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import re
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+from fragment_cache import default_cache_dir
+from testcase_stream import TestCaseRecord, parse_test_case
+
+INDEX_VERSION = 2
+
+# A case starts at its "TEST CASE N" marker comment if it has one, else at its div
+CASE_START_PATTERN = re.compile(rb'(?:<!-- TEST CASE \d+ -->\s*)?<div class="test-case">')
+TC_ID_PATTERN = re.compile(rb'<div class="test-id">([^<]+)</div>')
+DIV_TAG_PATTERN = re.compile(rb'<div[\s>]|</div>')
+
+# Section name -> (start marker, end marker); a missing end marker means end of case
+SECTIONS = {
+    'stack_setup': (b'<div class="section-title">Stack Setup</div>', b'<div class="section-title">Actions</div>'),
+    'actions': (b'<div class="section-title">Actions</div>', b'<div class="section-title">Expected Results'),
+    'expected_results': (b'<div class="section-title">Expected Results', b'<div class="next-hand-preview">'),
+    'pot_breakdown': (b'<div class="pot-item', b'<table>'),
+    'next_hand': (b'<div class="next-hand-preview">', None),
+}
+
+
+@dataclass
+class CaseSpan:
+    tc_id: str
+    start: int
+    end: int
+    sections: Dict[str, Tuple[int, int]] = field(default_factory=dict)
+
+
+def file_hash(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def case_end(data, start: int) -> int:
+    """End of the test-case div opened at or after start (its closing </div>), or of the data"""
+    depth = 0
+    for tag in DIV_TAG_PATTERN.finditer(data, data.find(b'<div class="test-case">', start)):
+        depth += -1 if tag.group().startswith(b'</') else 1
+        if depth == 0:
+            return tag.end()
+    return len(data)
+
+
+def scan_cases(data) -> List[CaseSpan]:
+    """One pass over the file's bytes: case spans, TC ids and section spans"""
+    starts = [m.start() for m in CASE_START_PATTERN.finditer(data)]
+    if not starts:
+        return []
+
+    cases = []
+    for i, start in enumerate(starts):
+        # A case runs to the next one; the last one to its own closing </div>, not the page footer
+        end = starts[i + 1] if i + 1 < len(starts) else case_end(data, start)
+        tc_match = TC_ID_PATTERN.search(data, start, end)
+        span = CaseSpan(tc_match.group(1).decode('utf-8').strip() if tc_match else f"#{i}", start, end)
+        for name, (start_marker, end_marker) in SECTIONS.items():
+            section_start = data.find(start_marker, start, end)
+            if section_start < 0:
+                continue
+            section_end = data.find(end_marker, section_start, end) if end_marker else -1
+            span.sections[name] = (section_start, section_end if section_end >= 0 else end)
+        cases.append(span)
+    return cases
+
+
+class CorpusIndex:
+    """TC id -> byte spans for one HTML corpus, backed by a memory map of the file"""
+
+    def __init__(self, path: Path, cases: List[CaseSpan]):
+        self.path = path
+        self.cases = cases
+        self.by_id: Dict[str, CaseSpan] = {}
+        for case in cases:
+            self.by_id.setdefault(case.tc_id, case)  # First occurrence wins for duplicate ids
+        self._file = open(path, 'rb')
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if cases else b''
+
+    @staticmethod
+    def sidecar_path(path: Path) -> Path:
+        return default_cache_dir(str(path), 'corpus_index') / f"{path.name}.json"
+
+    @classmethod
+    def open(cls, html_file, rebuild: bool = False) -> 'CorpusIndex':
+        """Load the sidecar if it still describes the file, else scan the file and save one"""
+        path = Path(html_file).resolve()
+        stat = path.stat()
+        sidecar = cls.sidecar_path(path)
+
+        cached = None
+        if not rebuild:
+            try:
+                with open(sidecar, 'r', encoding='utf-8') as f:
+                    cached = json.load(f)
+            except (FileNotFoundError, json.JSONDecodeError):
+                pass
+        if cached and cached.get('version') == INDEX_VERSION and cached.get('size') == stat.st_size:
+            if cached.get('mtime_ns') == stat.st_mtime_ns:
+                return cls(path, cls._load_cases(cached))
+            # Touched but maybe not changed: trust the index if the content hash still matches
+            digest = file_hash(path)
+            if cached.get('sha256') == digest:
+                cached['mtime_ns'] = stat.st_mtime_ns
+                cls._save(sidecar, cached)
+                return cls(path, cls._load_cases(cached))
+
+        with open(path, 'rb') as f:
+            data = f.read()
+        cases = scan_cases(data)
+        cls._save(sidecar, {
+            'version': INDEX_VERSION,
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'sha256': hashlib.sha256(data).hexdigest(),
+            'cases': [[c.tc_id, c.start, c.end, c.sections] for c in cases],
+        })
+        return cls(path, cases)
+
+    @staticmethod
+    def _load_cases(cached: Dict) -> List[CaseSpan]:
+        return [CaseSpan(tc_id, start, end, {name: tuple(span) for name, span in sections.items()})
+                for tc_id, start, end, sections in cached['cases']]
+
+    @staticmethod
+    def _save(sidecar: Path, payload: Dict):
+        sidecar.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = sidecar.with_name(f'.{sidecar.name}.{os.getpid()}.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(payload, f, separators=(',', ':'))
+        os.replace(tmp_path, sidecar)
+
+    def close(self):
+        if isinstance(self._map, mmap.mmap):
+            self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return len(self.cases)
+
+    def __contains__(self, tc: Union[str, int]) -> bool:
+        return self.find(tc) is not None
+
+    def find(self, tc: Union[str, int]) -> Optional[CaseSpan]:
+        """Look a case up by TC id ("TC-9", "TC-14.1") or number (9 -> TC-9, else first TC-9.x)"""
+        if isinstance(tc, str) and tc in self.by_id:
+            return self.by_id[tc]
+        num = str(tc).removeprefix('TC-')
+        case = self.by_id.get(f"TC-{num}")
+        if case is None and num.isdigit():
+            case = next((c for c in self.cases if c.tc_id.startswith(f"TC-{num}.")), None)
+        return case
+
+    def _span(self, tc: Union[str, int], section: Optional[str] = None) -> Tuple[int, int]:
+        case = self.find(tc)
+        if case is None:
+            raise KeyError(f"{tc} not in {self.path.name}")
+        if section is None:
+            return case.start, case.end
+        if section not in SECTIONS:
+            raise KeyError(f"Unknown section '{section}'; sections: {', '.join(SECTIONS)}")
+        if section not in case.sections:
+            raise KeyError(f"{case.tc_id} has no {section} section")
+        return case.sections[section]
+
+    def case_bytes(self, tc: Union[str, int], section: Optional[str] = None) -> bytes:
+        start, end = self._span(tc, section)
+        return self._map[start:end]
+
+    def case_text(self, tc: Union[str, int]) -> str:
+        return self.case_bytes(tc).decode('utf-8')
+
+    def section_text(self, tc: Union[str, int], section: str) -> str:
+        return self.case_bytes(tc, section).decode('utf-8')
+
+    def record(self, tc: Union[str, int]) -> Optional[TestCaseRecord]:
+        """Parse just this case with testcase_stream"""
+        return parse_test_case(self.case_text(tc))
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Index a QA HTML corpus and print single test cases')
+    parser.add_argument('html_file', type=Path)
+    parser.add_argument('tc_ids', nargs='*', help='TC ids or numbers to print (default: list the index)')
+    parser.add_argument('--section', choices=list(SECTIONS), help='Print only this section')
+    parser.add_argument('--rebuild', action='store_true', help='Ignore the sidecar and rescan the file')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    start = time.perf_counter()
+    index = CorpusIndex.open(args.html_file, rebuild=args.rebuild)
+    seconds = time.perf_counter() - start
+
+    with index:
+        if not args.tc_ids:
+            print(f"{args.html_file.name}: {len(index)} cases indexed ({seconds * 1000:.1f} ms)")
+            for case in index.cases:
+                sections = ', '.join(f"{name} {end - start:,}" for name, (start, end) in case.sections.items())
+                print(f"  {case.tc_id}: bytes {case.start:,}-{case.end:,} ({sections})")
+            return 0
+
+        for tc in args.tc_ids:
+            try:
+                print(index.section_text(tc, args.section) if args.section else index.case_text(tc))
+            except KeyError as e:
+                print(f"[ERROR] {e.args[0]}")
+                return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,12 +1,12 @@
 import re
 
-with open('40_TestCases.html', 'r', encoding='utf-8') as f:
-    content = f.read()
+from corpus_index import CorpusIndex
 
-# Find TC-9
-tc_match = re.search(r'<!-- TEST CASE 9 -->(.*?)<!-- TEST CASE 10', content, re.DOTALL)
-if tc_match:
-    tc_content = tc_match.group(1)
+# Jump straight to TC-9 through the corpus index
+with CorpusIndex.open('40_TestCases.html') as index:
+    tc_content = index.case_text('TC-9') if 'TC-9' in index else None
+
+if tc_content:
 
     # Find Copy Player Data button
     copy_match = re.search(
@@ -0,0 +1,381 @@
+"""
+DOM Snapshot Queries
+Pure-Python lookups of Chrome Recorder selectors against a saved HTML page
+
+Loads a page saved from the app (driver.page_source or DevTools "Save as")
+into a lightweight element tree and resolves the selector kinds Chrome
+Recorder emits, without a browser:
+
+- CSS:    tag, #id, .class (with \\-escapes), [attr] / [attr="v"],
+          :nth-of-type(n), :nth-child(n), descendant and '>' combinators
+- XPath:  absolute/relative location paths with '//' and '/', name or '*'
+          steps, [n] positions and [@attr="v"] predicates
+- aria/:  elements whose accessible name equals the text
+- text/:  innermost elements whose text content contains the text
+- pierce/: treated as CSS (saved snapshots have no shadow roots)
+
+Usage:
+    from dom_snapshot import load_snapshot
+
+    snapshot = load_snapshot('app_after_setup.html')
+    matches = snapshot.query('css', 'div.space-y-3 button')
+"""
+import re
+from html.parser import HTMLParser
+from typing import Dict, List, Optional, Tuple
+
+VOID_TAGS = {'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link', 'meta', 'source', 'wbr'}
+SKIP_TEXT_TAGS = {'script', 'style', 'template'}
+
+# Elements whose accessible name comes from their content
+NAME_FROM_CONTENT_TAGS = {'button', 'a', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'option', 'summary',
+                          'td', 'th', 'label', 'legend', 'caption'}
+
+WHITESPACE_PATTERN = re.compile(r'\s+')
+NTH_PATTERN = re.compile(r'\s*(\d+)\s*')
+XPATH_STEP_PATTERN = re.compile(r'^([\w*-]+)((?:\[[^\]]*\])*)$')
+XPATH_PREDICATE_PATTERN = re.compile(r'\[([^\]]*)\]')
+XPATH_ATTR_PATTERN = re.compile(r'^@([\w-]+)\s*=\s*["\'](.*)["\']$')
+
+
+class Element:
+    __slots__ = ('tag', 'attrs', 'children', 'parent', 'texts', 'classes')
+
+    def __init__(self, tag: str, attrs: Dict[str, str], parent: Optional['Element']):
+        self.tag = tag
+        self.attrs = attrs
+        self.children: List['Element'] = []
+        self.parent = parent
+        # texts[i] is the text that precedes children[i]; texts[-1] trails the last child
+        self.texts: List[str] = ['']
+        self.classes = set(attrs.get('class', '').split())
+
+    def text_content(self) -> str:
+        if self.tag in SKIP_TEXT_TAGS:
+            return ''
+        parts = []
+        for text, child in zip(self.texts, self.children):
+            parts.append(text)
+            parts.append(child.text_content())
+        parts.append(self.texts[-1])
+        return ''.join(parts)
+
+    def iter_descendants(self):
+        for child in self.children:
+            yield child
+            yield from child.iter_descendants()
+
+    def accessible_name(self) -> Optional[str]:
+        """Simplified accessible name: aria-label, alt/value/placeholder, or content for named roles"""
+        label = self.attrs.get('aria-label')
+        if label:
+            return WHITESPACE_PATTERN.sub(' ', label).strip()
+        if self.tag == 'img' and self.attrs.get('alt'):
+            return self.attrs['alt'].strip()
+        if self.tag == 'input':
+            return (self.attrs.get('value') or self.attrs.get('placeholder') or '').strip() or None
+        if self.tag in NAME_FROM_CONTENT_TAGS or 'role' in self.attrs:
+            return WHITESPACE_PATTERN.sub(' ', self.text_content()).strip() or None
+        return None
+
+    def __repr__(self):
+        return f"<{self.tag}{' id=' + self.attrs['id'] if 'id' in self.attrs else ''}>"
+
+
+class _TreeBuilder(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.root = Element('#document', {}, None)
+        self.current = self.root
+
+    def handle_starttag(self, tag, attrs):
+        element = Element(tag, {name: value or '' for name, value in attrs}, self.current)
+        self.current.children.append(element)
+        self.current.texts.append('')
+        if tag not in VOID_TAGS:
+            self.current = element
+
+    def handle_startendtag(self, tag, attrs):
+        element = Element(tag, {name: value or '' for name, value in attrs}, self.current)
+        self.current.children.append(element)
+        self.current.texts.append('')
+
+    def handle_endtag(self, tag):
+        # Close up to the nearest open element with this tag; ignore stray end tags
+        node = self.current
+        while node is not self.root and node.tag != tag:
+            node = node.parent
+        if node is not self.root:
+            self.current = node.parent
+
+    def handle_data(self, data):
+        self.current.texts[-1] += data
+
+
+# ---------------------------------------------------------------------------
+# CSS
+# ---------------------------------------------------------------------------
+
+def _read_ident(selector: str, i: int) -> Tuple[str, int]:
+    """Read a CSS identifier starting at i, resolving backslash escapes"""
+    out = []
+    while i < len(selector):
+        ch = selector[i]
+        if ch == '\\' and i + 1 < len(selector):
+            out.append(selector[i + 1])
+            i += 2
+        elif ch.isalnum() or ch in '-_' or ord(ch) > 127:
+            out.append(ch)
+            i += 1
+        else:
+            break
+    return ''.join(out), i
+
+
+def parse_css(selector: str) -> List[Tuple[str, Dict]]:
+    """
+    Parse a CSS selector into [(combinator, compound), ...] left to right.
+
+    combinator is ' ' or '>' (the first entry's is ' '). A compound has keys
+    tag, id, classes, attrs [(name, value or None)], nth_of_type, nth_child.
+    """
+    parts = []
+    combinator = ' '
+    i = 0
+    compound = None
+    while i < len(selector):
+        ch = selector[i]
+        if ch.isspace() or ch == '>':
+            if compound is not None:
+                parts.append((combinator, compound))
+                compound = None
+                combinator = ' '
+            if ch == '>':
+                combinator = '>'
+            i += 1
+            continue
+
+        if compound is None:
+            compound = {'tag': None, 'id': None, 'classes': [], 'attrs': [], 'nth_of_type': None, 'nth_child': None}
+
+        if ch == '#':
+            compound['id'], i = _read_ident(selector, i + 1)
+        elif ch == '.':
+            name, i = _read_ident(selector, i + 1)
+            compound['classes'].append(name)
+        elif ch == '[':
+            end = selector.index(']', i)
+            name, sep, value = selector[i + 1:end].partition('=')
+            compound['attrs'].append((name.strip(), value.strip().strip('"\'') if sep else None))
+            i = end + 1
+        elif ch == ':':
+            name, i = _read_ident(selector, i + 1)
+            if i < len(selector) and selector[i] == '(':
+                end = selector.index(')', i)
+                argument = selector[i + 1:end]
+                i = end + 1
+            else:
+                argument = ''
+            nth = NTH_PATTERN.fullmatch(argument)
+            if name not in ('nth-of-type', 'nth-child') or not nth:
+                raise ValueError(f"Unsupported pseudo-class ':{name}({argument})' in '{selector}'")
+            compound[name.replace('-', '_')] = int(nth.group(1))
+        elif ch == '*':
+            i += 1
+        else:
+            compound['tag'], i = _read_ident(selector, i)
+            compound['tag'] = compound['tag'].lower()
+            if not compound['tag']:
+                raise ValueError(f"Unexpected '{ch}' in CSS selector '{selector}'")
+
+    if compound is not None:
+        parts.append((combinator, compound))
+    if not parts:
+        raise ValueError(f"Empty CSS selector '{selector}'")
+    return parts
+
+
+def _matches_compound(element: Element, compound: Dict) -> bool:
+    if element.parent is None:
+        return False
+    if compound['tag'] and element.tag != compound['tag']:
+        return False
+    if compound['id'] and element.attrs.get('id') != compound['id']:
+        return False
+    if any(name not in element.classes for name in compound['classes']):
+        return False
+    for name, value in compound['attrs']:
+        if name not in element.attrs or (value is not None and element.attrs[name] != value):
+            return False
+    if compound['nth_child'] is not None:
+        if element.parent.children.index(element) + 1 != compound['nth_child']:
+            return False
+    if compound['nth_of_type'] is not None:
+        same_type = [child for child in element.parent.children if child.tag == element.tag]
+        if same_type.index(element) + 1 != compound['nth_of_type']:
+            return False
+    return True
+
+
+def _matches_css(element: Element, parts: List[Tuple[str, Dict]], index: int) -> bool:
+    """Match parts[:index + 1] right to left, ending at element"""
+    combinator, compound = parts[index]
+    if not _matches_compound(element, compound):
+        return False
+    if index == 0:
+        return True
+    ancestor = element.parent
+    if combinator == '>':
+        return ancestor is not None and _matches_css(ancestor, parts, index - 1)
+    while ancestor is not None:
+        if _matches_css(ancestor, parts, index - 1):
+            return True
+        ancestor = ancestor.parent
+    return False
+
+
+# ---------------------------------------------------------------------------
+# XPath
+# ---------------------------------------------------------------------------
+
+def parse_xpath(expression: str) -> List[Tuple[str, str, List]]:
+    """Parse a location path into [(axis, name, predicates), ...]; axis is 'child' or 'descendant'"""
+    steps = []
+    i = 0
+    if not expression.startswith('/'):
+        expression = './' + expression
+    while i < len(expression):
+        if expression.startswith('//', i):
+            axis, i = 'descendant', i + 2
+        elif expression[i] == '/':
+            axis, i = 'child', i + 1
+        elif expression.startswith('./', i):
+            i += 1
+            continue
+        else:
+            raise ValueError(f"Unsupported XPath '{expression}'")
+
+        # Step runs to the next '/' outside brackets
+        depth, start = 0, i
+        while i < len(expression) and (depth or expression[i] != '/'):
+            depth += {'[': 1, ']': -1}.get(expression[i], 0)
+            i += 1
+        match = XPATH_STEP_PATTERN.match(expression[start:i])
+        if not match:
+            raise ValueError(f"Unsupported XPath step '{expression[start:i]}' in '{expression}'")
+
+        predicates = []
+        for predicate in XPATH_PREDICATE_PATTERN.findall(match.group(2)):
+            predicate = predicate.strip()
+            attr = XPATH_ATTR_PATTERN.match(predicate)
+            if predicate.isdigit():
+                predicates.append(('position', int(predicate)))
+            elif attr:
+                predicates.append(('attr', (attr.group(1), attr.group(2))))
+            else:
+                raise ValueError(f"Unsupported XPath predicate '[{predicate}]' in '{expression}'")
+        steps.append((axis, match.group(1).lower(), predicates))
+    return steps
+
+
+def _xpath_step(context: Element, axis: str, name: str, predicates: List) -> List[Element]:
+    candidates = context.children if axis == 'child' else list(context.iter_descendants())
+    if axis == 'descendant':
+        # '//x[n]' is '/descendant-or-self::node()/x[n]': positions count per parent
+        groups: Dict[int, List[Element]] = {}
+        for element in candidates:
+            if name == '*' or element.tag == name:
+                groups.setdefault(id(element.parent), []).append(element)
+        selected = []
+        for group in groups.values():
+            selected.extend(_apply_predicates(group, predicates))
+        return selected
+    return _apply_predicates([e for e in candidates if name == '*' or e.tag == name], predicates)
+
+
+def _apply_predicates(elements: List[Element], predicates: List) -> List[Element]:
+    for kind, value in predicates:
+        if kind == 'position':
+            elements = elements[value - 1:value] if 0 < value <= len(elements) else []
+        else:
+            attr, expected = value
+            elements = [e for e in elements if e.attrs.get(attr) == expected]
+    return elements
+
+
+# ---------------------------------------------------------------------------
+# Snapshot
+# ---------------------------------------------------------------------------
+
+class DomSnapshot:
+    """Parsed page plus cached selector lookups"""
+
+    def __init__(self, html: str, name: str = ''):
+        builder = _TreeBuilder()
+        builder.feed(html)
+        builder.close()
+        self.root = builder.root
+        self.name = name
+        self.elements = list(self.root.iter_descendants())
+        self._cache: Dict[Tuple[str, str], List[Element]] = {}
+
+    @property
+    def title(self) -> Optional[str]:
+        for element in self.elements:
+            if element.tag == 'title':
+                return element.text_content().strip()
+        return None
+
+    def query(self, kind: str, value: str, scope: Optional[Element] = None) -> List[Element]:
+        """All elements matching one selector part; kind is css, xpath, aria, text or pierce"""
+        if scope is None and (kind, value) in self._cache:
+            return self._cache[(kind, value)]
+
+        root = scope or self.root
+        elements = self.elements if scope is None else list(scope.iter_descendants())
+        if kind in ('css', 'pierce'):
+            parts = parse_css(value)
+            last = len(parts) - 1
+            result = [e for e in elements if _matches_css(e, parts, last)
+                      and (scope is None or _inside(e, scope))]
+        elif kind == 'xpath':
+            context = [root]
+            for axis, name, predicates in parse_xpath(value):
+                context = [found for node in context for found in _xpath_step(node, axis, name, predicates)]
+            result = context
+        elif kind == 'aria':
+            result = [e for e in elements if e.accessible_name() == value]
+        elif kind == 'text':
+            containing = {id(e) for e in elements if value in e.text_content()}
+            result = [e for e in elements if id(e) in containing
+                      and not any(id(child) in containing for child in e.children)]
+        else:
+            raise ValueError(f"Unknown selector kind '{kind}'")
+
+        if scope is None:
+            self._cache[(kind, value)] = result
+        return result
+
+    def resolve(self, chain: Tuple[Tuple[str, str], ...]) -> List[Element]:
+        """Resolve a selector chain (frames/shadow hops collapse to nested scopes)"""
+        scopes: List[Optional[Element]] = [None]
+        for kind, value in chain:
+            scopes = [found for scope in scopes for found in self.query(kind, value, scope)]
+            if not scopes:
+                return []
+        return scopes
+
+
+def _inside(element: Element, scope: Element) -> bool:
+    node = element.parent
+    while node is not None:
+        if node is scope:
+            return True
+        node = node.parent
+    return False
+
+
+def load_snapshot(path) -> DomSnapshot:
+    """Parse a saved HTML page into a DomSnapshot"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return DomSnapshot(f.read(), name=str(path))
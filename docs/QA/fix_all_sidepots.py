@@ -5,6 +5,13 @@ Reads from sidepot_analysis_report.txt and fixes all issues
 import re
 import json
 
+from pot_oracle import compute_pots
+
+# List of TCs that need fixing (from analysis)
+TCS_TO_FIX = [7, 14, 16, 19, 21, 22, 23, 24, 25, 26, 27, 29, 30, 31, 33, 36, 38, 39]
+
+BB_ANTE_PATTERN = re.compile(r'<strong>BB Ante: ([\d,]+)</strong>')
+
 def parse_number(s):
     """Parse number from formatted string"""
     if isinstance(s, str):
@@ -27,52 +34,12 @@ def calculate_side_pots(players_data, bb_ante, bb_player_name):
     Returns:
         List of pot dicts with {type, amount, eligible, percentage}
     """
-    # Calculate live contributions (excluding ante)
-    contributions = []
-    for p in players_data:
-        live_contrib = p['contributed']
-        if p['name'] == bb_player_name:
-            live_contrib -= bb_ante  # Remove ante from BB's live contribution
-
-        contributions.append({
-            'name': p['name'],
-            'live': live_contrib,
-            'total': p['contributed']
-        })
-
-    # Sort by live contribution
-    contributions.sort(key=lambda x: x['live'])
-
-    # Get unique contribution levels
-    unique_levels = sorted(set(c['live'] for c in contributions))
-
-    # Calculate pots
-    pots = []
-    remaining_players = len(contributions)
-    prev_level = 0
-
-    for i, level in enumerate(unique_levels):
-        if remaining_players > 0:
-            pot_amount = (level - prev_level) * remaining_players
-
-            # Add ante to first (main) pot
-            if i == 0:
-                pot_amount += bb_ante
-
-            # Eligible players: those who contributed at least to this level
-            eligible = [c['name'] for c in contributions if c['live'] >= level]
-
-            pot_type = 'Main Pot' if i == 0 else f'Side Pot {i}'
-
-            pots.append({
-                'type': pot_type,
-                'amount': pot_amount,
-                'eligible': eligible
-            })
-
-            # Remove players at this level from next pot calculation
-            remaining_players = len([c for c in contributions if c['live'] > level])
-            prev_level = level
+    ante_seat = next((i for i, p in enumerate(players_data) if p['name'] == bb_player_name), None)
+    pots = [{
+        'type': pot.name,
+        'amount': pot.amount,
+        'eligible': [players_data[s]['name'] for s in pot.eligible]
+    } for pot in compute_pots([p['contributed'] for p in players_data], bb_ante, ante_seat)]
 
     # Calculate percentages
     total_pot = sum(p['amount'] for p in pots)
@@ -135,7 +102,7 @@ def fix_test_case(tc_num, tc_content):
         return tc_content, False
 
     # Extract ante info
-    ante_match = re.search(r'<strong>BB Ante: ([\d,]+)</strong>', tc_content)
+    ante_match = BB_ANTE_PATTERN.search(tc_content)
     bb_ante = parse_number(ante_match.group(1)) if ante_match else 0
 
     # Find BB player
@@ -248,8 +215,7 @@ def main():
     input_file = 'C:\\Apps\\HUDR\\HHTool_Modular\\docs\\QA\\40_TestCases.html'
     output_file = 'C:\\Apps\\HUDR\\HHTool_Modular\\docs\\QA\\40_TestCases_v2.html'
 
-    # List of TCs that need fixing (from analysis)
-    tcs_to_fix = [7, 14, 16, 19, 21, 22, 23, 24, 25, 26, 27, 29, 30, 31, 33, 36, 38, 39]
+    tcs_to_fix = TCS_TO_FIX
 
     print("=" * 80)
     print("FIXING ALL SIDE POT ERRORS")
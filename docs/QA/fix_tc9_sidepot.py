@@ -17,25 +17,8 @@ Winner: Alice wins both pots
 
 import re
 
-def fix_tc9_sidepot():
-    filename = 'C:\\Apps\\HUDR\\HHTool_Modular\\docs\\QA\\40_TestCases.html'
-
-    print("=" * 80)
-    print("FIXING TC-9: Adding side pot structure and reverting to correct values")
-    print("=" * 80)
-
-    with open(filename, 'r', encoding='utf-8') as f:
-        content = f.read()
-
-    # Find TC-9 section
-    tc9_start = content.find('<!-- TEST CASE 9 -->')
-    tc9_end = content.find('<!-- TEST CASE 10 -->')
-
-    if tc9_start == -1:
-        print("  [ERROR] Could not find TC-9")
-        return
-
-    tc9_section = content[tc9_start:tc9_end]
+def fix_tc9_section(tc9_section):
+    """Apply the TC-9 side pot fixes to the TC-9 fragment; returns the fixed fragment"""
 
     # Fix 1: Revert Total Pot (540,000 → 530,000)
     tc9_section = tc9_section.replace(
@@ -167,6 +150,30 @@ Alice BB 590000'''
 
     tc9_section = tc9_section.replace(old_preview, new_preview)
 
+    return tc9_section
+
+
+def fix_tc9_sidepot():
+    filename = 'C:\\Apps\\HUDR\\HHTool_Modular\\docs\\QA\\40_TestCases.html'
+
+    print("=" * 80)
+    print("FIXING TC-9: Adding side pot structure and reverting to correct values")
+    print("=" * 80)
+
+    with open(filename, 'r', encoding='utf-8') as f:
+        content = f.read()
+
+    # Find TC-9 section
+    tc9_start = content.find('<!-- TEST CASE 9 -->')
+    tc9_end = content.find('<!-- TEST CASE 10 -->')
+
+    if tc9_start == -1:
+        print("  [ERROR] Could not find TC-9")
+        return
+
+    tc9_section = content[tc9_start:tc9_end]
+    tc9_section = fix_tc9_section(tc9_section)
+
     # Write back
     content = content[:tc9_start] + tc9_section + content[tc9_end:]
 
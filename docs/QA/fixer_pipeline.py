@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+Incremental Fixer Pipeline
+Run every registered HTML fixer over a test case corpus in one pass
+
+The fix_*.py scripts each re-read a whole corpus file, run their chained
+re.sub calls over all of it and rewrite it. The pipeline instead:
+
+- Splits a file once into header, per-case fragments and footer; cases that
+  no fixer touches are written back as the same string
+- Runs each registered fixer (see corpus_fixers.py) over each fragment in
+  order; fixers that need structured data get the fragment parsed once via
+  testcase_stream
+- Re-runs every fixer that changed a fragment on its own output and reports
+  it if the second run is not a no-op
+- Writes the file once, atomically, and only if something changed
+- Records a content hash per fixed case (and for the whole file) in a
+  manifest, so a rerun skips clean cases, and skips an unchanged file
+  without parsing it at all
+
+Usage:
+python fixer_pipeline.py [html_file ...] [--fixers a,b] [--dry-run] [--force]
+"""
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+from dataclasses import dataclass, field
+from fnmatch import fnmatch
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from fragment_cache import default_cache_dir, source_version
+from testcase_stream import TestCaseRecord, parse_test_case
+
+DOCS_DIR = Path(__file__).resolve().parent.parent
+
+DEFAULT_FILES = [
+    DOCS_DIR / 'pot-test-cases-batch-1.html',
+    DOCS_DIR / 'pot-test-cases-batch-2.html',
+    DOCS_DIR / 'pot-test-cases-batch-3.html',
+    DOCS_DIR / 'pot-test-cases-batch-4.html',
+]
+
+# A case starts at its "TEST CASE N" marker comment if it has one, else at its div
+CASE_START_PATTERN = re.compile(r'(?:<!-- TEST CASE \d+ -->\s*)?<div class="test-case">')
+TC_ID_PATTERN = re.compile(r'<div class="test-id">TC-(\d+)</div>')
+
+
+@dataclass
+class CaseFragment:
+    file_name: str
+    index: int
+    tc_num: Optional[int]
+    text: str
+    _record: Optional[TestCaseRecord] = field(default=None, repr=False)
+
+    @property
+    def tc_id(self) -> str:
+        return f"TC-{self.tc_num}" if self.tc_num is not None else f"#{self.index}"
+
+    @property
+    def record(self) -> Optional[TestCaseRecord]:
+        """Parsed view of the current text (re-parsed only after a fixer changes it)"""
+        if self._record is None:
+            self._record = parse_test_case(self.text)
+        return self._record
+
+    def update(self, text: str):
+        if text != self.text:
+            self.text = text
+            self._record = None
+
+
+@dataclass
+class Fixer:
+    name: str
+    fix: Callable[[CaseFragment], str]
+    files: Tuple[str, ...] = ()  # Filename globs; empty = every file
+    cases: Tuple[int, ...] = ()  # TC numbers; empty = every case
+    sources: Tuple = ()  # Modules whose code the fixer wraps (part of the manifest version)
+
+    def applies_to(self, case: CaseFragment) -> bool:
+        if self.files and not any(fnmatch(case.file_name, pattern) for pattern in self.files):
+            return False
+        return not self.cases or case.tc_num in self.cases
+
+
+@dataclass
+class FixerStats:
+    cases_changed: int = 0
+    not_idempotent: List[str] = field(default_factory=list)
+    seconds: float = 0.0
+
+
+FIXERS: List[Fixer] = []
+
+
+def fixer(name: str, files: Tuple[str, ...] = (), cases: Tuple[int, ...] = (), sources: Tuple = ()):
+    """Register a fixer; it receives a CaseFragment and returns the (possibly) fixed text"""
+    def decorator(fix):
+        FIXERS.append(Fixer(name, fix, files, cases, sources))
+        return fix
+    return decorator
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def split_corpus(content: str, file_name: str) -> Tuple[str, List[CaseFragment], str]:
+    """Split a corpus into (header, case fragments, footer); joining them gives content back"""
+    starts = [m.start() for m in CASE_START_PATTERN.finditer(content)]
+    if not starts:
+        return content, [], ''
+
+    footer_start = content.rfind('</body>')
+    if footer_start < starts[-1]:
+        footer_start = len(content)
+
+    cases = []
+    for i, start in enumerate(starts):
+        end = starts[i + 1] if i + 1 < len(starts) else footer_start
+        text = content[start:end]
+        tc_match = TC_ID_PATTERN.search(text)
+        cases.append(CaseFragment(file_name, i, int(tc_match.group(1)) if tc_match else None, text))
+    return content[:starts[0]], cases, content[footer_start:]
+
+
+def atomic_write(path: Path, content: str):
+    """Write to a temp file next to path and swap it in"""
+    tmp_path = path.with_name(f'.{path.name}.{os.getpid()}.tmp')
+    with open(tmp_path, 'w', encoding='utf-8', newline='') as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+
+
+class FixerPipeline:
+    def __init__(self, fixers: Optional[List[Fixer]] = None, version: Optional[str] = None,
+                 dry_run: bool = False, force: bool = False):
+        self.fixers = fixers if fixers is not None else FIXERS
+        # Manifest entries are only trusted for the same fixer set and fixer sources
+        self.version = version or content_hash(
+            ','.join(f.name for f in self.fixers) + ':' +
+            source_version(*sorted({sys.modules[f.fix.__module__] for f in self.fixers}
+                                   | {m for f in self.fixers for m in f.sources}, key=lambda m: m.__name__))
+        )[:16]
+        self.dry_run = dry_run
+        self.force = force
+        self.stats: Dict[str, FixerStats] = {f.name: FixerStats() for f in self.fixers}
+
+    def manifest_path(self, path: Path) -> Path:
+        return default_cache_dir(str(path), 'fixer_pipeline') / f"{path.name}.json"
+
+    def load_manifest(self, path: Path) -> Dict:
+        try:
+            with open(self.manifest_path(path), 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+        return manifest if manifest.get('version') == self.version and not self.force else {}
+
+    def save_manifest(self, path: Path, file_hash: str, case_hashes: Dict[str, str]):
+        manifest_path = self.manifest_path(path)
+        manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        atomic_write(manifest_path, json.dumps(
+            {'version': self.version, 'file': file_hash, 'cases': case_hashes}, indent=1, sort_keys=True
+        ))
+
+    def fix_case(self, case: CaseFragment) -> bool:
+        """Run every applicable fixer over one fragment; returns True if it changed"""
+        original = case.text
+        for f in self.fixers:
+            if not f.applies_to(case):
+                continue
+            stats = self.stats[f.name]
+            start = time.perf_counter()
+            before = case.text
+            case.update(f.fix(case))
+            if case.text != before:
+                stats.cases_changed += 1
+                fixed = case.text
+                if f.fix(case) != fixed:
+                    stats.not_idempotent.append(f"{case.file_name} {case.tc_id}")
+            stats.seconds += time.perf_counter() - start
+        return case.text != original
+
+    def run_file(self, path: Path) -> Dict:
+        """Fix one corpus file in a single pass; returns counts for the summary"""
+        with open(path, 'r', encoding='utf-8', newline='') as f:
+            content = f.read()
+        file_hash = content_hash(content)
+        manifest = self.load_manifest(path)
+
+        if manifest.get('file') == file_hash:
+            return {'cases': None, 'skipped': None, 'changed': 0, 'written': False}
+
+        header, cases, footer = split_corpus(content, path.name)
+        clean_hashes = manifest.get('cases', {})
+        case_hashes = {}
+        changed = skipped = 0
+
+        for case in cases:
+            key = f"{case.index}:{case.tc_id}"
+            if clean_hashes.get(key) == content_hash(case.text):
+                case_hashes[key] = clean_hashes[key]
+                skipped += 1
+                continue
+            if self.fix_case(case):
+                changed += 1
+            case_hashes[key] = content_hash(case.text)
+
+        written = False
+        if changed:
+            content = ''.join([header, *(case.text for case in cases), footer])
+            if not self.dry_run:
+                atomic_write(path, content)
+                written = True
+        if not self.dry_run:
+            self.save_manifest(path, content_hash(content), case_hashes)
+
+        return {'cases': len(cases), 'skipped': skipped, 'changed': changed, 'written': written}
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Run all registered fixers over test case corpora')
+    parser.add_argument('files', nargs='*', type=Path, help='Corpus HTML files (default: pot-test-cases-batch-*.html)')
+    parser.add_argument('--fixers', help='Comma-separated fixer names to run (default: all)')
+    parser.add_argument('--dry-run', action='store_true', help='Report changes without writing')
+    parser.add_argument('--force', action='store_true', help='Ignore the manifest and re-check every case')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    # corpus_fixers registers into the importable fixer_pipeline module, which
+    # is not this one when the file runs as a script
+    import corpus_fixers
+    registered = corpus_fixers.FIXERS
+
+    args = parse_args(argv)
+    fixers = registered
+    if args.fixers:
+        names = args.fixers.split(',')
+        unknown = set(names) - {f.name for f in registered}
+        if unknown:
+            print(f"Unknown fixers: {', '.join(sorted(unknown))}; available: {', '.join(f.name for f in registered)}")
+            return 2
+        fixers = [f for f in registered if f.name in names]
+
+    print("=" * 80)
+    print(f"FIXER PIPELINE{' (DRY RUN)' if args.dry_run else ''}: {', '.join(f.name for f in fixers)}")
+    print("=" * 80)
+
+    pipeline = FixerPipeline(fixers, dry_run=args.dry_run, force=args.force)
+    for path in args.files or DEFAULT_FILES:
+        if not path.exists():
+            print(f"  ! {path.name}: not found")
+            continue
+        start = time.perf_counter()
+        result = pipeline.run_file(path)
+        seconds = time.perf_counter() - start
+        if result['cases'] is None:
+            print(f"  = {path.name}: unchanged since last run ({seconds * 1000:.0f} ms)")
+        else:
+            action = 'written' if result['written'] else ('would write' if result['changed'] else 'no changes')
+            print(f"  {'*' if result['changed'] else '='} {path.name}: {result['changed']} of {result['cases']} "
+                  f"cases fixed, {result['skipped']} clean from manifest, {action} ({seconds * 1000:.0f} ms)")
+
+    print()
+    print("| Fixer | Cases changed | Time (ms) |")
+    print("|-------|---------------|-----------|")
+    for name, stats in pipeline.stats.items():
+        print(f"| {name} | {stats.cases_changed} | {stats.seconds * 1000:.1f} |")
+
+    not_idempotent = [(name, case) for name, stats in pipeline.stats.items() for case in stats.not_idempotent]
+    if not_idempotent:
+        print()
+        print(f"[WARNING] {len(not_idempotent)} fixes change again on a second run:")
+        for name, case in not_idempotent[:10]:
+            print(f"  - {name}: {case}")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Content-addressed cache for rendered test case fragments
+
+Generators key every test case by everything that determines its HTML:
+generator source version, tc_num, seed, player count, complexity, blind
+structures and any other per-case settings. Fragments are stored on disk
+under their key, so a run only re-renders cases whose key changed and splices
+the output file back together from the header, cached fragments and footer.
+
+Usage:
+    cache = FragmentCache(cache_dir, source_version(generator_module))
+    html = cache.get_or_render(render_fn, tc_num=5, seed=seed, players=3, ...)
+    ...
+    cache.prune()  # drop fragments no longer referenced
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Callable, Set
+
+CACHE_DIR_NAME = '.fragment_cache'
+
+
+def case_seed(master_seed: int, tc_num: int) -> int:
+    """Derive a stable per-case seed from (master seed, test case number)"""
+    digest = hashlib.sha256(f"{master_seed}:{tc_num}".encode('ascii')).digest()
+    return int.from_bytes(digest[:8], 'big')
+
+
+def source_version(*modules) -> str:
+    """Digest of the modules' source files (modules or paths); editing any of them invalidates their fragments"""
+    digest = hashlib.sha256()
+    for module in modules:
+        with open(getattr(module, '__file__', module), 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+
+def default_cache_dir(output_path: str, generator_name: str) -> Path:
+    """Cache directory next to the output file, one subdirectory per generator"""
+    return Path(os.path.dirname(os.path.abspath(output_path))) / CACHE_DIR_NAME / generator_name
+
+
+class FragmentCache:
+    """On-disk fragment store keyed by a hash of the case parameters"""
+
+    def __init__(self, cache_dir, version: str, enabled: bool = True):
+        self.cache_dir = Path(cache_dir)
+        self.version = version
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self.used: Set[str] = set()
+
+    def key(self, **params) -> str:
+        payload = json.dumps({'version': self.version, **params}, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.html"
+
+    def get_or_render(self, render: Callable[[], str], **params) -> str:
+        """Return the cached fragment for params, rendering and storing it on a miss"""
+        key = self.key(**params)
+        self.used.add(key)
+        path = self.path(key)
+
+        if self.enabled:
+            try:
+                with open(path, 'r', encoding='utf-8', newline='') as f:
+                    html = f.read()
+                self.hits += 1
+                return html
+            except FileNotFoundError:
+                pass
+
+        html = render()
+        self.misses += 1
+        if self.enabled:
+            self._store(path, html)
+        return html
+
+    def _store(self, path: Path, html: str):
+        """Write atomically so an interrupted run never leaves a truncated fragment"""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f'.{os.getpid()}.tmp')
+        with open(tmp_path, 'w', encoding='utf-8', newline='') as f:
+            f.write(html)
+        os.replace(tmp_path, path)
+
+    def prune(self) -> int:
+        """Delete fragments not used in this run; returns the number removed"""
+        if not self.enabled or not self.cache_dir.exists():
+            return 0
+        removed = 0
+        for path in self.cache_dir.glob('*/*.html'):
+            if path.stem not in self.used:
+                path.unlink()
+                removed += 1
+        return removed
+
+    def summary(self) -> str:
+        return f"{self.hits} cached, {self.misses} rendered"
@@ -0,0 +1,409 @@
+#!/usr/bin/env python3
+"""
+Property-Based Fuzzing for the Test Case Generators
+
+Drives TestCaseGenerator and ExtendedActionGenerator over a range of seeds and
+every table size from 2 to 9 players, and checks each generated hand against
+the spec invariants:
+
+- no_negative_stacks: no negative stack (checked per action by the hand's
+  ChipLedger) or next-hand stack
+- chip_conservation: stack + contribution == starting stack per action (the
+  ChipLedger again), the side pots add up to the contributions, and the
+  results / next hand pay out every chip
+- action_order: Base rounds follow the preflop/postflop position order, nobody
+  acts twice in a Base round or after folding
+- base_more_sections: TestCaseValidator.validate_base_more_sections
+- button_rotation: TestCaseValidator button rotation + all players present
+- more_action_reopen: MoreActionsValidator.validate_all_in_for_less
+  (More Action 2 only after a full raise in More Action 1)
+
+Hands are generated without rendering HTML; the invariants run on the
+generator state. Every hand is fully determined by a HandSpec, so a failure is
+reported as a spec string that --replay reproduces. The first failure of each
+invariant is shrunk greedily (fewer players, simpler complexity, fewer
+extended streets, no river, smallest seed) to a minimal reproducer.
+
+Usage:
+python fuzz_generators.py [--hands N] [--workers N] [--seed N] [--invariants a,b]
+python fuzz_generators.py --replay "extended:3:Simple:preflop:river:-:1234"
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field, replace
+from typing import Callable, Dict, List, Optional, Tuple
+
+from action_order import is_action_order
+from chip_ledger import ChipConservationError
+from fragment_cache import case_seed
+from generate_10_extended_actions import ExtendedActionGenerator
+from generate_30_progressive import TestCaseGenerator, TestCaseValidator
+from sidepot_calculator import calculate_side_pots
+import validate_more_actions
+
+MASTER_SEED = 42
+
+# ChipLedger error kind -> invariant it breaks
+LEDGER_INVARIANTS = {'negative_stack': 'no_negative_stacks', 'conservation': 'chip_conservation'}
+
+KINDS = ('progressive', 'extended')
+COMPLEXITIES = ('Simple', 'Medium', 'Complex')
+STREETS = ('preflop', 'flop', 'turn', 'river')
+PLAYER_COUNTS = range(2, 10)
+
+ROUND_NAMES = {'base': "Base", 'more1': "More Action 1", 'more2': "More Action 2"}
+
+
+@dataclass(frozen=True)
+class HandSpec:
+    """Everything that determines one fuzzed hand"""
+    kind: str
+    num_players: int
+    complexity: str
+    extended_streets: Tuple[str, ...]
+    go_to_river: bool
+    require_side_pot: bool
+    seed: int
+
+    def __str__(self) -> str:
+        return ':'.join([
+            self.kind, str(self.num_players), self.complexity,
+            '+'.join(self.extended_streets) or '-',
+            'river' if self.go_to_river else 'no-river',
+            'side-pot' if self.require_side_pot else '-',
+            str(self.seed),
+        ])
+
+    @classmethod
+    def parse(cls, text: str) -> 'HandSpec':
+        kind, players, complexity, streets, river, side_pot, seed = text.split(':')
+        return cls(kind, int(players), complexity,
+                   tuple(s for s in streets.split('+') if s and s != '-'),
+                   river == 'river', side_pot == 'side-pot', int(seed))
+
+    @classmethod
+    def for_index(cls, master_seed: int, index: int, kinds=KINDS) -> 'HandSpec':
+        """Derive hand index's spec from the master seed; player counts cycle 2-9"""
+        seed = case_seed(master_seed, index)
+        rng = random.Random(seed)
+        kind = kinds[index // len(PLAYER_COUNTS) % len(kinds)]
+        extended = ()
+        if kind == 'extended':
+            extended = tuple(s for s in STREETS if rng.random() < 0.5)
+        return cls(kind, PLAYER_COUNTS[index % len(PLAYER_COUNTS)], rng.choice(COMPLEXITIES),
+                   extended, rng.random() < 0.5, rng.random() < 0.5, seed)
+
+
+@dataclass
+class Hand:
+    """A generated hand plus its actions as (street, round, actions) rounds"""
+    spec: HandSpec
+    generator: TestCaseGenerator
+    rounds: List[Tuple[str, str, list]]
+
+
+def play_hand(spec: HandSpec) -> Hand:
+    """Generate the hand for spec (same global random stream as the generators use)"""
+    random.seed(spec.seed)
+    if spec.kind == 'extended':
+        generator = ExtendedActionGenerator(
+            0, spec.num_players, spec.complexity, extended_streets=list(spec.extended_streets),
+            require_side_pot=spec.require_side_pot, go_to_river=spec.go_to_river
+        )
+    else:
+        generator = TestCaseGenerator(
+            0, spec.num_players, spec.complexity,
+            require_side_pot=spec.require_side_pot, go_to_river=spec.go_to_river
+        )
+    # Invariants run on the generator state, so skip rendering
+    generator.generate_html = lambda: ''
+    generator.generate()
+
+    if spec.kind == 'extended':
+        rounds = [(street.title(), ROUND_NAMES[key], actions)
+                  for street in STREETS
+                  for key, actions in generator.street_actions[street].items() if actions]
+    else:
+        rounds = [(label.split()[0], "Base", actions) for label, actions in generator.actions.items()]
+    return Hand(spec, generator, rounds)
+
+
+def base_actions(hand: Hand) -> Dict[str, list]:
+    """Street label -> Base actions, in the "<Street> Base" form TestCaseValidator reads"""
+    return {f"{street} Base": actions for street, round_name, actions in hand.rounds if round_name == "Base"}
+
+
+# Invariant registry: each check returns a list of failure messages for one hand
+INVARIANTS: Dict[str, Callable[[Hand], List[str]]] = {}
+
+
+def invariant(name: str):
+    def decorator(check):
+        INVARIANTS[name] = check
+        return check
+    return decorator
+
+
+@invariant('no_negative_stacks')
+def check_no_negative_stacks(hand: Hand) -> List[str]:
+    # Stacks during the hand are checked action by action by the ChipLedger
+    errors = []
+    for p in hand.generator.rotate_button_for_next_hand():
+        if p['stack'] < 0:
+            errors.append(f"{p['name']} next-hand stack {p['stack']:,}")
+    return errors
+
+
+@invariant('chip_conservation')
+def check_chip_conservation(hand: Hand) -> List[str]:
+    # Per-player stack + contribution is checked action by action by the ChipLedger
+    errors = []
+    players = hand.generator.players
+    contributed = sum(p.total_contribution for p in players)
+    pots = calculate_side_pots(players, hand.generator.ante)
+    if pots['total_pot'] != contributed:
+        errors.append(f"side pots total {pots['total_pot']:,} != contributions {contributed:,}")
+
+    starting = sum(p.starting_stack for p in players)
+    paid_out = sum(r['new_stack'] for r in hand.generator.calculate_pot_and_results()['results'])
+    if paid_out != starting:
+        errors.append(f"results pay out {paid_out:,} of {starting:,} chips")
+    next_hand = sum(p['stack'] for p in hand.generator.rotate_button_for_next_hand())
+    if next_hand != starting:
+        errors.append(f"next hand stacks total {next_hand:,} != {starting:,}")
+    return errors
+
+
+@invariant('action_order')
+def check_action_order(hand: Hand) -> List[str]:
+    errors = []
+    num_players = hand.spec.num_players
+    positions = {p.name: p.position for p in hand.generator.players}
+    folded = set()
+    for street, round_name, actions in hand.rounds:
+        if round_name == "Base":
+            acted = [positions[a.player_name] for a in actions]
+            if len(set(acted)) != len(acted):
+                errors.append(f"{street} Base: a player acts twice")
+            elif not is_action_order(acted, num_players, street):
+                errors.append(f"{street} Base out of order: {', '.join(acted)}")
+        for a in actions:
+            if a.player_name in folded:
+                errors.append(f"{street} {round_name}: {a.player_name} acts after folding")
+            if a.action_type.name == 'FOLD':
+                folded.add(a.player_name)
+    return errors
+
+
+@invariant('base_more_sections')
+def check_base_more_sections(hand: Hand) -> List[str]:
+    errors = []
+    actions = base_actions(hand)
+    for label, street_actions in actions.items():
+        # The players who acted in the round are the ones the Base section must cover
+        acted = {a.player_name for a in street_actions}
+        active = [p for p in hand.generator.players if p.name in acted]
+        try:
+            valid, msg = TestCaseValidator.validate_base_more_sections(label[:-len(" Base")], actions, active,
+                                                                       hand.spec.num_players)
+        except ValueError as e:
+            valid, msg = False, f"{label}: validator cannot order positions ({e})"
+        if not valid:
+            errors.append(msg)
+    return errors
+
+
+@invariant('button_rotation')
+def check_button_rotation(hand: Hand) -> List[str]:
+    errors = []
+    next_hand = hand.generator.rotate_button_for_next_hand()
+    for check in (TestCaseValidator.validate_button_rotation, TestCaseValidator.validate_all_players_present):
+        valid, msg = check(hand.generator.players, next_hand)
+        if not valid:
+            errors.append(msg)
+    return errors
+
+
+@invariant('more_action_reopen')
+def check_more_action_reopen(hand: Hand) -> List[str]:
+    errors = []
+    streets: Dict[str, List[validate_more_actions.BettingRound]] = {}
+    for street, round_name, actions in hand.rounds:
+        streets.setdefault(street, []).append(validate_more_actions.BettingRound(round_name, [
+            validate_more_actions.Action(a.player_name, a.action_type, a.amount) for a in actions
+        ]))
+    validator = validate_more_actions.MoreActionsValidator()
+    for street, rounds in streets.items():
+        for result in validator.validate_all_in_for_less(rounds):
+            if not result.passed:
+                errors.append(f"{street}: {result.message}")
+    return errors
+
+
+def check_hand(spec: HandSpec, invariants: List[str]) -> Dict[str, str]:
+    """Invariant name -> first failure message for one hand (empty if it passes)"""
+    try:
+        hand = play_hand(spec)
+    except ChipConservationError as e:
+        name = LEDGER_INVARIANTS[e.kind]
+        return {name: str(e)} if name in invariants else {}
+    except Exception as e:
+        return {'generator_error': f"{type(e).__name__}: {e}"}
+    failures = {}
+    for name in invariants:
+        try:
+            errors = INVARIANTS[name](hand)
+        except Exception as e:
+            errors = [f"{type(e).__name__}: {e}"]
+        if errors:
+            failures[name] = errors[0]
+    return failures
+
+
+@dataclass
+class FuzzStats:
+    hands: int = 0
+    seconds: float = 0.0
+    failures: Dict[str, int] = field(default_factory=dict)
+    examples: Dict[str, Tuple[str, str]] = field(default_factory=dict)  # invariant -> (spec, message)
+
+    def merge(self, other: 'FuzzStats'):
+        self.hands += other.hands
+        self.seconds += other.seconds
+        for name, count in other.failures.items():
+            self.failures[name] = self.failures.get(name, 0) + count
+        for name, example in other.examples.items():
+            self.examples.setdefault(name, example)
+
+
+def fuzz_range(start: int, stop: int, master_seed: int, kinds: Tuple[str, ...],
+               invariants: List[str]) -> FuzzStats:
+    """Check hands [start, stop); runs in a worker process"""
+    stats = FuzzStats()
+    begin = time.perf_counter()
+    for index in range(start, stop):
+        spec = HandSpec.for_index(master_seed, index, kinds)
+        for name, message in check_hand(spec, invariants).items():
+            stats.failures[name] = stats.failures.get(name, 0) + 1
+            stats.examples.setdefault(name, (str(spec), message))
+    stats.hands = stop - start
+    stats.seconds = time.perf_counter() - begin
+    return stats
+
+
+def shrink(spec: HandSpec, name: str, invariants: List[str], seed_budget: int = 1000) -> Tuple[HandSpec, str]:
+    """Greedily simplify spec while the named invariant still fails; returns (spec, message)"""
+    def fails(candidate: HandSpec) -> Optional[str]:
+        return check_hand(candidate, invariants).get(name)
+
+    message = fails(spec)
+    improved = True
+    while improved:
+        improved = False
+        candidates = [replace(spec, num_players=n) for n in range(2, spec.num_players)]
+        candidates += [replace(spec, complexity=c) for c in COMPLEXITIES[:COMPLEXITIES.index(spec.complexity)]]
+        candidates += [replace(spec, extended_streets=tuple(s for s in spec.extended_streets if s != street))
+                       for street in spec.extended_streets]
+        if spec.go_to_river:
+            candidates.append(replace(spec, go_to_river=False))
+        if spec.require_side_pot:
+            candidates.append(replace(spec, require_side_pot=False))
+        for candidate in candidates:
+            candidate_message = fails(candidate)
+            if candidate_message:
+                spec, message = candidate, candidate_message
+                improved = True
+                break
+
+    # Smallest seed that still reproduces the simplified hand
+    for seed in range(min(seed_budget, spec.seed)):
+        candidate_message = fails(replace(spec, seed=seed))
+        if candidate_message:
+            return replace(spec, seed=seed), candidate_message
+    return spec, message
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Fuzz the test case generators against the spec invariants')
+    parser.add_argument('--hands', type=int, default=100000, help='Number of hands to generate (default: 100000)')
+    parser.add_argument('--start', type=int, default=0, help='First hand index (default: 0)')
+    parser.add_argument('--seed', type=int, default=MASTER_SEED, help=f'Master seed (default: {MASTER_SEED})')
+    parser.add_argument('--workers', type=int, default=0, help='Worker processes (default: one per CPU)')
+    parser.add_argument('--chunk', type=int, default=2000, help='Hands per work unit (default: 2000)')
+    parser.add_argument('--kinds', default=','.join(KINDS), help=f"Generators to fuzz (default: {','.join(KINDS)})")
+    parser.add_argument('--invariants', help='Comma-separated invariants to check (default: all)')
+    parser.add_argument('--shrink-seeds', type=int, default=1000,
+                        help='Seeds to search for the smallest reproducer (default: 1000, 0 = keep seed)')
+    parser.add_argument('--no-shrink', action='store_true', help='Report failures without shrinking them')
+    parser.add_argument('--replay', metavar='SPEC', help='Re-run one hand spec and print every failure')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    invariants = args.invariants.split(',') if args.invariants else list(INVARIANTS)
+    unknown = set(invariants) - set(INVARIANTS)
+    kinds = tuple(args.kinds.split(','))
+    if unknown or not set(kinds) <= set(KINDS):
+        print(f"Unknown invariants/kinds: {', '.join(sorted(unknown | (set(kinds) - set(KINDS))))}")
+        print(f"Invariants: {', '.join(INVARIANTS)}; kinds: {', '.join(KINDS)}")
+        return 2
+
+    if args.replay:
+        spec = HandSpec.parse(args.replay)
+        failures = check_hand(spec, invariants)
+        print(f"{spec}: {'PASS' if not failures else 'FAIL'}")
+        for name, message in failures.items():
+            print(f"  - {name}: {message}")
+        return 1 if failures else 0
+
+    workers = args.workers or os.cpu_count() or 1
+    print("=" * 80)
+    print(f"FUZZING {', '.join(kinds)}: {args.hands:,} hands, {workers} workers, master seed {args.seed}")
+    print("=" * 80)
+
+    stop = args.start + args.hands
+    ranges = [(i, min(i + args.chunk, stop)) for i in range(args.start, stop, args.chunk)]
+    stats = FuzzStats()
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(fuzz_range, lo, hi, args.seed, kinds, invariants) for lo, hi in ranges]
+        for done, future in enumerate(as_completed(futures), 1):
+            stats.merge(future.result())
+            if done % max(1, len(futures) // 10) == 0 or done == len(futures):
+                elapsed = time.perf_counter() - start
+                print(f"  {stats.hands:,} hands, {sum(stats.failures.values()):,} failures, "
+                      f"{stats.hands / elapsed:,.0f} hands/sec")
+    wall = time.perf_counter() - start
+
+    print()
+    print(f"{stats.hands:,} hands in {wall:.1f}s: {stats.hands / wall:,.0f} hands/sec "
+          f"({stats.hands / stats.seconds:,.0f} per worker)")
+    print()
+    print("| Invariant | Failing hands |")
+    print("|-----------|---------------|")
+    for name in [*invariants, *(n for n in stats.failures if n not in invariants)]:
+        print(f"| {name} | {stats.failures.get(name, 0):,} |")
+
+    if not stats.failures:
+        print()
+        print("[OK] All invariants hold")
+        return 0
+
+    print()
+    print("Minimal reproducers:")
+    for name, (spec_text, message) in stats.examples.items():
+        spec = HandSpec.parse(spec_text)
+        if not args.no_shrink:
+            spec, message = shrink(spec, name, invariants, args.shrink_seeds)
+        print(f"  - {name}: {message}")
+        print(f"    python fuzz_generators.py --replay \"{spec}\"")
+    return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -77,16 +77,15 @@ class ExtendedActionGenerator(TestCaseGenerator):
                 amount = player.street_contribution + additional
                 player.all_in_street = "current"
 
-            # Update stacks
-            player.current_stack -= additional
-            player.street_contribution = amount
-            player.total_contribution += additional
+            # Update stacks (checked against the hand's chip ledger)
+            self.ledger.post(player, additional, action_type.value)
 
             return Action(player.name, player.position, action_type, amount), amount
 
     def generate_preflop_simple(self):
         """Override parent's generate_preflop_simple to use street_actions structure"""
         actions = []
+        self.ledger.begin_street("Preflop")
 
         # Get correct preflop action order
         action_order = self.get_preflop_action_order(self.players)
@@ -117,6 +116,7 @@ class ExtendedActionGenerator(TestCaseGenerator):
         actions_base = []
         actions_more1 = []
         actions_more2 = []
+        self.ledger.begin_street("Preflop")
 
         # Get action order
         action_order = self.get_preflop_action_order(self.players)
@@ -216,6 +216,7 @@ class ExtendedActionGenerator(TestCaseGenerator):
         actions_base = []
         actions_more1 = []
         actions_more2 = []
+        self.ledger.begin_street(street_name.title())
 
         active_players = [p for p in self.players if not p.folded and p.current_stack > 0]
         if len(active_players) < 2:
@@ -319,6 +320,7 @@ class ExtendedActionGenerator(TestCaseGenerator):
     def generate_postflop_simple(self, street_name):
         """Generate simple postflop street (bet/call, no extended actions)"""
         actions_base = []
+        self.ledger.begin_street(street_name.title())
 
         active_players = [p for p in self.players if not p.folded and p.current_stack > 0]
         if len(active_players) < 2:
@@ -708,9 +710,15 @@ def main():
     with open(output_file, 'w', encoding='utf-8') as f:
         f.write(full_html)
 
+    # Binary corpus next to the HTML, so validators don't re-parse the markup
+    import hand_corpus
+    corpus = hand_corpus.build_corpus(output_file) if hand_corpus.np is not None else None
+
     print("=" * 80)
     print(f"Generated {len(EXTENDED_TEST_CASES)} test cases")
     print(f"Output: {output_file}")
+    if corpus:
+        print(f"Corpus: {corpus}")
     print("=" * 80)
 
 
@@ -3,7 +3,8 @@
 Generate 10 Test Cases with All-In Across Multiple Streets
 - All-ins happen at different points: some on flop, some on turn, some on river
 - More betting actions across streets
-- Side pots created from varied all-in timing
+- Side pots created from varied all-in timing, planned by scenario_planner.py
+  (one per short stack; the heads-up cases are an all-in with no side pot)
 - 2 heads-up cases (2 players)
 - 5 short-handed cases (3-4 players)
 - 3 full ring cases (5-6 players)
@@ -13,23 +14,43 @@ sys.path.insert(0, '.')
 
 from generate_30_progressive import (
     TestCaseGenerator, generate_html_header, generate_html_footer,
-    Player, Action, BlindStructure
+    Player, Action, ActionType, BlindStructure, render_source_version
 )
+from scenario_planner import ScenarioTarget
+from fragment_cache import FragmentCache, case_seed, default_cache_dir
 import random
 from typing import List, Dict
 
-# Set seed for reproducibility
-random.seed(42)
+# Master seed for reproducibility; each case reseeds random from (MASTER_SEED, tc)
+MASTER_SEED = 42
+
+
+def allin_target(num_players: int, allin_street: str) -> ScenarioTarget:
+    """Every short stack all-in on allin_street, one side pot each (heads-up: an all-in, no side pot)"""
+    if num_players == 2:
+        return ScenarioTarget(side_pots=0, allin_streets=(allin_street,))
+    return ScenarioTarget(side_pots=num_players - 2, allin_streets=(allin_street,) * (num_players - 2))
 
 
 class VariedAllInGenerator(TestCaseGenerator):
-    """Extended generator with varied all-in timing across streets"""
+    """Extended generator with varied all-in timing across streets
+
+    Stacks and bets come from the scenario planner, so every short stack goes
+    all-in on allin_street and each one opens its own side pot.
+    """
 
     def __init__(self, tc_num: int, num_players: int, complexity: str,
                  allin_street: str = "Flop"):
         super().__init__(tc_num, num_players, complexity,
-                        require_side_pot=True, go_to_river=True)
+                        require_side_pot=True, go_to_river=True,
+                        scenario=allin_target(num_players, allin_street))
         self.allin_street = allin_street  # Where main all-in action happens
+        if allin_street == "River":
+            self.BETTING_STREETS = TestCaseGenerator.BETTING_STREETS + ("River",)
+
+    @property
+    def limps_preflop(self) -> bool:
+        return False  # Always raised preflop
 
     def generate_with_varied_allins(self) -> str:
         """Generate test case with all-ins happening on specific street"""
@@ -39,182 +60,47 @@ class VariedAllInGenerator(TestCaseGenerator):
         # Always have preflop action
         self.generate_preflop_with_betting()
 
-        # Generate streets with all-ins occurring at different points
-        if self.allin_street == "Flop":
-            self.generate_flop_with_allin_action()
-            if len([p for p in self.players if not p.folded and p.current_stack > 0]) > 1:
-                self.generate_turn_with_bet_call()
-                self.generate_river_with_check()
-        elif self.allin_street == "Turn":
-            self.generate_flop_with_bet_call()
-            self.generate_turn_with_allin_action()
-            if len([p for p in self.players if not p.folded and p.current_stack > 0]) > 1:
-                self.generate_river_with_check()
-        elif self.allin_street == "River":
-            self.generate_flop_with_bet_call()
-            self.generate_turn_with_bet_call()
-            self.generate_river_with_allin_action()
+        # Bet/call streets until the all-in street, then continue while two players still have chips
+        for street, bet_call in (("Flop", self.generate_flop_with_bet_call),
+                                 ("Turn", self.generate_turn_with_bet_call),
+                                 ("River", self.generate_river_with_check)):
+            if len([p for p in self.players if not p.folded and not p.all_in_street]) < 2:
+                break
+            if street == self.allin_street:
+                self.generate_street_with_allins(street)
+            else:
+                bet_call()
 
         self.winner_idx = random.randint(0, self.num_players - 1)
         return self.generate_html()
 
-    def generate_flop_with_allin_action(self):
-        """Flop with betting that leads to all-ins"""
-        active_players = [p for p in self.players if not p.folded]
-        if len(active_players) < 2:
-            return
+    def generate_street_with_allins(self, street: str):
+        """The first actor bets the planned size; the short stacks call all-in for less, the rest call"""
+        actions = []
+        active = [p for p in self.players if not p.folded and not p.all_in_street]
 
-        # Reset street contributions
-        for p in active_players:
-            p.street_contribution = 0
-
-        self.actions["Flop"] = []
-        action_order = self.get_postflop_action_order(active_players)
-
-        # Pot-sized bet from first player
-        bettor = action_order[0]
-        pot_size = sum(p.total_contribution for p in self.players)
-        bet_amount = int(pot_size * 0.75)
-
-        # Cap at available stack (all-in if needed)
-        amount_to_add = min(bet_amount, bettor.current_stack)
-        if amount_to_add == bettor.current_stack and amount_to_add > 0:
-            bettor.all_in_street = "Flop"
-
-        bettor.current_stack -= amount_to_add
-        bettor.total_contribution += amount_to_add
-        bettor.street_contribution = amount_to_add
-
-        self.actions["Flop"].append(Action(bettor.name, "Bet", amount_to_add))
-
-        # Other players: some call, some raise all-in
-        for i, player in enumerate(action_order[1:], 1):
-            call_amount = bettor.street_contribution - player.street_contribution
-
-            # Decide action: alternate between call and all-in raise
-            if i % 2 == 0 and player.current_stack > call_amount:
-                # Raise all-in
-                raise_amount = player.current_stack
-                player.all_in_street = "Flop"
-                player.current_stack = 0
-                player.total_contribution += raise_amount
-                player.street_contribution = raise_amount
-                self.actions["Flop"].append(Action(player.name, "Raise (all-in)", raise_amount))
-            else:
-                # Call (possibly all-in)
-                amount_to_add = min(call_amount, player.current_stack)
-                if amount_to_add == player.current_stack:
-                    player.all_in_street = "Flop"
-
-                player.current_stack -= amount_to_add
-                player.total_contribution += amount_to_add
-                player.street_contribution = amount_to_add
-
-                if amount_to_add == call_amount:
-                    self.actions["Flop"].append(Action(player.name, "Call", amount_to_add))
-                else:
-                    self.actions["Flop"].append(Action(player.name, "Call (all-in)", amount_to_add))
-
-    def generate_turn_with_allin_action(self):
-        """Turn with betting that leads to all-ins"""
-        active_players = [p for p in self.players if not p.folded and p.current_stack > 0]
-        if len(active_players) < 2:
-            return
+        self.ledger.begin_street(street)
 
         # Reset street contributions
-        for p in active_players:
+        for p in active:
             p.street_contribution = 0
 
-        self.actions["Turn"] = []
-        action_order = self.get_postflop_action_order(active_players)
-
-        # Pot-sized bet
-        bettor = action_order[0]
-        pot_size = sum(p.total_contribution for p in self.players)
-        bet_amount = int(pot_size * 0.6)
-
-        amount_to_add = min(bet_amount, bettor.current_stack)
-        if amount_to_add == bettor.current_stack and amount_to_add > 0:
-            bettor.all_in_street = "Turn"
-
-        bettor.current_stack -= amount_to_add
-        bettor.total_contribution += amount_to_add
-        bettor.street_contribution = amount_to_add
-
-        self.actions["Turn"].append(Action(bettor.name, "Bet", amount_to_add))
-
-        # Subsequent players raise or call all-in
-        for player in action_order[1:]:
-            call_amount = bettor.street_contribution - player.street_contribution
-
-            # Most go all-in on turn
-            if random.random() > 0.3 and player.current_stack > call_amount * 1.5:
-                # Raise all-in
-                raise_amount = player.current_stack
-                player.all_in_street = "Turn"
-                player.current_stack = 0
-                player.total_contribution += raise_amount
-                player.street_contribution = raise_amount
-                self.actions["Turn"].append(Action(player.name, "Raise (all-in)", raise_amount))
+        bettor, *callers = self.get_postflop_action_order(active)
+        bet_amount = self.street_bets[street]
+        actions.append(Action(bettor.name, bettor.position, ActionType.BET, bet_amount))
+        self.ledger.post(bettor, bet_amount, "Bet")
+
+        for player in callers:
+            if player.current_stack < bet_amount:
+                amount_to_add = player.current_stack
+                player.all_in_street = street
+                actions.append(Action(player.name, player.position, ActionType.ALL_IN, amount_to_add))
+                self.ledger.post(player, amount_to_add, "Call (all-in)")
             else:
-                # Call (likely all-in)
-                amount_to_add = min(call_amount, player.current_stack)
-                if amount_to_add == player.current_stack:
-                    player.all_in_street = "Turn"
-
-                player.current_stack -= amount_to_add
-                player.total_contribution += amount_to_add
-                player.street_contribution = amount_to_add
-
-                if amount_to_add == call_amount:
-                    self.actions["Turn"].append(Action(player.name, "Call", amount_to_add))
-                else:
-                    self.actions["Turn"].append(Action(player.name, "Call (all-in)", amount_to_add))
-
-    def generate_river_with_allin_action(self):
-        """River with betting that leads to all-ins"""
-        active_players = [p for p in self.players if not p.folded and p.current_stack > 0]
-        if len(active_players) < 2:
-            return
+                actions.append(Action(player.name, player.position, ActionType.CALL, bet_amount))
+                self.ledger.post(player, bet_amount, "Call")
 
-        # Reset street contributions
-        for p in active_players:
-            p.street_contribution = 0
-
-        self.actions["River"] = []
-        action_order = self.get_postflop_action_order(active_players)
-
-        # Large bet on river
-        bettor = action_order[0]
-        pot_size = sum(p.total_contribution for p in self.players)
-        bet_amount = int(pot_size * 0.8)
-
-        amount_to_add = min(bet_amount, bettor.current_stack)
-        if amount_to_add == bettor.current_stack and amount_to_add > 0:
-            bettor.all_in_street = "River"
-
-        bettor.current_stack -= amount_to_add
-        bettor.total_contribution += amount_to_add
-        bettor.street_contribution = amount_to_add
-
-        self.actions["River"].append(Action(bettor.name, "Bet", amount_to_add))
-
-        # Calls and raises all-in
-        for player in action_order[1:]:
-            call_amount = bettor.street_contribution - player.street_contribution
-            amount_to_add = min(call_amount, player.current_stack)
-
-            if amount_to_add == player.current_stack:
-                player.all_in_street = "River"
-
-            player.current_stack -= amount_to_add
-            player.total_contribution += amount_to_add
-            player.street_contribution = amount_to_add
-
-            if amount_to_add == call_amount:
-                self.actions["River"].append(Action(player.name, "Call", amount_to_add))
-            else:
-                self.actions["River"].append(Action(player.name, "Call (all-in)", amount_to_add))
+        self.actions[f"{street} Base ({' '.join(self.board_cards[street])})"] = actions
 
 
 # Test case configurations with varied all-in streets
@@ -265,6 +151,45 @@ footer = generate_html_footer()
 
 all_test_cases_html = ""
 
+# Rendered cases are cached next to the output file; only cases whose config
+# (or generator source) changed are re-rendered. Pass --no-cache to render all.
+output_path = "C:\\Apps\\HUDR\\HHTool_Modular\\docs\\QA\\10_varied_allin_cases.html"
+cache = FragmentCache(
+    default_cache_dir(output_path, 'generate_10_varied_allin_cases'),
+    render_source_version(sys.modules[__name__]),
+    enabled='--no-cache' not in sys.argv
+)
+
+
+def render_case(tc_num, num_players, complexity, allin_street, seed):
+    """Generate and validate one test case from its own seed, returning its HTML"""
+    random.seed(seed)
+
+    # Create generator
+    generator = VariedAllInGenerator(
+        tc_num=tc_num,
+        num_players=num_players,
+        complexity=complexity,
+        allin_street=allin_street
+    )
+
+    # Generate test case HTML
+    test_case_html = generator.generate_with_varied_allins()
+
+    # Validate (warnings are OK for all-in scenarios)
+    errors = generator.validate_test_case()
+
+    if errors:
+        print("[VALIDATION WARNING]")
+        for error in errors:
+            print(f"   - {error}")
+        print("   (Note: Warnings expected for all-in scenarios - calculations are correct)")
+    else:
+        print("[PASSED]")
+
+    return test_case_html
+
+
 for config in TEST_CASES:
     tc_num = config['tc']
     num_players = config['players']
@@ -275,27 +200,15 @@ for config in TEST_CASES:
     print(f"[TC-{tc_num}] Generating: {num_players}P {complexity} - All-in on {allin_street}...", end=" ")
 
     try:
-        # Create generator
-        generator = VariedAllInGenerator(
-            tc_num=tc_num,
-            num_players=num_players,
-            complexity=complexity,
-            allin_street=allin_street
+        seed = case_seed(MASTER_SEED, tc_num)
+        rendered = cache.misses
+        test_case_html = cache.get_or_render(
+            lambda: render_case(tc_num, num_players, complexity, allin_street, seed),
+            tc_num=tc_num, seed=seed, players=num_players, complexity=complexity,
+            allin_street=allin_street, blinds=BlindStructure.STRUCTURES
         )
-
-        # Generate test case HTML
-        test_case_html = generator.generate_with_varied_allins()
-
-        # Validate (warnings are OK for all-in scenarios)
-        errors = generator.validate_test_case()
-
-        if errors:
-            print("[VALIDATION WARNING]")
-            for error in errors:
-                print(f"   - {error}")
-            print("   (Note: Warnings expected for all-in scenarios - calculations are correct)")
-        else:
-            print("[PASSED]")
+        if cache.misses == rendered:
+            print("[CACHED]")
 
         # Always add test case
         all_test_cases_html += test_case_html
@@ -306,17 +219,18 @@ for config in TEST_CASES:
         traceback.print_exc()
 
 # Write complete HTML
-output_path = "C:\\Apps\\HUDR\\HHTool_Modular\\docs\\QA\\10_varied_allin_cases.html"
 complete_html = header + all_test_cases_html + footer
 
 with open(output_path, "w", encoding="utf-8") as f:
     f.write(complete_html)
 
+cache.prune()
+
 print()
 print("=" * 70)
 print("[OK] Generation Complete!")
 print(f"Output: {output_path}")
-print(f"Total Test Cases: {len(TEST_CASES)}")
+print(f"Total Test Cases: {len(TEST_CASES)} ({cache.summary()})")
 print("=" * 70)
 print()
 
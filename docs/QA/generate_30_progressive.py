@@ -23,55 +23,19 @@ Action Requirements:
 - 1-2 side pots in 80% of test cases
 """
 
+import argparse
+import io
 import random
+import sys
+from pathlib import Path
 from typing import List, Dict, Tuple, Optional
-from dataclasses import dataclass
-from enum import Enum
-
-
-class ActionType(Enum):
-    FOLD = "Fold"
-    CHECK = "Check"
-    CALL = "Call"
-    BET = "Bet"
-    RAISE = "Raise"
-    ALL_IN = "All-in"
-
-
-@dataclass
-class Action:
-    player_name: str
-    position: str
-    action_type: ActionType
-    amount: Optional[int] = None
-
-    def to_html(self) -> str:
-        if self.amount:
-            return (f'<div class="action-row"><span class="action-player">{self.player_name} ({self.position}):</span> '
-                   f'<span class="action-type">{self.action_type.value}</span> '
-                   f'<span class="action-amount">{self.amount:,}</span></div>')
-        else:
-            return (f'<div class="action-row"><span class="action-player">{self.player_name} ({self.position}):</span> '
-                   f'<span class="action-type">{self.action_type.value}</span></div>')
-
-
-@dataclass
-class Player:
-    name: str
-    position: str
-    starting_stack: int
-    current_stack: int = 0
-    street_contribution: int = 0
-    total_contribution: int = 0
-    folded: bool = False
-    all_in_street: Optional[str] = None
-    is_bb: bool = False
-    ante_posted: int = 0
-    blind_posted: int = 0
 
-    def __post_init__(self):
-        self.current_stack = self.starting_stack
-        self.is_bb = self.position == "BB"
+from action_order import SEAT_POSITIONS, order_players
+from blind_schedule import LEVEL_TABLES, BlindSchedule
+from chip_ledger import ChipLedger
+from hand_state import ActionType, Action, Player
+from phase_profiler import NULL_PROFILER
+from scenario_planner import ScenarioPlan, ScenarioTarget, default_target, plan_scenario
 
 
 class BlindStructure:
@@ -111,14 +75,29 @@ class BlindStructure:
         else:  # Complex
             return random.choice(cls.STRUCTURES[7:])  # Hundreds of thousands/millions
 
+    # Level tables a schedule can walk: STRUCTURES itself, or a tournament table
+    SCHEDULES = ("denominations", *LEVEL_TABLES)
+
+    @classmethod
+    def schedule(cls, levels: str = "denominations", **clock) -> BlindSchedule:
+        """Blinds that rise over a session; clock is hands_per_level=N or minutes_per_level=N (+ hands_per_hour)"""
+        if levels not in cls.SCHEDULES:
+            raise ValueError(f"Unknown level table '{levels}'; tables: {', '.join(cls.SCHEDULES)}")
+        return BlindSchedule(cls.STRUCTURES if levels == "denominations" else LEVEL_TABLES[levels], **clock)
+
 
 class TestCaseValidator:
     """Validates test case against spec rules"""
 
     @staticmethod
     def validate_base_more_sections(street_name: str, actions: Dict[str, List[Action]],
-                                     active_players: List[Player]) -> Tuple[bool, str]:
-        """Validate Base vs More section assignment for a street"""
+                                     active_players: List[Player],
+                                     num_seats: Optional[int] = None) -> Tuple[bool, str]:
+        """Validate Base vs More section assignment for a street
+
+        num_seats is the table size the action order comes from (default: the
+        number of active players, right only while nobody has left the hand).
+        """
         base_key = f"{street_name} Base"
         base_actions = actions.get(base_key, [])
 
@@ -126,31 +105,11 @@ class TestCaseValidator:
         if len(base_actions) != len(active_players):
             return False, f"{street_name}: Base has {len(base_actions)} actions, but {len(active_players)} active players"
 
-        # Rule: Base actions must be in position order
-        # Different order for preflop vs postflop
-        num_players = len(active_players)
-
-        if street_name == "Preflop":
-            # Preflop action order
-            if num_players == 2:
-                # Heads-up preflop: SB acts first, BB acts last (NO Dealer in heads-up!)
-                position_order = ["SB", "BB"]
-            elif num_players == 3:
-                # 3-player preflop: Dealer → SB → BB
-                position_order = ["Dealer", "SB", "BB"]
-            else:
-                # 4+ player preflop: UTG (first to act) → others → Dealer → SB → BB
-                position_order = ["UTG", "UTG+1", "UTG+2", "MP", "HJ", "CO", "Dealer", "SB", "BB"]
-        else:
-            # Postflop action order
-            if num_players == 2:
-                # Heads-up postflop: BB acts first, SB acts last (SB is also Dealer)
-                position_order = ["BB", "SB"]
-            else:
-                # 3+ player postflop: SB → BB → others → Dealer
-                position_order = ["SB", "BB", "UTG", "UTG+1", "UTG+2", "MP", "HJ", "CO", "Dealer"]
-
-        expected_order = sorted(active_players, key=lambda p: position_order.index(p.position))
+        # Rule: Base actions must be in position order (preflop and postflop differ)
+        try:
+            expected_order = order_players(active_players, num_seats or len(active_players), street_name)
+        except ValueError as e:
+            return False, f"{street_name}: {e}"
 
         for i, action in enumerate(base_actions):
             if action.player_name != expected_order[i].name:
@@ -217,53 +176,271 @@ class TestCaseValidator:
         return True, "OK"
 
 
+# HTML template layer for one test case. Each render_* function is a compiled
+# f-string chunk; TestCaseGenerator collects the chunks in a list and writes them
+# with a single join per case, so a full file renders in linear time.
+def render_case_header(tc_num: int, test_desc: str, complexity: str, validation_html: str,
+                       sb: int, bb: int, ante: int, stack_str: str, stack_pre: str) -> str:
+    """Render test case header, validation status, stack setup and copy box"""
+    return f'''
+        <!-- TEST CASE {tc_num} -->
+        <div class="test-case">
+            <div class="test-header" onclick="toggleTestCase(this)">
+                <div>
+                    <div class="test-id">TC-{tc_num}</div>
+                    <div class="test-name">{test_desc}</div>
+                </div>
+                <div class="badges">
+                    <span class="badge {complexity.lower()}">{complexity}</span>
+                    <span class="collapse-icon collapsed">▶</span>
+                </div>
+            </div>
+
+            <div class="test-content collapsed">
+            {validation_html}
+
+            <div class="section-title">Stack Setup</div>
+            <div class="blind-setup">
+                <div class="blind-item"><label>Small Blind</label><div class="value">{sb:,}</div></div>
+                <div class="blind-item"><label>Big Blind</label><div class="value">{bb:,}</div></div>
+                <div class="blind-item"><label>Ante</label><div class="value">{ante:,}</div></div>
+                <div class="blind-item"><label>Ante Order</label><div class="value">BB First</div></div>
+            </div>
+
+            <div class="copy-instruction">📋 Copy and paste this into the app:</div>
+            <button class="copy-btn" onclick="copyPlayerData(this, `Hand ({tc_num})\\nstarted_at: 00:02:30 ended_at: 00:05:40\\nSB {sb} BB {bb} Ante {ante}\\nStack Setup:\\n{stack_str}`)">
+                <span>📋</span> Copy Player Data
+            </button>
+            <div class="player-data-box">
+<pre>Hand ({tc_num})
+started_at: 00:02:30 ended_at: 00:05:40
+SB {sb} BB {bb} Ante {ante}
+Stack Setup:
+{stack_pre}</pre>
+            </div>
+
+            <div class="section-title">Actions</div>
+            <div class="actions-section">
+'''
+
+
+STREET_ACTION_INDENT = '                    '
+STREET_FOOTER = '                </div>\n'
+ACTIONS_FOOTER = '            </div>\n\n'
+
+
+def render_street_header(street_name: str) -> str:
+    """Render the opening of a street block"""
+    return f'                <div class="street-block">\n                    <div class="street-name">{street_name}</div>\n'
+
+
+def render_results_header(total_pot: int, bb_ante: int, ante_posted: int, blind_posted: int, bb_name: str,
+                          bb_starting_stack: int) -> str:
+    """Render Expected Results heading, total pot and BB ante info (a short BB posts less than the level)"""
+    return f'''
+            <div class="section-title">Expected Results</div>
+            <div class="results-section">
+                <div class="pot-summary">Total Pot: {total_pot:,}</div>
+                <div style="background: #d4edda; border: 1px solid #c3e6cb; padding: 10px; border-radius: 4px; margin-bottom: 12px;">
+                    <strong style="color: #155724;">✅ VALIDATION PASSED</strong> - All pot calculations and stack distributions are correct.
+                </div>
+                <div class="ante-info-box">
+                    <strong>BB Ante: {bb_ante:,}</strong>
+                    <div style="margin-top: 5px;">
+                        {bb_name} posts ante ({ante_posted:,}) first → stack becomes {bb_starting_stack - ante_posted:,}<br>
+                        {bb_name} posts blind ({blind_posted:,}) → stack becomes {bb_starting_stack - ante_posted - blind_posted:,}
+                    </div>
+                </div>
+'''
+
+
+def render_pot_item(pot: Dict, eligible_html: str, calc_text: str) -> str:
+    """Render one main/side pot item"""
+    return f'''                <div class="pot-item {pot['type']}">
+                    <div class="pot-name">{pot['name']}</div>
+                    <div class="pot-amount">{pot['amount']:,} ({pot['percentage']:.1f}%)</div>
+                    <div class="eligible">Eligible: {eligible_html}</div>
+                    <div style="font-size: 11px; color: #666; margin-top: 5px;">
+                        {calc_text}
+                    </div>
+                </div>'''
+
+
+RESULTS_TABLE_HEADER = '''
+                <table>
+                    <thead>
+                        <tr>
+                            <th>Player (Position)</th>
+                            <th>Starting Stack</th>
+                            <th>Final Stack</th>
+                            <th>Contributed</th>
+                            <th>Winner</th>
+                            <th>New Stack</th>
+                        </tr>
+                    </thead>
+                    <tbody>
+'''
+
+RESULTS_FOOTER = '''                    </tbody>
+                </table>
+            </div>
+'''
+
+LOSER_CELL = '<span class="winner-badge loser">-</span>'
+
+
+def render_winner_cell(pot_names: str, breakdown_lines: List[str]) -> str:
+    """Render the winner badge with its pot breakdown"""
+    breakdown = ''.join(['                                    ' + line + '\n' for line in breakdown_lines])
+    return f'''<span class="winner-badge" onclick="toggleBreakdown(this)">
+                                    🏆 {pot_names} <span class="expand-icon">▼</span>
+                                </span>
+                                <div class="breakdown-details" style="display:none;">
+                                    {breakdown}                                </div>'''
+
+
+def render_result_row(r: Dict, winner_cell: str) -> str:
+    """Render one Expected Results table row"""
+    return f'''                        <tr>
+                            <td>{r['name']} ({r['position']})</td>
+                            <td>{r['starting_stack']:,}</td>
+                            <td>{r['final_stack']:,}</td>
+                            <td>{r['contributed']:,}</td>
+                            <td>{winner_cell}</td>
+                            <td>{r['new_stack']:,}</td>
+                        </tr>
+'''
+
+
+def render_case_footer(tc_num: int, num_players: int, complexity: str, sb: int, bb: int, ante: int,
+                       next_str: str, next_pre: str, all_present: bool) -> str:
+    """Render next hand preview, comparison box and validation notes"""
+    next_copy = f"Hand ({tc_num + 1})\\nstarted_at: 00:05:40 ended_at: HH:MM:SS\\nSB {sb} BB {bb} Ante {ante}\\nStack Setup:\\n{next_str}"
+    return f'''
+
+            <div class="next-hand-preview">
+                <div class="next-hand-header">
+                    <div class="next-hand-title">📋 Next Hand Preview</div>
+                    <button class="copy-btn" onclick="copyPlayerData(this, `{next_copy}`)">
+                        <span>📋</span> Copy Next Hand
+                    </button>
+                </div>
+                <div class="next-hand-content">
+Hand ({tc_num + 1})
+started_at: 00:05:40 ended_at: HH:MM:SS
+SB {sb} BB {bb} Ante {ante}
+Stack Setup:
+{next_pre}
+                </div>
+
+                <div class="comparison-section">
+                    <div class="comparison-header">🔍 Compare with Actual Output</div>
+                    <textarea id="actual-output-tc-{tc_num}" class="comparison-textarea" placeholder="Paste the actual next hand output from your app here..." rows="8"></textarea>
+                    <div style="margin-bottom: 10px;">
+                        <button class="paste-btn" onclick="pasteFromClipboard(this, 'tc-{tc_num}')">
+                            📋 Paste from Clipboard
+                        </button>
+                        <button class="compare-btn" onclick="compareNextHand('tc-{tc_num}', `{next_copy}`)">
+                            🔍 Compare
+                        </button>
+                        <button class="copy-result-btn" onclick="copyComparisonResult('tc-{tc_num}')" style="background: #4caf50;">
+                            📋 Copy Result
+                        </button>
+                    </div>
+                    <div id="comparison-result-tc-{tc_num}" class="comparison-result"></div>
+                </div>
+            </div>
+
+            <div class="notes">
+                <div class="notes-title">📝 Validation Notes</div>
+                <div class="notes-text">
+                    • Players: {num_players}<br>
+                    • Complexity: {complexity}<br>
+                    • Blinds: SB {sb:,} / BB {bb:,} / Ante {ante:,}<br>
+                    • Button rotation: {'Previous SB → New Dealer' if num_players > 2 else 'Players swap positions'}<br>
+                    • All players present in next hand: {'✅' if all_present else '❌'}
+                </div>
+            </div>
+            </div>
+        </div>
+'''
+
+
+VALIDATION_ERRORS_HEADER = ('<div style="background: #ffebee; border: 2px solid #f44336; padding: 10px; margin: 10px 0; border-radius: 4px;">\n'
+                            '<strong style="color: #c62828;">❌ VALIDATION ERRORS:</strong><ul>\n')
+VALIDATION_ERRORS_FOOTER = '</ul></div>\n'
+VALIDATION_PASSED_HTML = ('<div style="background: #e8f5e9; border: 2px solid #4caf50; padding: 10px; margin: 10px 0; border-radius: 4px;">\n'
+                          '<strong style="color: #2e7d32;">✅ ALL VALIDATIONS PASSED</strong>\n'
+                          '</div>\n')
+
+
 class TestCaseGenerator:
     """Generates a single test case with full validation"""
 
     PLAYER_NAMES = ["Alice", "Bob", "Charlie", "David", "Eve", "Frank", "Grace", "Henry", "Ivy"]
 
-    POSITIONS = {
-        2: ["SB", "BB"],
-        3: ["Dealer", "SB", "BB"],
-        4: ["Dealer", "SB", "BB", "UTG"],
-        5: ["Dealer", "SB", "BB", "UTG", "CO"],
-        6: ["Dealer", "SB", "BB", "UTG", "MP", "CO"],
-        7: ["Dealer", "SB", "BB", "UTG", "MP", "HJ", "CO"],
-        8: ["Dealer", "SB", "BB", "UTG", "UTG+1", "MP", "HJ", "CO"],
-        9: ["Dealer", "SB", "BB", "UTG", "UTG+1", "UTG+2", "MP", "HJ", "CO"]
-    }
+    POSITIONS = {n: list(seats) for n, seats in SEAT_POSITIONS.items()}
 
     def __init__(self, tc_num: int, num_players: int, complexity: str,
-                 require_side_pot: bool = False, go_to_river: bool = True):
+                 require_side_pot: bool = False, go_to_river: bool = True, profiler=NULL_PROFILER,
+                 scenario: Optional[ScenarioTarget] = None):
         self.tc_num = tc_num
         self.num_players = num_players
         self.complexity = complexity
         self.require_side_pot = require_side_pot
         self.go_to_river = go_to_river
+        self.profiler = profiler
+        self.scenario = scenario  # Explicit side-pot target; require_side_pot picks one otherwise
+        self.plan: Optional[ScenarioPlan] = None
 
         # Get blind structure based on complexity
         blinds = BlindStructure.get_for_complexity(complexity)
         self.sb = blinds["sb"]
         self.bb = blinds["bb"]
         self.ante = blinds["ante"]
+        # Preflop raise-to and the flop/turn bets; a scenario plan resizes them
+        self.street_bets = {"Preflop": self.bb * 3, "Flop": self.bb * 5, "Turn": self.bb * 10}
 
         self.players: List[Player] = []
         self.actions: Dict[str, List[Action]] = {}
+        self.ledger: Optional[ChipLedger] = None  # Opened by post_blinds_antes
         self.board_cards = {
             "Flop": ["A♠", "K♦", "Q♣"],
             "Turn": ["7♥"],
             "River": ["3♦"]
         }
         self.winner_idx = 0
+        self.payouts: Optional[List[int]] = None  # Chips each seat collects; set by calculate_pot_and_results
         self.pot_breakdown = {}
         self.validation_errors = []
 
+    # Streets where the first actor bets (the river checks through)
+    BETTING_STREETS = ("Preflop", "Flop", "Turn")
+
+    @property
+    def limps_preflop(self) -> bool:
+        return self.complexity == "Simple"
+
     def create_players(self) -> List[Player]:
-        """Create players with varied stack sizes (10-60 BB)"""
+        """Create players with varied stack sizes (10-60 BB)
+
+        Side-pot cases are planned rather than hoped for: the scenario planner
+        solves for stacks and street bets that produce the target's side pots.
+        """
         players = []
         positions = self.POSITIONS[self.num_players]
         names = self.PLAYER_NAMES[:self.num_players]
 
+        target = self.scenario
+        if target is None and self.require_side_pot:
+            target = default_target(self.num_players, self.limps_preflop)
+        if target is not None:
+            self.plan = plan_scenario(target, positions, self.complexity, self.bb, self.ante,
+                                      self.BETTING_STREETS, self.limps_preflop)
+            self.street_bets.update(self.plan.street_bets)
+            self.profiler.count('planned_side_pots', target.side_pots)
+            return [Player(name, pos, stack) for name, pos, stack in zip(names, positions, self.plan.stacks)]
+
         # Generate varied stack sizes between 10 BB and 60 BB
         stack_bb_ranges = []
 
@@ -285,25 +462,25 @@ class TestCaseGenerator:
         return players
 
     def post_blinds_antes(self):
-        """Post blinds and antes following spec rules"""
+        """Post blinds and antes following spec rules
+
+        Opens the hand's chip ledger; every later stack change goes through it.
+        """
+        self.ledger = ChipLedger(self.players, self.tc_num)
+        self.ledger.begin_street("Preflop")
         for player in self.players:
             if player.position == "BB":
                 # BB posts ANTE FIRST (dead money)
                 player.ante_posted = self.ante
-                player.current_stack -= self.ante
-                player.total_contribution += self.ante
+                self.ledger.post(player, self.ante, "Ante", live=False)
 
                 # Then BB posts BLIND (live money)
                 player.blind_posted = self.bb
-                player.current_stack -= self.bb
-                player.street_contribution = self.bb
-                player.total_contribution += self.bb
+                self.ledger.post(player, self.bb, "Big Blind")
 
             elif player.position == "SB":
                 player.blind_posted = self.sb
-                player.current_stack -= self.sb
-                player.street_contribution = self.sb
-                player.total_contribution += self.sb
+                self.ledger.post(player, self.sb, "Small Blind")
 
     def generate_preflop_simple(self):
         """Generate simple preflop: everyone calls, BB checks
@@ -314,6 +491,7 @@ class TestCaseGenerator:
         - 4+ players: SB → BB → UTG... → Dealer
         """
         actions = []
+        self.ledger.begin_street("Preflop")
 
         # Get correct preflop action order
         action_order = self.get_preflop_action_order(self.players)
@@ -323,9 +501,7 @@ class TestCaseGenerator:
             if i < len(action_order) - 1:
                 # Not BB - call
                 actions.append(Action(player.name, player.position, ActionType.CALL, self.bb))
-                player.street_contribution = self.bb
-                player.current_stack -= (self.bb - player.blind_posted)
-                player.total_contribution += (self.bb - player.blind_posted)
+                self.ledger.post(player, self.bb - player.blind_posted, "Call")
             else:
                 # BB checks
                 actions.append(Action(player.name, player.position, ActionType.CHECK))
@@ -342,7 +518,8 @@ class TestCaseGenerator:
         - 4+ players: SB → BB → UTG... → Dealer
         """
         actions = []
-        raise_amount = self.bb * 3
+        self.ledger.begin_street("Preflop")
+        raise_amount = self.street_bets["Preflop"]
 
         # Use correct preflop action order
         action_order = self.get_preflop_action_order(self.players)
@@ -360,9 +537,7 @@ class TestCaseGenerator:
             # Use actual total contribution (blind_posted + amount_to_add) for Action display
             actual_raise_amount = raiser.blind_posted + amount_to_add
             actions.append(Action(raiser.name, raiser.position, ActionType.RAISE, actual_raise_amount))
-            raiser.street_contribution = actual_raise_amount
-            raiser.current_stack -= amount_to_add
-            raiser.total_contribution += amount_to_add
+            self.ledger.post(raiser, amount_to_add, "Raise")
 
             # Others call
             for player in action_order[1:]:
@@ -376,9 +551,7 @@ class TestCaseGenerator:
                 # Use actual total contribution (blind_posted + amount_to_add) for Action display
                 actual_call_amount = player.blind_posted + amount_to_add
                 actions.append(Action(player.name, player.position, ActionType.CALL, actual_call_amount))
-                player.street_contribution = actual_call_amount
-                player.current_stack -= amount_to_add
-                player.total_contribution += amount_to_add
+                self.ledger.post(player, amount_to_add, "Call")
 
         self.actions["Preflop Base"] = actions
 
@@ -387,12 +560,14 @@ class TestCaseGenerator:
         actions = []
         active = [p for p in self.players if not p.folded and not p.all_in_street]
 
+        self.ledger.begin_street("Flop")
+
         # Reset street contributions
         for p in active:
             p.street_contribution = 0
 
         action_order = self.get_postflop_action_order(active)
-        bet_amount = self.bb * 5
+        bet_amount = self.street_bets["Flop"]
         actual_bet = 0  # Track what first player actually bets
 
         for i, player in enumerate(action_order):
@@ -404,9 +579,7 @@ class TestCaseGenerator:
 
                 actual_bet = amount_to_add  # Remember the actual bet amount
                 actions.append(Action(player.name, player.position, ActionType.BET, amount_to_add))
-                player.street_contribution = amount_to_add
-                player.current_stack -= amount_to_add
-                player.total_contribution += amount_to_add
+                self.ledger.post(player, amount_to_add, "Bet")
             else:  # Others call to match the actual bet
                 # Call to match actual_bet, capped at their stack
                 amount_to_add = min(actual_bet, player.current_stack)
@@ -414,9 +587,7 @@ class TestCaseGenerator:
                     player.all_in_street = "Flop"
 
                 actions.append(Action(player.name, player.position, ActionType.CALL, amount_to_add))
-                player.street_contribution = amount_to_add
-                player.current_stack -= amount_to_add
-                player.total_contribution += amount_to_add
+                self.ledger.post(player, amount_to_add, "Call")
 
         self.actions["Flop Base (A♠ K♦ Q♣)"] = actions
 
@@ -425,12 +596,14 @@ class TestCaseGenerator:
         actions = []
         active = [p for p in self.players if not p.folded and not p.all_in_street]
 
+        self.ledger.begin_street("Turn")
+
         # Reset street contributions
         for p in active:
             p.street_contribution = 0
 
         action_order = self.get_postflop_action_order(active)
-        bet_amount = self.bb * 10
+        bet_amount = self.street_bets["Turn"]
         actual_bet = 0  # Track what first player actually bets
 
         for i, player in enumerate(action_order):
@@ -442,9 +615,7 @@ class TestCaseGenerator:
 
                 actual_bet = amount_to_add  # Remember the actual bet amount
                 actions.append(Action(player.name, player.position, ActionType.BET, amount_to_add))
-                player.street_contribution = amount_to_add
-                player.current_stack -= amount_to_add
-                player.total_contribution += amount_to_add
+                self.ledger.post(player, amount_to_add, "Bet")
             else:  # Others call to match the actual bet
                 # Call to match actual_bet, capped at their stack
                 amount_to_add = min(actual_bet, player.current_stack)
@@ -452,9 +623,7 @@ class TestCaseGenerator:
                     player.all_in_street = "Turn"
 
                 actions.append(Action(player.name, player.position, ActionType.CALL, amount_to_add))
-                player.street_contribution = amount_to_add
-                player.current_stack -= amount_to_add
-                player.total_contribution += amount_to_add
+                self.ledger.post(player, amount_to_add, "Call")
 
         self.actions["Turn Base (7♥)"] = actions
 
@@ -463,6 +632,8 @@ class TestCaseGenerator:
         actions = []
         active = [p for p in self.players if not p.folded and not p.all_in_street]
 
+        self.ledger.begin_street("River")
+
         # Reset street contributions
         for p in active:
             p.street_contribution = 0
@@ -477,50 +648,23 @@ class TestCaseGenerator:
     def get_preflop_action_order(self, players: List[Player]) -> List[Player]:
         """Get correct preflop action order
 
-        Rules (FIXED):
+        Rules (see action_order.py):
         - 2-handed: SB → BB (NO Dealer in heads-up! SB is also the button)
         - 3-handed: Dealer → SB → BB
         - 4+ players: UTG → ... → Dealer → SB → BB (UTG acts FIRST!)
         """
-        num_players = len(players)
-
-        if num_players == 2:
-            # 2-handed preflop: SB first, then BB (NO Dealer!)
-            position_order = ["SB", "BB"]
-        elif num_players == 3:
-            # 3-handed preflop: Dealer → SB → BB
-            position_order = ["Dealer", "SB", "BB"]
-        else:
-            # 4+ players preflop: UTG acts FIRST! → ... → Dealer → SB → BB
-            position_order = ["UTG", "UTG+1", "UTG+2", "MP", "HJ", "CO", "Dealer", "SB", "BB"]
-
-        return sorted(players, key=lambda p: position_order.index(p.position))
+        return order_players(players, self.num_players, "Preflop")
 
     def get_postflop_action_order(self, players: List[Player]) -> List[Player]:
         """Get correct post-flop action order
 
-        Rules (FIXED):
+        Rules (see action_order.py):
         - 2-handed: BB → SB (NO Dealer! SB is also the button, acts last postflop)
         - 3+ players: SB → BB → UTG → MP → HJ → CO → Dealer
-        """
-        if len(players) == 0:
-            return []
-
-        # Use original player count, not current active count
-        num_players = self.num_players
 
-        if num_players == 2:
-            # 2-handed postflop: BB first, then SB (NO Dealer!)
-            position_order = ["BB", "SB"]
-        else:
-            # 3+ players: standard postflop order (SB first, Dealer last)
-            position_order = ["SB", "BB", "UTG", "UTG+1", "UTG+2", "MP", "HJ", "CO", "Dealer"]
-
-        # Filter position_order to only include positions that exist in players
-        player_positions = [p.position for p in players]
-        filtered_order = [pos for pos in position_order if pos in player_positions]
-
-        return sorted(players, key=lambda p: filtered_order.index(p.position))
+        The order comes from the original player count, not the current active count.
+        """
+        return order_players(players, self.num_players, "Flop")
 
     def rotate_button_for_next_hand(self) -> List[Dict]:
         """Rotate button clockwise and generate next hand"""
@@ -530,6 +674,11 @@ class TestCaseGenerator:
         dealer_idx = next(i for i, p in enumerate(self.players)
                          if p.position == "Dealer" or (self.num_players == 2 and p.position == "SB"))
 
+        # Same payouts as the Expected Results (an uncalled excess goes back to its owner)
+        if self.payouts is None:
+            self.calculate_pot_and_results()
+        payouts = self.payouts
+
         # Rotate
         next_hand = []
         for i in range(self.num_players):
@@ -537,11 +686,8 @@ class TestCaseGenerator:
             player_idx = (dealer_idx + 1 + i) % self.num_players
             player = self.players[player_idx]
 
-            # Calculate new stack
-            new_stack = player.starting_stack - player.total_contribution
-            if player_idx == self.winner_idx:
-                total_pot = sum(p.total_contribution for p in self.players)
-                new_stack += total_pot
+            # Calculate new stack: what is left plus what the pots pay out
+            new_stack = player.starting_stack - player.total_contribution + payouts[player_idx]
 
             next_hand.append({
                 "name": player.name,
@@ -555,32 +701,55 @@ class TestCaseGenerator:
         """Run all validations on generated test case"""
         errors = []
         validator = TestCaseValidator()
+        count = self.profiler.count
 
         # Validate each street's Base/More sections
-        for street in ["Preflop", "Flop", "Turn", "River"]:
+        streets = ["Preflop", "Flop", "Turn", "River"]
+        # Street each player folded on (action labels start with the street)
+        fold_street = {action.player_name: streets.index(label.split(" ", 1)[0])
+                       for label, street_actions in self.actions.items() for action in street_actions
+                       if action.action_type == ActionType.FOLD}
+        for n, street in enumerate(streets):
             if f"{street} Base" in self.actions:
-                active = [p for p in self.players if not p.folded and
-                         (not p.all_in_street or p.all_in_street == street)]
-                valid, msg = validator.validate_base_more_sections(street, self.actions, active)
+                # Players still in when the street began: all-ins and folds on this or a later
+                # street acted on it
+                active = [p for p in self.players if fold_street.get(p.name, n) >= n and
+                         (not p.all_in_street or streets.index(p.all_in_street) >= n)]
+                valid, msg = validator.validate_base_more_sections(street, self.actions, active, self.num_players)
+                count('validation_calls')
                 if not valid:
                     errors.append(f"Base/More validation failed: {msg}")
 
         # Validate button rotation
         next_hand = self.rotate_button_for_next_hand()
         valid, msg = validator.validate_button_rotation(self.players, next_hand)
+        count('validation_calls')
         if not valid:
             errors.append(f"Button rotation validation failed: {msg}")
 
         # Validate all players present
         valid, msg = validator.validate_all_players_present(self.players, next_hand)
+        count('validation_calls')
         if not valid:
             errors.append(f"Player presence validation failed: {msg}")
 
+        count('validation_errors', len(errors))
         return errors
 
+    def showdown_ranking(self) -> List[List[int]]:
+        """
+        Best hand first: winner_idx, then every other live seat, more chips
+        behind ranking higher (seat order breaks ties). Each side pot goes to
+        its best-ranked contender, never chopped for lack of a ranking.
+        """
+        others = sorted((i for i, p in enumerate(self.players) if not p.folded and i != self.winner_idx),
+                        key=lambda i: -self.players[i].current_stack)
+        return [[self.winner_idx]] + [[i] for i in others]
+
     def calculate_pot_and_results(self):
         """Calculate pot with side pots, winners, and final stacks"""
         # Import the side pot calculator
+        from pot_oracle import pot_awards
         from sidepot_calculator import calculate_side_pots
 
         # Calculate side pots using the new module
@@ -588,18 +757,17 @@ class TestCaseGenerator:
 
         winner = self.players[self.winner_idx]
 
+        # Each pot goes to its best-ranked contender (a lone contender takes
+        # back its uncalled excess)
+        awards = pot_awards(pot_results['oracle_pots'], self.showdown_ranking(), len(self.players))
+        payouts = self.payouts = [sum(pot[i] for pot in awards) for i in range(len(self.players))]
+        self.profiler.count('side_pots', len(pot_results['oracle_pots']) - 1)
+
         results = []
         for i, p in enumerate(self.players):
             final_stack = p.current_stack
-            new_stack = final_stack
-            won_amount = 0
-
-            if i == self.winner_idx:
-                # Winner gets all pots they're eligible for
-                for pot in pot_results['pots']:
-                    if p in pot['eligible']:
-                        won_amount += pot['amount']
-                new_stack = final_stack + won_amount
+            won_amount = payouts[i]
+            new_stack = final_stack + won_amount
 
             results.append({
                 'name': p.name,
@@ -607,9 +775,12 @@ class TestCaseGenerator:
                 'starting_stack': p.starting_stack,
                 'final_stack': final_stack,
                 'contributed': p.total_contribution,
-                'is_winner': i == self.winner_idx,
+                'is_winner': won_amount > 0,
                 'new_stack': new_stack,
-                'won_amount': won_amount
+                'won_amount': won_amount,
+                # (pot name, chips won from it) for the breakdown
+                'pots_won': [(pot['name'], pot_award[i])
+                             for pot, pot_award in zip(pot_results['pots'], awards) if pot_award[i]]
             })
 
         return {
@@ -620,35 +791,29 @@ class TestCaseGenerator:
             'winner': winner
         }
 
-    def generate_results_html(self, pot_results) -> str:
-        """Generate Expected Results section HTML with side pots"""
+    def results_html_parts(self, pot_results) -> List[str]:
+        """Render Expected Results section with side pots as a list of HTML chunks"""
         total_pot = pot_results['total_pot']
         bb_ante = pot_results['bb_ante']
         pots = pot_results['pots']  # Now a list of pots (main + sides)
         results = pot_results['results']
-        winner = pot_results['winner']
 
         def fmt(n):
             return f"{n:,}"
 
         bb_player = next(p for p in self.players if p.position == "BB")
-        ante_info = f'''                <div class="ante-info-box">
-                    <strong>BB Ante: {fmt(bb_ante)}</strong>
-                    <div style="margin-top: 5px;">
-                        {bb_player.name} posts ante ({fmt(bb_ante)}) first → stack becomes {fmt(bb_player.starting_stack - bb_ante)}<br>
-                        {bb_player.name} posts blind ({fmt(self.bb)}) → stack becomes {fmt(bb_player.starting_stack - bb_ante - self.bb)}
-                    </div>
-                </div>'''
+        parts = [render_results_header(total_pot, bb_ante, bb_player.ante_posted, bb_player.blind_posted,
+                                       bb_player.name, bb_player.starting_stack)]
 
-        # Generate HTML for all pots (main + side pots)
-        live_contributions = sum(p.total_contribution - (bb_ante if p.position == "BB" else 0) for p in self.players)
+        # Render all pots (main + side pots)
+        dead = bb_player.ante_posted
+        live_contributions = sum(p.total_contribution for p in self.players) - dead
 
-        pot_htmls = []
-        for pot in pots:
+        for i, pot in enumerate(pots):
             eligible_html = ' '.join([f'<span>{name}</span>' for name in pot['eligible_names']])
 
             if pot['type'] == 'main':
-                calc_text = f"Calculation: {fmt(live_contributions)} (live) + {fmt(bb_ante)} (BB ante dead) = {fmt(total_pot)}"
+                calc_text = f"Calculation: {fmt(live_contributions)} (live) + {fmt(dead)} (BB ante dead) = {fmt(total_pot)}"
             else:
                 # For side pots, show the level calculation
                 pot_num = int(pot['type'].replace('side', ''))
@@ -659,81 +824,38 @@ class TestCaseGenerator:
 
                 calc_text = f"Calculation: {fmt(level_diff)} × {num_players} players = {fmt(pot['amount'])}"
 
-            pot_html = f'''                <div class="pot-item {pot['type']}">
-                    <div class="pot-name">{pot['name']}</div>
-                    <div class="pot-amount">{fmt(pot['amount'])} ({pot['percentage']:.1f}%)</div>
-                    <div class="eligible">Eligible: {eligible_html}</div>
-                    <div style="font-size: 11px; color: #666; margin-top: 5px;">
-                        {calc_text}
-                    </div>
-                </div>'''
-            pot_htmls.append(pot_html)
+            if i:
+                parts.append('\n')
+            parts.append(render_pot_item(pot, eligible_html, calc_text))
 
-        pot_section = '\n'.join(pot_htmls)
+        parts.append(RESULTS_TABLE_HEADER)
 
-        # Generate winner cell showing all pots won
-        table_rows = ""
+        # Winner cell shows every pot the seat collects from
         for r in results:
             if r['is_winner']:
-                # Find which pots this player won
-                eligible_pots = [pot for pot in pots if r['name'] in pot['eligible_names']]
-                pot_names = ' + '.join([pot['name'] for pot in eligible_pots])
+                pot_names = ' + '.join(name for name, _ in r['pots_won'])
 
                 # Build breakdown
                 breakdown_lines = [f'<div class="breakdown-line">Final Stack: {fmt(r["final_stack"])}</div>']
-                for pot in eligible_pots:
-                    breakdown_lines.append(f'<div class="breakdown-line">+ {pot["name"]}: {fmt(pot["amount"])}</div>')
+                for name, won in r['pots_won']:
+                    breakdown_lines.append(f'<div class="breakdown-line">+ {name}: {fmt(won)}</div>')
                 breakdown_lines.append(f'<div class="breakdown-line total">= New Stack: {fmt(r["new_stack"])}</div>')
 
-                winner_cell = f'''<span class="winner-badge" onclick="toggleBreakdown(this)">
-                                    🏆 {pot_names} <span class="expand-icon">▼</span>
-                                </span>
-                                <div class="breakdown-details" style="display:none;">
-                                    {''.join(['                                    ' + line + '\n' for line in breakdown_lines])}                                </div>'''
+                winner_cell = render_winner_cell(pot_names, breakdown_lines)
             else:
-                winner_cell = '<span class="winner-badge loser">-</span>'
+                winner_cell = LOSER_CELL
 
-            table_rows += f'''                        <tr>
-                            <td>{r['name']} ({r['position']})</td>
-                            <td>{fmt(r['starting_stack'])}</td>
-                            <td>{fmt(r['final_stack'])}</td>
-                            <td>{fmt(r['contributed'])}</td>
-                            <td>{winner_cell}</td>
-                            <td>{fmt(r['new_stack'])}</td>
-                        </tr>
-'''
+            parts.append(render_result_row(r, winner_cell))
 
-        validation_msg = f'''                <div style="background: #d4edda; border: 1px solid #c3e6cb; padding: 10px; border-radius: 4px; margin-bottom: 12px;">
-                    <strong style="color: #155724;">✅ VALIDATION PASSED</strong> - All pot calculations and stack distributions are correct.
-                </div>'''
+        parts.append(RESULTS_FOOTER)
+        return parts
 
-        results_section = f'''
-            <div class="section-title">Expected Results</div>
-            <div class="results-section">
-                <div class="pot-summary">Total Pot: {fmt(total_pot)}</div>
-{validation_msg}
-{ante_info}
-{pot_section}
-                <table>
-                    <thead>
-                        <tr>
-                            <th>Player (Position)</th>
-                            <th>Starting Stack</th>
-                            <th>Final Stack</th>
-                            <th>Contributed</th>
-                            <th>Winner</th>
-                            <th>New Stack</th>
-                        </tr>
-                    </thead>
-                    <tbody>
-{table_rows}                    </tbody>
-                </table>
-            </div>
-'''
-        return results_section
+    def generate_results_html(self, pot_results) -> str:
+        """Generate Expected Results section HTML with side pots"""
+        return ''.join(self.results_html_parts(pot_results))
 
-    def generate_html(self) -> str:
-        """Generate HTML for test case"""
+    def write_html(self, out):
+        """Write HTML for test case to out (a file handle or StringIO)"""
         # Build stack setup
         stack_lines = []
         for p in self.players:
@@ -742,24 +864,15 @@ class TestCaseGenerator:
             else:
                 stack_lines.append(f"{p.name} {p.starting_stack}")
 
-        stack_str = "\\n".join(stack_lines)
-        stack_pre = "\n".join(stack_lines)
-
-        # Build actions
-        actions_html = ""
-        for street_name, action_list in self.actions.items():
-            actions_html += f'                <div class="street-block">\n'
-            actions_html += f'                    <div class="street-name">{street_name}</div>\n'
-            for action in action_list:
-                actions_html += f'                    {action.to_html()}\n'
-            actions_html += '                </div>\n'
+        profiler = self.profiler
 
         # Calculate pot and results
-        pot_results = self.calculate_pot_and_results()
-        results_html = self.generate_results_html(pot_results)
+        with profiler.phase('calculate_pot_and_results'):
+            pot_results = self.calculate_pot_and_results()
 
         # Build next hand
-        next_hand = self.rotate_button_for_next_hand()
+        with profiler.phase('rotate_button'):
+            next_hand = self.rotate_button_for_next_hand()
         next_lines = []
         for p in next_hand:
             if p['position'] in ["Dealer", "SB", "BB"]:
@@ -767,139 +880,85 @@ class TestCaseGenerator:
             else:
                 next_lines.append(f"{p['name']} {p['stack']}")
 
-        next_str = "\\n".join(next_lines)
-        next_pre = "\n".join(next_lines)
-
         # Validation status
-        validation_errors = self.validate_test_case()
-        validation_html = ""
+        with profiler.phase('validate'):
+            validation_errors = self.validate_test_case()
         if validation_errors:
-            validation_html = '<div style="background: #ffebee; border: 2px solid #f44336; padding: 10px; margin: 10px 0; border-radius: 4px;">\n'
-            validation_html += '<strong style="color: #c62828;">❌ VALIDATION ERRORS:</strong><ul>\n'
-            for error in validation_errors:
-                validation_html += f'<li style="color: #c62828;">{error}</li>\n'
-            validation_html += '</ul></div>\n'
+            validation_html = ''.join(
+                [VALIDATION_ERRORS_HEADER]
+                + [f'<li style="color: #c62828;">{error}</li>\n' for error in validation_errors]
+                + [VALIDATION_ERRORS_FOOTER]
+            )
         else:
-            validation_html = '<div style="background: #e8f5e9; border: 2px solid #4caf50; padding: 10px; margin: 10px 0; border-radius: 4px;">\n'
-            validation_html += '<strong style="color: #2e7d32;">✅ ALL VALIDATIONS PASSED</strong>\n'
-            validation_html += '</div>\n'
+            validation_html = VALIDATION_PASSED_HTML
 
-        # Determine test case description
-        betting_pattern = "Checks to River" if "Check" in str(self.actions.get("River Base", [])) else "With Betting"
-        test_desc = f"{self.num_players}P {self.complexity} - {betting_pattern} (SB:{self.sb:,} BB:{self.bb:,})"
+        with profiler.phase('render'):
+            # Determine test case description
+            betting_pattern = "Checks to River" if "Check" in str(self.actions.get("River Base", [])) else "With Betting"
+            test_desc = f"{self.num_players}P {self.complexity} - {betting_pattern} (SB:{self.sb:,} BB:{self.bb:,})"
 
-        html = f'''
-        <!-- TEST CASE {self.tc_num} -->
-        <div class="test-case">
-            <div class="test-header" onclick="toggleTestCase(this)">
-                <div>
-                    <div class="test-id">TC-{self.tc_num}</div>
-                    <div class="test-name">{test_desc}</div>
-                </div>
-                <div class="badges">
-                    <span class="badge {self.complexity.lower()}">{self.complexity}</span>
-                    <span class="collapse-icon collapsed">▶</span>
-                </div>
-            </div>
+            parts = [render_case_header(self.tc_num, test_desc, self.complexity, validation_html,
+                                        self.sb, self.bb, self.ante,
+                                        "\\n".join(stack_lines), "\n".join(stack_lines))]
 
-            <div class="test-content collapsed">
-            {validation_html}
+            # Actions
+            for street_name, action_list in self.actions.items():
+                parts.append(render_street_header(street_name))
+                for action in action_list:
+                    parts += (STREET_ACTION_INDENT, action.to_html(), '\n')
+                parts.append(STREET_FOOTER)
+            parts.append(ACTIONS_FOOTER)
 
-            <div class="section-title">Stack Setup</div>
-            <div class="blind-setup">
-                <div class="blind-item"><label>Small Blind</label><div class="value">{self.sb:,}</div></div>
-                <div class="blind-item"><label>Big Blind</label><div class="value">{self.bb:,}</div></div>
-                <div class="blind-item"><label>Ante</label><div class="value">{self.ante:,}</div></div>
-                <div class="blind-item"><label>Ante Order</label><div class="value">BB First</div></div>
-            </div>
+            parts += self.results_html_parts(pot_results)
 
-            <div class="copy-instruction">📋 Copy and paste this into the app:</div>
-            <button class="copy-btn" onclick="copyPlayerData(this, `Hand ({self.tc_num})\\nstarted_at: 00:02:30 ended_at: 00:05:40\\nSB {self.sb} BB {self.bb} Ante {self.ante}\\nStack Setup:\\n{stack_str}`)">
-                <span>📋</span> Copy Player Data
-            </button>
-            <div class="player-data-box">
-<pre>Hand ({self.tc_num})
-started_at: 00:02:30 ended_at: 00:05:40
-SB {self.sb} BB {self.bb} Ante {self.ante}
-Stack Setup:
-{stack_pre}</pre>
-            </div>
-
-            <div class="section-title">Actions</div>
-            <div class="actions-section">
-{actions_html}            </div>
-
-{results_html}
-
-            <div class="next-hand-preview">
-                <div class="next-hand-header">
-                    <div class="next-hand-title">📋 Next Hand Preview</div>
-                    <button class="copy-btn" onclick="copyPlayerData(this, `Hand ({self.tc_num + 1})\\nstarted_at: 00:05:40 ended_at: HH:MM:SS\\nSB {self.sb} BB {self.bb} Ante {self.ante}\\nStack Setup:\\n{next_str}`)">
-                        <span>📋</span> Copy Next Hand
-                    </button>
-                </div>
-                <div class="next-hand-content">
-Hand ({self.tc_num + 1})
-started_at: 00:05:40 ended_at: HH:MM:SS
-SB {self.sb} BB {self.bb} Ante {self.ante}
-Stack Setup:
-{next_pre}
-                </div>
+            parts.append(render_case_footer(self.tc_num, self.num_players, self.complexity,
+                                            self.sb, self.bb, self.ante,
+                                            "\\n".join(next_lines), "\n".join(next_lines),
+                                            len(next_hand) == len(self.players)))
 
-                <div class="comparison-section">
-                    <div class="comparison-header">🔍 Compare with Actual Output</div>
-                    <textarea id="actual-output-tc-{self.tc_num}" class="comparison-textarea" placeholder="Paste the actual next hand output from your app here..." rows="8"></textarea>
-                    <div style="margin-bottom: 10px;">
-                        <button class="paste-btn" onclick="pasteFromClipboard(this, 'tc-{self.tc_num}')">
-                            📋 Paste from Clipboard
-                        </button>
-                        <button class="compare-btn" onclick="compareNextHand('tc-{self.tc_num}', `Hand ({self.tc_num + 1})\\nstarted_at: 00:05:40 ended_at: HH:MM:SS\\nSB {self.sb} BB {self.bb} Ante {self.ante}\\nStack Setup:\\n{next_str}`)">
-                            🔍 Compare
-                        </button>
-                        <button class="copy-result-btn" onclick="copyComparisonResult('tc-{self.tc_num}')" style="background: #4caf50;">
-                            📋 Copy Result
-                        </button>
-                    </div>
-                    <div id="comparison-result-tc-{self.tc_num}" class="comparison-result"></div>
-                </div>
-            </div>
+            out.write(''.join(parts))
 
-            <div class="notes">
-                <div class="notes-title">📝 Validation Notes</div>
-                <div class="notes-text">
-                    • Players: {self.num_players}<br>
-                    • Complexity: {self.complexity}<br>
-                    • Blinds: SB {self.sb:,} / BB {self.bb:,} / Ante {self.ante:,}<br>
-                    • Button rotation: {'Previous SB → New Dealer' if self.num_players > 2 else 'Players swap positions'}<br>
-                    • All players present in next hand: {'✅' if len(next_hand) == len(self.players) else '❌'}
-                </div>
-            </div>
-            </div>
-        </div>
-'''
-        return html
+    def generate_html(self) -> str:
+        """Generate HTML for test case"""
+        out = io.StringIO()
+        with self.profiler.phase('generate_html'):
+            self.write_html(out)
+        return out.getvalue()
 
     def generate(self) -> str:
-        """Generate complete test case with validation"""
-        self.players = self.create_players()
-        self.post_blinds_antes()
+        """Generate complete test case with validation
 
-        # Generate streets based on complexity
-        if self.complexity == "Simple":
-            self.generate_preflop_simple()
-            if self.go_to_river:
-                self.generate_flop_with_bet_call()
-                self.generate_turn_with_bet_call()
-                self.generate_river_with_check()
-        else:
-            self.generate_preflop_with_betting()
+        With a profiler, each step runs in its own phase: create_players,
+        post_blinds_antes, one per street, then generate_html (with pot
+        calculation, button rotation, validation and rendering nested inside).
+        """
+        phase = self.profiler.phase
+        with phase('simulate'):
+            with phase('create_players'):
+                self.players = self.create_players()
+            with phase('post_blinds_antes'):
+                self.post_blinds_antes()
+
+            # Generate streets based on complexity
+            with phase('preflop'):
+                if self.complexity == "Simple":
+                    self.generate_preflop_simple()
+                else:
+                    self.generate_preflop_with_betting()
             if self.go_to_river:
-                self.generate_flop_with_bet_call()
-                self.generate_turn_with_bet_call()
-                self.generate_river_with_check()
-
-        self.winner_idx = random.randint(0, self.num_players - 1)
-
+                with phase('flop'):
+                    self.generate_flop_with_bet_call()
+                with phase('turn'):
+                    self.generate_turn_with_bet_call()
+                with phase('river'):
+                    self.generate_river_with_check()
+
+            self.winner_idx = random.randint(0, self.num_players - 1)
+
+        if self.profiler:
+            self.profiler.count('cases')
+            self.profiler.count('players', self.num_players)
+            self.profiler.count('actions', sum(len(actions) for actions in self.actions.values()))
         return self.generate_html()
 
 
@@ -971,12 +1030,14 @@ def generate_html_footer() -> str:
 </html>'''
 
 
-def get_test_case_distribution() -> List[Tuple[int, int, str]]:
+def get_test_case_distribution(num_cases: int = 30) -> List[Tuple[int, int, str]]:
     """
     Generate distribution of 30 test cases:
     - TC 1-5: Simple (2 players)
     - TC 6-20: Medium (2-4 players mixed)
     - TC 21-30: Complex (5-9 players)
+
+    Soak runs ask for more; TC 31 onwards repeat the 30-case pattern.
     """
     distribution = []
 
@@ -994,20 +1055,121 @@ def get_test_case_distribution() -> List[Tuple[int, int, str]]:
     for i, count in enumerate(player_counts_complex, start=21):
         distribution.append((i, count, "Complex"))
 
-    return distribution
+    pattern = len(distribution)
+    for i in range(pattern + 1, num_cases + 1):
+        _, count, complexity = distribution[(i - 1) % pattern]
+        distribution.append((i, count, complexity))
+
+    return distribution[:num_cases]
+
+
+# Master seed for the corpus; each case reseeds random from (MASTER_SEED, tc_num)
+MASTER_SEED = 42
+
+# Modules a rendered case depends on besides this one; fragment caches key on all
+# of their sources, so add a module here when the renderer starts importing it
+RENDER_MODULES = ('action_order', 'blind_schedule', 'chip_ledger', 'hand_state', 'phase_profiler',
+                  'pot_oracle', 'scenario_planner', 'sidepot_calculator')
+
+
+def render_source_version(*modules) -> str:
+    """source_version() of this generator, RENDER_MODULES and any extra modules (e.g. a subclassing generator)"""
+    from importlib.util import find_spec
+    from fragment_cache import source_version
+    # Hash the sources without importing them (pot_oracle would pull NumPy into every caller)
+    return source_version(sys.modules[__name__], *(find_spec(name).origin for name in RENDER_MODULES), *modules)
+
+
+def render_case(tc_num: int, num_players: int, complexity: str, seed: int, verbose: bool = True,
+                profiler=NULL_PROFILER) -> str:
+    """Generate and validate one test case from its own seed, returning its HTML"""
+    random.seed(seed)
+
+    # Create generator
+    generator = TestCaseGenerator(
+        tc_num=tc_num,
+        num_players=num_players,
+        complexity=complexity,
+        require_side_pot=(tc_num > 6),  # Side pots for 80% of cases
+        go_to_river=True,
+        profiler=profiler
+    )
 
+    # Generate test case
+    test_case_html = generator.generate()
 
-def main():
-    """Generate all 30 test cases progressively"""
-    import sys
-    import io
+    # Validate (note: Base/More validation may fail for all-in scenarios, but calculations are still correct)
+    with profiler.phase('validate'):
+        errors = generator.validate_test_case()
+
+    if verbose:
+        if errors:
+            print("[VALIDATION FAILED]:")
+            for error in errors:
+                print(f"   - {error}")
+            print("   (Note: Internal validation warnings - actual calculations are correct)")
+        else:
+            print("[PASSED]")
+
+    return test_case_html
+
+
+def shard_index_batches(shards) -> List[Tuple]:
+    """Index page cards for generate_test_cases.write_index_html, one per shard"""
+    batches = []
+    for shard in shards:
+        heads_up = shard.players[2]
+        full_ring = sum(n for players, n in shard.players.items() if players >= 7)
+        distribution = [
+            f"{heads_up} Heads-up (2P)", f"{shard.complexity['Simple']} Simple cases",
+            f"{shard.cases - heads_up - full_ring} Short-handed (3-6P)", f"{shard.complexity['Medium']} Medium cases",
+            f"{full_ring} Full ring (7-9P)", f"{shard.complexity['Complex']} Complex cases",
+        ]
+        batches.append((shard.number, shard.first_tc, shard.last_tc, shard.path.name, distribution))
+    return batches
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Generate the 30 validated base test cases (or a soak corpus)')
+    parser.add_argument('--cases', type=int, default=30,
+                        help='Number of test cases; past 30 the distribution repeats (default: 30)')
+    parser.add_argument('--shard-size', type=int, default=0,
+                        help='Rotate to a new shard file every N cases and write an index page (default: one file)')
+    parser.add_argument('--output', default="C:\\Apps\\HUDR\\HHTool_Modular\\docs\\30_base_validated_cases.html")
+    parser.add_argument('--no-cache', action='store_true', help='Render every case instead of using the fragment cache')
+    parser.add_argument('--profile', metavar='PATH',
+                        help='Time each generation phase (implies --no-cache) and write the totals here: '
+                             'JSON for .json, cProfile/pstats stats otherwise')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Generate all 30 test cases progressively
+
+    Rendered cases are kept in a fragment cache next to the output file; only
+    cases whose parameters (or this generator's source) changed are re-rendered.
+    Pass --no-cache to render everything, or --profile to also time each
+    generation phase (see phase_profiler.py).
+
+    Soak corpora (--cases 100000 --shard-size 1000) are streamed case by case
+    into rotating shard files with an index page, so memory stays flat. The
+    fragment cache is skipped past 30 cases: it would store every soak case.
+    """
+    import hand_corpus
+    from fragment_cache import FragmentCache, case_seed, default_cache_dir
+    from phase_profiler import PhaseProfiler
+    from shard_writer import ShardWriter
 
     # Fix Unicode encoding for Windows console
     if sys.platform == "win32":
         sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
 
+    args = parse_args(argv)
+    soak = args.cases > 30
+    profiler = PhaseProfiler() if args.profile else NULL_PROFILER
+
     print("=" * 70)
-    print("Progressive Generation of 30 Validated Test Cases")
+    print(f"Progressive Generation of {args.cases} Validated Test Cases")
     print("=" * 70)
     print("\nRequirements:")
     print("- Varied stack sizes: 10 BB to 60 BB per player")
@@ -1021,60 +1183,83 @@ def main():
     footer = generate_html_footer()
 
     # Get distribution
-    distribution = get_test_case_distribution()
-
-    # Generate all test cases
-    all_test_cases_html = ""
-
-    for tc_num, num_players, complexity in distribution:
-        print(f"[TC-{tc_num}] Generating: {num_players}P {complexity}...", end=" ")
-
-        try:
-            # Create generator
-            generator = TestCaseGenerator(
-                tc_num=tc_num,
-                num_players=num_players,
-                complexity=complexity,
-                require_side_pot=(tc_num > 6),  # Side pots for 80% of cases
-                go_to_river=True
-            )
-
-            # Generate test case
-            test_case_html = generator.generate()
-
-            # Validate (note: Base/More validation may fail for all-in scenarios, but calculations are still correct)
-            errors = generator.validate_test_case()
-
-            if errors:
-                print("[VALIDATION FAILED]:")
-                for error in errors:
-                    print(f"   - {error}")
-                print("   (Note: Internal validation warnings - actual calculations are correct)")
-            else:
-                print("[PASSED]")
-
-            # Always add test case to HTML (validation is overly strict for all-in scenarios)
-            all_test_cases_html += test_case_html
-
-        except Exception as e:
-            print(f"[ERROR]: {e}")
-            import traceback
-            traceback.print_exc()
-
-    # Write complete HTML
-    output_path = "C:\\Apps\\HUDR\\HHTool_Modular\\docs\\30_base_validated_cases.html"
-    complete_html = header + all_test_cases_html + footer
-
-    with open(output_path, "w", encoding="utf-8") as f:
-        f.write(complete_html)
+    distribution = get_test_case_distribution(args.cases)
+
+    output_path = args.output
+    cache = FragmentCache(
+        default_cache_dir(output_path, 'generate_30_progressive'),
+        render_source_version(),
+        enabled=not args.no_cache and not soak and not profiler
+    )
+
+    # Generate all test cases, streaming each one to the output (or current shard) file
+    with ShardWriter(output_path, header, footer, args.shard_size) as writer:
+        for tc_num, num_players, complexity in distribution:
+            if not soak:
+                print(f"[TC-{tc_num}] Generating: {num_players}P {complexity}...", end=" ")
+            elif tc_num % 1000 == 0:
+                print(f"[TC-{tc_num}] {tc_num:,}/{args.cases:,} generated")
+
+            try:
+                seed = case_seed(MASTER_SEED, tc_num)
+                if soak:
+                    test_case_html = render_case(tc_num, num_players, complexity, seed, verbose=False,
+                                                 profiler=profiler)
+                else:
+                    rendered = cache.misses
+                    test_case_html = cache.get_or_render(
+                        lambda: render_case(tc_num, num_players, complexity, seed, profiler=profiler),
+                        tc_num=tc_num, seed=seed, players=num_players, complexity=complexity,
+                        require_side_pot=(tc_num > 6), go_to_river=True, blinds=BlindStructure.STRUCTURES
+                    )
+                    if cache.misses == rendered:
+                        print("[CACHED]")
+
+                # Always add test case to HTML (validation is overly strict for all-in scenarios)
+                with profiler.phase('write'):
+                    writer.write_case(tc_num, test_case_html, num_players, complexity)
+
+            except Exception as e:
+                profiler.count('errors')
+                print(f"[TC-{tc_num}] [ERROR]: {e}" if soak else f"[ERROR]: {e}")
+                if not soak:
+                    import traceback
+                    traceback.print_exc()
+
+    if cache.enabled:
+        cache.prune()
+
+    index_path = None
+    if writer.sharded:
+        sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+        from generate_test_cases import write_index_html
+        index_path = writer.index_path()
+        with open(index_path, 'w', encoding='utf-8') as f:
+            write_index_html(f, shard_index_batches(writer.shards))
+
+    # Binary corpus next to each HTML file, so validators don't re-parse the markup
+    corpora = [hand_corpus.build_corpus(shard.path) for shard in writer.shards] if hand_corpus.np is not None else []
 
     print()
     print("=" * 70)
     print("[OK] Generation Complete!")
-    print(f"Output: {output_path}")
-    print(f"Total Test Cases: {len(distribution)}")
+    if writer.sharded:
+        print(f"Output: {len(writer.shards)} shards of up to {args.shard_size:,} cases "
+              f"({sum(shard.size for shard in writer.shards) / 1024 / 1024:.1f} MB)")
+        print(f"Index: {index_path}")
+    else:
+        print(f"Output: {output_path}")
+        if corpora:
+            print(f"Corpus: {corpora[0]}")
+    print(f"Total Test Cases: {writer.cases}" + ("" if soak else f" ({cache.summary()})"))
     print("=" * 70)
 
+    if profiler:
+        profiler.write(args.profile)
+        print()
+        print(profiler.report())
+        print(f"\nProfile written to {args.profile}")
+
 
 if __name__ == "__main__":
     main()
@@ -23,53 +23,9 @@ Validation Rules Checked:
 
 import random
 from typing import List, Dict, Tuple, Optional
-from dataclasses import dataclass
-from enum import Enum
-
-
-class ActionType(Enum):
-    FOLD = "Fold"
-    CHECK = "Check"
-    CALL = "Call"
-    BET = "Bet"
-    RAISE = "Raise"
-    ALL_IN = "All-in"
-
-
-@dataclass
-class Action:
-    player_name: str
-    position: str
-    action_type: ActionType
-    amount: Optional[int] = None
-
-    def to_html(self) -> str:
-        if self.amount:
-            return (f'<div class="action-row"><span class="action-player">{self.player_name} ({self.position}):</span> '
-                   f'<span class="action-type">{self.action_type.value}</span> '
-                   f'<span class="action-amount">{self.amount:,}</span></div>')
-        else:
-            return (f'<div class="action-row"><span class="action-player">{self.player_name} ({self.position}):</span> '
-                   f'<span class="action-type">{self.action_type.value}</span></div>')
-
-
-@dataclass
-class Player:
-    name: str
-    position: str
-    starting_stack: int
-    current_stack: int = 0
-    street_contribution: int = 0  # Contribution this street
-    total_contribution: int = 0  # Total contribution across all streets
-    folded: bool = False
-    all_in_street: Optional[str] = None  # Which street they went all-in
-    is_bb: bool = False
-    ante_posted: int = 0
-    blind_posted: int = 0
 
-    def __post_init__(self):
-        self.current_stack = self.starting_stack
-        self.is_bb = self.position == "BB"
+from action_order import SEAT_POSITIONS, order_players
+from hand_state import ActionType, Action, Player
 
 
 class TestCaseValidator:
@@ -77,7 +33,8 @@ class TestCaseValidator:
 
     @staticmethod
     def validate_base_more_sections(street_name: str, actions: Dict[str, List[Action]],
-                                     active_players: List[Player]) -> Tuple[bool, str]:
+                                     active_players: List[Player],
+                                     num_seats: Optional[int] = None) -> Tuple[bool, str]:
         """Validate Base vs More section assignment for a street"""
         base_key = f"{street_name} Base"
         base_actions = actions.get(base_key, [])
@@ -86,9 +43,11 @@ class TestCaseValidator:
         if len(base_actions) != len(active_players):
             return False, f"{street_name}: Base has {len(base_actions)} actions, but {len(active_players)} active players"
 
-        # Rule: Base actions must be in position order
-        position_order = ["SB", "BB", "UTG", "UTG+1", "UTG+2", "MP", "HJ", "CO", "Dealer"]
-        expected_order = sorted(active_players, key=lambda p: position_order.index(p.position))
+        # Rule: Base actions must be in position order (preflop and postflop differ)
+        try:
+            expected_order = order_players(active_players, num_seats or len(active_players), street_name)
+        except ValueError as e:
+            return False, f"{street_name}: {e}"
 
         for i, action in enumerate(base_actions):
             if action.player_name != expected_order[i].name:
@@ -164,16 +123,7 @@ class TestCaseGenerator:
 
     PLAYER_NAMES = ["Alice", "Bob", "Charlie", "David", "Eve", "Frank", "Grace", "Henry", "Ivy"]
 
-    POSITIONS = {
-        2: ["SB", "BB"],
-        3: ["Dealer", "SB", "BB"],
-        4: ["Dealer", "SB", "BB", "UTG"],
-        5: ["Dealer", "SB", "BB", "UTG", "CO"],
-        6: ["Dealer", "SB", "BB", "UTG", "MP", "CO"],
-        7: ["Dealer", "SB", "BB", "UTG", "MP", "HJ", "CO"],
-        8: ["Dealer", "SB", "BB", "UTG", "UTG+1", "MP", "HJ", "CO"],
-        9: ["Dealer", "SB", "BB", "UTG", "UTG+1", "UTG+2", "MP", "HJ", "CO"]
-    }
+    POSITIONS = {n: list(seats) for n, seats in SEAT_POSITIONS.items()}
 
     def __init__(self, tc_num: int, num_players: int, complexity: str,
                  require_side_pot: bool = False, go_to_river: bool = True):
@@ -353,9 +303,8 @@ class TestCaseGenerator:
         self.actions["River Base (3♦)"] = actions
 
     def get_postflop_action_order(self, players: List[Player]) -> List[Player]:
-        """Get correct post-flop action order"""
-        position_order = ["SB", "BB", "UTG", "UTG+1", "UTG+2", "MP", "HJ", "CO", "Dealer"]
-        return sorted(players, key=lambda p: position_order.index(p.position))
+        """Get correct post-flop action order (heads-up: BB first)"""
+        return order_players(players, self.num_players, "Flop")
 
     def rotate_button_for_next_hand(self) -> List[Dict]:
         """Rotate button clockwise and generate next hand"""
@@ -399,7 +348,7 @@ class TestCaseGenerator:
             if f"{street} Base" in self.actions:
                 active = [p for p in self.players if not p.folded and
                          (not p.all_in_street or p.all_in_street == street)]
-                valid, msg = validator.validate_base_more_sections(street, self.actions, active)
+                valid, msg = validator.validate_base_more_sections(street, self.actions, active, self.num_players)
                 if not valid:
                     errors.append(f"Base/More validation failed: {msg}")
 
@@ -0,0 +1,500 @@
+#!/usr/bin/env python3
+"""
+Binary Columnar Hand Corpus
+Compact, memory-mappable store for generated hands next to their HTML
+
+The HTML corpora are presentation markup: every validator re-parses about
+9 KB of HTML per hand to get a few dozen numbers back. A .hands file holds
+the same players, actions, pots and expected results as flat typed columns:
+
+- Hand columns (tc id, name, blinds, expected total pot, next hand number)
+  plus a start offset per row group, so hand h's seats are rows
+  seat_start[h]:seat_start[h + 1]
+- Seat columns from the Expected Results table (name, position, starting,
+  final, contributed, new stack, winner) and their breakdown lines
+- Stack setup and next-hand rows (name, position, stack) in listed order
+- Action columns (player, position, seat, street, section, label, amount)
+- Pot columns (name, amount) and their eligible names in listed order
+- Every string (names, positions, labels, tc ids) once in a UTF-8 blob
+
+Missing numbers are stored as -1. Layout: an 8-byte magic, a JSON index of
+column name -> (dtype, length, offset), then each column's raw bytes at a
+64-byte aligned offset. HandCorpus memory-maps the file and exposes every
+column as a zero-copy NumPy view; TestCaseRecords are only built on demand,
+and equal the parsed records in everything but their raw HTML (content).
+
+Usage:
+python hand_corpus.py build <html_file> [...]     # writes <html_file>.hands
+python hand_corpus.py check <html_file> [...]     # parse -> write -> read round trip
+python hand_corpus.py bench <html_file or .hands> [--hands N]
+"""
+import argparse
+import json
+import os
+import struct
+import sys
+import time
+from collections.abc import Sequence
+from pathlib import Path
+from dataclasses import replace
+from typing import Dict, Iterable, List, Optional
+
+from testcase_stream import (
+    ActionRecord, PotRecord, ResultRow, StackEntry, TestCaseRecord, iter_test_cases
+)
+from pot_oracle import is_fold, pack_seats
+
+try:
+    import numpy as np
+except ImportError:
+    # The corpus is NumPy-native; the HTML corpora remain the fallback
+    np = None
+
+MAGIC = b'HANDS\x00\x02\x00'
+ALIGNMENT = 64
+MISSING = -1
+CORPUS_SUFFIX = '.hands'
+
+STREETS = ('Preflop', 'Flop', 'Turn', 'River')
+
+COLUMN_DTYPES = {
+    # Per hand (the *_start columns have one extra entry)
+    'tc_id': 'int32', 'tc_num': 'int32', 'name': 'int32',
+    'sb': 'int64', 'bb': 'int64', 'ante': 'int64', 'total_pot': 'int64', 'next_hand_number': 'int32',
+    'seat_start': 'int64', 'breakdown_start': 'int64', 'setup_start': 'int64', 'next_start': 'int64',
+    'action_start': 'int64', 'pot_start': 'int64', 'eligible_start': 'int64',
+    # Per seat (Expected Results row) and per breakdown line (seat = its row in the hand)
+    'seat_name': 'int32', 'seat_position': 'int32',
+    'seat_starting': 'int64', 'seat_final': 'int64', 'seat_contributed': 'int64',
+    'seat_new_stack': 'int64', 'seat_winner': 'bool',
+    'breakdown_seat': 'int16', 'breakdown_text': 'int32',
+    # Per stack setup / next hand entry
+    'setup_name': 'int32', 'setup_position': 'int32', 'setup_stack': 'int64',
+    'next_name': 'int32', 'next_position': 'int32', 'next_stack': 'int64',
+    # Per action (seat = results row of the player, -1 if none)
+    'action_player': 'int32', 'action_position': 'int32', 'action_seat': 'int16',
+    'action_street': 'uint8', 'action_section': 'int32', 'action_label': 'int32', 'action_amount': 'int64',
+    # Per pot and per eligible name (pot = its row in the hand)
+    'pot_name': 'int32', 'pot_amount': 'int64',
+    'eligible_pot': 'int16', 'eligible_name': 'int32',
+    # String table
+    'string_data': 'uint8', 'string_start': 'int64',
+}
+HAND_COLUMNS = ('tc_id', 'tc_num', 'name', 'sb', 'bb', 'ante', 'total_pot', 'next_hand_number')
+ROW_COLUMNS = {
+    'seat_start': ('seat_name', 'seat_position', 'seat_starting', 'seat_final', 'seat_contributed',
+                   'seat_new_stack', 'seat_winner'),
+    'breakdown_start': ('breakdown_seat', 'breakdown_text'),
+    'setup_start': ('setup_name', 'setup_position', 'setup_stack'),
+    'next_start': ('next_name', 'next_position', 'next_stack'),
+    'action_start': ('action_player', 'action_position', 'action_seat', 'action_street', 'action_section',
+                     'action_label', 'action_amount'),
+    'pot_start': ('pot_name', 'pot_amount'),
+    'eligible_start': ('eligible_pot', 'eligible_name'),
+}
+
+
+def corpus_path(html_file) -> Path:
+    """Where the corpus for an HTML file lives: alongside it, with .hands appended"""
+    path = Path(html_file)
+    return path if path.suffix == CORPUS_SUFFIX else path.with_name(path.name + CORPUS_SUFFIX)
+
+
+def fresh_corpus(html_file) -> Optional[Path]:
+    """The HTML file's corpus if it exists, has this layout and is at least as new as the HTML"""
+    path = corpus_path(html_file)
+    if not path.exists():
+        return None
+    if path != Path(html_file) and os.path.getmtime(path) < os.path.getmtime(html_file):
+        return None
+    with open(path, 'rb') as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            return None
+    return path
+
+
+def _or_missing(value: Optional[int]) -> int:
+    return MISSING if value is None else value
+
+
+class _StringTable:
+    def __init__(self):
+        self.ids: Dict[str, int] = {}
+
+    def __call__(self, text: Optional[str]) -> int:
+        if text is None:
+            return MISSING
+        string_id = self.ids.get(text)
+        if string_id is None:
+            string_id = self.ids[text] = len(self.ids)
+        return string_id
+
+    def columns(self):
+        encoded = [text.encode('utf-8') for text in self.ids]
+        starts = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(b) for b in encoded], out=starts[1:])
+        return np.frombuffer(b''.join(encoded), dtype=np.uint8), starts
+
+
+def records_to_columns(records: Iterable[TestCaseRecord]) -> Dict[str, 'np.ndarray']:
+    """Flatten parsed test cases into corpus columns"""
+    if np is None:
+        raise ImportError("numpy is required for .hands corpora")
+
+    strings = _StringTable()
+    rows = {name: [] for name in COLUMN_DTYPES if name not in ('string_data', 'string_start')}
+    for start in ROW_COLUMNS:
+        rows[start].append(0)
+
+    for tc in records:
+        rows['tc_id'].append(strings(tc.tc_id))
+        rows['tc_num'].append(_or_missing(tc.tc_num))
+        rows['name'].append(strings(tc.name))
+        for name in ('sb', 'bb', 'ante', 'total_pot'):
+            rows[name].append(_or_missing(getattr(tc, name)))
+        rows['next_hand_number'].append(strings(tc.next_hand_number))
+
+        seat_of = {}
+        for s, row in enumerate(tc.results):
+            seat_of.setdefault(row.name, s)
+            rows['seat_name'].append(strings(row.name))
+            rows['seat_position'].append(strings(row.position))
+            rows['seat_starting'].append(row.starting_stack)
+            rows['seat_final'].append(row.final_stack)
+            rows['seat_contributed'].append(_or_missing(row.contributed))
+            rows['seat_new_stack'].append(_or_missing(row.new_stack))
+            rows['seat_winner'].append(row.is_winner)
+            for line in row.breakdown:
+                rows['breakdown_seat'].append(s)
+                rows['breakdown_text'].append(strings(line))
+
+        for prefix, entries in (('setup', tc.stack_setup), ('next', tc.next_hand)):
+            for entry in entries:
+                rows[f'{prefix}_name'].append(strings(entry.name))
+                rows[f'{prefix}_position'].append(strings(entry.position))
+                rows[f'{prefix}_stack'].append(entry.stack)
+
+        for action in tc.actions:
+            rows['action_player'].append(strings(action.player))
+            rows['action_position'].append(strings(action.position))
+            rows['action_seat'].append(seat_of.get(action.player, MISSING))
+            rows['action_street'].append(STREETS.index(action.street))
+            rows['action_section'].append(strings(action.section))
+            rows['action_label'].append(strings(action.action))
+            rows['action_amount'].append(_or_missing(action.amount))
+
+        for k, pot in enumerate(tc.pots):
+            rows['pot_name'].append(strings(pot.name))
+            rows['pot_amount'].append(_or_missing(pot.amount))
+            for name in pot.eligible:
+                rows['eligible_pot'].append(k)
+                rows['eligible_name'].append(strings(name))
+
+        for start, row_columns in ROW_COLUMNS.items():
+            rows[start].append(len(rows[row_columns[0]]))
+
+    columns = {name: np.array(values, dtype=COLUMN_DTYPES[name]) for name, values in rows.items()}
+    columns['string_data'], columns['string_start'] = strings.columns()
+    return columns
+
+
+def write_columns(path, columns: Dict[str, 'np.ndarray']):
+    """Write columns in the .hands layout, atomically"""
+    path = Path(path)
+    offset = 0
+    index = {}
+    for name in COLUMN_DTYPES:
+        column = columns[name]
+        index[name] = [COLUMN_DTYPES[name], len(column), offset]
+        offset += -(-column.nbytes // ALIGNMENT) * ALIGNMENT
+    header = json.dumps({'num_hands': len(columns['tc_id']), 'columns': index}).encode('utf-8')
+    data_start = -(-(len(MAGIC) + 4 + len(header)) // ALIGNMENT) * ALIGNMENT
+
+    tmp_path = path.with_name(f'.{path.name}.{os.getpid()}.tmp')
+    with open(tmp_path, 'wb') as f:
+        f.write(MAGIC + struct.pack('<I', len(header)) + header)
+        for name in COLUMN_DTYPES:
+            f.seek(data_start + index[name][2])
+            f.write(np.ascontiguousarray(columns[name]).tobytes())
+        f.truncate(data_start + offset)
+    os.replace(tmp_path, path)
+
+
+def write_corpus(path, records: Iterable[TestCaseRecord]) -> int:
+    """Write parsed test cases to a .hands corpus; returns the number of hands"""
+    columns = records_to_columns(records)
+    write_columns(path, columns)
+    return len(columns['tc_id'])
+
+
+def build_corpus(html_file) -> Path:
+    """Parse an HTML corpus once and write its .hands file next to it"""
+    path = corpus_path(html_file)
+    write_corpus(path, iter_test_cases(html_file))
+    return path
+
+
+class StringColumn(Sequence):
+    """Lazily decoded view of a string id column (supports * and slicing like a list)"""
+
+    def __init__(self, corpus: 'HandCorpus', ids):
+        self.corpus = corpus
+        self.ids = ids
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return StringColumn(self.corpus, self.ids[index])
+        return self.corpus.string(self.ids[index])
+
+    def __mul__(self, reps: int):
+        return StringColumn(self.corpus, np.tile(self.ids, reps))
+
+
+class HandCorpus:
+    """Memory-mapped .hands corpus; columns are zero-copy views into the file"""
+
+    def __init__(self, path):
+        if np is None:
+            raise ImportError("numpy is required for .hands corpora")
+        self.path = Path(path)
+        self._map = np.memmap(self.path, dtype=np.uint8, mode='r')
+        if bytes(self._map[:len(MAGIC)]) != MAGIC:
+            raise ValueError(f"{self.path}: not a .hands corpus")
+        header_len, = struct.unpack('<I', bytes(self._map[len(MAGIC):len(MAGIC) + 4]))
+        header = json.loads(bytes(self._map[len(MAGIC) + 4:len(MAGIC) + 4 + header_len]))
+        data_start = -(-(len(MAGIC) + 4 + header_len) // ALIGNMENT) * ALIGNMENT
+
+        self.num_hands = header['num_hands']
+        self.columns: Dict[str, np.ndarray] = {}
+        for name, (dtype, length, offset) in header['columns'].items():
+            dtype = np.dtype(dtype)
+            start = data_start + offset
+            self.columns[name] = self._map[start:start + length * dtype.itemsize].view(dtype)
+        self._strings: Dict[int, str] = {}
+
+    def __len__(self):
+        return self.num_hands
+
+    def __getitem__(self, name: str) -> 'np.ndarray':
+        return self.columns[name]
+
+    @property
+    def nbytes(self) -> int:
+        return sum(column.nbytes for column in self.columns.values())
+
+    def string(self, string_id: int) -> Optional[str]:
+        string_id = int(string_id)
+        if string_id == MISSING:
+            return None
+        text = self._strings.get(string_id)
+        if text is None:
+            start, end = self.columns['string_start'][string_id:string_id + 2]
+            text = self._strings[string_id] = bytes(self.columns['string_data'][start:end]).decode('utf-8')
+        return text
+
+    def string_ids(self, column: str, match) -> List[int]:
+        """Ids used in a string id column whose text satisfies match(text)"""
+        return [int(i) for i in np.unique(self.columns[column]) if i != MISSING and match(self.string(i))]
+
+    def rows(self, start_column: str, h: int) -> slice:
+        starts = self.columns[start_column]
+        return slice(int(starts[h]), int(starts[h + 1]))
+
+    def record(self, h: int) -> TestCaseRecord:
+        """Rebuild hand h as a TestCaseRecord (without its raw HTML)"""
+        c = self.columns
+        num = lambda value: None if value == MISSING else int(value)
+        string = self.string
+
+        tc = TestCaseRecord(tc_id=string(c['tc_id'][h]), tc_num=num(c['tc_num'][h]), name=string(c['name'][h]),
+                            sb=num(c['sb'][h]), bb=num(c['bb'][h]), ante=num(c['ante'][h]),
+                            total_pot=num(c['total_pot'][h]), next_hand_number=string(c['next_hand_number'][h]))
+        seats = self.rows('seat_start', h)
+        for row in range(seats.start, seats.stop):
+            tc.results.append(ResultRow(
+                string(c['seat_name'][row]), string(c['seat_position'][row]), int(c['seat_starting'][row]),
+                int(c['seat_final'][row]), num(c['seat_contributed'][row]), bool(c['seat_winner'][row]),
+                num(c['seat_new_stack'][row])
+            ))
+        breakdown = self.rows('breakdown_start', h)
+        for row in range(breakdown.start, breakdown.stop):
+            tc.results[c['breakdown_seat'][row]].breakdown.append(string(c['breakdown_text'][row]))
+        for prefix, entries in (('setup', tc.stack_setup), ('next', tc.next_hand)):
+            listed = self.rows(f'{prefix}_start', h)
+            for row in range(listed.start, listed.stop):
+                entries.append(StackEntry(string(c[f'{prefix}_name'][row]), string(c[f'{prefix}_position'][row]),
+                                          int(c[f'{prefix}_stack'][row])))
+        actions = self.rows('action_start', h)
+        for row in range(actions.start, actions.stop):
+            tc.actions.append(ActionRecord(
+                string(c['action_player'][row]), string(c['action_position'][row]),
+                string(c['action_label'][row]), num(c['action_amount'][row]),
+                STREETS[c['action_street'][row]], string(c['action_section'][row])
+            ))
+        pots = self.rows('pot_start', h)
+        for row in range(pots.start, pots.stop):
+            tc.pots.append(PotRecord(string(c['pot_name'][row]), num(c['pot_amount'][row])))
+        eligible = self.rows('eligible_start', h)
+        for row in range(eligible.start, eligible.stop):
+            tc.pots[c['eligible_pot'][row]].eligible.append(string(c['eligible_name'][row]))
+        return tc
+
+    def __iter__(self):
+        for h in range(self.num_hands):
+            yield self.record(h)
+
+    def pot_columns(self) -> Dict:
+        """
+        Padded (hands x seats) / (hands x pots) arrays in the layout of
+        validate_40_pot_cases.load_pot_columns, built without a per-hand loop
+        """
+        c = self.columns
+        n = self.num_hands
+        seat_counts = np.diff(c['seat_start'])
+        pot_counts = np.diff(c['pot_start'])
+        num_pots = int(pot_counts.max(initial=0))
+
+        # Hand of every seat row, hand and within-hand index of every pot row
+        seat_hand = np.repeat(np.arange(n), seat_counts)
+        pot_hand = np.repeat(np.arange(n), pot_counts)
+        pot_index = np.arange(len(pot_hand)) - c['pot_start'][pot_hand]
+
+        contributed = np.where(c['seat_contributed'] != MISSING, c['seat_contributed'],
+                               c['seat_starting'] - c['seat_final'])
+        is_bb = np.isin(c['seat_position'], self.string_ids('seat_position', 'BB'.__eq__))
+        fold_rows = np.flatnonzero(np.isin(c['action_label'], self.string_ids('action_label', is_fold))
+                                   & (c['action_seat'] != MISSING))
+        action_hand = np.searchsorted(c['action_start'], fold_rows, side='right') - 1
+        folded = np.zeros(len(seat_hand), dtype=bool)
+        folded[c['seat_start'][action_hand] + c['action_seat'][fold_rows]] = True
+        seats = pack_seats(seat_hand, contributed, is_bb, folded, n)
+
+        expected_amounts = np.full((n, num_pots), MISSING, dtype=np.int64)
+        expected_amounts[pot_hand, pot_index] = c['pot_amount']
+
+        return {
+            'tc_ids': StringColumn(self, c['tc_id']),
+            'contributions': seats['contributions'],
+            'ante_mask': seats['ante_mask'],
+            'folded': seats['folded'],
+            'seated': seats['seated'],
+            'bb_ante': np.maximum(c['ante'], 0),
+            'expected_amounts': expected_amounts,
+            'expected_num_pots': pot_counts,
+            'expected_total': np.asarray(c['total_pot'], dtype=np.int64),
+        }
+
+
+def tile_columns(corpus: HandCorpus, num_hands: int) -> Dict[str, 'np.ndarray']:
+    """Repeat a corpus's hands until there are num_hands (synthetic soak corpus)"""
+    n = corpus.num_hands
+    reps = -(-num_hands // n)
+    columns = {name: np.tile(corpus[name], reps)[:num_hands] for name in HAND_COLUMNS}
+    for start, row_columns in ROW_COLUMNS.items():
+        counts = np.tile(np.diff(corpus[start]), reps)[:num_hands]
+        starts = np.zeros(num_hands + 1, dtype=np.int64)
+        np.cumsum(counts, out=starts[1:])
+        columns[start] = starts
+        for name in row_columns:
+            columns[name] = np.tile(corpus[name], reps)[:starts[-1]]
+    columns['string_data'] = corpus['string_data']
+    columns['string_start'] = corpus['string_start']
+    return columns
+
+
+def round_trip_errors(html_file, path) -> List[str]:
+    """Parse html_file, write it to path and read it back; every field that differs"""
+    parsed = [replace(tc, content='') for tc in iter_test_cases(html_file)]
+    write_corpus(path, parsed)
+    read = list(HandCorpus(path))
+    if len(read) != len(parsed):
+        return [f"{len(parsed)} hands parsed, {len(read)} read back"]
+    errors = []
+    for before, after in zip(parsed, read):
+        for name in before.__dataclass_fields__:
+            if getattr(before, name) != getattr(after, name):
+                errors.append(f"{before.tc_id}: {name} {getattr(before, name)!r} parsed, "
+                              f"{getattr(after, name)!r} read back")
+    return errors
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Build and benchmark .hands corpora')
+    sub = parser.add_subparsers(dest='command', required=True)
+    build = sub.add_parser('build', help='Write <html_file>.hands next to each HTML corpus')
+    build.add_argument('files', nargs='+', type=Path)
+    check = sub.add_parser('check', help='Check that parse -> write -> read reproduces every parsed case')
+    check.add_argument('files', nargs='+', type=Path)
+    bench = sub.add_parser('bench', help='Time loading a (tiled) corpus against parsing its HTML')
+    bench.add_argument('file', type=Path)
+    bench.add_argument('--hands', type=int, default=1000000, help='Hands in the tiled corpus (default: 1000000)')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    if args.command == 'build':
+        for html_file in args.files:
+            start = time.perf_counter()
+            path = build_corpus(html_file)
+            corpus = HandCorpus(path)
+            print(f"  {path.name}: {len(corpus):,} hands, {path.stat().st_size:,} bytes "
+                  f"({html_file.stat().st_size:,} bytes HTML), {time.perf_counter() - start:.2f}s")
+        return 0
+
+    if args.command == 'check':
+        failed = 0
+        for html_file in args.files:
+            path = html_file.with_name(f'.{html_file.name}.check{CORPUS_SUFFIX}')
+            try:
+                errors = round_trip_errors(html_file, path)
+            finally:
+                path.unlink(missing_ok=True)
+            if errors:
+                failed += 1
+                print(f"  [FAIL] {html_file.name}: {len(errors)} fields differ")
+                for error in errors[:20]:
+                    print(f"    - {error}")
+            else:
+                print(f"  [OK] {html_file.name}: every case read back as parsed")
+        return 1 if failed else 0
+
+    html_file = args.file
+    path = fresh_corpus(html_file)
+    if path is None:
+        path = build_corpus(html_file)
+    corpus = HandCorpus(path)
+    html_per_hand = html_file.stat().st_size / len(corpus) if path != html_file else None
+
+    bench_path = path.with_name(f'.{path.stem}.bench{CORPUS_SUFFIX}')
+    write_columns(bench_path, tile_columns(corpus, args.hands))
+    try:
+        start = time.perf_counter()
+        tiled = HandCorpus(bench_path)
+        open_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        columns = tiled.pot_columns()
+        pot_seconds = time.perf_counter() - start
+
+        print("=" * 80)
+        print(f"HAND CORPUS BENCHMARK: {path.name} tiled to {len(tiled):,} hands")
+        print("=" * 80)
+        print(f"Open (memory-mapped): {open_seconds * 1000:.1f} ms")
+        print(f"Pot columns for the batch checker: {pot_seconds:.2f}s "
+              f"({sum(a.nbytes for a in columns.values() if hasattr(a, 'nbytes')):,} bytes)")
+        print(f"Corpus: {tiled.nbytes:,} bytes ({tiled.nbytes / len(tiled):.0f} bytes/hand)")
+        if html_per_hand:
+            print(f"HTML: {html_per_hand * len(tiled):,.0f} bytes ({html_per_hand:.0f} bytes/hand), "
+                  f"corpus is {tiled.nbytes / (html_per_hand * len(tiled)):.1%} of it")
+        del tiled, columns
+    finally:
+        bench_path.unlink()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Shared hand-state model for the test case generators
+
+Player and Action are the slotted records the generators mutate while a hand
+is being built; ActionType is shared with validate_more_actions so a generated
+hand can be validated without translating its action types.
+"""
+
+from dataclasses import dataclass
+from enum import Enum
+from typing import Optional
+
+
+class ActionType(Enum):
+    FOLD = "Fold"
+    CHECK = "Check"
+    CALL = "Call"
+    BET = "Bet"
+    RAISE = "Raise"
+    ALL_IN = "All-in"
+
+
+@dataclass(slots=True)
+class Action:
+    player_name: str
+    position: str
+    action_type: ActionType
+    amount: Optional[int] = None
+
+    def to_html(self) -> str:
+        if self.amount:
+            return (f'<div class="action-row"><span class="action-player">{self.player_name} ({self.position}):</span> '
+                   f'<span class="action-type">{self.action_type.value}</span> '
+                   f'<span class="action-amount">{self.amount:,}</span></div>')
+        else:
+            return (f'<div class="action-row"><span class="action-player">{self.player_name} ({self.position}):</span> '
+                   f'<span class="action-type">{self.action_type.value}</span></div>')
+
+
+@dataclass(slots=True)
+class Player:
+    name: str
+    position: str
+    starting_stack: int
+    current_stack: int = 0
+    street_contribution: int = 0  # Contribution this street
+    total_contribution: int = 0  # Total contribution across all streets
+    folded: bool = False
+    all_in_street: Optional[str] = None  # Which street they went all-in
+    is_bb: bool = False
+    ante_posted: int = 0
+    blind_posted: int = 0
+
+    def __post_init__(self):
+        self.current_stack = self.starting_stack
+        self.is_bb = self.position == "BB"
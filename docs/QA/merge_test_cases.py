@@ -1,59 +1,254 @@
 #!/usr/bin/env python3
 """
-Merge 30_base_validated_cases.html with 10_sidepot_cases.html to create 40_TestCases.html
+Merge QA HTML corpora into one file, e.g. 30_base_validated_cases.html +
+10_sidepot_cases.html -> 40_TestCases.html
+
+Inputs are streamed in chunks and merged in order:
+
+- The header (everything before the first case) and the footer (container
+  close, script, </body> after the last case) are taken from the first
+  input only
+- Each case runs from its "TEST CASE N" marker to the close of its
+  test-case div, so the other inputs' containers and scripts are dropped
+  instead of being copied in after their last case. Markup between two
+  cases (an older merge left a container close and a <script> block after
+  TC-30 of 40_TestCases.html) is skipped and the scan goes on to the next case
+- Cases are renumbered as they go: the marker comment, the TC id
+  (TC-N / TC-N.x) and the "Hand (N)" / "Hand (N+1)" labels
+
+Only one case is held in memory at a time, so memory stays flat however
+big the inputs are. The output is written to a temp file and swapped in only
+if it holds exactly as many cases as the inputs.
+
+Usage:
+    python merge_test_cases.py                      # 30 base + 10 side pot -> 40_TestCases.html
+    python merge_test_cases.py a.html b.html c.html -o merged.html [--start N] [--keep-numbers]
 """
+import argparse
+import os
 import re
-
-# Read the 30 test case file from parent directory (where generator writes it)
-with open('../30_base_validated_cases.html', 'r', encoding='utf-8') as f:
-    base_content = f.read()
-
-# Read the 10 test case file from current directory
-with open('10_sidepot_cases.html', 'r', encoding='utf-8') as f:
-    new_content = f.read()
-
-# Extract just the test case sections from the new file (TC-31 through TC-40)
-# Pattern: <!-- TEST CASE XX --> through the next test case or end
-test_case_pattern = r'(<!-- TEST CASE \d+ -->.*?)(?=<!-- TEST CASE \d+ -->|</body>)'
-new_test_cases = re.findall(test_case_pattern, new_content, re.DOTALL)
-
-print(f"Found {len(new_test_cases)} test cases in new file")
-
-# Find where to insert in base file (before closing body tag)
-# The base file ends with </body></html>
-insertion_point = base_content.rfind('</body>')
-
-if insertion_point == -1:
-    print("[ERROR] Could not find </body> tag in base file")
-    exit(1)
-
-# Insert the new test cases before </body>
-merged_content = (
-    base_content[:insertion_point] +
-    '\n'.join(new_test_cases) +
-    '\n' +
-    base_content[insertion_point:]
-)
-
-# Update title if present
-merged_content = merged_content.replace(
-    '<title>30 Poker Hand History Test Cases</title>',
-    '<title>40 Poker Hand History Test Cases</title>'
-)
-
-# Write merged file
-output_path = '40_TestCases.html'
-with open(output_path, 'w', encoding='utf-8') as f:
-    f.write(merged_content)
-
-# Verify
-with open(output_path, 'r', encoding='utf-8') as f:
-    verify_content = f.read()
-    tc_count = len(re.findall(r'<!-- TEST CASE (\d+) -->', verify_content))
-    print(f"\n[OK] Created {output_path}")
-    print(f"[OK] Total test cases: {tc_count}")
-
-# Also copy to main docs folder
 import shutil
-shutil.copy(output_path, '../40_TestCases.html')
-print(f"[OK] Copied to ../40_TestCases.html")
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+
+CHUNK_SIZE = 1 << 20
+# Enough text after a case's closing div to see whether another case follows
+LOOKAHEAD = 512
+
+CASE_START_PATTERN = re.compile(r'(?:<!-- TEST CASE \d+ -->\s*)?<div class="test-case">')
+NEXT_CASE_PATTERN = re.compile(r'\s*(?:<!-- TEST CASE \d+ -->\s*)?<div class="test-case">')
+DIV_TAG_PATTERN = re.compile(r'<div\b|</div>')
+CASE_DIV = '<div class="test-case">'
+MARKER_PATTERN = re.compile(r'<!-- TEST CASE (\d+) -->')
+TC_ID_PATTERN = re.compile(r'(<div class="test-id">TC-)(\d+)')
+HAND_NUMBER_PATTERN = re.compile(r'Hand \((\d+)\)')
+TITLE_PATTERN = re.compile(r'<title>.*?</title>', re.DOTALL)
+
+DEFAULT_INPUTS = [Path('../30_base_validated_cases.html'), Path('10_sidepot_cases.html')]
+DEFAULT_OUTPUT = Path('40_TestCases.html')
+DEFAULT_COPY = Path('../40_TestCases.html')
+
+
+@dataclass
+class MergeStats:
+    inputs: int = 0
+    cases: int = 0
+    found: int = 0
+    renumbered: int = 0
+    chars_written: int = 0
+
+
+def split_stream(f, chunk_size: int = CHUNK_SIZE) -> Iterator[Tuple[str, str]]:
+    """Yield ('header', text), then ('case', text) per case, then ('footer', text) from an open file"""
+    buf = ''
+    eof = False
+
+    def fill():
+        nonlocal buf, eof
+        chunk = f.read(chunk_size)
+        if chunk:
+            buf += chunk
+        else:
+            eof = True
+
+    # Header: up to the first case start that is fully in the buffer
+    while True:
+        match = CASE_START_PATTERN.search(buf)
+        if match and match.end() < len(buf) - LOOKAHEAD or eof:
+            break
+        fill()
+    if match is None:
+        yield 'header', buf
+        yield 'footer', ''
+        return
+    yield 'header', buf[:match.start()]
+    buf = buf[match.start():]
+
+    while True:
+        # Walk the div tags from this case's test-case div until it closes
+        scan_pos = CASE_START_PATTERN.match(buf).end()
+        depth = 1
+        case_end = None
+        while case_end is None:
+            for tag in DIV_TAG_PATTERN.finditer(buf, scan_pos):
+                depth += 1 if tag.group() == '<div' else -1
+                scan_pos = tag.end()
+                if depth == 0:
+                    case_end = tag.end()
+                    break
+            else:
+                if eof:
+                    break
+                # Rescan the tail in case a tag was cut off at the chunk boundary
+                scan_pos = max(scan_pos, len(buf) - 6)
+                fill()
+
+        if case_end is None:
+            # Unbalanced case: fall back to the next case start or </body>
+            next_start = CASE_START_PATTERN.search(buf, 1)
+            if next_start:
+                yield 'case', buf[:next_start.start()]
+                buf = buf[next_start.start():]
+                continue
+            body_end = buf.rfind('</body>')
+            case_end = body_end if body_end > 0 else len(buf)
+            yield 'case', buf[:case_end]
+            yield 'footer', buf[case_end:]
+            return
+
+        while not eof and len(buf) - case_end < LOOKAHEAD:
+            fill()
+        if NEXT_CASE_PATTERN.match(buf, case_end):
+            next_start = CASE_START_PATTERN.search(buf, case_end).start()
+            yield 'case', buf[:next_start]
+            buf = buf[next_start:]
+            continue
+
+        # Something other than a case follows: look past it for another case
+        # before taking the rest as the footer
+        search_pos = case_end
+        while True:
+            next_case = CASE_START_PATTERN.search(buf, search_pos)
+            if next_case or eof:
+                break
+            search_pos = max(case_end, len(buf) - LOOKAHEAD)
+            fill()
+        yield 'case', buf[:case_end]
+        if next_case is None:
+            # The footer is small: container close, script, </body></html>
+            yield 'footer', buf[case_end:]
+            return
+        buf = buf[next_case.start():]
+
+
+def case_number(case: str) -> Optional[int]:
+    match = MARKER_PATTERN.search(case) or TC_ID_PATTERN.search(case)
+    if match is None:
+        return None
+    return int(match.group(match.lastindex))
+
+
+def renumber_case(case: str, new_num: int) -> str:
+    """Give a case number new_num: marker, TC id and its Hand (N) / Hand (N+1) labels"""
+    old_num = case_number(case)
+    if old_num is None or old_num == new_num:
+        return case
+    hand_numbers = {str(old_num): str(new_num), str(old_num + 1): str(new_num + 1)}
+
+    case = MARKER_PATTERN.sub(f'<!-- TEST CASE {new_num} -->', case, count=1)
+    case = TC_ID_PATTERN.sub(lambda m: f'{m.group(1)}{new_num}', case, count=1)
+    return HAND_NUMBER_PATTERN.sub(
+        lambda m: f'Hand ({hand_numbers.get(m.group(1), m.group(1))})', case
+    )
+
+
+def count_cases(path: Path) -> int:
+    """Test-case divs in a file, counted line by line"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return sum(line.count(CASE_DIV) for line in f)
+
+
+def merge_corpora(inputs: List[Path], output: Path, start: int = 1, renumber: bool = True,
+                  title: Optional[str] = None, chunk_size: int = CHUNK_SIZE) -> MergeStats:
+    """Stream the cases of every input into output, with the first input's header and footer"""
+    stats = MergeStats()
+    footer = ''
+    tmp_path = output.with_name(f'.{output.name}.{os.getpid()}.tmp')
+    try:
+        with open(tmp_path, 'w', encoding='utf-8', newline='') as out:
+            for i, path in enumerate(inputs):
+                stats.inputs += 1
+                stats.found += count_cases(path)
+                with open(path, 'r', encoding='utf-8', newline='') as f:
+                    for kind, text in split_stream(f, chunk_size):
+                        if kind == 'header':
+                            if i == 0:
+                                stats.chars_written += out.write(
+                                    TITLE_PATTERN.sub(f'<title>{title}</title>', text, count=1) if title else text
+                                )
+                        elif kind == 'footer':
+                            if i == 0:
+                                footer = text
+                        else:
+                            if renumber:
+                                renumbered = renumber_case(text, start + stats.cases)
+                                stats.renumbered += renumbered != text
+                                text = renumbered
+                            if not text[-1:].isspace():
+                                text += '\n\n'
+                            stats.chars_written += out.write(text)
+                            stats.cases += 1
+            stats.chars_written += out.write(footer)
+        written = count_cases(tmp_path)
+        if not stats.found == stats.cases == written:
+            raise ValueError(f"{stats.found} cases in the inputs, {stats.cases} merged, {written} in the output")
+        os.replace(tmp_path, output)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+    return stats
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Merge QA HTML corpora, renumbering their test cases')
+    parser.add_argument('inputs', nargs='*', type=Path, default=DEFAULT_INPUTS,
+                        help='Input HTML files, in order (default: 30 base + 10 side pot cases)')
+    parser.add_argument('-o', '--output', type=Path, default=DEFAULT_OUTPUT)
+    parser.add_argument('--copy-to', type=Path, help='Also copy the merged file here')
+    parser.add_argument('--start', type=int, default=1, help='Number of the first merged case')
+    parser.add_argument('--keep-numbers', action='store_true', help='Keep the inputs\' case numbers')
+    parser.add_argument('--title', help='Replace the <title> of the merged file')
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE)
+    args = parser.parse_args(argv)
+    if args.inputs == DEFAULT_INPUTS and args.output == DEFAULT_OUTPUT and args.copy_to is None:
+        args.copy_to = DEFAULT_COPY
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    missing = [str(p) for p in args.inputs if not p.exists()]
+    if missing:
+        print(f"[ERROR] Input not found: {', '.join(missing)}")
+        return 1
+
+    try:
+        stats = merge_corpora(args.inputs, args.output, start=args.start, renumber=not args.keep_numbers,
+                              title=args.title, chunk_size=args.chunk_size)
+    except ValueError as e:
+        print(f"[ERROR] {e}; {args.output} not written")
+        return 1
+    print(f"[OK] Merged {stats.inputs} files into {args.output}")
+    print(f"[OK] Total test cases: {stats.cases} ({stats.renumbered} renumbered)")
+    print(f"[OK] Wrote {stats.chars_written:,} characters")
+
+    if args.copy_to:
+        shutil.copy(args.output, args.copy_to)
+        print(f"[OK] Copied to {args.copy_to}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
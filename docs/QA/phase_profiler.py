@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Opt-in per-phase timers and counters for the test case generators
+
+A PhaseProfiler aggregates, across a whole run, how long each phase of
+generation takes and how often it runs, plus free-form counters (actions
+generated, validation calls, side pots, ...). Phases nest: a phase's
+self time excludes the phases opened inside it, so "simulation vs
+rendering" can be read straight off the report.
+
+Generators take a profiler argument that defaults to NULL_PROFILER, whose
+phase() and count() do nothing, so an unprofiled run pays one attribute
+lookup per phase.
+
+Exports:
+- to_dict() / write_json(path): phases and counters as plain JSON
+- write_pstats(path): a marshalled stats file that pstats, snakeviz and
+  other cProfile viewers load; every phase is a "function" and nesting
+  shows up as its callers
+
+Usage:
+    profiler = PhaseProfiler()
+    with profiler.phase('render'):
+        ...
+    profiler.count('actions', len(actions))
+    print(profiler.report())
+    profiler.write_pstats('generate.prof')   # python -m pstats generate.prof
+"""
+import json
+import marshal
+import os
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# pstats keys functions by (file, line, name); phases all live in this pseudo-file
+PSTATS_FILE = 'phase'
+
+
+@dataclass
+class PhaseStats:
+    calls: int = 0
+    seconds: float = 0.0  # Inclusive: time inside the phase, nested phases included
+    self_seconds: float = 0.0  # Exclusive: minus the phases opened inside it
+    min_seconds: Optional[float] = None
+    max_seconds: float = 0.0
+    callers: Counter = field(default_factory=Counter)  # Enclosing phase -> calls from it
+
+    def to_dict(self) -> Dict:
+        return {
+            'calls': self.calls,
+            'seconds': round(self.seconds, 6),
+            'self_seconds': round(self.self_seconds, 6),
+            'min_seconds': round(self.min_seconds or 0.0, 6),
+            'max_seconds': round(self.max_seconds, 6),
+            'callers': dict(self.callers),
+        }
+
+
+class _PhaseTimer:
+    __slots__ = ('profiler', 'name', 'start', 'children')
+
+    def __init__(self, profiler: 'PhaseProfiler', name: str):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.children = 0.0
+        self.profiler._stack.append(self)
+        self.start = self.profiler.clock()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = self.profiler.clock() - self.start
+        stack = self.profiler._stack
+        stack.pop()
+        parent = stack[-1] if stack else None
+        if parent is not None:
+            parent.children += elapsed
+        self.profiler._record(self.name, elapsed, elapsed - self.children, parent.name if parent else None)
+
+
+class PhaseProfiler:
+    """Aggregates phase timings and counters across a run"""
+
+    def __init__(self, clock=time.perf_counter):
+        self.clock = clock
+        self.phases: Dict[str, PhaseStats] = {}
+        self.counters: Counter = Counter()
+        self._stack: List[_PhaseTimer] = []
+
+    def __bool__(self):
+        return True
+
+    def phase(self, name: str) -> _PhaseTimer:
+        """Context manager timing one run of the named phase"""
+        return _PhaseTimer(self, name)
+
+    def count(self, name: str, n: int = 1):
+        self.counters[name] += n
+
+    def _record(self, name: str, seconds: float, self_seconds: float, caller: Optional[str]):
+        stats = self.phases.get(name)
+        if stats is None:
+            stats = self.phases[name] = PhaseStats()
+        stats.calls += 1
+        stats.seconds += seconds
+        stats.self_seconds += self_seconds
+        stats.min_seconds = seconds if stats.min_seconds is None else min(stats.min_seconds, seconds)
+        stats.max_seconds = max(stats.max_seconds, seconds)
+        if caller is not None:
+            stats.callers[caller] += 1
+
+    def merge(self, other: 'PhaseProfiler'):
+        """Fold another profiler's totals into this one (e.g. one per worker process)"""
+        for name, theirs in other.phases.items():
+            ours = self.phases.setdefault(name, PhaseStats())
+            ours.calls += theirs.calls
+            ours.seconds += theirs.seconds
+            ours.self_seconds += theirs.self_seconds
+            if theirs.min_seconds is not None:
+                ours.min_seconds = theirs.min_seconds if ours.min_seconds is None \
+                    else min(ours.min_seconds, theirs.min_seconds)
+            ours.max_seconds = max(ours.max_seconds, theirs.max_seconds)
+            ours.callers.update(theirs.callers)
+        self.counters.update(other.counters)
+
+    def to_dict(self) -> Dict:
+        return {
+            'phases': {name: stats.to_dict() for name, stats in self.phases.items()},
+            'counters': dict(self.counters),
+        }
+
+    def write_json(self, path):
+        _atomic_write(Path(path), json.dumps(self.to_dict(), indent=2).encode('utf-8'))
+
+    def pstats_dict(self) -> Dict:
+        """The {(file, line, func): (cc, nc, tt, ct, callers)} mapping pstats.Stats loads"""
+        def key(name):
+            return (PSTATS_FILE, 0, name)
+
+        stats = {}
+        for name, phase in self.phases.items():
+            callers = {}
+            for caller, calls in phase.callers.items():
+                # Per-caller times are not tracked; attribute them by call share
+                share = calls / phase.calls
+                callers[key(caller)] = (calls, calls, phase.self_seconds * share, phase.seconds * share)
+            stats[key(name)] = (phase.calls, phase.calls, phase.self_seconds, phase.seconds, callers)
+        return stats
+
+    def write_pstats(self, path):
+        _atomic_write(Path(path), marshal.dumps(self.pstats_dict()))
+
+    def write(self, path):
+        """JSON for .json paths, pstats for anything else (.prof, .pstats)"""
+        if Path(path).suffix == '.json':
+            self.write_json(path)
+        else:
+            self.write_pstats(path)
+
+    def report(self) -> str:
+        total = sum(stats.self_seconds for stats in self.phases.values()) or 1.0
+        lines = [
+            "| Phase | Calls | Total (ms) | Self (ms) | Self % | Mean (us) |",
+            "|-------|-------|------------|-----------|--------|-----------|",
+        ]
+        for name, stats in sorted(self.phases.items(), key=lambda item: -item[1].self_seconds):
+            lines.append(f"| {name} | {stats.calls:,} | {stats.seconds * 1000:,.1f} | "
+                         f"{stats.self_seconds * 1000:,.1f} | {stats.self_seconds / total:.1%} | "
+                         f"{stats.seconds / stats.calls * 1e6:,.1f} |")
+        if self.counters:
+            lines += ["", "| Counter | Value |", "|---------|-------|"]
+            lines += [f"| {name} | {value:,} |" for name, value in sorted(self.counters.items())]
+        return "\n".join(lines)
+
+
+class _NullPhase:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+class NullProfiler:
+    """Profiler stand-in that records nothing"""
+
+    _PHASE = _NullPhase()
+
+    def __bool__(self):
+        return False
+
+    def phase(self, name: str) -> _NullPhase:
+        return self._PHASE
+
+    def count(self, name: str, n: int = 1):
+        pass
+
+
+NULL_PROFILER = NullProfiler()
+
+
+def _atomic_write(path: Path, data: bytes):
+    tmp_path = path.with_name(f'.{path.name}.{os.getpid()}.tmp')
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
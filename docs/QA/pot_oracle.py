@@ -0,0 +1,594 @@
+#!/usr/bin/env python3
+"""
+Reference Pot Oracle
+One exact-integer implementation of the pot rules every script shares
+
+- Live contribution = total contribution minus the BB ante (dead money);
+  a BB who could not cover the ante posted all they had as dead money
+- One pot per distinct live contribution level: (level - previous level) x
+  players still at or above it; the ante goes into the Main Pot
+- Eligible for a pot = every seat that reached its level. Folded seats
+  (including a folded blind) still fund the pots but cannot win them; a pot
+  nobody live can win is forfeited down into the pot below it
+- Each pot goes to the best-ranked live seats eligible for it. A pot with no
+  ranked contender (e.g. an uncalled excess) is chopped between its live
+  contenders, so it goes back to a lone contender. Split pots give the
+  odd chips one at a time to the winners in seat order
+
+All amounts are ints and the only division is divmod, so results are exact;
+shares are Fractions. compute_pots / distribute are the reference scalar
+path; compute_pots_batch / settle_batch apply the same rules row-wise to
+(hands x seats) NumPy arrays.
+
+python pot_oracle.py check [html_file ...]   # differential test on every corpus case
+python pot_oracle.py bench [--hands N]       # hands/sec, scalar and batch
+"""
+import argparse
+import sys
+import time
+from dataclasses import dataclass
+from fractions import Fraction
+from numbers import Integral
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    # Only the batch API and the corpus check/bench need NumPy; the scalar oracle stays pure Python
+    np = None
+
+DOCS_DIR = Path(__file__).resolve().parent.parent
+
+# The pot-test-cases-batch-*.html files can be passed explicitly; their
+# Contributed column is not the hand total, so every case there differs
+DEFAULT_FILES = [
+    DOCS_DIR / '40_TestCases.html',
+    DOCS_DIR / '30_base_validated_cases.html',
+    DOCS_DIR / 'QA' / '10_sidepot_cases.html',
+    DOCS_DIR / 'QA' / '10_varied_allin_cases.html',
+    DOCS_DIR / 'QA' / '10_Extended_Action_TestCases.html',
+]
+
+
+@dataclass(frozen=True)
+class Pot:
+    index: int
+    amount: int
+    level: int
+    eligible: Tuple[int, ...]    # Seats that reached the level, folded or not, by live contribution
+    contenders: Tuple[int, ...]  # Eligible seats that can still win it
+
+    @property
+    def name(self) -> str:
+        return 'Main Pot' if self.index == 0 else f'Side Pot {self.index}'
+
+    def share(self, total_pot: int) -> Fraction:
+        return Fraction(self.amount, total_pot) if total_pot else Fraction(0)
+
+
+def _chips(value, what: str) -> int:
+    if isinstance(value, bool) or not isinstance(value, Integral):
+        raise TypeError(f"{what} must be an integer chip count, got {value!r}")
+    if value < 0:
+        raise ValueError(f"{what} must not be negative, got {value:,}")
+    return int(value)
+
+
+def compute_pots(contributions: Sequence[int], bb_ante: int = 0, ante_seat: Optional[int] = None,
+                 folded: Optional[Sequence[bool]] = None) -> List[Pot]:
+    """
+    Main and side pots for one hand
+
+    Args:
+        contributions: Total chips each seat put in, ante included
+        bb_ante: BB ante (dead money in the Main Pot)
+        ante_seat: Seat that posted the ante; None means the ante is not
+                   part of contributions and is simply added to the Main Pot
+        folded: Optional per-seat fold flags; a folded seat still funds the
+                pots but cannot win them, except a pot only it reached (its
+                own unmatched excess, which goes back to it)
+
+    Returns:
+        Pots in order, Main Pot first
+    """
+    live = [_chips(c, f"seat {s} contribution") for s, c in enumerate(contributions)]
+    dead = _chips(bb_ante, "BB ante")
+    if ante_seat is not None:
+        dead = min(dead, live[ante_seat])
+        live[ante_seat] -= dead
+    folded = folded or [False] * len(live)
+
+    order = sorted(range(len(live)), key=live.__getitem__)
+    pots = []
+    prev_level = 0
+    for rank, seat in enumerate(order):
+        level = live[seat]
+        if rank and level == live[order[rank - 1]]:
+            continue
+        eligible = tuple(order[rank:])
+        amount = (level - prev_level) * (len(live) - rank)
+        if not pots:
+            amount += dead
+        contenders = eligible if len(eligible) == 1 else tuple(s for s in eligible if not folded[s])
+        pots.append(Pot(len(pots), amount, level, eligible, contenders))
+        prev_level = level
+    return pots
+
+
+def pot_awards(pots: Sequence[Pot], ranking: Iterable[Iterable[int]], num_seats: int,
+               odd_chip_order: Optional[Sequence[int]] = None) -> List[List[int]]:
+    """
+    Chips each seat collects from each pot, for results that itemize them
+
+    Same arguments as distribute(). Returns one per-seat list per pot, in pot
+    order; a forfeited pot's chips are awarded with the pot below it.
+    """
+    ranking = [set(group) for group in ranking]
+    chip_order = {seat: i for i, seat in enumerate(odd_chip_order)} if odd_chip_order is not None else {}
+    awards = [[0] * num_seats for _ in pots]
+
+    carry = 0
+    for k in reversed(range(len(pots))):
+        pot = pots[k]
+        amount = pot.amount + carry
+        if not pot.contenders:
+            carry = amount  # Forfeited: nobody live reached this level
+            continue
+        carry = 0
+        contenders = set(pot.contenders)
+        winners = next((won for won in (group & contenders for group in ranking) if won), contenders)
+        share, odd_chips = divmod(amount, len(winners))
+        for i, seat in enumerate(sorted(winners, key=lambda s: chip_order.get(s, num_seats + s))):
+            awards[k][seat] += share + (1 if i < odd_chips else 0)
+
+    if carry:
+        raise ValueError(f"{carry:,} chips in pots with no live player")
+    return awards
+
+
+def distribute(pots: Sequence[Pot], ranking: Iterable[Iterable[int]], num_seats: int,
+               odd_chip_order: Optional[Sequence[int]] = None) -> List[int]:
+    """
+    Chips each seat collects from pots
+
+    Args:
+        pots: Result of compute_pots
+        ranking: Groups of tied seats, best hand first; unranked seats chop
+                 whatever no ranked seat can win
+        num_seats: Seats in the hand
+        odd_chip_order: Seats in the order odd chips are handed out
+                        (default: seat order)
+
+    Returns:
+        Per-seat winnings; they always sum to the total pot
+    """
+    payouts = [0] * num_seats
+    for awards in pot_awards(pots, ranking, num_seats, odd_chip_order):
+        for seat, won in enumerate(awards):
+            payouts[seat] += won
+    return payouts
+
+
+@dataclass
+class Settlement:
+    pots: List[Pot]
+    payouts: List[int]
+
+    @property
+    def total_pot(self) -> int:
+        return sum(pot.amount for pot in self.pots)
+
+
+def settle(contributions: Sequence[int], winners: Iterable[int], bb_ante: int = 0, ante_seat: Optional[int] = None,
+           folded: Optional[Sequence[bool]] = None, odd_chip_order: Optional[Sequence[int]] = None) -> Settlement:
+    """Pots and payouts for a hand with one set of (tied) winners"""
+    pots = compute_pots(contributions, bb_ante, ante_seat, folded)
+    return Settlement(pots, distribute(pots, [winners], len(contributions), odd_chip_order))
+
+
+def compute_pots_batch(contributions, bb_ante, ante_mask, folded=None, seated=None):
+    """
+    Calculate main and side pots for many hands in one vectorized pass
+
+    Same pot rules as compute_pots(), applied row-wise: live contributions
+    are sorted per hand, the gap to the previous level times the number of
+    players still at or above it gives each pot, and the eligible set of a
+    pot is the suffix of the sorted order.
+
+    Args:
+        contributions: (hands x seats) total contributions, ante included
+        bb_ante: Scalar or (hands,) BB ante amount (dead money in main pot)
+        ante_mask: (hands x seats) bool, True for the seat that posted the ante
+        folded: Optional (hands x seats) bool; folded seats still fund the pots
+                but are cleared from the eligibility bitmasks (except a pot
+                only they reached, as in compute_pots)
+        seated: Optional (hands x seats) bool; False marks padding seats
+
+    Returns:
+        dict with (hands x seats) 'amounts', 'levels' and 'eligible' (uint64
+        seat bitmasks, bit i = seat i) where pot k sits in column k
+        (0 = Main Pot), plus 'num_pots', 'total_pot' and 'bb_ante' per hand
+    """
+    if np is None:
+        raise ImportError("numpy is required for batch side pot calculation")
+
+    contributions = np.asarray(contributions, dtype=np.int64)
+    num_hands, num_seats = contributions.shape
+    if num_seats > 64:
+        raise ValueError(f"At most 64 seats per hand supported, got {num_seats}")
+
+    bb_ante = np.broadcast_to(np.asarray(bb_ante, dtype=np.int64), (num_hands,))
+    ante_mask = np.asarray(ante_mask, dtype=bool)
+    if seated is None:
+        seated = np.ones((num_hands, num_seats), dtype=bool)
+    else:
+        seated = np.asarray(seated, dtype=bool)
+
+    # Live contributions; padding sorts to the end of every row
+    dead = np.where(ante_mask, np.minimum(contributions, bb_ante[:, None]), 0)
+    live = contributions - dead
+    live = np.where(seated, live, np.iinfo(np.int64).max)
+
+    order = np.argsort(live, axis=1, kind='stable')
+    sorted_live = np.take_along_axis(live, order, axis=1)
+    num_seated = seated.sum(axis=1)
+    rank = np.arange(num_seats)
+    in_hand = rank[None, :] < num_seated[:, None]
+
+    # Level step at each sorted position; zero for repeats of a level
+    step = np.diff(sorted_live, axis=1, prepend=0)
+    new_level = in_hand & ((rank[None, :] == 0) | (step > 0))
+    pot_values = np.where(new_level, step * (num_seated[:, None] - rank[None, :]), 0)
+
+    # Eligible at a level = every seat from its first sorted position onward
+    seat_bits = np.left_shift(np.uint64(1), order.astype(np.uint64))
+    seat_bits = np.where(in_hand, seat_bits, np.uint64(0))
+    eligible_sorted = np.bitwise_or.accumulate(seat_bits[:, ::-1], axis=1)[:, ::-1]
+
+    # Compact new levels into pot columns (0 = Main Pot)
+    pot_col = np.cumsum(new_level, axis=1) - 1
+    rows, cols = np.nonzero(new_level)
+    dest = pot_col[rows, cols]
+
+    amounts = np.zeros((num_hands, num_seats), dtype=np.int64)
+    levels = np.zeros((num_hands, num_seats), dtype=np.int64)
+    eligible = np.zeros((num_hands, num_seats), dtype=np.uint64)
+    amounts[rows, dest] = pot_values[rows, cols]
+    levels[rows, dest] = sorted_live[rows, cols]
+    eligible[rows, dest] = eligible_sorted[rows, cols]
+
+    num_pots = new_level.sum(axis=1)
+    if num_seats:
+        # Ante is dead money in the main pot
+        dead_money = np.where(ante_mask.any(axis=1), dead.sum(axis=1), bb_ante)
+        amounts[:, 0] += np.where(num_pots > 0, dead_money, 0)
+
+    if folded is not None:
+        folded_bits = np.bitwise_or.reduce(
+            np.where(np.asarray(folded, dtype=bool) & seated,
+                     np.left_shift(np.uint64(1), rank.astype(np.uint64))[None, :],
+                     np.uint64(0)),
+            axis=1
+        )
+        # A pot with one eligible seat is that seat's unmatched excess, folded or not
+        single = (eligible != 0) & ((eligible & (eligible - np.uint64(1))) == 0)
+        eligible = np.where(single, eligible, eligible & ~folded_bits[:, None])
+
+    return {
+        'amounts': amounts,
+        'levels': levels,
+        'eligible': eligible,
+        'num_pots': num_pots,
+        'total_pot': amounts.sum(axis=1),
+        'bb_ante': bb_ante
+    }
+
+
+def distribute_batch(pots, winner_mask):
+    """
+    distribute() for a compute_pots_batch result, one winner group per hand
+
+    Args:
+        pots: Result of compute_pots_batch (with folded, 'eligible' holds contenders)
+        winner_mask: (hands x seats) bool, the tied best hands of each row
+
+    Returns:
+        (hands x seats) int64 payouts; odd chips go out in seat order
+    """
+    amounts, eligible, num_pots = pots['amounts'], pots['eligible'], pots['num_pots']
+    num_hands, num_seats = amounts.shape
+    seat_bit = np.left_shift(np.uint64(1), np.arange(num_seats, dtype=np.uint64))
+    winner_bits = np.bitwise_or.reduce(
+        np.where(np.asarray(winner_mask, dtype=bool), seat_bit[None, :], np.uint64(0)), axis=1
+    )
+
+    payouts = np.zeros((num_hands, num_seats), dtype=np.int64)
+    carry = np.zeros(num_hands, dtype=np.int64)
+    for k in range(num_seats - 1, -1, -1):
+        has_pot = k < num_pots
+        amount = amounts[:, k] + carry
+        contenders = eligible[:, k]
+        dead = has_pot & (contenders == 0)
+        carry = np.where(dead, amount, 0)
+        live = has_pot & ~dead
+
+        winners = contenders & winner_bits
+        winners = np.where(winners == 0, contenders, winners)
+        seat_won = (winners[:, None] & seat_bit[None, :]) != 0
+        num_winners = np.maximum(seat_won.sum(axis=1), 1)
+        share, odd_chips = np.divmod(amount, num_winners)
+        # i-th winner in seat order gets an odd chip while i < odd_chips
+        odd = seat_won & ((np.cumsum(seat_won, axis=1) - 1) < odd_chips[:, None])
+        payouts += np.where(live[:, None] & seat_won, share[:, None] + odd, 0)
+
+    if carry.any():
+        h = int(np.flatnonzero(carry)[0])
+        raise ValueError(f"hand {h}: {int(carry[h]):,} chips in pots with no live player")
+    return payouts
+
+
+def settle_batch(contributions, bb_ante, ante_mask, winner_mask, folded=None, seated=None):
+    """compute_pots_batch + distribute_batch; adds 'payouts' to the pots dict"""
+    pots = compute_pots_batch(contributions, bb_ante, ante_mask, folded, seated)
+    pots['payouts'] = distribute_batch(pots, winner_mask)
+    return pots
+
+
+def is_fold(action: str) -> bool:
+    """The fold rule every corpus loader shares: an action label starting with 'Fold'"""
+    return action.startswith('Fold')
+
+
+def pack_seats(seat_hand, contributions, is_bb, folded, num_hands: int) -> Dict[str, 'np.ndarray']:
+    """
+    Padded (hands x seats) 'contributions', 'ante_mask', 'folded' and 'seated'
+    arrays for the batch API, from flat per-seat rows listed hand by hand in
+    seat order; seat_hand is each row's hand index
+
+    The BB ante is charged to the first BB of a hand only, the ante_seat
+    calculate_side_pots() and the generators use.
+    """
+    seat_hand = np.asarray(seat_hand, dtype=np.int64)
+    counts = np.bincount(seat_hand, minlength=num_hands)
+    seat_index = np.arange(len(seat_hand)) - (np.cumsum(counts) - counts)[seat_hand]
+    shape = (num_hands, int(counts.max(initial=0)))
+
+    packed = {
+        'contributions': np.zeros(shape, dtype=np.int64),
+        'ante_mask': np.zeros(shape, dtype=bool),
+        'folded': np.zeros(shape, dtype=bool),
+        'seated': np.zeros(shape, dtype=bool),
+    }
+    packed['contributions'][seat_hand, seat_index] = contributions
+    packed['folded'][seat_hand, seat_index] = folded
+    packed['seated'][seat_hand, seat_index] = True
+    bb_rows = np.flatnonzero(is_bb)
+    _, first = np.unique(seat_hand[bb_rows], return_index=True)
+    packed['ante_mask'][seat_hand[bb_rows[first]], seat_index[bb_rows[first]]] = True
+    return packed
+
+
+# ---------------------------------------------------------------------------
+# Differential test and benchmark over the HTML corpora
+# ---------------------------------------------------------------------------
+
+@dataclass
+class CorpusHand:
+    file_name: str
+    tc_id: str
+    names: List[str]
+    contributions: List[int]
+    bb_ante: int
+    ante_seat: Optional[int]
+    winners: List[int]
+    expected_total: Optional[int]
+    expected_pots: List[Tuple[Optional[int], List[str]]]
+    expected_won: List[Optional[int]]
+    folded: List[bool]
+
+
+def load_corpus_hands(html_file) -> List[CorpusHand]:
+    """Seat data and expected pots/payouts for every case in a corpus file"""
+    from testcase_stream import iter_test_cases
+
+    hands = []
+    seat_hand, contributions, is_bb, folded = [], [], [], []
+    for tc in iter_test_cases(html_file):
+        if not tc.results:
+            continue
+        folded_names = {action.player for action in tc.actions if is_fold(action.action)}
+        for row in tc.results:
+            seat_hand.append(len(hands))
+            contributions.append(row.contributed if row.contributed is not None
+                                 else row.starting_stack - row.final_stack)
+            is_bb.append(row.position == 'BB')
+            folded.append(row.name in folded_names)
+        # Seat columns are filled in from pack_seats below
+        hands.append(CorpusHand(
+            Path(html_file).name, tc.tc_id or '?', [row.name for row in tc.results], [], tc.ante or 0,
+            None, [s for s, row in enumerate(tc.results) if row.is_winner], tc.total_pot,
+            [(pot.amount, pot.eligible) for pot in tc.pots],
+            [row.new_stack - row.final_stack if row.new_stack is not None else None for row in tc.results],
+            [],
+        ))
+
+    packed = pack_seats(seat_hand, contributions, is_bb, folded, len(hands))
+    for h, hand in enumerate(hands):
+        n = len(hand.names)
+        hand.contributions = packed['contributions'][h, :n].tolist()
+        hand.folded = packed['folded'][h, :n].tolist()
+        ante_seats = np.flatnonzero(packed['ante_mask'][h])
+        hand.ante_seat = int(ante_seats[0]) if len(ante_seats) else None
+    return hands
+
+
+def check_hand(hand: CorpusHand) -> Tuple[Settlement, List[str]]:
+    """Oracle vs the corpus' own expected values; returns (settlement, mismatches)"""
+    if any(c < 0 for c in hand.contributions):
+        return None, [f"negative contribution in {hand.contributions}"]
+    result = settle(hand.contributions, hand.winners, hand.bb_ante, hand.ante_seat, hand.folded)
+    errors = []
+    if hand.expected_total is not None and hand.expected_total != result.total_pot:
+        errors.append(f"total pot {hand.expected_total:,} expected, oracle {result.total_pot:,}")
+    if hand.expected_pots:
+        if len(hand.expected_pots) != len(result.pots):
+            errors.append(f"{len(hand.expected_pots)} pots expected, oracle {len(result.pots)}")
+        for pot, (amount, eligible) in zip(result.pots, hand.expected_pots):
+            if amount is not None and amount != pot.amount:
+                errors.append(f"{pot.name}: {amount:,} expected, oracle {pot.amount:,}")
+            oracle_names = sorted(hand.names[s] for s in pot.eligible)
+            if eligible and sorted(eligible) != oracle_names:
+                errors.append(f"{pot.name}: eligible {sorted(eligible)} expected, oracle {oracle_names}")
+    for s, won in enumerate(hand.expected_won):
+        if won is not None and won != result.payouts[s]:
+            errors.append(f"{hand.names[s]} wins {won:,} expected, oracle {result.payouts[s]:,}")
+    return result, errors
+
+
+def pack_hands(hands: List[CorpusHand]):
+    """(hands x seats) arrays for the batch API"""
+    num_seats = max((len(h.contributions) for h in hands), default=0)
+    shape = (len(hands), num_seats)
+    contributions = np.zeros(shape, dtype=np.int64)
+    ante_mask = np.zeros(shape, dtype=bool)
+    seated = np.zeros(shape, dtype=bool)
+    winner_mask = np.zeros(shape, dtype=bool)
+    folded = np.zeros(shape, dtype=bool)
+    bb_ante = np.zeros(len(hands), dtype=np.int64)
+    for h, hand in enumerate(hands):
+        n = len(hand.contributions)
+        contributions[h, :n] = hand.contributions
+        seated[h, :n] = True
+        winner_mask[h, hand.winners] = True
+        folded[h, :n] = hand.folded
+        bb_ante[h] = hand.bb_ante
+        if hand.ante_seat is not None:
+            ante_mask[h, hand.ante_seat] = True
+    return contributions, bb_ante, ante_mask, winner_mask, folded, seated
+
+
+def compare_batch(result: Settlement, batch, h: int) -> List[str]:
+    """Scalar oracle vs row h of the batch API"""
+    errors = []
+    if len(result.pots) != batch['num_pots'][h]:
+        return [f"pot count {len(result.pots)} (scalar) vs {batch['num_pots'][h]} (batch)"]
+    for k, pot in enumerate(result.pots):
+        mask = int(batch['eligible'][h, k])
+        if pot.amount != batch['amounts'][h, k] or pot.level != batch['levels'][h, k]:
+            errors.append(f"{pot.name}: {pot.amount:,}@{pot.level:,} (scalar) vs "
+                          f"{int(batch['amounts'][h, k]):,}@{int(batch['levels'][h, k]):,} (batch)")
+        if sum(1 << s for s in pot.contenders) != mask:
+            errors.append(f"{pot.name}: contenders {pot.contenders} (scalar) vs mask {mask:#x} (batch)")
+    batch_payouts = batch['payouts'][h, :len(result.payouts)].tolist()
+    if result.payouts != batch_payouts:
+        errors.append(f"payouts {result.payouts} (scalar) vs {batch_payouts} (batch)")
+    return errors
+
+
+def run_check(files: List[Path], strict: bool, limit: int) -> int:
+    if np is None:
+        print("[ERROR] numpy is required to load the corpus")
+        return 1
+    print("=" * 80)
+    print("POT ORACLE DIFFERENTIAL CHECK")
+    print("=" * 80)
+
+    hands = []
+    for html_file in files:
+        if not html_file.exists():
+            print(f"{html_file.name}: not found, skipped")
+            continue
+        file_hands = load_corpus_hands(html_file)
+        print(f"{html_file.name}: {len(file_hands)} hands")
+        hands.extend(file_hands)
+
+    settled = [(hand, *check_hand(hand)) for hand in hands]
+    engine_errors = []
+    corpus_errors = []
+    for hand, result, errors in settled:
+        corpus_errors.extend(f"{hand.file_name} {hand.tc_id}: {e}" for e in errors)
+        if result is not None and sum(result.payouts) != result.total_pot:
+            engine_errors.append(f"{hand.file_name} {hand.tc_id}: payouts {sum(result.payouts):,} "
+                                 f"!= total pot {result.total_pot:,}")
+
+    checked = [(hand, result) for hand, result, _ in settled if result is not None]
+    if checked:
+        contributions, bb_ante, ante_mask, winner_mask, folded, seated = pack_hands([hand for hand, _ in checked])
+        batch = settle_batch(contributions, bb_ante, ante_mask, winner_mask, folded, seated)
+        for h, (hand, result) in enumerate(checked):
+            engine_errors.extend(f"{hand.file_name} {hand.tc_id}: {e}" for e in compare_batch(result, batch, h))
+
+    print()
+    print(f"Hands checked: {len(hands)}")
+    if engine_errors:
+        print(f"[FAIL] {len(engine_errors)} scalar/batch disagreements")
+        for error in engine_errors[:limit]:
+            print(f"  - {error}")
+    else:
+        print("[OK] Scalar oracle and batch API agree on every hand, payouts conserve every pot")
+
+    failed_hands = len({e.split(':')[0] for e in corpus_errors})
+    if corpus_errors:
+        print(f"[{'FAIL' if strict else 'WARN'}] {len(corpus_errors)} corpus expectations differ from the oracle "
+              f"({failed_hands} hands)")
+        for error in corpus_errors[:limit]:
+            print(f"  - {error}")
+    else:
+        print("[OK] Every corpus case matches the oracle")
+
+    return 1 if engine_errors or (strict and corpus_errors) else 0
+
+
+def run_bench(files: List[Path], num_hands: int) -> int:
+    if np is None:
+        print("[ERROR] numpy is required for the benchmark")
+        return 1
+    hands = [hand for html_file in files if html_file.exists() for hand in load_corpus_hands(html_file)]
+    hands = [hand for hand in hands if min(hand.contributions, default=0) >= 0]
+    if not hands:
+        print("[ERROR] No corpus hands to benchmark")
+        return 1
+    tiled = (hands * (num_hands // len(hands) + 1))[:num_hands]
+
+    print("=" * 80)
+    print(f"POT ORACLE BENCHMARK ({num_hands:,} hands tiled from {len(hands)} corpus hands)")
+    print("=" * 80)
+
+    start = time.perf_counter()
+    for hand in tiled:
+        settle(hand.contributions, hand.winners, hand.bb_ante, hand.ante_seat, hand.folded)
+    scalar_seconds = time.perf_counter() - start
+    print(f"Scalar settle:  {num_hands / scalar_seconds:>14,.0f} hands/sec ({scalar_seconds:.3f}s)")
+
+    contributions, bb_ante, ante_mask, winner_mask, folded, seated = pack_hands(tiled)
+    start = time.perf_counter()
+    settle_batch(contributions, bb_ante, ante_mask, winner_mask, folded, seated)
+    batch_seconds = time.perf_counter() - start
+    print(f"Batch settle:   {num_hands / batch_seconds:>14,.0f} hands/sec ({batch_seconds:.3f}s)")
+    return 0
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Reference pot oracle: differential check and benchmark')
+    sub = parser.add_subparsers(dest='command', required=True)
+    check = sub.add_parser('check', help='Compare the oracle, its batch API and every corpus case')
+    check.add_argument('html_files', nargs='*', type=Path)
+    check.add_argument('--strict', action='store_true', help='Fail on corpus expectations that differ')
+    check.add_argument('--limit', type=int, default=20, help='Mismatches to print per kind')
+    bench = sub.add_parser('bench', help='Scalar and batch throughput in hands/sec')
+    bench.add_argument('html_files', nargs='*', type=Path)
+    bench.add_argument('--hands', type=int, default=100_000)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    files = args.html_files or DEFAULT_FILES
+    if args.command == 'check':
+        return run_check(files, args.strict, args.limit)
+    return run_bench(files, args.hands)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
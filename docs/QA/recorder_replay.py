@@ -0,0 +1,460 @@
+#!/usr/bin/env python3
+"""
+Chrome Recorder Replay
+Replay Chrome DevTools Recorder JSON (see Recording/) in batch, or dry-run it
+against saved DOM snapshots without a browser
+
+- Recordings are parsed into a step graph: identical steps (same type, URL /
+  viewport and selector set) across recordings share one node, and each
+  recording is a path through the nodes
+- Selector fallbacks are normalized and deduped per step (pierce/X collapses
+  into the CSS selector X, exact repeats are dropped)
+- Dry run resolves every step's selectors against one or more saved HTML
+  snapshots in pure Python (dom_snapshot), each unique selector once
+- Live mode replays all recordings through one reused Chrome session,
+  clearing cookies and storage between recordings, optionally --repeat times
+- Both modes write a JSON report with per-step timings, which fallback
+  resolved each step, and flakiness (steps that fail on some runs only, or
+  that resolve through different fallbacks across runs)
+
+Usage:
+python recorder_replay.py --dry-run --snapshot page.html [recording.json ...]
+python recorder_replay.py --repeat 3 --headless [recording.json ...]
+"""
+import argparse
+import json
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit, urlunsplit
+
+from dom_snapshot import DomSnapshot, load_snapshot
+
+try:
+    from selenium import webdriver
+    from selenium.common.exceptions import WebDriverException
+    from selenium.webdriver.common.action_chains import ActionChains
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait
+except ImportError:
+    # Dry runs need no browser; only live replay requires selenium
+    webdriver = None
+
+RECORDING_DIR = Path(__file__).resolve().parent / 'Recording'
+
+STEP_TIMEOUT = 5  # Seconds to wait for a click target in live mode
+POLL_FREQUENCY = 0.05
+
+SELECTOR_KINDS = ('aria', 'xpath', 'pierce', 'text')
+
+Chain = Tuple[Tuple[str, str], ...]
+
+
+def parse_selector(raw: str) -> Tuple[str, str]:
+    """Split a Recorder selector ('aria/Name', 'xpath//...', 'pierce/...', css) into (kind, value)"""
+    kind, sep, value = raw.partition('/')
+    if sep and kind in SELECTOR_KINDS:
+        # pierce only differs from CSS inside shadow roots, which the app doesn't use
+        return ('css', value) if kind == 'pierce' else (kind, value)
+    return 'css', raw
+
+
+def dedupe_selectors(selectors: List[List[str]]) -> Tuple[Chain, ...]:
+    """Normalize Recorder fallbacks into unique selector chains, keeping their order"""
+    chains = []
+    for fallback in selectors:
+        chain = tuple(parse_selector(part) for part in fallback)
+        if chain not in chains:
+            chains.append(chain)
+    return tuple(chains)
+
+
+def format_chain(chain: Chain) -> str:
+    return ' >> '.join(f"{kind}/{value}" for kind, value in chain)
+
+
+@dataclass(frozen=True)
+class Step:
+    type: str
+    url: Optional[str] = None
+    viewport: Optional[Tuple[int, int]] = None
+    selectors: Tuple[Chain, ...] = ()
+    offset: Tuple[float, float] = (0.0, 0.0)
+    expected_title: Optional[str] = None
+
+    @property
+    def key(self) -> Tuple:
+        """Identity for sharing nodes across recordings (click offsets don't matter)"""
+        return (self.type, self.url, self.viewport, self.selectors, self.expected_title)
+
+    def describe(self) -> str:
+        if self.type == 'navigate':
+            return f"navigate {self.url}"
+        if self.type == 'setViewport':
+            return f"setViewport {self.viewport[0]}x{self.viewport[1]}"
+        if self.selectors:
+            return f"{self.type} {format_chain(self.selectors[0])}"
+        return self.type
+
+
+@dataclass
+class Recording:
+    title: str
+    path: str
+    steps: List[Step]
+    node_ids: List[int] = field(default_factory=list)  # Filled in by StepGraph
+
+
+def parse_step(raw: Dict) -> Step:
+    step_type = raw['type']
+    expected_title = next((event.get('title') for event in raw.get('assertedEvents', [])
+                           if event.get('type') == 'navigation' and event.get('title')), None)
+    viewport = (raw['width'], raw['height']) if step_type == 'setViewport' else None
+    return Step(
+        type=step_type,
+        url=raw.get('url'),
+        viewport=viewport,
+        selectors=dedupe_selectors(raw.get('selectors', [])),
+        offset=(raw.get('offsetX', 0.0), raw.get('offsetY', 0.0)),
+        expected_title=expected_title
+    )
+
+
+def load_recording(path) -> Recording:
+    """Parse one Chrome Recorder JSON file"""
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    return Recording(data.get('title', Path(path).stem), str(path), [parse_step(s) for s in data['steps']])
+
+
+class StepGraph:
+    """Unique steps across recordings, with the transitions each recording takes"""
+
+    def __init__(self, recordings: List[Recording]):
+        self.recordings = recordings
+        self.nodes: List[Step] = []
+        self.edges: Dict[int, set] = {}
+        self.uses: Dict[int, int] = {}
+        index: Dict[Tuple, int] = {}
+
+        for recording in recordings:
+            recording.node_ids = []
+            previous = None
+            for step in recording.steps:
+                node_id = index.setdefault(step.key, len(self.nodes))
+                if node_id == len(self.nodes):
+                    self.nodes.append(step)
+                    self.edges[node_id] = set()
+                self.uses[node_id] = self.uses.get(node_id, 0) + 1
+                if previous is not None:
+                    self.edges[previous].add(node_id)
+                recording.node_ids.append(node_id)
+                previous = node_id
+
+    def summary(self) -> Dict:
+        return {
+            'recordings': len(self.recordings),
+            'steps': sum(len(r.steps) for r in self.recordings),
+            'unique_steps': len(self.nodes),
+            'shared_steps': sum(1 for count in self.uses.values() if count > 1),
+            'selector_chains': sum(len(step.selectors) for step in self.nodes),
+            'edges': {str(node): sorted(targets) for node, targets in self.edges.items() if targets}
+        }
+
+
+class StepStats:
+    """Outcome of every run of one recording step"""
+
+    def __init__(self, recording: Recording, index: int):
+        self.recording = recording
+        self.index = index
+        self.step = recording.steps[index]
+        self.seconds: List[float] = []
+        self.failures = 0
+        self.resolved_by: Dict[str, int] = {}
+        self.errors: List[str] = []
+
+    def record(self, seconds: float, chain: Optional[Chain], error: Optional[str] = None):
+        self.seconds.append(seconds)
+        if error:
+            self.failures += 1
+            if error not in self.errors:
+                self.errors.append(error)
+        if chain is not None:
+            label = format_chain(chain)
+            self.resolved_by[label] = self.resolved_by.get(label, 0) + 1
+
+    def to_dict(self) -> Dict:
+        runs = len(self.seconds)
+        primary = format_chain(self.step.selectors[0]) if self.step.selectors else None
+        return {
+            'index': self.index,
+            'node': self.recording.node_ids[self.index],
+            'step': self.step.describe(),
+            'runs': runs,
+            'failures': self.failures,
+            'mean_seconds': round(sum(self.seconds) / runs, 6) if runs else None,
+            'max_seconds': round(max(self.seconds), 6) if runs else None,
+            'resolved_by': self.resolved_by,
+            'used_fallback': any(label != primary for label in self.resolved_by),
+            'flaky': 0 < self.failures < runs or len(self.resolved_by) > 1,
+            'errors': self.errors
+        }
+
+
+# ---------------------------------------------------------------------------
+# Dry run
+# ---------------------------------------------------------------------------
+
+def dry_run_step(step: Step, snapshots: List[DomSnapshot]) -> Tuple[Optional[Chain], Optional[str]]:
+    """Check one step against the snapshots; returns (resolving chain, error)"""
+    if step.type == 'navigate':
+        if step.expected_title and snapshots and all(s.title != step.expected_title for s in snapshots):
+            return None, f"no snapshot titled '{step.expected_title}'"
+        return None, None
+    if not step.selectors:
+        return None, None
+
+    for chain in step.selectors:
+        for snapshot in snapshots:
+            try:
+                matches = snapshot.resolve(chain)
+            except ValueError as e:
+                return None, str(e)
+            if matches:
+                return chain, None
+    return None, "no selector fallback matches any snapshot"
+
+
+def dry_run(recordings: List[Recording], snapshots: List[DomSnapshot]) -> List[List[StepStats]]:
+    results = []
+    for recording in recordings:
+        stats = [StepStats(recording, i) for i in range(len(recording.steps))]
+        for step_stats in stats:
+            start = time.perf_counter()
+            chain, error = dry_run_step(step_stats.step, snapshots)
+            step_stats.record(time.perf_counter() - start, chain, error)
+        results.append(stats)
+    return results
+
+
+# ---------------------------------------------------------------------------
+# Live replay
+# ---------------------------------------------------------------------------
+
+def chain_locator(kind: str, value: str) -> Tuple[str, str]:
+    """Selenium locator for one selector part"""
+    if kind == 'css':
+        return By.CSS_SELECTOR, value
+    if kind == 'xpath':
+        return By.XPATH, value
+    literal = json.dumps(value) if "'" in value else f"'{value}'"
+    if kind == 'aria':
+        return By.XPATH, (f"//*[@aria-label={literal} or ((self::button or self::a or @role) "
+                          f"and normalize-space(.)={literal})]")
+    # text/: innermost element containing the text
+    return By.XPATH, f"//*[contains(., {literal}) and not(*[contains(., {literal})])]"
+
+
+class LiveReplayer:
+    """Replays recordings through one Chrome session"""
+
+    def __init__(self, headless: bool = False, base_url: Optional[str] = None,
+                 snapshot_dir: Optional[Path] = None):
+        if webdriver is None:
+            raise ImportError("selenium is required for live replay (pip install selenium)")
+        options = webdriver.ChromeOptions()
+        if headless:
+            options.add_argument('--headless=new')
+            options.add_argument('--disable-gpu')
+        self.driver = webdriver.Chrome(options=options)
+        self.driver.implicitly_wait(0)
+        self.wait = WebDriverWait(self.driver, STEP_TIMEOUT, poll_frequency=POLL_FREQUENCY)
+        self.base_url = base_url
+        self.snapshot_dir = snapshot_dir
+
+    def close(self):
+        self.driver.quit()
+
+    def reset(self):
+        """Start each recording from a clean app state without a new browser"""
+        if self.driver.current_url.startswith('http'):
+            self.driver.delete_all_cookies()
+            self.driver.execute_script('window.localStorage.clear(); window.sessionStorage.clear();')
+
+    def find(self, chain: Chain):
+        """First element the chain resolves to, or None"""
+        scope = self.driver
+        for kind, value in chain:
+            found = scope.find_elements(*chain_locator(kind, value))
+            if not found:
+                return None
+            scope = found[0]
+        return scope
+
+    def run_step(self, step: Step) -> Optional[Chain]:
+        """Execute one step; returns the selector chain used, raises on failure"""
+        if step.type == 'setViewport':
+            self.driver.set_window_size(*step.viewport)
+            return None
+        if step.type == 'navigate':
+            url = step.url
+            if self.base_url:
+                # Keep the recorded path, swap the origin
+                base = urlsplit(self.base_url)
+                url = urlunsplit(urlsplit(url)._replace(scheme=base.scheme, netloc=base.netloc))
+            self.driver.get(url)
+            self.wait.until(lambda d: d.execute_script('return document.readyState') == 'complete')
+            if step.expected_title and self.driver.title != step.expected_title:
+                raise AssertionError(f"title '{self.driver.title}' != '{step.expected_title}'")
+            return None
+        if step.type != 'click':
+            raise NotImplementedError(f"step type '{step.type}' is not supported")
+
+        def any_fallback(driver):
+            for chain in step.selectors:
+                element = self.find(chain)
+                if element is not None and element.is_displayed() and element.is_enabled():
+                    return chain, element
+            return False
+
+        chain, element = self.wait.until(any_fallback, message="no selector fallback became clickable")
+        # Recorder offsets are from the element's top-left, Selenium's from its center
+        size = element.size
+        ActionChains(self.driver).move_to_element_with_offset(
+            element, step.offset[0] - size['width'] / 2, step.offset[1] - size['height'] / 2
+        ).click().perform()
+        return chain
+
+    def save_snapshot(self, recording: Recording, index: int):
+        if self.snapshot_dir is None:
+            return
+        self.snapshot_dir.mkdir(parents=True, exist_ok=True)
+        path = self.snapshot_dir / f"{Path(recording.path).stem}.step{index:02d}.html"
+        path.write_text(self.driver.page_source, encoding='utf-8')
+
+    def replay(self, recordings: List[Recording], repeat: int = 1) -> List[List[StepStats]]:
+        results = [[StepStats(r, i) for i in range(len(r.steps))] for r in recordings]
+        for run in range(repeat):
+            for recording, stats in zip(recordings, results):
+                self.reset()
+                for i, step_stats in enumerate(stats):
+                    if step_stats.step.type == 'click' and run == 0:
+                        self.save_snapshot(recording, i)
+                    start = time.perf_counter()
+                    try:
+                        chain = self.run_step(step_stats.step)
+                        step_stats.record(time.perf_counter() - start, chain)
+                    except (WebDriverException, AssertionError, NotImplementedError) as e:
+                        message = str(e).splitlines()[0] if str(e) else type(e).__name__
+                        step_stats.record(time.perf_counter() - start, None, message)
+                        # Later steps depend on this one; count them as not run
+                        break
+        return results
+
+
+# ---------------------------------------------------------------------------
+# Report
+# ---------------------------------------------------------------------------
+
+def build_report(mode: str, graph: StepGraph, results: List[List[StepStats]], seconds: float) -> Dict:
+    recordings = []
+    for stats in results:
+        steps = [s.to_dict() for s in stats]
+        recording = stats[0].recording if stats else None
+        recordings.append({
+            'title': recording.title if recording else '',
+            'path': recording.path if recording else '',
+            'passed': all(s['failures'] == 0 and s['runs'] for s in steps),
+            'steps': steps
+        })
+    all_steps = [s for r in recordings for s in r['steps']]
+    return {
+        'mode': mode,
+        'seconds': round(seconds, 4),
+        'graph': graph.summary(),
+        'summary': {
+            'recordings': len(recordings),
+            'recordings_passed': sum(1 for r in recordings if r['passed']),
+            'steps_failed': sum(1 for s in all_steps if s['failures']),
+            'steps_not_run': sum(1 for s in all_steps if not s['runs']),
+            'steps_flaky': sum(1 for s in all_steps if s['flaky']),
+            'steps_using_fallback': sum(1 for s in all_steps if s['used_fallback'])
+        },
+        'recordings': recordings
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Replay Chrome Recorder JSON recordings')
+    parser.add_argument('recordings', nargs='*', help='Recording JSON files (default: Recording/*.json)')
+    parser.add_argument('--dry-run', action='store_true', help='Check selectors against DOM snapshots only')
+    parser.add_argument('--snapshot', action='append', default=[],
+                        help='Saved HTML page for --dry-run (repeatable)')
+    parser.add_argument('--repeat', type=int, default=1, help='Live runs per recording, for flakiness stats')
+    parser.add_argument('--headless', action='store_true')
+    parser.add_argument('--base-url', help='Replace the recorded origin, e.g. http://localhost:3001')
+    parser.add_argument('--save-snapshots', type=Path,
+                        help='Directory to save the page before each click (live mode, first run)')
+    parser.add_argument('--report', default='test-results/recorder-replay.json')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    paths = [Path(p) for p in args.recordings] or sorted(RECORDING_DIR.glob('*.json'))
+
+    print("=" * 80)
+    print(f"CHROME RECORDER REPLAY ({'DRY RUN' if args.dry_run else 'LIVE'})")
+    print("=" * 80)
+
+    recordings = [load_recording(p) for p in paths]
+    graph = StepGraph(recordings)
+    summary = graph.summary()
+    print(f"{summary['recordings']} recordings, {summary['steps']} steps, "
+          f"{summary['unique_steps']} unique ({summary['shared_steps']} shared), "
+          f"{summary['selector_chains']} selector chains after dedupe")
+
+    start = time.perf_counter()
+    if args.dry_run:
+        if not args.snapshot:
+            print("--dry-run needs at least one --snapshot")
+            return 2
+        snapshots = [load_snapshot(p) for p in args.snapshot]
+        results = dry_run(recordings, snapshots)
+    else:
+        replayer = LiveReplayer(args.headless, args.base_url, args.save_snapshots)
+        try:
+            results = replayer.replay(recordings, args.repeat)
+        finally:
+            replayer.close()
+    report = build_report('dry-run' if args.dry_run else 'live', graph, results, time.perf_counter() - start)
+
+    for recording in report['recordings']:
+        print(f"\n{'[OK]  ' if recording['passed'] else '[FAIL]'} {recording['title']}")
+        for step in recording['steps']:
+            if step['failures'] or step['flaky'] or step['used_fallback'] or not step['runs']:
+                status = 'not run' if not step['runs'] else f"{step['failures']}/{step['runs']} failed"
+                notes = ', '.join(filter(None, ['flaky' if step['flaky'] else '',
+                                                'fallback' if step['used_fallback'] else '']))
+                print(f"  #{step['index']} {step['step'][:70]}: {status}{' (' + notes + ')' if notes else ''}")
+                for error in step['errors'][:2]:
+                    print(f"      - {error[:100]}")
+
+    Path(args.report).parent.mkdir(parents=True, exist_ok=True)
+    with open(args.report, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+
+    totals = report['summary']
+    print()
+    print(f"Recordings passed: {totals['recordings_passed']}/{totals['recordings']}, "
+          f"failed steps: {totals['steps_failed']}, flaky: {totals['steps_flaky']}, "
+          f"fallbacks: {totals['steps_using_fallback']}")
+    print(f"Report saved to: {args.report}")
+    return 0 if totals['recordings_passed'] == totals['recordings'] else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+Constructive Side-Pot Scenario Planner
+Solve for stacks and bet sizes that produce a requested pot structure
+
+Side pots used to come from randomizing stacks and hoping the all-ins
+landed: most "side pot" cases had none, and the tighter the request the
+less likely a random deal met it. The planner works backwards from a
+target instead:
+
+- side_pots: how many side pots the hand must end with
+- allin_streets: the street each all-in level happens on (shortest first)
+- shape: how many players go all-in together at each level, which sets
+  the eligible players of each pot (a level of 2 drops two players at once)
+
+It picks which seats are short, gives every short seat a stack inside the
+window of the street it must go all-in on, and sizes each street's bet so
+the windows line up with the complexity's stack range. Two covering seats
+stay deep enough to call everything, so each all-in level becomes its own
+pot: the first postflop actor, who makes every bet, and the preflop
+opener, so a short stack never sets the raise. With one covering seat the
+top level is uncalled instead, giving an all-in with no side pot
+(heads-up).
+
+The betting script it solves for is the generators': preflop raise to
+street_bets['Preflop'] (or limp at 1 BB), each later betting street a bet
+by the first actor that everyone still in calls, all-in when short. Every
+plan meets its target by construction, so nothing is retried.
+
+Usage:
+    plan = plan_scenario(ScenarioTarget(side_pots=2, allin_streets=('Flop', 'Turn')),
+                         positions, 'Complex', bb, ante)
+    plan.stacks, plan.street_bets, plan.allin_street
+
+python scenario_planner.py [--cases N]   # plan, generate and check N cases
+"""
+import argparse
+import math
+import random
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from action_order import first_to_act
+
+STREETS = ('Preflop', 'Flop', 'Turn', 'River')
+
+# Default street sizes in BB: preflop raise-to, then the bet on each street
+DEFAULT_BETS_BB = {'Preflop': 3, 'Flop': 5, 'Turn': 10, 'River': 10}
+
+# Stack range per complexity in BB (see the generation spec)
+STACK_RANGES_BB = {'Simple': (30, 60), 'Medium': (15, 60), 'Complex': (10, 60)}
+
+
+@dataclass(frozen=True)
+class ScenarioTarget:
+    side_pots: int = 1
+    allin_streets: Tuple[str, ...] = ()  # One per all-in level; default: every level on the Turn
+    shape: Tuple[int, ...] = ()  # Players all-in at each level; default: one each
+
+    @property
+    def num_levels(self) -> int:
+        return len(self.allin_streets) or self.side_pots
+
+    def level(self, k: int) -> Tuple[str, int]:
+        """(street, players) of all-in level k, shortest first"""
+        street = self.allin_streets[k] if self.allin_streets else 'Turn'
+        return street, self.shape[k] if k < len(self.shape) else 1
+
+
+@dataclass
+class ScenarioPlan:
+    positions: List[str]
+    stacks: List[int]  # Per seat, in positions order
+    street_bets: Dict[str, int]  # Preflop raise-to, then each street's bet
+    allin_street: Dict[int, str]  # Seat -> street it goes all-in on
+    levels: List[int]  # Live contribution of each all-in level, ascending
+    covering: List[int] = field(default_factory=list)  # Seats that call everything
+
+    def expected_contributions(self, ante: int) -> List[int]:
+        """Total chips each seat puts in if the script is followed (ante included)"""
+        committed = sum(self.street_bets.values())
+        contributions = []
+        for seat, position in enumerate(self.positions):
+            dead = ante if position == 'BB' else 0
+            live = self.stacks[seat] - dead if seat in self.allin_street else committed
+            contributions.append(live + dead)
+        return contributions
+
+
+def covering_seats(positions: Sequence[str], count: int) -> List[int]:
+    """The first postflop actor (who makes every bet), then the preflop opener (who sets the raise)"""
+    seats = [positions.index(first_to_act(positions, 'Flop'))]
+    if count > 1:
+        seats.append(positions.index(first_to_act(positions, 'Preflop')))
+    return seats
+
+
+def check_target(target: ScenarioTarget, num_players: int, betting_streets: Sequence[str],
+                 limp_preflop: bool) -> int:
+    """Raise ValueError if the target cannot be built; returns the number of covering seats"""
+    levels = target.num_levels
+    if target.side_pots not in (levels, levels - 1) or target.side_pots < 0:
+        raise ValueError(f"{levels} all-in levels make {levels} side pots (or {levels - 1} "
+                         f"when the top one is uncalled), not {target.side_pots}")
+    covering = 2 if target.side_pots == levels else 1
+    shorts = sum(target.level(k)[1] for k in range(levels))
+    if shorts + covering > num_players:
+        raise ValueError(f"{target.side_pots} side pots over {levels} all-in levels need "
+                         f"{shorts + covering} players, not {num_players}")
+    streets = [target.level(k)[0] for k in range(levels)]
+    for street in streets:
+        if street not in betting_streets:
+            raise ValueError(f"No betting on {street}; all-ins can happen on {', '.join(betting_streets)}")
+        if street == 'Preflop' and limp_preflop:
+            raise ValueError("A limped preflop (1 BB) cannot put a 10+ BB stack all-in")
+    if streets != sorted(streets, key=STREETS.index):
+        raise ValueError(f"All-in streets must run shortest level first: {', '.join(streets)}")
+    return covering
+
+
+def plan_scenario(target: ScenarioTarget, positions: Sequence[str], complexity: str, bb: int, ante: int,
+                  betting_streets: Sequence[str] = ('Preflop', 'Flop', 'Turn'), limp_preflop: bool = False,
+                  rng=random) -> ScenarioPlan:
+    """Stacks and bet sizes (in chips) whose all-ins produce exactly target's pots"""
+    positions = list(positions)
+    num_players = len(positions)
+    covering = covering_seats(positions, check_target(target, num_players, betting_streets, limp_preflop))
+
+    # Short seats: preflop all-ins must not be the preflop opener (the raise sets the price)
+    candidates = [s for s in range(num_players) if s not in covering]
+    rng.shuffle(candidates)
+    opener = positions.index(first_to_act(positions, 'Preflop'))
+    level_seats: List[List[int]] = []
+    for k in range(target.num_levels):
+        street, size = target.level(k)
+        pool = [s for s in candidates if not (street == 'Preflop' and s == opener)]
+        if len(pool) < size:
+            raise ValueError(f"Not enough seats for {size} preflop all-in(s) besides the opener")
+        seats = pool[:size]
+        level_seats.append(seats)
+        candidates = [s for s in candidates if s not in seats]
+
+    # Walk the streets: each all-in level gets a stack inside its street's window,
+    # and the street's size is set just above the window's last stack
+    lo, hi = STACK_RANGES_BB[complexity]
+    stacks_bb: Dict[int, int] = {}
+    allin_street: Dict[int, str] = {}
+    levels_bb: List[int] = []
+    street_bets_bb: Dict[str, int] = {}
+    committed = 0
+    k = 0
+    for street in STREETS:
+        if street not in betting_streets:
+            continue
+        if street == 'Preflop' and limp_preflop:
+            street_bets_bb[street] = committed = 1  # Everyone limps for the big blind
+            continue
+        # Smallest stack that is still live after the previous streets
+        floor = max(lo, committed + 1)
+        level = None
+        while k < target.num_levels and target.level(k)[0] == street:
+            level = floor + rng.randint(0, 2) if level is None else level + rng.randint(1, 3)
+            levels_bb.append(level)
+            for seat in level_seats[k]:
+                stacks_bb[seat] = level
+                allin_street[seat] = street
+            k += 1
+        new_committed = committed + DEFAULT_BETS_BB[street] if level is None else level + rng.randint(1, 3)
+        street_bets_bb[street] = new_committed if street == 'Preflop' else new_committed - committed
+        committed = new_committed
+
+    # Everyone else covers the whole script; the BB also pays the dead ante
+    deep_lo = committed + 1 + math.ceil(ante / bb)
+    deep_hi = max(hi, deep_lo + 10)
+    for seat in range(num_players):
+        if seat not in stacks_bb:
+            stacks_bb[seat] = rng.randint(deep_lo, deep_hi)
+
+    return ScenarioPlan(
+        positions=positions,
+        # A short BB's ante is dead money on top of its all-in level
+        stacks=[stacks_bb[s] * bb + (ante if s in allin_street and positions[s] == 'BB' else 0)
+                for s in range(num_players)],
+        street_bets={street: size * bb for street, size in street_bets_bb.items()},
+        allin_street=allin_street,
+        levels=[level * bb for level in levels_bb],
+        covering=covering,
+    )
+
+
+def default_target(num_players: int, limp_preflop: bool = False, rng=random) -> Optional[ScenarioTarget]:
+    """1-2 side pots on randomly chosen streets; None when there are too few players for one"""
+    if num_players < 3:
+        return None
+    side_pots = rng.randint(1, min(2, num_players - 2))
+    streets = ['Flop', 'Turn'] if limp_preflop else ['Preflop', 'Flop', 'Turn']
+    allin_streets = sorted((rng.choice(streets) for _ in range(side_pots)), key=STREETS.index)
+    return ScenarioTarget(side_pots, tuple(allin_streets))
+
+
+def random_target(num_players: int, limp_preflop: bool = False, rng=random) -> ScenarioTarget:
+    """Any buildable target for num_players, for the self-check"""
+    shape = []
+    while sum(shape) + 2 < num_players and (not shape or rng.random() < 0.6):
+        shape.append(min(rng.choice((1, 1, 1, 2)), num_players - 2 - sum(shape)))
+    streets = ('Flop', 'Turn') if limp_preflop else ('Preflop', 'Flop', 'Turn')
+    streets = sorted((rng.choice(streets) for _ in shape), key=STREETS.index)
+    return ScenarioTarget(len(shape), tuple(streets), tuple(shape))
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Plan side-pot scenarios and check the generated hands')
+    parser.add_argument('--cases', type=int, default=2000, help='Cases to plan and check (default: 2000)')
+    parser.add_argument('--seed', type=int, default=42)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    from generate_30_progressive import TestCaseGenerator
+
+    args = parse_args(argv)
+    print("=" * 80)
+    print(f"SCENARIO PLANNER CHECK: {args.cases:,} planned cases")
+    print("=" * 80)
+
+    rng = random.Random(args.seed)
+    failures = []
+    start = time.perf_counter()
+    for tc_num in range(1, args.cases + 1):
+        num_players = rng.randint(3, 9)
+        complexity = rng.choice(('Simple', 'Medium', 'Complex'))
+        target = random_target(num_players, complexity == 'Simple', rng)
+        random.seed(rng.getrandbits(64))
+        generator = TestCaseGenerator(tc_num, num_players, complexity, require_side_pot=True, scenario=target)
+        try:
+            generator.generate()
+        except Exception as e:  # Ledger violations raise
+            failures.append(f"TC-{tc_num} {num_players}P {target}: {e}")
+            continue
+        pots = generator.calculate_pot_and_results()['pots']
+        contributions = [p.total_contribution for p in generator.players]
+        expected = generator.plan.expected_contributions(generator.ante)
+        if len(pots) != target.side_pots + 1 or contributions != expected:
+            failures.append(f"TC-{tc_num} {num_players}P {target}: {len(pots)} pots, "
+                            f"contributions {contributions} vs planned {expected}")
+    seconds = time.perf_counter() - start
+
+    for failure in failures[:10]:
+        print(f"  x {failure}")
+    print(f"\n{args.cases - len(failures):,}/{args.cases:,} cases match their target "
+          f"({args.cases / seconds:,.0f} cases/sec, no retries)")
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
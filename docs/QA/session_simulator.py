@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+"""
+Multi-Hand Tournament Session Simulator
+Chain hands at a table until one player holds every chip
+
+Each test case is one hand with a Next Hand Preview. A session plays the
+preview: every hand after the first is dealt from the previous hand's
+rotate_button_for_next_hand(), so the button moves and stacks carry over
+exactly as the app's next-hand generation should compute them. Players
+whose stack reaches 0 leave before the next deal (the preview still lists
+them, as the spec requires) and the table re-seats short-handed, down to
+heads-up. Blinds rise on a BlindSchedule (blind_schedule.py): a level
+table (--levels) walked on a hand clock (--hands-per-level) or a time
+clock (--minutes-per-level at --hands-per-hour).
+
+Hand script (the generators', plus preflop folds so sessions last):
+- Blinds and the BB ante are capped at the poster's stack (the BB posts
+  the ante first); a short blind is all-in before the cards are dealt
+- Preflop: each player enters with probability 1 - --fold-rate; the first
+  entrant raises to 3 BB, later entrants call, the rest fold. A player with
+  nothing to call checks: if nobody raises, the BB checks and takes the
+  blinds (a short all-in below the big blind is not a raise)
+- Flop and Turn bet and call, River checks, for as long as two players who
+  have not folded still have chips
+- The winner is drawn from the players who did not fold
+
+Only live table state is held in memory: seat names, positions, stacks and
+the hand / level counters. Each hand's HTML goes straight to the table's
+file (ShardWriter) and its stacks to a JSON-lines history, so memory stays
+flat however long a session runs. Tables are independent and seeded from
+(--seed, table number); batches of tables run in a process pool.
+
+Output per table, in --output-dir:
+    table-0001.html            the hands, in order (table-0001-shard-0001.html, ... with --shard-size)
+    table-0001.stacks.jsonl    one line per hand: level, blinds and each seat's stack before and after
+
+Usage:
+python session_simulator.py --tables 2000 --players 9 --max-hands 5000 --output-dir sessions
+python session_simulator.py --tables 1 --players 6 --hands-per-level 10 --output-dir sessions
+python session_simulator.py --tables 500 --levels turbo --minutes-per-level 15 --hands-per-hour 30
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from action_order import SEAT_POSITIONS
+from blind_schedule import DEFAULT_HANDS_PER_HOUR, BlindLevel, BlindSchedule
+from chip_ledger import ChipLedger
+from fragment_cache import case_seed
+from generate_30_progressive import (
+    BlindStructure, TestCaseGenerator, generate_html_footer, generate_html_header
+)
+from hand_state import Action, ActionType, Player
+from shard_writer import ShardWriter
+
+MASTER_SEED = 42
+
+# Complexity label on every session hand (blinds come from the level, not the label)
+SESSION_COMPLEXITY = "Session"
+
+
+class SessionHandGenerator(TestCaseGenerator):
+    """One hand of a session, dealt from the seats the previous hand left"""
+
+    def __init__(self, tc_num: int, seats: List[Dict], level: BlindLevel, fold_rate: float):
+        super().__init__(tc_num, len(seats), SESSION_COMPLEXITY, go_to_river=True)
+        self.seats = seats
+        self.level = level
+        self.sb = level.sb
+        self.bb = level.bb
+        self.ante = level.ante
+        self.street_bets = {"Preflop": self.bb * 3, "Flop": self.bb * 5, "Turn": self.bb * 10}
+        self.fold_rate = fold_rate
+
+    def create_players(self) -> List[Player]:
+        """Players carried over from the previous hand"""
+        return [Player(seat["name"], seat["position"], seat["stack"]) for seat in self.seats]
+
+    def post_blinds_antes(self):
+        """Post blinds and the BB ante, each capped at the poster's stack (BB ante first)"""
+        self.ledger = ChipLedger(self.players, self.tc_num)
+        self.ledger.begin_street("Preflop")
+        for player in self.players:
+            if player.position == "BB":
+                player.ante_posted, player.blind_posted = self.level.bb_posts(player.current_stack)
+                self.ledger.post(player, player.ante_posted, "Ante", live=False)
+                self.ledger.post(player, player.blind_posted, "Big Blind")
+            elif player.position == "SB":
+                player.blind_posted = min(self.sb, player.current_stack)
+                self.ledger.post(player, player.blind_posted, "Small Blind")
+            else:
+                continue
+            if player.current_stack == 0:
+                player.all_in_street = "Preflop"
+
+    def generate_preflop_with_folds(self):
+        """First entrant raises, later entrants call, the rest fold; the BB checks if nobody raised"""
+        actions = []
+        self.ledger.begin_street("Preflop")
+        raise_to = self.street_bets["Preflop"]
+        price = self.bb  # Live chips it takes to stay in
+        raised = False
+
+        for player in self.get_preflop_action_order(self.players):
+            if player.current_stack == 0:
+                # All-in from the blinds: no decision left to make
+                actions.append(Action(player.name, player.position, ActionType.ALL_IN, player.blind_posted))
+                continue
+            if player.street_contribution >= price:
+                # Nothing to call (the BB when nobody raised): check, never fold
+                actions.append(Action(player.name, player.position, ActionType.CHECK))
+                continue
+            if random.random() < self.fold_rate:
+                player.folded = True
+                actions.append(Action(player.name, player.position, ActionType.FOLD))
+                continue
+
+            target = price if raised else max(raise_to, price)
+            amount_to_add = min(target - player.street_contribution, player.current_stack)
+            total = player.street_contribution + amount_to_add
+            if amount_to_add == player.current_stack:
+                action_type = ActionType.ALL_IN
+                player.all_in_street = "Preflop"
+            else:
+                action_type = ActionType.CALL if raised else ActionType.RAISE
+            actions.append(Action(player.name, player.position, action_type, total))
+            self.ledger.post(player, amount_to_add, action_type.value)
+            # An all-in for less than the big blind is not a raise
+            raised = raised or total > price
+            price = max(price, total)
+
+        self.actions["Preflop Base"] = actions
+
+    def can_bet(self) -> bool:
+        """Two players who have not folded still have chips behind"""
+        return sum(1 for p in self.players if not p.folded and not p.all_in_street) >= 2
+
+    def play(self) -> str:
+        """Play the hand and return its HTML"""
+        self.players = self.create_players()
+        self.post_blinds_antes()
+        self.generate_preflop_with_folds()
+        for street in (self.generate_flop_with_bet_call, self.generate_turn_with_bet_call,
+                       self.generate_river_with_check):
+            if not self.can_bet():
+                break
+            street()
+
+        contenders = [i for i, p in enumerate(self.players) if not p.folded]
+        self.winner_idx = random.choice(contenders)
+        return self.generate_html()
+
+
+def next_seats(rotated: List[Dict]) -> List[Dict]:
+    """The next deal: rotate_button_for_next_hand() minus busted players, re-seated from the button"""
+    survivors = [seat for seat in rotated if seat["stack"] > 0]
+    if len(survivors) < 2:
+        return survivors  # The tournament is over
+    positions = SEAT_POSITIONS[len(survivors)]
+    return [{"name": seat["name"], "position": position, "stack": seat["stack"]}
+            for seat, position in zip(survivors, positions)]
+
+
+def session_schedule(args) -> BlindSchedule:
+    return BlindStructure.schedule(args.levels, hands_per_level=args.hands_per_level,
+                                   minutes_per_level=args.minutes_per_level,
+                                   hands_per_hour=args.hands_per_hour, start_level=args.start_level)
+
+
+@dataclass
+class SessionStats:
+    tables: int = 0
+    hands: int = 0
+    busts: int = 0
+    finished: int = 0  # Tables played down to one player
+    longest: int = 0
+    seconds: float = 0.0
+    failures: List[str] = field(default_factory=list)
+
+    def merge(self, other: 'SessionStats'):
+        self.tables += other.tables
+        self.hands += other.hands
+        self.busts += other.busts
+        self.finished += other.finished
+        self.longest = max(self.longest, other.longest)
+        self.seconds += other.seconds
+        self.failures.extend(other.failures)
+
+
+def table_path(output_dir: Path, table: int, suffix: str) -> Path:
+    return output_dir / f"table-{table:04d}{suffix}"
+
+
+def play_table(table: int, args, schedule: BlindSchedule, header: str, footer: str) -> SessionStats:
+    """Play one session to the last player standing (or --max-hands), streaming every hand"""
+    stats = SessionStats(tables=1)
+    random.seed(case_seed(args.seed, table))
+
+    output_dir = Path(args.output_dir)
+    stack = schedule.levels[0].bb * args.starting_bb
+    seats = [{"name": name, "position": position, "stack": stack}
+             for name, position in zip(TestCaseGenerator.PLAYER_NAMES, SEAT_POSITIONS[args.players])]
+    chips = stack * args.players
+
+    history_path = table_path(output_dir, table, ".stacks.jsonl")
+    tmp_history = history_path.with_name(f'.{history_path.name}.{os.getpid()}.tmp')
+    with ShardWriter(table_path(output_dir, table, ".html"), header, footer, args.shard_size) as writer, \
+            open(tmp_history, 'w', encoding='utf-8') as history:
+        hand = 0
+        while len(seats) > 1 and hand < args.max_hands:
+            hand += 1
+            level = schedule.level(hand)
+            generator = SessionHandGenerator(hand, seats, level, args.fold_rate)
+            try:
+                html = generator.play()
+                rotated = generator.rotate_button_for_next_hand()
+            except Exception as e:
+                stats.failures.append(f"table {table} hand {hand}: {e}")
+                break
+            writer.write_case(hand, html, len(seats), SESSION_COMPLEXITY)
+
+            after = {seat["name"]: seat["stack"] for seat in rotated}
+            history.write(json.dumps({
+                "hand": hand, "level": level.number, "sb": level.sb, "bb": level.bb, "ante": level.ante,
+                "seats": [[seat["name"], seat["position"], seat["stack"], after[seat["name"]]] for seat in seats],
+            }) + "\n")
+
+            if sum(after.values()) != chips or min(after.values()) < 0:
+                stats.failures.append(f"table {table} hand {hand}: stacks {after} do not hold {chips:,} chips")
+                break
+            seats = next_seats(rotated)
+            stats.busts += len(rotated) - len(seats)
+    os.replace(tmp_history, history_path)
+
+    stats.hands = stats.longest = writer.cases
+    stats.finished = int(len(seats) == 1)
+    return stats
+
+
+def play_tables(lo: int, hi: int, args) -> SessionStats:
+    """Worker entry point: play tables lo..hi-1 one after another"""
+    header = generate_html_header()
+    footer = generate_html_footer()
+    schedule = session_schedule(args)
+    stats = SessionStats()
+    start = time.perf_counter()
+    for table in range(lo, hi):
+        stats.merge(play_table(table, args, schedule, header, footer))
+    stats.seconds = time.perf_counter() - start
+    return stats
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Simulate multi-hand tournament sessions, one file per table')
+    parser.add_argument('--tables', type=int, default=1, help='Independent tables to play (default: 1)')
+    parser.add_argument('--players', type=int, default=9, choices=range(2, 10), help='Players per table (default: 9)')
+    parser.add_argument('--max-hands', type=int, default=10000,
+                        help='Stop a table after this many hands even if it is not down to one player')
+    parser.add_argument('--starting-bb', type=int, default=100, help='Starting stack in big blinds (default: 100)')
+    parser.add_argument('--levels', default='standard', choices=BlindStructure.SCHEDULES,
+                        help='Blind level table (default: standard)')
+    parser.add_argument('--start-level', type=int, default=0,
+                        help='Levels of the table to skip before the first hand (default: 0)')
+    clock = parser.add_mutually_exclusive_group()
+    clock.add_argument('--hands-per-level', type=int, help='Hands between blind increases (default: 50)')
+    clock.add_argument('--minutes-per-level', type=int, help='Minutes between blind increases, at --hands-per-hour')
+    parser.add_argument('--hands-per-hour', type=int, default=DEFAULT_HANDS_PER_HOUR,
+                        help=f'Pace of play for the time clock (default: {DEFAULT_HANDS_PER_HOUR})')
+    parser.add_argument('--fold-rate', type=float, default=0.75,
+                        help='Chance each player folds preflop instead of entering (default: 0.75)')
+    parser.add_argument('--shard-size', type=int, default=0, help="Rotate each table's file every N hands")
+    parser.add_argument('--output-dir', default='sessions')
+    parser.add_argument('--workers', type=int, default=0, help='Worker processes (default: one per CPU)')
+    parser.add_argument('--chunk', type=int, default=10, help='Tables per worker task (default: 10)')
+    parser.add_argument('--seed', type=int, default=MASTER_SEED)
+    args = parser.parse_args(argv)
+    if args.hands_per_level is None and args.minutes_per_level is None:
+        args.hands_per_level = 50
+    try:
+        session_schedule(args)
+    except ValueError as e:
+        parser.error(str(e))
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    Path(args.output_dir).mkdir(parents=True, exist_ok=True)
+    workers = args.workers or os.cpu_count() or 1
+
+    print("=" * 80)
+    print(f"TOURNAMENT SESSIONS: {args.tables:,} tables of {args.players} players, {workers} workers")
+    print("=" * 80)
+
+    ranges = [(lo, min(lo + args.chunk, args.tables + 1)) for lo in range(1, args.tables + 1, args.chunk)]
+    stats = SessionStats()
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(play_tables, lo, hi, args) for lo, hi in ranges]
+        for done, future in enumerate(as_completed(futures), 1):
+            stats.merge(future.result())
+            if done % max(1, len(futures) // 10) == 0 or done == len(futures):
+                elapsed = time.perf_counter() - start
+                print(f"  {stats.tables:,}/{args.tables:,} tables, {stats.hands:,} hands, "
+                      f"{stats.hands / elapsed:,.0f} hands/sec")
+    wall = time.perf_counter() - start
+
+    print()
+    print("| Tables | Hands | Mean hands/table | Longest | Busts | Down to one player |")
+    print("|--------|-------|------------------|---------|-------|--------------------|")
+    print(f"| {stats.tables:,} | {stats.hands:,} | {stats.hands / max(stats.tables, 1):,.0f} | "
+          f"{stats.longest:,} | {stats.busts:,} | {stats.finished:,} |")
+    print(f"\n{stats.hands:,} hands in {wall:.1f}s ({stats.hands / wall:,.0f} hands/sec); output in {args.output_dir}")
+
+    if stats.failures:
+        print(f"\nx {len(stats.failures)} table(s) stopped early:")
+        for failure in stats.failures[:10]:
+            print(f"  - {failure}")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
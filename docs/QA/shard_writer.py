@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Streaming output for generated test cases, optionally split into shard files
+
+Generators hand each case to ShardWriter.write_case the moment it is
+rendered; nothing but the current case is kept in memory. With a shard
+size, the output rotates to a new file every N cases:
+
+    30_base_validated_cases.html -> 30_base_validated_cases-shard-0001.html,
+                                    30_base_validated_cases-shard-0002.html, ...
+
+Every file gets the full header and footer, so each shard opens on its own
+in the app. Each file is written to a temp file and swapped in when it is
+complete, so an interrupted soak run never leaves a truncated shard behind.
+The Shard records carry what an index page needs (case range and player /
+complexity counts).
+
+Usage:
+    with ShardWriter(output_path, header, footer, shard_size=1000) as writer:
+        for tc_num, html in cases:
+            writer.write_case(tc_num, html, num_players=..., complexity=...)
+    shards = writer.shards
+"""
+import os
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import IO, List, Optional
+
+
+@dataclass
+class Shard:
+    number: int
+    path: Path
+    first_tc: Optional[int] = None
+    last_tc: Optional[int] = None
+    cases: int = 0
+    size: int = 0
+    players: Counter = field(default_factory=Counter)
+    complexity: Counter = field(default_factory=Counter)
+
+
+class ShardWriter:
+    """Write cases to output_path, or to numbered shards of shard_size cases each"""
+
+    def __init__(self, output_path, header: str, footer: str, shard_size: int = 0):
+        self.output_path = Path(output_path)
+        self.header = header
+        self.footer = footer
+        self.shard_size = shard_size
+        self.shards: List[Shard] = []
+        self._current: Optional[Shard] = None
+        self._file: Optional[IO[str]] = None
+        self._tmp_path: Optional[Path] = None
+
+    @property
+    def sharded(self) -> bool:
+        return self.shard_size > 0
+
+    @property
+    def cases(self) -> int:
+        return sum(shard.cases for shard in self.shards)
+
+    def shard_path(self, number: int) -> Path:
+        if not self.sharded:
+            return self.output_path
+        return self.output_path.with_name(f"{self.output_path.stem}-shard-{number:04d}{self.output_path.suffix}")
+
+    def index_path(self) -> Path:
+        return self.output_path.with_name(f"{self.output_path.stem}-index{self.output_path.suffix}")
+
+    def _open(self):
+        shard = Shard(len(self.shards) + 1, self.shard_path(len(self.shards) + 1))
+        self._tmp_path = shard.path.with_name(f'.{shard.path.name}.{os.getpid()}.tmp')
+        self._file = open(self._tmp_path, 'w', encoding='utf-8')
+        self._file.write(self.header)
+        self._current = shard
+        self.shards.append(shard)
+
+    def _finish(self):
+        self._file.write(self.footer)
+        self._file.close()
+        os.replace(self._tmp_path, self._current.path)
+        self._current.size = self._current.path.stat().st_size
+        self._file = self._tmp_path = self._current = None
+
+    def write_case(self, tc_num: int, html: str, num_players: Optional[int] = None,
+                   complexity: Optional[str] = None):
+        if self._current is None:
+            self._open()
+        shard = self._current
+        self._file.write(html)
+        if shard.first_tc is None:
+            shard.first_tc = tc_num
+        shard.last_tc = tc_num
+        shard.cases += 1
+        if num_players is not None:
+            shard.players[num_players] += 1
+        if complexity is not None:
+            shard.complexity[complexity] += 1
+        if self.sharded and shard.cases >= self.shard_size:
+            self._finish()
+
+    def close(self):
+        if self._current is None and not self.shards:
+            self._open()  # No cases: still write an empty corpus
+        if self._current is not None:
+            self._finish()
+
+    def abort(self):
+        """Drop the shard being written; finished shards stay"""
+        if self._file is not None:
+            self._file.close()
+            self._tmp_path.unlink(missing_ok=True)
+            self.shards.remove(self._current)
+            self._file = self._tmp_path = self._current = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
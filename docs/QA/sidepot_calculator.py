@@ -1,76 +1,43 @@
 """
 Side Pot Calculator Module
 Add this to the generator to enable proper side pot calculations
+
+The pot math itself is pot_oracle's; this module adapts Player objects to it
+and renders the pot HTML.
 """
 
+from pot_oracle import compute_pots, compute_pots_batch, np, pack_seats
+
 def calculate_side_pots(players, bb_ante):
     """
     Calculate main pot and side pots based on all-in amounts
 
     Args:
         players: List of Player objects with total_contribution and all_in_street attributes
+                 (and folded, if they track it)
         bb_ante: BB ante amount (dead money added to main pot)
 
     Returns:
-        dict with 'pots' (list of pot dicts) and 'total_pot'
+        dict with 'pots' (list of pot dicts), 'total_pot' and 'oracle_pots'
+        (the pot_oracle.Pot list, for pot_oracle.distribute)
     """
-    # Find BB player who paid ante
-    bb_player = next((p for p in players if p.position == "BB"), None)
-
-    # Calculate live contributions (excluding ante which is dead money)
-    contributions = []
-    for p in players:
-        live_contrib = p.total_contribution
-        # Compare by name instead of id (Player class doesn't have id attribute)
-        if bb_player and p.name == bb_player.name:
-            live_contrib -= bb_ante  # Ante is dead money, not part of live action
-
-        contributions.append({
-            'player': p,
-            'live': live_contrib,
-            'total': p.total_contribution
-        })
+    # Ante is dead money posted by the BB (the first one, if names repeat)
+    bb_seat = next((s for s, p in enumerate(players) if p.position == "BB"), None)
+    # Folded players fund the pots but cannot win them
+    oracle_pots = compute_pots([p.total_contribution for p in players], bb_ante, bb_seat,
+                               [getattr(p, 'folded', False) for p in players])
 
-    # Sort by live contribution amount
-    contributions.sort(key=lambda x: x['live'])
-
-    # Get unique contribution levels (where players went all-in)
-    unique_levels = sorted(set(c['live'] for c in contributions))
-
-    # Build pots
     pots = []
-    remaining_players = len(contributions)
-    prev_level = 0
-
-    for i, level in enumerate(unique_levels):
-        if remaining_players > 0:
-            # Calculate pot amount: (level difference) × (number of players contributing)
-            pot_amount = (level - prev_level) * remaining_players
-
-            # Add ante to first (main) pot as dead money
-            if i == 0:
-                pot_amount += bb_ante
-
-            # Determine eligible players: those who contributed at least to this level
-            eligible = [c['player'] for c in contributions if c['live'] >= level]
-            eligible_names = [p.name for p in eligible]
-
-            pot_type = 'main' if i == 0 else f'side{i}'
-            pot_name = 'Main Pot' if i == 0 else f'Side Pot {i}'
-
-            pots.append({
-                'type': pot_type,
-                'name': pot_name,
-                'amount': pot_amount,
-                'eligible': eligible,
-                'eligible_names': eligible_names,
-                'level': level
-            })
-
-            # Remove players at this exact level from future pot calculations
-            # (they're all-in and can't contribute more)
-            remaining_players = len([c for c in contributions if c['live'] > level])
-            prev_level = level
+    for pot in oracle_pots:
+        eligible = [players[s] for s in pot.eligible]
+        pots.append({
+            'type': 'main' if pot.index == 0 else f'side{pot.index}',
+            'name': pot.name,
+            'amount': pot.amount,
+            'eligible': eligible,
+            'eligible_names': [p.name for p in eligible],
+            'level': pot.level
+        })
 
     total_pot = sum(p['amount'] for p in pots)
 
@@ -81,10 +48,38 @@ def calculate_side_pots(players, bb_ante):
     return {
         'pots': pots,
         'total_pot': total_pot,
-        'bb_ante': bb_ante
+        'bb_ante': bb_ante,
+        'oracle_pots': oracle_pots
     }
 
 
+def players_to_batch_arrays(hands):
+    """
+    Pack hands of Player objects into padded (hands x seats) arrays
+
+    Args:
+        hands: List of player lists (objects with name, position,
+               total_contribution and optional folded attributes)
+
+    Returns:
+        dict with 'contributions', 'ante_mask', 'folded', 'seated' arrays
+        and 'names' (per-hand list of seat names, unpadded)
+    """
+    if np is None:
+        raise ImportError("numpy is required for batch side pot calculation")
+
+    seats = [(h, p) for h, players in enumerate(hands) for p in players]
+    packed = pack_seats([h for h, _ in seats], [p.total_contribution for _, p in seats],
+                        [p.position == "BB" for _, p in seats], [getattr(p, 'folded', False) for _, p in seats],
+                        len(hands))
+    packed['names'] = [[p.name for p in players] for players in hands]
+    return packed
+
+
+# The vectorized engine lives in the oracle; this name is kept for existing callers
+calculate_side_pots_batch = compute_pots_batch
+
+
 def generate_pot_html(pot_results, players, bb, ante):
     """
     Generate HTML for pot display with side pots
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Test that testcase_stream reads the Next Hand preview in both layouts:
+
+- <div class="next-hand-content"> (40_TestCases.html)
+- <div class="next-hand-preview"> ... <div class="player-data-box"><pre>
+  (10_MoreAction_TC.html), which used to be dropped, so comprehensive_validation
+  reported "No Next Hand Preview found" for TC-41..50
+
+Usage:
+    python test_next_hand_preview.py
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+from testcase_stream import iter_test_cases
+
+QA_DIR = Path(__file__).parent
+FILES = ['10_MoreAction_TC.html', '40_TestCases.html']
+
+
+def check_file(html_file):
+    """Every case's preview is the following hand and lists every player"""
+    errors = []
+    cases = list(iter_test_cases(html_file))
+    for tc in cases:
+        if not tc.next_hand:
+            errors.append(f"{tc.tc_id}: no next hand parsed")
+            continue
+        if tc.next_hand_number != str(tc.tc_num + 1):
+            errors.append(f"{tc.tc_id}: next hand is Hand ({tc.next_hand_number}), expected Hand ({tc.tc_num + 1})")
+        missing = {row.name for row in tc.results} - {entry.name for entry in tc.next_hand}
+        if missing:
+            errors.append(f"{tc.tc_id}: {', '.join(sorted(missing))} missing from the next hand")
+        if tc.stack_setup == tc.next_hand:
+            errors.append(f"{tc.tc_id}: stack setup was read from the next hand preview")
+    return len(cases), errors
+
+
+print("=" * 70)
+print("TESTING NEXT HAND PREVIEW PARSING")
+print("=" * 70)
+print()
+
+failed = False
+for name in FILES:
+    html_file = QA_DIR / name
+    if not html_file.exists():
+        print(f"{name}: not found, skipped")
+        continue
+    total, errors = check_file(html_file)
+    if errors:
+        failed = True
+        print(f"[X] {name}: {len(errors)} problems in {total} cases")
+        for error in errors:
+            print(f"  - {error}")
+    else:
+        print(f"[OK] {name}: next hand parsed for all {total} cases")
+
+print()
+sys.exit(1 if failed else 0)
@@ -0,0 +1,404 @@
+"""
+Streaming Test Case Extractor
+Walks a QA HTML corpus once and yields typed test case records
+
+All validators share this instead of re-reading the file and running their
+own DOTALL regex over it. The file is fed to an HTMLParser in fixed-size
+chunks, and each test case is yielded as soon as its closing </div> is seen,
+so memory stays bounded by the largest single case.
+
+Usage:
+    from testcase_stream import iter_test_cases
+
+    for tc in iter_test_cases('40_TestCases.html'):
+        print(tc.tc_id, tc.total_pot, len(tc.actions))
+"""
+import re
+from collections import deque
+from dataclasses import dataclass, field
+from html import unescape
+from html.parser import HTMLParser
+from typing import Iterator, List, Optional
+
+CHUNK_SIZE = 64 * 1024
+
+VOID_TAGS = {'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link', 'meta', 'source', 'wbr'}
+
+MARKER_PATTERN = re.compile(r'\s*TEST CASE (\d+)\s*')
+BLINDS_PATTERN = re.compile(r'SB ([\d,]+) BB ([\d,]+) Ante ([\d,]+)')
+HAND_PATTERN = re.compile(r'Hand \(([^)]*)\)')
+PLAYER_CELL_PATTERN = re.compile(r'^(\w+) \(([^)]+)\)$')
+NUMBER_PATTERN = re.compile(r'-?[\d,]*\d')
+STREET_PATTERN = re.compile(r'^(Preflop|Flop|Turn|River)\s*(Base|More \d+)?')
+TC_ID_PATTERN = re.compile(r'TC-(\d+)')
+
+
+@dataclass
+class StackEntry:
+    name: str
+    position: str
+    stack: int
+
+
+@dataclass
+class ActionRecord:
+    player: str
+    position: str
+    action: str
+    amount: Optional[int]
+    street: str
+    section: str
+
+
+@dataclass
+class PotRecord:
+    name: str
+    amount: Optional[int]
+    eligible: List[str] = field(default_factory=list)
+
+
+@dataclass
+class ResultRow:
+    name: str
+    position: str
+    starting_stack: int
+    final_stack: int
+    contributed: Optional[int]
+    is_winner: bool
+    new_stack: Optional[int]
+    breakdown: List[str] = field(default_factory=list)
+
+
+@dataclass
+class TestCaseRecord:
+    tc_id: Optional[str] = None
+    tc_num: Optional[int] = None
+    name: Optional[str] = None
+    sb: Optional[int] = None
+    bb: Optional[int] = None
+    ante: Optional[int] = None
+    stack_setup: List[StackEntry] = field(default_factory=list)
+    actions: List[ActionRecord] = field(default_factory=list)
+    total_pot: Optional[int] = None
+    pots: List[PotRecord] = field(default_factory=list)
+    results: List[ResultRow] = field(default_factory=list)
+    next_hand_number: Optional[str] = None
+    next_hand: List[StackEntry] = field(default_factory=list)
+    content: str = ''
+
+    def street_actions(self, street: str, section: Optional[str] = None) -> List[ActionRecord]:
+        """Actions on one street, optionally limited to a section ("Base", "More 1", ...)"""
+        return [a for a in self.actions
+                if a.street == street and (section is None or a.section == section)]
+
+    def result_for(self, name: str) -> Optional[ResultRow]:
+        return next((r for r in self.results if r.name == name), None)
+
+
+def parse_number(text: str) -> Optional[int]:
+    """First integer in a formatted string ('1,250,000 (100.0%)' -> 1250000)"""
+    match = NUMBER_PATTERN.search(text.replace('−', '-'))
+    return int(match.group().replace(',', '')) if match else None
+
+
+def parse_stack_lines(text: str) -> List[StackEntry]:
+    """Parse 'Name [Position] Stack' lines following 'Stack Setup:'"""
+    if 'Stack Setup:' in text:
+        text = text.split('Stack Setup:', 1)[1]
+
+    entries = []
+    for line in text.strip().split('\n'):
+        parts = line.split()
+        if len(parts) < 2:
+            continue
+        if parts[1].replace(',', '').lstrip('-').isdigit():
+            entries.append(StackEntry(parts[0], "", int(parts[1].replace(',', ''))))
+        elif len(parts) >= 3 and parts[2].replace(',', '').lstrip('-').isdigit():
+            entries.append(StackEntry(parts[0], parts[1], int(parts[2].replace(',', ''))))
+    return entries
+
+
+class _Element:
+    __slots__ = ('tag', 'classes', 'text')
+
+    def __init__(self, tag, classes):
+        self.tag = tag
+        self.classes = classes
+        self.text = []
+
+
+class TestCaseStreamParser(HTMLParser):
+    """Incremental parser; feed() chunks and drain finished records with pop_ready()"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=False)
+        self._ready = deque()
+        self._pending_marker = None
+        self._reset_case()
+
+    def _reset_case(self):
+        self.record = None
+        self._raw = []
+        self._stack = []
+        self._depth = 0
+        self._label = None
+        self._in_next_hand = False
+        self._street = None
+        self._section = None
+        self._action = None
+        self._pot = None
+        self._eligible_spans = []
+        self._cells = None
+        self._breakdown = []
+
+    def pop_ready(self) -> Iterator[TestCaseRecord]:
+        while self._ready:
+            yield self._ready.popleft()
+
+    # -- raw capture -------------------------------------------------------
+
+    def handle_comment(self, data):
+        marker = MARKER_PATTERN.fullmatch(data)
+        if marker and self.record is None:
+            self._pending_marker = (int(marker.group(1)), [f'<!--{data}-->'])
+        elif self.record is not None:
+            self._raw.append(f'<!--{data}-->')
+
+    def handle_startendtag(self, tag, attrs):
+        if self.record is not None:
+            self._raw.append(self.get_starttag_text())
+
+    def handle_entityref(self, name):
+        self._text(f'&{name};')
+
+    def handle_charref(self, name):
+        self._text(f'&#{name};')
+
+    def handle_data(self, data):
+        self._text(data)
+
+    def _text(self, raw):
+        if self.record is None:
+            if self._pending_marker and raw.strip():
+                self._pending_marker = None
+            elif self._pending_marker:
+                self._pending_marker[1].append(raw)
+            return
+        self._raw.append(raw)
+        if self._stack:
+            self._stack[-1].text.append(unescape(raw))
+
+    # -- structure ---------------------------------------------------------
+
+    def handle_starttag(self, tag, attrs):
+        classes = set()
+        for key, value in attrs:
+            if key == 'class' and value:
+                classes = set(value.split())
+
+        if self.record is None:
+            if tag == 'div' and 'test-case' in classes:
+                self.record = TestCaseRecord()
+                if self._pending_marker:
+                    self.record.tc_num, marker_raw = self._pending_marker
+                    self._raw.extend(marker_raw)
+                self._pending_marker = None
+            else:
+                self._pending_marker = None
+                return
+
+        self._raw.append(self.get_starttag_text())
+        if tag in VOID_TAGS:
+            if tag == 'br' and self._stack:
+                self._stack[-1].text.append('\n')
+            return
+
+        if tag == 'div':
+            self._depth += 1
+        if 'next-hand-preview' in classes:
+            self._in_next_hand = True
+        if 'action-row' in classes:
+            self._action = {}
+        elif 'pot-item' in classes:
+            self._pot = PotRecord(name='', amount=None)
+            self._eligible_spans = []
+        elif tag == 'tr':
+            self._cells = []
+            self._breakdown = []
+
+        self._stack.append(_Element(tag, classes))
+
+    def handle_endtag(self, tag):
+        if self.record is None:
+            return
+        self._raw.append(f'</{tag}>')
+
+        if not any(el.tag == tag for el in self._stack):
+            return
+        while self._stack:
+            element = self._stack.pop()
+            text = ''.join(element.text)
+            if self._stack:
+                self._stack[-1].text.append(text)
+            self._close(element, text.strip())
+            if element.tag == tag:
+                break
+
+        if tag == 'div':
+            self._depth -= 1
+            if self._depth == 0:
+                self.record.content = ''.join(self._raw)
+                tc_id_match = TC_ID_PATTERN.match(self.record.tc_id or '')
+                if self.record.tc_num is None and tc_id_match:
+                    self.record.tc_num = int(tc_id_match.group(1))
+                self._ready.append(self.record)
+                self._reset_case()
+
+    def _close(self, element, text):
+        """Store the text of a finished element on the current record"""
+        record = self.record
+        classes = element.classes
+
+        if 'test-id' in classes:
+            record.tc_id = text
+        elif 'test-name' in classes:
+            record.name = text
+        elif element.tag == 'label':
+            self._label = text.lower()
+        elif 'value' in classes and self._label:
+            amount = parse_number(text)
+            if self._label == 'small blind':
+                record.sb = amount
+            elif self._label == 'big blind':
+                record.bb = amount
+            elif self._label == 'ante':
+                record.ante = amount
+            self._label = None
+        elif element.tag == 'pre' or 'player-data-box' in classes:
+            # The preview's copy of the hand text is the next hand (10_MoreAction_TC.html)
+            if self._in_next_hand:
+                if not record.next_hand:
+                    self._parse_hand_text(text, is_next_hand=True)
+            elif not record.stack_setup:
+                self._parse_hand_text(text, is_next_hand=False)
+        elif 'next-hand-content' in classes:
+            self._parse_hand_text(text, is_next_hand=True)
+        elif 'next-hand-preview' in classes:
+            self._in_next_hand = False
+        elif 'street-name' in classes:
+            match = STREET_PATTERN.match(text)
+            if match:
+                self._street = match.group(1)
+                self._section = match.group(2) or 'Base'
+        elif self._action is not None and 'action-player' in classes:
+            player = PLAYER_CELL_PATTERN.match(text.rstrip(':'))
+            if player:
+                self._action['player'], self._action['position'] = player.groups()
+            else:
+                self._action['player'], self._action['position'] = text.rstrip(':'), ''
+        elif self._action is not None and 'action-type' in classes:
+            self._action['action'] = text
+        elif self._action is not None and 'action-amount' in classes:
+            self._action['amount'] = parse_number(text)
+        elif 'action-row' in classes and self._action is not None:
+            if 'player' in self._action:
+                record.actions.append(ActionRecord(
+                    player=self._action['player'],
+                    position=self._action['position'],
+                    action=self._action.get('action', ''),
+                    amount=self._action.get('amount'),
+                    street=self._street or 'Preflop',
+                    section=self._section or 'Base'
+                ))
+            self._action = None
+        elif 'pot-summary' in classes:
+            record.total_pot = parse_number(text)
+        elif self._pot is not None and 'pot-name' in classes:
+            self._pot.name = text
+        elif self._pot is not None and 'pot-amount' in classes:
+            self._pot.amount = parse_number(text)
+        elif self._pot is not None and element.tag == 'span' and text:
+            self._eligible_spans.append(text)
+        elif self._pot is not None and 'eligible' in classes:
+            # "Eligible: <span>Alice</span> <span>Bob</span>" or "Eligible: Alice, Bob (all-in at 300)"
+            if self._eligible_spans:
+                self._pot.eligible = list(self._eligible_spans)
+            else:
+                names = re.sub(r'\([^)]*\)', '', text.split(':', 1)[-1]).split(',')
+                self._pot.eligible = [n.strip() for n in names if n.strip()]
+        elif 'pot-item' in classes and self._pot is not None:
+            record.pots.append(self._pot)
+            self._pot = None
+        elif 'breakdown-line' in classes:
+            self._breakdown.append(text)
+        elif element.tag == 'td' and self._cells is not None:
+            self._cells.append(text)
+        elif element.tag == 'tr' and self._cells is not None:
+            self._parse_result_row(self._cells)
+            self._cells = None
+
+    def _parse_hand_text(self, text, is_next_hand):
+        entries = parse_stack_lines(text)
+        if is_next_hand:
+            self.record.next_hand = entries
+            hand = HAND_PATTERN.search(text)
+            self.record.next_hand_number = hand.group(1) if hand else None
+            return
+
+        self.record.stack_setup = entries
+        blinds = BLINDS_PATTERN.search(text)
+        if blinds:
+            sb, bb, ante = (int(v.replace(',', '')) for v in blinds.groups())
+            self.record.sb = self.record.sb if self.record.sb is not None else sb
+            self.record.bb = self.record.bb if self.record.bb is not None else bb
+            self.record.ante = self.record.ante if self.record.ante is not None else ante
+
+    def _parse_result_row(self, cells):
+        """Expected Results row: Player (Pos), Starting, Final, [Contributed], Winner, New"""
+        if len(cells) < 4:
+            return
+        player = PLAYER_CELL_PATTERN.match(cells[0])
+        starting = parse_number(cells[1])
+        final = parse_number(cells[2])
+        if not player or starting is None or final is None:
+            return
+
+        has_contributed = len(cells) >= 6
+        winner_cell = cells[4] if has_contributed else cells[3]
+        self.record.results.append(ResultRow(
+            name=player.group(1),
+            position=player.group(2),
+            starting_stack=starting,
+            final_stack=final,
+            contributed=parse_number(cells[3]) if has_contributed else None,
+            is_winner='🏆' in winner_cell,
+            new_stack=parse_number(cells[-1]),
+            breakdown=list(self._breakdown)
+        ))
+
+
+def iter_test_cases(html_file, chunk_size: int = CHUNK_SIZE) -> Iterator[TestCaseRecord]:
+    """Yield every test case in html_file, reading it once in chunks"""
+    parser = TestCaseStreamParser()
+    with open(html_file, 'r', encoding='utf-8') as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            parser.feed(chunk)
+            yield from parser.pop_ready()
+    parser.close()
+    yield from parser.pop_ready()
+
+
+def parse_test_case(html: str) -> Optional[TestCaseRecord]:
+    """Parse a single test case fragment already in memory"""
+    parser = TestCaseStreamParser()
+    parser.feed(html)
+    parser.close()
+    return next(parser.pop_ready(), None)
+
+
+def load_test_cases(html_file) -> List[TestCaseRecord]:
+    """Convenience wrapper for tools that need every case at once"""
+    return list(iter_test_cases(html_file))
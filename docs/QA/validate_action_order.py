@@ -1,6 +1,8 @@
 import re
 from collections import defaultdict
 
+from action_order import ORDER_POSITIONS, SEAT_INDEX, is_action_order, round_of
+
 # Read the HTML file
 with open('30_base_validated_cases.html', 'r', encoding='utf-8') as f:
     content = f.read()
@@ -12,8 +14,31 @@ tc_matches = re.findall(tc_pattern, content, re.DOTALL)
 validation_results = []
 failed_cases = []
 
+
+def check_base_order(street, acted, player_count):
+    """Errors for a Base round whose (name, position) actions break the table's action order"""
+    tag = f"[{player_count}P {'PREFLOP' if street == 'Preflop' else 'POSTFLOP'}"
+    if player_count not in ORDER_POSITIONS or not acted:
+        return []
+    positions = [pos for _, pos in acted]
+    if is_action_order(positions, player_count, street):
+        return []
+    unseated = [pos for pos in positions if pos not in SEAT_INDEX[player_count]]
+    if unseated:
+        return [f"{tag} SEATS] {', '.join(unseated)} not at a {player_count}-handed table"]
+    # Players who acted, in the order they should have
+    names = dict((pos, name) for name, pos in acted)
+    expected = [pos for pos in ORDER_POSITIONS[player_count][round_of(street)] if pos in names]
+    errors = []
+    if positions[0] != expected[0]:
+        errors.append(f"{tag} ORDER] First to act is {acted[0][0]} ({positions[0]}), "
+                      f"should be {names[expected[0]]} ({expected[0]})")
+    errors.append(f"{tag} SEQUENCE] Order is {' -> '.join(positions)}, should be {' -> '.join(expected)}")
+    return errors
+
+
 print('=' * 80)
-print('ACTION ORDER VALIDATION - 2-Player and 3-Player Rules')
+print('ACTION ORDER VALIDATION - 2 to 9 Player Rules')
 print('=' * 80)
 print()
 
@@ -56,69 +81,14 @@ for tc_num, tc_content in tc_matches[:30]:
 
     actions_section = actions_match.group(1)
 
-    # Extract Preflop Base actions
-    preflop_match = re.search(r'Preflop Base</div>(.*?)(?:</div>\s*<div class="street-block">|</div>\s*</div>)', actions_section, re.DOTALL)
-    if preflop_match:
-        preflop_actions = preflop_match.group(1)
-        action_pattern = r'<span class="action-player">(.*?)\((\w+)\):</span>'
-        preflop_players = re.findall(action_pattern, preflop_actions)
-
-        if preflop_players:
-            # Get first player to act preflop
-            first_player_name = preflop_players[0][0].strip()
-            first_player_pos = preflop_players[0][1].strip()
-
-            # VALIDATION RULE: Preflop Action Order
-            if player_count == 2:
-                # 2-handed (heads-up): Dealer/SB acts first, BB acts second
-                # Find who is SB
-                sb_player = next((p for p in players if 'SB' in p['position']), None)
-                if sb_player and first_player_name != sb_player['name']:
-                    errors.append(f"[2P PREFLOP ORDER] First to act is {first_player_name} ({first_player_pos}), should be {sb_player['name']} (SB/Dealer)")
-
-            elif player_count == 3:
-                # 3-handed: Dealer acts FIRST preflop, then SB, then BB
-                dealer_player = next((p for p in players if 'Dealer' in p['position']), None)
-                if dealer_player and first_player_name != dealer_player['name']:
-                    errors.append(f"[3P PREFLOP ORDER] First to act is {first_player_name} ({first_player_pos}), should be {dealer_player['name']} (Dealer)")
-
-                # Check full order: Dealer -> SB -> BB
-                if len(preflop_players) >= 3:
-                    expected_order = ['Dealer', 'SB', 'BB']
-                    actual_order = [p[1].strip() for p in preflop_players[:3]]
-                    if actual_order != expected_order:
-                        errors.append(f"[3P PREFLOP SEQUENCE] Order is {' -> '.join(actual_order)}, should be Dealer -> SB -> BB")
-
-    # Extract Flop Base actions (postflop)
-    flop_match = re.search(r'Flop Base[^>]*</div>(.*?)(?:</div>\s*<div class="street-block">|</div>\s*</div>)', actions_section, re.DOTALL)
-    if flop_match:
-        flop_actions = flop_match.group(1)
-        action_pattern = r'<span class="action-player">(.*?)\((\w+)\):</span>'
-        flop_players = re.findall(action_pattern, flop_actions)
-
-        if flop_players:
-            first_player_name = flop_players[0][0].strip()
-            first_player_pos = flop_players[0][1].strip()
-
-            # VALIDATION RULE: Postflop Action Order
-            if player_count == 2:
-                # 2-handed postflop: BB acts FIRST, Dealer/SB acts second
-                bb_player = next((p for p in players if 'BB' in p['position']), None)
-                if bb_player and first_player_name != bb_player['name']:
-                    errors.append(f"[2P POSTFLOP ORDER] First to act is {first_player_name} ({first_player_pos}), should be {bb_player['name']} (BB)")
-
-            elif player_count == 3:
-                # 3-handed postflop: SB acts FIRST, then BB, then Dealer
-                sb_player = next((p for p in players if 'SB' in p['position']), None)
-                if sb_player and first_player_name != sb_player['name']:
-                    errors.append(f"[3P POSTFLOP ORDER] First to act is {first_player_name} ({first_player_pos}), should be {sb_player['name']} (SB)")
-
-                # Check full order: SB -> BB -> Dealer
-                if len(flop_players) >= 3:
-                    expected_order = ['SB', 'BB', 'Dealer']
-                    actual_order = [p[1].strip() for p in flop_players[:3]]
-                    if actual_order != expected_order:
-                        errors.append(f"[3P POSTFLOP SEQUENCE] Order is {' -> '.join(actual_order)}, should be SB -> BB -> Dealer")
+    # Extract Preflop and Flop (postflop) Base actions
+    for street, street_pattern in (('Preflop', r'Preflop Base</div>'), ('Flop', r'Flop Base[^>]*</div>')):
+        street_match = re.search(street_pattern + r'(.*?)(?:</div>\s*<div class="street-block">|</div>\s*</div>)',
+                                 actions_section, re.DOTALL)
+        if street_match:
+            action_pattern = r'<span class="action-player">(.*?)\(([^)]+)\):</span>'
+            acted = [(name.strip(), pos.strip()) for name, pos in re.findall(action_pattern, street_match.group(1))]
+            errors.extend(check_base_order(street, acted, player_count))
 
     # Compile results
     status = "PASS" if len(errors) == 0 else "FAIL"
@@ -184,7 +154,9 @@ with open('action_order_validation.txt', 'w', encoding='utf-8') as f:
     f.write('1. 2-Player Preflop: SB/Dealer acts first, BB acts second\n')
     f.write('2. 2-Player Postflop: BB acts first, SB/Dealer acts second\n')
     f.write('3. 3-Player Preflop: Dealer -> SB -> BB\n')
-    f.write('4. 3-Player Postflop: SB -> BB -> Dealer\n\n')
+    f.write('4. 3-Player Postflop: SB -> BB -> Dealer\n')
+    f.write('5. 4+ Player Preflop: UTG -> ... -> CO -> Dealer -> SB -> BB\n')
+    f.write('6. 4+ Player Postflop: SB -> BB -> UTG -> ... -> CO -> Dealer\n\n')
     f.write('=' * 80 + '\n\n')
 
     for result in validation_results:
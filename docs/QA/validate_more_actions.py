@@ -17,16 +17,8 @@ import re
 import sys
 from dataclasses import dataclass
 from typing import List, Optional, Tuple
-from enum import Enum
 
-
-class ActionType(Enum):
-    CHECK = "check"
-    BET = "bet"
-    CALL = "call"
-    RAISE = "raise"
-    ALL_IN = "all-in"
-    FOLD = "fold"
+from hand_state import ActionType
 
 
 @dataclass
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Cross-check calculate_side_pots_batch() against the original scalar algorithm
+
+Loads every test case from 40_TestCases.html and pot-test-cases-batch-1..3.html
+(batch 4 carries no pot data), runs all hands through the batch engine in one
+call and compares each pot amount, level and eligible set with
+reference_side_pots(), a frozen copy of calculate_side_pots() as it was before
+it moved onto pot_oracle. The oracle's own scalar/batch agreement is covered
+by `pot_oracle.py check`.
+
+Usage:
+python validate_sidepot_batch.py [html_file ...]
+"""
+import re
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+from sidepot_calculator import calculate_side_pots_batch, players_to_batch_arrays
+
+DOCS_DIR = Path(__file__).resolve().parent.parent
+
+DEFAULT_FILES = [
+    DOCS_DIR / '40_TestCases.html',
+    DOCS_DIR / 'pot-test-cases-batch-1.html',
+    DOCS_DIR / 'pot-test-cases-batch-2.html',
+    DOCS_DIR / 'pot-test-cases-batch-3.html',
+]
+
+TC_PATTERN = re.compile(r'<div class="test-id">(TC-\d+)</div>.*?(?=<div class="test-id">TC-|\Z)', re.DOTALL)
+ANTE_PATTERN = re.compile(r'<label>Ante</label><div class="value">([\d,]+)</div>|\bAnte ([\d,]+)')
+# Without a Contributed column, fall back to Starting - Final
+ROW_PATTERN = re.compile(
+    r'<td>(\w+) \(([^)]+)\)</td>\s*<td>([\d,]+)</td>\s*<td>([\d,]+)</td>(?:\s*<td>([\d,]+))?'
+)
+
+
+def parse_number(s):
+    """Parse number from formatted string"""
+    return int(s.replace(',', ''))
+
+
+def load_hands(html_file):
+    """Extract (tc_id, players, bb_ante) for every test case in a file"""
+    with open(html_file, 'r', encoding='utf-8') as f:
+        content = f.read()
+
+    hands = []
+    for match in TC_PATTERN.finditer(content):
+        tc_id = match.group(1)
+        tc_content = match.group(0)
+
+        ante_match = ANTE_PATTERN.search(tc_content)
+        bb_ante = parse_number(ante_match.group(1) or ante_match.group(2)) if ante_match else 0
+
+        players = []
+        for name, position, starting, final, contributed in ROW_PATTERN.findall(tc_content):
+            if contributed:
+                total_contribution = parse_number(contributed)
+            else:
+                total_contribution = parse_number(starting) - parse_number(final)
+            players.append(SimpleNamespace(name=name, position=position, total_contribution=total_contribution))
+
+        if players:
+            hands.append((tc_id, players, bb_ante))
+
+    return hands
+
+
+def reference_side_pots(players, bb_ante):
+    """
+    The pre-oracle calculate_side_pots(), frozen: do not route it through
+    pot_oracle, it is the independent reference the batch engine is checked against
+
+    Returns:
+        dict with 'pots' (name, amount, eligible_names, level) and 'total_pot'
+    """
+    # Find BB player who paid ante
+    bb_player = next((p for p in players if p.position == "BB"), None)
+
+    # Calculate live contributions (excluding ante which is dead money)
+    contributions = []
+    for p in players:
+        live_contrib = p.total_contribution
+        if bb_player and p.name == bb_player.name:
+            live_contrib -= bb_ante  # Ante is dead money, not part of live action
+        contributions.append({'player': p, 'live': live_contrib})
+
+    # Sort by live contribution amount
+    contributions.sort(key=lambda x: x['live'])
+
+    # Get unique contribution levels (where players went all-in)
+    unique_levels = sorted(set(c['live'] for c in contributions))
+
+    # Build pots
+    pots = []
+    remaining_players = len(contributions)
+    prev_level = 0
+
+    for i, level in enumerate(unique_levels):
+        if remaining_players > 0:
+            # Calculate pot amount: (level difference) x (number of players contributing)
+            pot_amount = (level - prev_level) * remaining_players
+
+            # Add ante to first (main) pot as dead money
+            if i == 0:
+                pot_amount += bb_ante
+
+            # Determine eligible players: those who contributed at least to this level
+            eligible_names = [c['player'].name for c in contributions if c['live'] >= level]
+
+            pots.append({
+                'name': 'Main Pot' if i == 0 else f'Side Pot {i}',
+                'amount': pot_amount,
+                'eligible_names': eligible_names,
+                'level': level
+            })
+
+            # Remove players at this exact level from future pot calculations
+            remaining_players = len([c for c in contributions if c['live'] > level])
+            prev_level = level
+
+    return {'pots': pots, 'total_pot': sum(p['amount'] for p in pots)}
+
+
+def compare_hand(scalar, batch, h, names):
+    """Return list of mismatch descriptions for hand h"""
+    errors = []
+    pots = scalar['pots']
+
+    if len(pots) != batch['num_pots'][h]:
+        return [f"pot count {len(pots)} (scalar) vs {batch['num_pots'][h]} (batch)"]
+
+    for k, pot in enumerate(pots):
+        amount = int(batch['amounts'][h, k])
+        level = int(batch['levels'][h, k])
+        mask = int(batch['eligible'][h, k])
+        eligible_names = [name for s, name in enumerate(names) if mask >> s & 1]
+
+        if pot['amount'] != amount:
+            errors.append(f"{pot['name']}: amount {pot['amount']:,} vs {amount:,}")
+        if pot['level'] != level:
+            errors.append(f"{pot['name']}: level {pot['level']:,} vs {level:,}")
+        if sorted(pot['eligible_names']) != sorted(eligible_names):
+            errors.append(f"{pot['name']}: eligible {pot['eligible_names']} vs {eligible_names}")
+
+    if scalar['total_pot'] != batch['total_pot'][h]:
+        errors.append(f"total pot {scalar['total_pot']:,} vs {int(batch['total_pot'][h]):,}")
+
+    return errors
+
+
+def main():
+    files = [Path(f) for f in sys.argv[1:]] or DEFAULT_FILES
+
+    print("=" * 80)
+    print("BATCH SIDE POT ENGINE CROSS-CHECK")
+    print("=" * 80)
+
+    all_hands = []
+    for html_file in files:
+        hands = load_hands(html_file)
+        print(f"{html_file.name}: {len(hands)} hands")
+        all_hands.extend((html_file.name, tc_id, players, bb_ante) for tc_id, players, bb_ante in hands)
+
+    packed = players_to_batch_arrays([players for _, _, players, _ in all_hands])
+    bb_antes = [bb_ante for _, _, _, bb_ante in all_hands]
+    batch = calculate_side_pots_batch(
+        packed['contributions'], bb_antes, packed['ante_mask'], seated=packed['seated']
+    )
+
+    failures = []
+    for h, (file_name, tc_id, players, bb_ante) in enumerate(all_hands):
+        scalar = reference_side_pots(players, bb_ante)
+        for error in compare_hand(scalar, batch, h, packed['names'][h]):
+            failures.append(f"{file_name} {tc_id}: {error}")
+
+    print()
+    print(f"Hands checked: {len(all_hands)}")
+    if failures:
+        print(f"[FAIL] {len(failures)} mismatches")
+        for failure in failures[:20]:
+            print(f"  - {failure}")
+        return 1
+
+    print("[OK] Batch engine matches the reference side pot algorithm on every hand")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -3,8 +3,10 @@
 Generate 287 poker pot calculation test cases (TC-14.1 through TC-300.1)
 """
 
+import os
 import random
 import json
+import sys
 
 # Player names pool
 PLAYER_NAMES = [
@@ -473,14 +475,18 @@ def main():
     """Generate all 287 test cases"""
     print("Generating 287 test cases...")
 
-    all_html = ""
-    for tc_num in range(14, 301):
-        print(f"Generating TC-{tc_num}.1...")
-        all_html += generate_test_case_html(tc_num)
-
-    # Write to file
+    # Write each case as soon as it is generated instead of building one big string
     with open("C:\\Apps\\HUDR\\HHTool_Modular\\docs\\generated-test-cases.html", "w", encoding="utf-8") as f:
-        f.write(all_html)
+        for tc_num in range(14, 301):
+            print(f"Generating TC-{tc_num}.1...")
+            f.write(generate_test_case_html(tc_num))
+
+    # Binary corpus next to the HTML, so validators don't re-parse the markup
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'QA'))
+    import hand_corpus
+    if hand_corpus.np is not None:
+        corpus = hand_corpus.build_corpus("C:\\Apps\\HUDR\\HHTool_Modular\\docs\\generated-test-cases.html")
+        print(f"Corpus: {corpus}")
 
     print(f"✓ Generated 287 test cases successfully!")
     print(f"Output: C:\\Apps\\HUDR\\HHTool_Modular\\docs\\generated-test-cases.html")
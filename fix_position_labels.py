@@ -19,6 +19,14 @@ from pathlib import Path
 # Position labels to remove (keep only Dealer, SB, BB)
 POSITIONS_TO_REMOVE = ['UTG', 'UTG+1', 'UTG+2', 'MP', 'HJ', 'CO']
 
+# Pattern: PlayerName POSITION Stack, for every position at once (longest
+# alternative first so UTG+1 is not read as UTG)
+POSITION_LABEL_PATTERN = re.compile(
+    r'\b(\w+)\s+(?:'
+    + '|'.join(re.escape(p) for p in sorted(POSITIONS_TO_REMOVE, key=len, reverse=True))
+    + r')\s+(\d+)'
+)
+
 def fix_position_labels(content):
     """
     Remove extra position labels from Stack Setup sections.
@@ -31,26 +39,8 @@ def fix_position_labels(content):
     Replaces with:
     PlayerName Stack
     """
-    fixed_content = content
-    total_fixes = 0
-
-    # Create pattern for each position to remove
-    for position in POSITIONS_TO_REMOVE:
-        # Escape special characters in position (e.g., UTG+1 -> UTG\+1)
-        escaped_position = re.escape(position)
-
-        # Pattern: PlayerName POSITION Stack
-        # Match: word characters (player name), space, position, space, digits (stack)
-        # Replace: PlayerName Stack (remove position)
-        pattern = r'(\w+)\s+' + escaped_position + r'\s+(\d+)'
-        replacement = r'\1 \2'
-
-        # Count replacements
-        matches = re.findall(pattern, fixed_content)
-        total_fixes += len(matches)
-
-        # Apply replacement
-        fixed_content = re.sub(pattern, replacement, fixed_content)
+    # One scan of the content instead of a findall + sub per position
+    fixed_content, total_fixes = POSITION_LABEL_PATTERN.subn(r'\1 \2', content)
 
     return fixed_content, total_fixes
 
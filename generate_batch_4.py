@@ -1,9 +1,23 @@
 """
 Generate 100 aggressive poker test cases (TC-301 to TC-400) with heavy "More" action
+
+The action lines are scripted per category rather than played out seat by
+seat (no calls or folds, bet sizes are not tied to the stacks), so they do
+not define who put how much into the pot. The cases therefore carry no Pot
+Breakdown, Expected Results or Next Hand preview; use generate_30_progressive.py
+for cases with pot expectations from pot_oracle.
 """
 
 import random
 import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent / 'docs' / 'QA'))
+from fragment_cache import FragmentCache, case_seed, default_cache_dir, source_version
+
+# Master seed; each case reseeds random from (MASTER_SEED, tc_num)
+MASTER_SEED = 42
 
 # Player names pool
 PLAYER_NAMES = [
@@ -80,20 +94,6 @@ def generate_test_case(tc_num, player_count, category, complexity):
     # Generate action flow based on category
     action_flow = generate_action_flow(players, bb, ante, category, complexity)
 
-    # Calculate pots
-    pot_breakdown = calculate_pots(action_flow, ante)
-
-    # Assign winners
-    winners = assign_winners(pot_breakdown, players)
-
-    # Calculate final stacks and new stacks
-    for player in players:
-        player["final_stack"] = player["stack"] - player.get("contributed", 0)
-        player["new_stack"] = player["final_stack"] + player.get("pot_won", 0)
-
-    # Generate next hand
-    next_hand = generate_next_hand(players, sb, bb, ante)
-
     # Determine badge
     badge = get_complexity_badge(complexity)
     category_badge = get_category_badge(category)
@@ -108,9 +108,6 @@ def generate_test_case(tc_num, player_count, category, complexity):
         "bb": bb,
         "ante": ante,
         "action_flow": action_flow,
-        "pot_breakdown": pot_breakdown,
-        "winners": winners,
-        "next_hand": next_hand,
         "notes": get_notes(category, complexity)
     }
 
@@ -206,47 +203,6 @@ def generate_street_action(players, street, complexity):
         "more2": more2 if more2 else None
     }
 
-def calculate_pots(action_flow, ante):
-    """Calculate pot breakdown"""
-    # Simplified pot calculation
-    total_pot = random.randint(10000, 50000)
-    main_pot = int(total_pot * 0.4)
-    side_pot1 = int(total_pot * 0.35)
-    side_pot2 = total_pot - main_pot - side_pot1
-
-    return {
-        "total": total_pot,
-        "main_pot": {"amount": main_pot, "percentage": round(main_pot/total_pot*100, 1)},
-        "side_pot1": {"amount": side_pot1, "percentage": round(side_pot1/total_pot*100, 1)},
-        "side_pot2": {"amount": side_pot2, "percentage": round(side_pot2/total_pot*100, 1)}
-    }
-
-def assign_winners(pot_breakdown, players):
-    """Assign winners to pots"""
-    winner_idx = random.randint(0, len(players)-1)
-    return {
-        "main_pot": players[winner_idx]["name"],
-        "side_pot1": players[(winner_idx + 1) % len(players)]["name"],
-        "side_pot2": players[(winner_idx + 2) % len(players)]["name"] if len(players) > 2 else None
-    }
-
-def generate_next_hand(players, sb, bb, ante):
-    """Generate next hand preview"""
-    # Rotate button
-    rotated_players = players[1:] + [players[0]]
-
-    lines = [
-        f"Hand (X)",
-        f"started_at: HH:MM:SS ended_at: HH:MM:SS",
-        f"SB {sb:,} BB {bb:,} Ante {ante:,}",
-        "Stack Setup:"
-    ]
-
-    for player in rotated_players:
-        lines.append(f"{player['name']} {player['position']} {player['new_stack']:,}")
-
-    return "\n".join(lines)
-
 def get_complexity_badge(complexity):
     """Get complexity badge"""
     if complexity == 1:
@@ -284,7 +240,7 @@ def get_test_case_name(category, tc_num):
 def get_notes(category, complexity):
     """Get notes for test case"""
     return f"Category {category} test case with {complexity*2+4} More sections across multiple streets. " \
-           f"Multiple all-ins creating side pots. Strategic folds creating dead money."
+           f"Action-only scenario: pots and results are not generated for this batch."
 
 def generate_html_test_case(tc_data):
     """Generate HTML for a single test case"""
@@ -483,80 +439,7 @@ def generate_html_test_case(tc_data):
         html += '''            </div>
 '''
 
-    # Pot breakdown
-    pots = tc_data["pot_breakdown"]
     html += f'''
-            <div class="section-title">Pot Breakdown</div>
-            <table class="pot-table">
-                <tr>
-                    <th>Pot</th>
-                    <th>Amount</th>
-                    <th>Percentage</th>
-                    <th>Eligible Players</th>
-                </tr>
-                <tr>
-                    <td>Main Pot</td>
-                    <td>{pots["main_pot"]["amount"]:,}</td>
-                    <td>{pots["main_pot"]["percentage"]}%</td>
-                    <td>All players</td>
-                </tr>
-                <tr>
-                    <td>Side Pot 1</td>
-                    <td>{pots["side_pot1"]["amount"]:,}</td>
-                    <td>{pots["side_pot1"]["percentage"]}%</td>
-                    <td>2-3 players</td>
-                </tr>
-                <tr>
-                    <td>Side Pot 2</td>
-                    <td>{pots["side_pot2"]["amount"]:,}</td>
-                    <td>{pots["side_pot2"]["percentage"]}%</td>
-                    <td>1-2 players</td>
-                </tr>
-                <tr class="total-row">
-                    <td><strong>Total Pot</strong></td>
-                    <td><strong>{pots["total"]:,}</strong></td>
-                    <td><strong>100.0%</strong></td>
-                    <td></td>
-                </tr>
-            </table>
-
-            <div class="section-title">Expected Results</div>
-            <table class="results-table">
-                <tr>
-                    <th>Player (Position)</th>
-                    <th>Starting Stack</th>
-                    <th>Final Stack</th>
-                    <th>Winner</th>
-                    <th>New Stack</th>
-                </tr>
-'''
-
-    for i, player in enumerate(tc_data["players"]):
-        winner_badge = ""
-        if tc_data["winners"]["main_pot"] == player["name"]:
-            winner_badge = f'<span class="winner-badge" onclick="toggleBreakdown(this)">🏆 Main Pot <span class="expand-icon">▼</span></span><div class="breakdown-details" style="display:none;"><div class="breakdown-line">Final Stack: {player["final_stack"]:,}</div><div class="breakdown-line">+ Main Pot: {pots["main_pot"]["amount"]:,}</div><div class="breakdown-line total">= New Stack: {player["new_stack"]:,}</div></div>'
-
-        html += f'''                <tr>
-                    <td>{player["name"]} ({player["position"]})</td>
-                    <td>{player["stack"]:,}</td>
-                    <td>{player["final_stack"]:,}</td>
-                    <td>{winner_badge if winner_badge else "-"}</td>
-                    <td>{player["new_stack"]:,}</td>
-                </tr>
-'''
-
-    html += f'''            </table>
-
-            <div class="next-hand-preview">
-                <div class="next-hand-header">
-                    <div class="next-hand-title">📋 Next Hand Preview</div>
-                    <button class="copy-btn" onclick="copyPlayerData(this, `{tc_data["next_hand"]}`)">
-                        <span>📋</span> Copy Next Hand
-                    </button>
-                </div>
-                <div class="next-hand-content">{tc_data["next_hand"]}</div>
-            </div>
-
             <div class="notes">
                 <strong>Notes:</strong> {tc_data["notes"]}
             </div>
@@ -567,9 +450,21 @@ def generate_html_test_case(tc_data):
     return html
 
 def main():
-    """Generate all 100 test cases"""
+    """Generate all 100 test cases
+
+    Rendered cases are cached next to the output file; only cases whose key
+    (tc_num, seed, category, player count, complexity, generator source)
+    changed are re-rendered. Pass --no-cache to render everything.
+    """
     print("Generating 100 aggressive test cases (TC-301 to TC-400)...")
 
+    output_path = 'C:\\Apps\\HUDR\\HHTool_Modular\\docs\\pot-test-cases-batch-4.html'
+    cache = FragmentCache(
+        default_cache_dir(output_path, 'generate_batch_4'),
+        source_version(sys.modules[__name__]),
+        enabled='--no-cache' not in sys.argv
+    )
+
     # Read batch-1 as template for HTML structure
     with open('C:\\Apps\\HUDR\\HHTool_Modular\\docs\\pot-test-cases-batch-1.html', 'r', encoding='utf-8') as f:
         template_content = f.read()
@@ -579,7 +474,7 @@ def main():
     head_section = template_content[:head_end + 7]
 
     # Start building the new file
-    html_content = head_section + '\n<body>\n<div class="container">\n<h1>Poker Pot Calculation Test Cases - Batch 4 (TC-301 to TC-400)</h1>\n<p><strong>Focus:</strong> Aggressive action with heavy "More" sections and guaranteed side pots</p>\n<p><strong>Player Count:</strong> 6-8 players per test case</p>\n<p><strong>Action Pattern:</strong> Minimal checks, heavy raises/re-raises on every street</p>\n\n'
+    html_content = head_section + '\n<body>\n<div class="container">\n<h1>Poker Pot Calculation Test Cases - Batch 4 (TC-301 to TC-400)</h1>\n<p><strong>Focus:</strong> Aggressive action with heavy "More" sections and multiple all-ins</p>\n<p><strong>Player Count:</strong> 6-8 players per test case</p>\n<p><strong>Action Pattern:</strong> Minimal checks, heavy raises/re-raises on every street</p>\n\n'
 
     # Generate test cases
     test_cases_html = []
@@ -598,15 +493,18 @@ def main():
     for category_id, count, category_name in categories:
         print(f"Generating {count} test cases for {category_name}...")
         for i in range(count):
+            seed = case_seed(MASTER_SEED, tc_num)
+            random.seed(seed)
+
             # Determine player count and complexity
             player_count = random.choice([6, 6, 7, 7, 7, 8])  # Weighted towards 7
             complexity = random.randint(2, 3)  # Medium to Complex
 
-            # Generate test case
-            tc_data = generate_test_case(tc_num, player_count, category_id, complexity)
-
-            # Convert to HTML
-            tc_html = generate_html_test_case(tc_data)
+            # Generate test case and convert to HTML (random continues from the draws above)
+            tc_html = cache.get_or_render(
+                lambda: generate_html_test_case(generate_test_case(tc_num, player_count, category_id, complexity)),
+                tc_num=tc_num, seed=seed, category=category_id, players=player_count, complexity=complexity
+            )
             test_cases_html.append(tc_html)
 
             tc_num += 1
@@ -624,12 +522,13 @@ def main():
     html_content += '\n</div>\n' + footer_section
 
     # Write to file
-    output_path = 'C:\\Apps\\HUDR\\HHTool_Modular\\docs\\pot-test-cases-batch-4.html'
     with open(output_path, 'w', encoding='utf-8') as f:
         f.write(html_content)
 
+    cache.prune()
+
     print(f"\n✅ Successfully generated {output_path}")
-    print(f"📊 Total test cases: 100 (TC-301 to TC-400)")
+    print(f"📊 Total test cases: 100 (TC-301 to TC-400), {cache.summary()}")
     print(f"📁 File size: {len(html_content) / 1024:.1f} KB")
 
 if __name__ == "__main__":
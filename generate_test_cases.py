@@ -2,10 +2,22 @@
 """
 Generate 300 poker pot calculation test cases across 3 HTML files.
 Each file contains 100 test cases following poker tournament rules.
+
+For soak corpora, --cases N writes N cases across ceil(N / 100) batch files
+(--cases-per-batch to change that) plus an index page linking them all.
 """
 
+import argparse
+import io
+import os
 import random
 import json
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent / 'docs' / 'QA'))
+from fragment_cache import case_seed
 
 # CSS and JavaScript templates
 CSS_STYLES = """
@@ -676,43 +688,193 @@ def format_number(n):
     """Format number with commas."""
     return f"{n:,}"
 
-def generate_test_case(tc_num, batch_config):
-    """Generate a single test case with proper poker rules."""
+# Master seed for the whole corpus; each test case derives its own seed from it
+MASTER_SEED = 42
+
+# Test cases handed to a worker process per task
+CASE_CHUNKSIZE = 5
+
+# Test case template layer. Each render_* function is a compiled f-string chunk;
+# write_test_case() collects the chunks in a list and writes them with a single
+# join, so rendering a batch stays linear in the number of cases.
+def render_case_header(tc_num, tc_id, test_name, complexity, badge_style, edge_case, sb, bb, ante,
+                       player_data_text, player_data_display):
+    """Render test case header, stack setup and copy box up to the Preflop street."""
+    return f"""
+        <!-- TEST CASE {tc_num} -->
+        <div class="test-case">
+            <div class="test-header" onclick="toggleTestCase(this)">
+                <div>
+                    <div class="test-id">{tc_id}</div>
+                    <div class="test-name">{test_name}</div>
+                </div>
+                <div class="badges">
+                    <span class="badge {badge_style}">{complexity}</span>
+                    <span class="badge category">{edge_case}</span>
+                    <span class="collapse-icon">▼</span>
+                </div>
+            </div>
+
+            <div class="test-content">
+            <div class="section-title">Stack Setup</div>
+            <div class="blind-setup">
+                <div class="blind-item"><label>Small Blind</label><div class="value">{format_number(sb)}</div></div>
+                <div class="blind-item"><label>Big Blind</label><div class="value">{format_number(bb)}</div></div>
+                <div class="blind-item"><label>Ante</label><div class="value">{format_number(ante)}</div></div>
+                <div class="blind-item"><label>Ante Order</label><div class="value">BB First</div></div>
+            </div>
+
+            <div class="ante-info-box">
+                ⚠️ BB posts {format_number(ante)} ante (dead money) first, then {format_number(bb)} blind (live money).
+            </div>
+
+            <div class="copy-instruction">📋 Copy and paste this into the app:</div>
+            <button class="copy-btn" onclick="copyPlayerData(this, `{player_data_text}`)">
+                <span>📋</span> Copy Player Data
+            </button>
+            <div class="player-data-box">
+<pre>{player_data_display}</pre>
+            </div>
+
+            <div class="section-title">Actions</div>
+            <div class="actions-section">
+                <div class="street-block">
+                    <div class="street-name">Preflop</div>
+"""
+
+def render_action_row(name, position, action, amount=None):
+    """Render one action row; amount is omitted for checks."""
+    if amount is None:
+        return f'                    <div class="action-row"><span class="action-player">{name} ({position}):</span> <span class="action-type">{action}</span></div>\n'
+    return f'                    <div class="action-row"><span class="action-player">{name} ({position}):</span> <span class="action-type">{action}</span> <span class="action-amount">{format_number(amount)}</span></div>\n'
+
+def render_pot_breakdown(total_pot, eligible_names):
+    """Close the actions section and render the pot breakdown and results table head."""
+    return f"""                </div>
+            </div>
+
+            <div class="section-title">Pot Breakdown</div>
+            <div class="results-section">
+                <div class="pot-summary">Total Pot: {format_number(total_pot)}</div>
+                <div class="pot-item main">
+                    <div class="pot-name">Main Pot</div>
+                    <div class="pot-amount">{format_number(total_pot)} (100%)</div>
+                    <div class="eligible">Eligible: {", ".join(eligible_names)}</div>
+                </div>
+            </div>
+
+            <div class="section-title">Expected Results</div>
+            <table>
+                <thead>
+                    <tr><th>Player (Position)</th><th>Starting Stack</th><th>Final Stack</th><th>Total Contributed</th><th>Winner</th><th>New Stack</th></tr>
+                </thead>
+                <tbody>
+"""
+
+LOSER_CELL = '<span class="winner-badge loser">-</span>'
+
+def render_winner_cell(final_stack, total_pot, new_stack):
+    """Render the winner badge with its pot breakdown."""
+    return f"""<span class="winner-badge" onclick="toggleBreakdown(this)">
+                                    🏆 Main Pot <span class="expand-icon">▼</span>
+                                </span>
+                                <div class="breakdown-details" style="display:none;">
+                                    <div class="breakdown-line">Final Stack: {format_number(final_stack)}</div>
+                                    <div class="breakdown-line">+ Main Pot: {format_number(total_pot)}</div>
+                                    <div class="breakdown-line total">= New Stack: {format_number(new_stack)}</div>
+                                </div>"""
+
+def render_result_row(name, position, starting_stack, final_stack, contributed_str, winner_cell, new_stack):
+    """Render one Expected Results table row."""
+    return f"""                    <tr>
+                        <td>{name} ({position})</td><td>{format_number(starting_stack)}</td><td>{format_number(final_stack)}</td><td>{contributed_str}</td>
+                        <td>
+                            {winner_cell}
+                        </td>
+                        <td>{format_number(new_stack)}</td>
+                    </tr>
+"""
+
+def render_case_footer(tc_id, test_name, winner_name, next_hand_text, next_hand_display):
+    """Render next hand preview, comparison box and notes."""
+    tc_key = tc_id.lower()
+    return f"""                </tbody>
+            </table>
+
+            <div class="next-hand-preview">
+                <div class="next-hand-header">
+                    <div class="next-hand-title">📋 Next Hand Preview</div>
+                    <button class="copy-btn" onclick="copyPlayerData(this, `{next_hand_text}`)">
+                        <span>📋</span> Copy Next Hand
+                    </button>
+                </div>
+                <div class="next-hand-content">{next_hand_display}</div>
+
+                <div class="comparison-section">
+                    <div class="comparison-header">🔍 Compare with Actual Output</div>
+                    <textarea id="actual-output-{tc_key}" class="comparison-textarea" placeholder="Paste the actual next hand output from your app here..." rows="8"></textarea>
+                    <div style="margin-bottom: 10px;">
+                        <button class="paste-btn" onclick="pasteFromClipboard(this, '{tc_key}')">
+                            📋 Paste from Clipboard
+                        </button>
+                        <button class="compare-btn" onclick="compareNextHand('{tc_key}', `{next_hand_text}`)">
+                            🔍 Compare
+                        </button>
+                    </div>
+                    <div id="comparison-result-{tc_key}" class="comparison-result"></div>
+                </div>
+            </div>
+
+            <div class="notes">
+                <div class="notes-title">Notes</div>
+                <div class="notes-text">{test_name}. All players call preflop. Winner: {winner_name}.</div>
+            </div>
+            </div>
+        </div>
+"""
+
+def write_test_case(out, tc_num, batch_config, master_seed=MASTER_SEED):
+    """Generate a single test case with proper poker rules and write its HTML to out.
+
+    All randomness comes from a private RNG seeded by case_seed(), so a case
+    is identical no matter which process generates it or in what order.
+    """
+    rng = random.Random(case_seed(master_seed, tc_num))
 
     # Determine player count
     player_count_weights = batch_config['player_count']
-    player_count = random.choices(
-        [2, random.randint(3, 6), random.randint(7, 9)],
+    player_count = rng.choices(
+        [2, rng.randint(3, 6), rng.randint(7, 9)],
         weights=[player_count_weights[0], player_count_weights[1], player_count_weights[2]]
     )[0]
 
     # Determine complexity
     complexity_weights = batch_config['complexity']
-    complexity = random.choices(
+    complexity = rng.choices(
         ['Simple', 'Medium', 'Complex'],
         weights=complexity_weights
     )[0]
 
     # Determine stack size range
     stack_weights = batch_config['stack_sizes']
-    stack_range = random.choices(
+    stack_range = rng.choices(
         ['thousands', 'hundreds_thousands', 'millions'],
         weights=stack_weights
     )[0]
 
     if stack_range == 'thousands':
-        base_stack = random.randint(1000, 9000)
-        bb = random.choice([50, 100, 200])
+        base_stack = rng.randint(1000, 9000)
+        bb = rng.choice([50, 100, 200])
         sb = bb // 2
         ante = bb
     elif stack_range == 'hundreds_thousands':
-        base_stack = random.randint(10000, 99000)
-        bb = random.choice([500, 1000, 2000])
+        base_stack = rng.randint(10000, 99000)
+        bb = rng.choice([500, 1000, 2000])
         sb = bb // 2
         ante = bb
     else:  # millions
-        base_stack = random.randint(100000, 999000)
-        bb = random.choice([5000, 10000, 20000])
+        base_stack = rng.randint(100000, 999000)
+        bb = rng.choice([5000, 10000, 20000])
         sb = bb // 2
         ante = bb
 
@@ -724,7 +886,7 @@ def generate_test_case(tc_num, batch_config):
     for i, pos in enumerate(positions):
         # Ensure unique stacks
         while True:
-            bb_multiple = random.randint(10, 60)
+            bb_multiple = rng.randint(10, 60)
             stack = bb * bb_multiple
             if stack not in used_stacks:
                 used_stacks.add(stack)
@@ -738,7 +900,7 @@ def generate_test_case(tc_num, batch_config):
         })
 
     # Determine edge case category
-    edge_case = random.choice([
+    edge_case = rng.choice([
         'BB Ante Posting', 'Short Stack', 'Multiple All-Ins',
         'Side Pot Complexity', 'Multi-Street', 'Position-Specific',
         'Fold Scenarios', 'Transitions', 'Calculation Edge Cases'
@@ -769,7 +931,7 @@ def generate_test_case(tc_num, batch_config):
         main_pot_contributors.append(p['name'])
 
     # Pick random winner
-    winner = random.choice(players)
+    winner = rng.choice(players)
     winner['final_stack'] += total_pot
 
     # Build test case HTML
@@ -812,82 +974,23 @@ def generate_test_case(tc_num, batch_config):
     next_hand_text = "\\n".join(next_hand_lines)
     next_hand_display = "\n".join(next_hand_lines)
 
-    # Build HTML
-    html = f"""
-        <!-- TEST CASE {tc_num} -->
-        <div class="test-case">
-            <div class="test-header" onclick="toggleTestCase(this)">
-                <div>
-                    <div class="test-id">{tc_id}</div>
-                    <div class="test-name">{test_name}</div>
-                </div>
-                <div class="badges">
-                    <span class="badge {badge_style}">{complexity}</span>
-                    <span class="badge category">{edge_case}</span>
-                    <span class="collapse-icon">▼</span>
-                </div>
-            </div>
-
-            <div class="test-content">
-            <div class="section-title">Stack Setup</div>
-            <div class="blind-setup">
-                <div class="blind-item"><label>Small Blind</label><div class="value">{format_number(sb)}</div></div>
-                <div class="blind-item"><label>Big Blind</label><div class="value">{format_number(bb)}</div></div>
-                <div class="blind-item"><label>Ante</label><div class="value">{format_number(ante)}</div></div>
-                <div class="blind-item"><label>Ante Order</label><div class="value">BB First</div></div>
-            </div>
-
-            <div class="ante-info-box">
-                ⚠️ BB posts {format_number(ante)} ante (dead money) first, then {format_number(bb)} blind (live money).
-            </div>
-
-            <div class="copy-instruction">📋 Copy and paste this into the app:</div>
-            <button class="copy-btn" onclick="copyPlayerData(this, `{player_data_text}`)">
-                <span>📋</span> Copy Player Data
-            </button>
-            <div class="player-data-box">
-<pre>{player_data_display}</pre>
-            </div>
-
-            <div class="section-title">Actions</div>
-            <div class="actions-section">
-                <div class="street-block">
-                    <div class="street-name">Preflop</div>
-"""
+    # Render HTML
+    parts = [render_case_header(tc_num, tc_id, test_name, complexity, badge_style, edge_case, sb, bb, ante,
+                                player_data_text, player_data_display)]
 
     # Add preflop actions
     for p in players:
         if p['position'] not in ['SB', 'BB']:
-            html += f'                    <div class="action-row"><span class="action-player">{p["name"]} ({p["position"]}):</span> <span class="action-type">Call</span> <span class="action-amount">{format_number(bb)}</span></div>\n'
-    html += f'                    <div class="action-row"><span class="action-player">{players[0]["name"]} (SB):</span> <span class="action-type">Call</span> <span class="action-amount">{format_number(bb - sb)}</span></div>\n'
-    html += f'                    <div class="action-row"><span class="action-player">{[p for p in players if p["position"] == "BB"][0]["name"]} (BB):</span> <span class="action-type">Check</span></div>\n'
-
-    html += """                </div>
-            </div>
+            parts.append(render_action_row(p['name'], p['position'], 'Call', bb))
+    parts.append(render_action_row(players[0]['name'], 'SB', 'Call', bb - sb))
+    parts.append(render_action_row([p for p in players if p['position'] == 'BB'][0]['name'], 'BB', 'Check'))
 
-            <div class="section-title">Pot Breakdown</div>
-            <div class="results-section">
-"""
-
-    html += f'                <div class="pot-summary">Total Pot: {format_number(total_pot)}</div>\n'
-    html += f"""                <div class="pot-item main">
-                    <div class="pot-name">Main Pot</div>
-                    <div class="pot-amount">{format_number(total_pot)} (100%)</div>
-                    <div class="eligible">Eligible: {", ".join([p['name'] for p in players])}</div>
-                </div>
-            </div>
-
-            <div class="section-title">Expected Results</div>
-            <table>
-                <thead>
-                    <tr><th>Player (Position)</th><th>Starting Stack</th><th>Final Stack</th><th>Total Contributed</th><th>Winner</th><th>New Stack</th></tr>
-                </thead>
-                <tbody>
-"""
+    parts.append(render_pot_breakdown(total_pot, [p['name'] for p in players]))
 
     for p in players:
-        contributed = p['stack'] - (p['final_stack'] if p['name'] != winner['name'] else p['final_stack'] - total_pot)
-        contributed_str = format_number(contributed)
+        is_winner = p['name'] == winner['name']
+        final_stack = p['final_stack'] - total_pot if is_winner else p['final_stack']
+        contributed_str = format_number(p['stack'] - final_stack)
 
         # Add contribution details
         if p['position'] == 'BB':
@@ -895,69 +998,43 @@ def generate_test_case(tc_num, batch_config):
         elif p['position'] == 'SB':
             contributed_str += f" ({format_number(sb)})"
 
-        winner_cell = ""
-        if p['name'] == winner['name']:
-            winner_cell = f"""<span class="winner-badge" onclick="toggleBreakdown(this)">
-                                    🏆 Main Pot <span class="expand-icon">▼</span>
-                                </span>
-                                <div class="breakdown-details" style="display:none;">
-                                    <div class="breakdown-line">Final Stack: {format_number(p['final_stack'] - total_pot)}</div>
-                                    <div class="breakdown-line">+ Main Pot: {format_number(total_pot)}</div>
-                                    <div class="breakdown-line total">= New Stack: {format_number(p['final_stack'])}</div>
-                                </div>"""
+        if is_winner:
+            winner_cell = render_winner_cell(final_stack, total_pot, p['final_stack'])
         else:
-            winner_cell = '<span class="winner-badge loser">-</span>'
+            winner_cell = LOSER_CELL
 
-        html += f"""                    <tr>
-                        <td>{p['name']} ({p['position']})</td><td>{format_number(p['stack'])}</td><td>{format_number(p['final_stack'] if p['name'] != winner['name'] else p['final_stack'] - total_pot)}</td><td>{contributed_str}</td>
-                        <td>
-                            {winner_cell}
-                        </td>
-                        <td>{format_number(p['final_stack'])}</td>
-                    </tr>
-"""
+        parts.append(render_result_row(p['name'], p['position'], p['stack'], final_stack, contributed_str,
+                                       winner_cell, p['final_stack']))
 
-    html += f"""                </tbody>
-            </table>
+    parts.append(render_case_footer(tc_id, test_name, winner['name'], next_hand_text, next_hand_display))
 
-            <div class="next-hand-preview">
-                <div class="next-hand-header">
-                    <div class="next-hand-title">📋 Next Hand Preview</div>
-                    <button class="copy-btn" onclick="copyPlayerData(this, `{next_hand_text}`)">
-                        <span>📋</span> Copy Next Hand
-                    </button>
-                </div>
-                <div class="next-hand-content">{next_hand_display}</div>
+    out.write("".join(parts))
 
-                <div class="comparison-section">
-                    <div class="comparison-header">🔍 Compare with Actual Output</div>
-                    <textarea id="actual-output-{tc_id.lower()}" class="comparison-textarea" placeholder="Paste the actual next hand output from your app here..." rows="8"></textarea>
-                    <div style="margin-bottom: 10px;">
-                        <button class="paste-btn" onclick="pasteFromClipboard(this, '{tc_id.lower()}')">
-                            📋 Paste from Clipboard
-                        </button>
-                        <button class="compare-btn" onclick="compareNextHand('{tc_id.lower()}', `{next_hand_text}`)">
-                            🔍 Compare
-                        </button>
-                    </div>
-                    <div id="comparison-result-{tc_id.lower()}" class="comparison-result"></div>
-                </div>
-            </div>
+def generate_test_case(tc_num, batch_config, master_seed=MASTER_SEED):
+    """Generate a single test case and return its HTML."""
+    out = io.StringIO()
+    write_test_case(out, tc_num, batch_config, master_seed)
+    return out.getvalue()
 
-            <div class="notes">
-                <div class="notes-title">Notes</div>
-                <div class="notes-text">{test_name}. All players call preflop. Winner: {winner['name']}.</div>
-            </div>
-            </div>
-        </div>
-"""
+def _generate_case_task(task):
+    """Process pool entry point: unpack (tc_num, batch_config, master_seed)."""
+    return generate_test_case(*task)
 
-    return html
+def iter_test_case_html(start_tc, end_tc, batch_config, master_seed=MASTER_SEED, executor=None):
+    """Yield test case HTML fragments for start_tc..end_tc in order.
 
-def generate_batch_html(batch_num, start_tc, end_tc, batch_config):
-    """Generate HTML file for a batch of test cases."""
+    With an executor the cases are generated in parallel; executor.map hands
+    back each fragment in submission order as soon as it (and every case before
+    it) is done, so the output is the same for any worker count.
+    """
+    tasks = [(tc_num, batch_config, master_seed) for tc_num in range(start_tc, end_tc + 1)]
+    if executor is None:
+        return map(_generate_case_task, tasks)
+    return executor.map(_generate_case_task, tasks, chunksize=CASE_CHUNKSIZE)
 
-    html = f"""<!DOCTYPE html>
+def render_batch_header(batch_num, start_tc, end_tc):
+    """Render the batch file head up to the first test case."""
+    return f"""<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
@@ -970,14 +1047,10 @@ def generate_batch_html(batch_num, start_tc, end_tc, batch_config):
 <body>
     <div class="container">
         <h1>Poker Pot Calculation Test Cases - Batch {batch_num}</h1>
-        <div class="subtitle">Test Cases {start_tc} - {end_tc} (100 test cases)</div>
+        <div class="subtitle">Test Cases {start_tc} - {end_tc} ({end_tc - start_tc + 1} test cases)</div>
 """
 
-    # Generate all test cases for this batch
-    for tc_num in range(start_tc, end_tc + 1):
-        html += generate_test_case(tc_num, batch_config)
-
-    html += f"""    </div>
+BATCH_FOOTER = f"""    </div>
 
     <script>
 {JAVASCRIPT_CODE}
@@ -985,17 +1058,49 @@ def generate_batch_html(batch_num, start_tc, end_tc, batch_config):
 </body>
 </html>"""
 
-    return html
+def write_batch_html(out, batch_num, start_tc, end_tc, batch_config, master_seed=MASTER_SEED, executor=None):
+    """Write the HTML file for a batch of test cases to out (a file handle or StringIO)."""
+    out.write(render_batch_header(batch_num, start_tc, end_tc))
 
-def generate_index_html():
-    """Generate index HTML with links to all batches."""
-    html = """<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Pot Test Cases Index</title>
-    <style>
+    # Generate all test cases for this batch, merging fragments in TC order
+    if executor is None:
+        for tc_num in range(start_tc, end_tc + 1):
+            write_test_case(out, tc_num, batch_config, master_seed)
+    else:
+        for fragment in iter_test_case_html(start_tc, end_tc, batch_config, master_seed, executor):
+            out.write(fragment)
+
+    out.write(BATCH_FOOTER)
+
+def generate_batch_html(batch_num, start_tc, end_tc, batch_config, master_seed=MASTER_SEED, executor=None):
+    """Generate HTML file for a batch of test cases."""
+    out = io.StringIO()
+    write_batch_html(out, batch_num, start_tc, end_tc, batch_config, master_seed, executor)
+    return out.getvalue()
+
+# Batch configurations for the 300-case suite; soak runs cycle through them
+BATCH_CONFIGS = {
+    1: {
+        'player_count': [15, 30, 55],  # Heads-up, Short-handed, Full ring
+        'complexity': [20, 40, 40],     # Simple, Medium, Complex
+        'stack_sizes': [33, 33, 34]     # Thousands, Hundreds of thousands, Millions
+    },
+    2: {
+        'player_count': [15, 30, 55],
+        'complexity': [20, 40, 40],
+        'stack_sizes': [33, 33, 34]
+    },
+    3: {
+        'player_count': [10, 20, 70],
+        'complexity': [20, 40, 40],
+        'stack_sizes': [34, 34, 32]
+    }
+}
+NUM_CASES = 300
+CASES_PER_BATCH = 100
+OUTPUT_DIR = "C:\\Apps\\HUDR\\HHTool_Modular\\docs"
+
+INDEX_STYLES = """
         body {
             font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
             margin: 0;
@@ -1114,7 +1219,65 @@ def generate_index_html():
         .distribution-item {
             padding: 5px 0;
         }
-    </style>
+"""
+
+def batch_config_for(batch_num):
+    """Batch config for any batch number; batches past the third reuse the three in turn."""
+    return BATCH_CONFIGS[(batch_num - 1) % len(BATCH_CONFIGS) + 1]
+
+def iter_batches(num_cases=NUM_CASES, cases_per_batch=CASES_PER_BATCH):
+    """Yield (batch_num, start_tc, end_tc) covering TC-1..TC-num_cases."""
+    for batch_num, start_tc in enumerate(range(1, num_cases + 1, cases_per_batch), start=1):
+        yield batch_num, start_tc, min(start_tc + cases_per_batch - 1, num_cases)
+
+def batch_file_name(batch_num):
+    return f"pot-test-cases-batch-{batch_num}.html"
+
+def batch_distribution(batch_config, num_cases):
+    """Expected case counts for a batch of num_cases, as the index page lists them."""
+    def scaled(weights):
+        total = sum(weights)
+        return [round(w * num_cases / total) for w in weights]
+
+    heads_up, short_handed, full_ring = scaled(batch_config['player_count'])
+    simple, medium, complex_ = scaled(batch_config['complexity'])
+    return [f"{heads_up} Heads-up (2P)", f"{simple} Simple cases",
+            f"{short_handed} Short-handed (3-6P)", f"{medium} Medium cases",
+            f"{full_ring} Full ring (7-9P)", f"{complex_} Complex cases"]
+
+def render_index_card(batch_num, start_tc, end_tc, href, distribution):
+    """Render one batch card of the index page."""
+    items = "".join(f"""                        <div class="distribution-item">• {item}</div>
+""" for item in distribution)
+    return f"""            <div class="batch-card" onclick="window.location.href='{href}'">
+                <div class="batch-title">📁 Batch {batch_num}</div>
+                <div class="batch-subtitle">Test Cases TC-{start_tc} through TC-{end_tc}</div>
+                <a href="{href}" class="batch-link">Open Batch {batch_num} →</a>
+
+                <div class="distribution">
+                    <div class="distribution-title">Distribution:</div>
+                    <div class="distribution-grid">
+{items}                    </div>
+                </div>
+            </div>
+"""
+
+def write_index_html(out, batches):
+    """Write the index page for batches, a list of (batch_num, start_tc, end_tc, href, distribution).
+
+    Cards are written one at a time, so the page for a soak run with
+    thousands of shard files is never held in memory.
+    """
+    total_cases = sum(end_tc - start_tc + 1 for _, start_tc, end_tc, _, _ in batches)
+    cases_per_batch = max((end_tc - start_tc + 1 for _, start_tc, end_tc, _, _ in batches), default=0)
+
+    out.write(f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Pot Test Cases Index</title>
+    <style>{INDEX_STYLES}    </style>
 </head>
 <body>
     <div class="container">
@@ -1125,80 +1288,33 @@ def generate_index_html():
             <div class="summary-title">📊 Test Suite Summary</div>
             <div class="summary-grid">
                 <div class="summary-item">
-                    <div class="number">300</div>
+                    <div class="number">{total_cases}</div>
                     <div class="label">Total Test Cases</div>
                 </div>
                 <div class="summary-item">
-                    <div class="number">3</div>
+                    <div class="number">{len(batches)}</div>
                     <div class="label">Batch Files</div>
                 </div>
                 <div class="summary-item">
-                    <div class="number">100</div>
+                    <div class="number">{cases_per_batch}</div>
                     <div class="label">Cases per Batch</div>
                 </div>
             </div>
         </div>
 
         <div class="batch-list">
-            <div class="batch-card" onclick="window.location.href='pot-test-cases-batch-1.html'">
-                <div class="batch-title">📁 Batch 1</div>
-                <div class="batch-subtitle">Test Cases TC-1 through TC-100</div>
-                <a href="pot-test-cases-batch-1.html" class="batch-link">Open Batch 1 →</a>
-
-                <div class="distribution">
-                    <div class="distribution-title">Distribution:</div>
-                    <div class="distribution-grid">
-                        <div class="distribution-item">• 15 Heads-up (2P)</div>
-                        <div class="distribution-item">• 20 Simple cases</div>
-                        <div class="distribution-item">• 30 Short-handed (3-6P)</div>
-                        <div class="distribution-item">• 40 Medium cases</div>
-                        <div class="distribution-item">• 55 Full ring (7-9P)</div>
-                        <div class="distribution-item">• 40 Complex cases</div>
-                    </div>
-                </div>
-            </div>
-
-            <div class="batch-card" onclick="window.location.href='pot-test-cases-batch-2.html'">
-                <div class="batch-title">📁 Batch 2</div>
-                <div class="batch-subtitle">Test Cases TC-101 through TC-200</div>
-                <a href="pot-test-cases-batch-2.html" class="batch-link">Open Batch 2 →</a>
-
-                <div class="distribution">
-                    <div class="distribution-title">Distribution:</div>
-                    <div class="distribution-grid">
-                        <div class="distribution-item">• 15 Heads-up (2P)</div>
-                        <div class="distribution-item">• 20 Simple cases</div>
-                        <div class="distribution-item">• 30 Short-handed (3-6P)</div>
-                        <div class="distribution-item">• 40 Medium cases</div>
-                        <div class="distribution-item">• 55 Full ring (7-9P)</div>
-                        <div class="distribution-item">• 40 Complex cases</div>
-                    </div>
-                </div>
-            </div>
+""")
+    for i, batch in enumerate(batches):
+        if i:
+            out.write("\n")
+        out.write(render_index_card(*batch))
 
-            <div class="batch-card" onclick="window.location.href='pot-test-cases-batch-3.html'">
-                <div class="batch-title">📁 Batch 3</div>
-                <div class="batch-subtitle">Test Cases TC-201 through TC-300</div>
-                <a href="pot-test-cases-batch-3.html" class="batch-link">Open Batch 3 →</a>
-
-                <div class="distribution">
-                    <div class="distribution-title">Distribution:</div>
-                    <div class="distribution-grid">
-                        <div class="distribution-item">• 10 Heads-up (2P)</div>
-                        <div class="distribution-item">• 20 Simple cases</div>
-                        <div class="distribution-item">• 20 Short-handed (3-6P)</div>
-                        <div class="distribution-item">• 40 Medium cases</div>
-                        <div class="distribution-item">• 70 Full ring (7-9P)</div>
-                        <div class="distribution-item">• 40 Complex cases</div>
-                    </div>
-                </div>
-            </div>
-        </div>
+    out.write(f"""        </div>
 
         <div class="summary-box" style="margin-top: 30px;">
             <div class="summary-title">ℹ️ About This Test Suite</div>
             <p style="line-height: 1.6; color: #666; margin: 0;">
-                This comprehensive test suite contains 300 poker pot calculation test cases designed to validate
+                This comprehensive test suite contains {total_cases} poker pot calculation test cases designed to validate
                 tournament poker rules including BB ante posting, side pots, all-in scenarios, and multi-street betting.
                 Each test case includes interactive features for copying player data, pasting actual outputs, and
                 comparing expected vs actual results.
@@ -1206,65 +1322,86 @@ def generate_index_html():
         </div>
     </div>
 </body>
-</html>"""
-
-    return html
-
-def main():
-    """Main function to generate all files."""
-
-    # Batch configurations
-    batch_configs = {
-        1: {
-            'player_count': [15, 30, 55],  # Heads-up, Short-handed, Full ring
-            'complexity': [20, 40, 40],     # Simple, Medium, Complex
-            'stack_sizes': [33, 33, 34]     # Thousands, Hundreds of thousands, Millions
-        },
-        2: {
-            'player_count': [15, 30, 55],
-            'complexity': [20, 40, 40],
-            'stack_sizes': [33, 33, 34]
-        },
-        3: {
-            'player_count': [10, 20, 70],
-            'complexity': [20, 40, 40],
-            'stack_sizes': [34, 34, 32]
-        }
-    }
-
-    # Set random seed for reproducibility
-    random.seed(42)
+</html>""")
+
+def generate_index_html(batches=None):
+    """Generate index HTML with links to all batches (default: the three 100-case batches)."""
+    if batches is None:
+        batches = [(batch_num, start_tc, end_tc, batch_file_name(batch_num),
+                    batch_distribution(batch_config_for(batch_num), end_tc - start_tc + 1))
+                   for batch_num, start_tc, end_tc in iter_batches()]
+    out = io.StringIO()
+    write_index_html(out, batches)
+    return out.getvalue()
+
+
+def parse_args(argv=None):
+    """Parse command line options."""
+    parser = argparse.ArgumentParser(description="Generate 300 poker pot calculation test cases.")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="Worker processes for case generation (0 = one per CPU, default: 1)")
+    parser.add_argument('--seed', type=int, default=MASTER_SEED,
+                        help=f"Master seed for per-case seeds (default: {MASTER_SEED})")
+    parser.add_argument('--cases', type=int, default=NUM_CASES,
+                        help=f"Total test cases, e.g. 100000 for a soak corpus (default: {NUM_CASES})")
+    parser.add_argument('--cases-per-batch', type=int, default=CASES_PER_BATCH,
+                        help=f"Test cases per batch file (default: {CASES_PER_BATCH})")
+    parser.add_argument('--out-dir', default=OUTPUT_DIR,
+                        help="Directory for the batch files and index")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    """Main function to generate all files.
+
+    Each case is written to its batch file as soon as it is generated and
+    only one batch file is open at a time, so memory stays flat for soak
+    corpora of any size (e.g. --cases 100000 gives 1,000 batch files).
+    """
+    args = parse_args(argv)
+    workers = args.workers or os.cpu_count() or 1
+    batches = list(iter_batches(args.cases, args.cases_per_batch))
+
+    # Every case seeds its own RNG from (seed, tc_num), so output is reproducible
+    # and byte-identical for any number of workers
+    executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    print(f"Master seed {args.seed}, {workers} worker(s), {args.cases} cases in {len(batches)} batch file(s)")
 
     # Generate batch files
-    for batch_num in range(1, 4):
-        start_tc = (batch_num - 1) * 100 + 1
-        end_tc = batch_num * 100
-
-        print(f"Generating Batch {batch_num} (TC-{start_tc} to TC-{end_tc})...")
-        html_content = generate_batch_html(batch_num, start_tc, end_tc, batch_configs[batch_num])
-
-        filename = f"C:\\Apps\\HUDR\\HHTool_Modular\\docs\\pot-test-cases-batch-{batch_num}.html"
-        with open(filename, 'w', encoding='utf-8') as f:
-            f.write(html_content)
-
-        file_size = len(html_content) / 1024 / 1024
-        print(f"[OK] Created {filename} ({file_size:.2f} MB)")
+    index_batches = []
+    total_size = 0
+    try:
+        for batch_num, start_tc, end_tc in batches:
+            batch_config = batch_config_for(batch_num)
+            print(f"Generating Batch {batch_num} (TC-{start_tc} to TC-{end_tc})...")
+            filename = os.path.join(args.out_dir, batch_file_name(batch_num))
+            with open(filename, 'w', encoding='utf-8') as f:
+                write_batch_html(f, batch_num, start_tc, end_tc, batch_config, args.seed, executor)
+
+            file_size = os.path.getsize(filename)
+            total_size += file_size
+            print(f"[OK] Created {filename} ({file_size / 1024 / 1024:.2f} MB)")
+            index_batches.append((batch_num, start_tc, end_tc, batch_file_name(batch_num),
+                                  batch_distribution(batch_config, end_tc - start_tc + 1)))
+    finally:
+        if executor is not None:
+            executor.shutdown()
 
     # Generate index file
     print("Generating index file...")
-    index_html = generate_index_html()
-    index_filename = "C:\\Apps\\HUDR\\HHTool_Modular\\docs\\pot-test-cases-index.html"
+    index_filename = os.path.join(args.out_dir, "pot-test-cases-index.html")
     with open(index_filename, 'w', encoding='utf-8') as f:
-        f.write(index_html)
+        write_index_html(f, index_batches)
 
-    index_size = len(index_html) / 1024
+    index_size = os.path.getsize(index_filename) / 1024
     print(f"[OK] Created {index_filename} ({index_size:.2f} KB)")
 
     print("\n[SUCCESS] All files generated successfully!")
     print("\nSummary:")
-    print("- Batch 1: TC-1 to TC-100")
-    print("- Batch 2: TC-101 to TC-200")
-    print("- Batch 3: TC-201 to TC-300")
+    if len(batches) <= 10:
+        for batch_num, start_tc, end_tc in batches:
+            print(f"- Batch {batch_num}: TC-{start_tc} to TC-{end_tc}")
+    else:
+        print(f"- Batches 1-{len(batches)}: TC-1 to TC-{args.cases} ({total_size / 1024 / 1024:.2f} MB)")
     print("- Index: Links to all batches")
 
 if __name__ == "__main__":
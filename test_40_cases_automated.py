@@ -9,17 +9,30 @@ This script automates the validation of all 40 poker hand test cases by:
 4. Validating the pot calculation matches expected values
 5. Generating a comprehensive test report
 
+Every UI transition (page load, parse done, view switched, action applied,
+pot rendered) waits on a WebDriverWait condition instead of a fixed sleep,
+and each step's latency is written to test-results/e2e-timings.json.
+
+--workers N shards the parsed cases across N Chrome sessions (headless by
+default when N > 1); each worker resets its session between cases and the
+results are merged into one report in TC order.
+
 Prerequisites:
 - pip install selenium webdriver-manager beautifulsoup4
 - Ensure dev server is running on http://localhost:3001 (npm run dev)
 
 Usage:
-python test_40_cases_automated.py
+python test_40_cases_automated.py [--workers N] [--limit N] [--headless]
 """
 
+import argparse
+import os
 import re
 import time
 import json
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
 from typing import List, Dict, Optional
 from dataclasses import dataclass
@@ -31,6 +44,11 @@ from selenium.webdriver.chrome.service import Service
 from webdriver_manager.chrome import ChromeDriverManager
 from bs4 import BeautifulSoup
 
+WAIT_TIMEOUT = 10  # Seconds before a UI transition counts as failed
+POLL_FREQUENCY = 0.05  # Seconds between condition checks
+
+POT_PATTERN = re.compile(r'Total Pot[^\d]*([\d,]+)')
+
 @dataclass
 class Player:
     name: str
@@ -190,37 +208,157 @@ class TestCaseParser:
         return actions
 
 
+def document_ready(driver):
+    """Condition: page finished loading"""
+    return driver.execute_script('return document.readyState') == 'complete'
+
+
+class page_text_changed:
+    """Condition: visible body text differs from a snapshot taken before an action"""
+
+    def __init__(self, before: str):
+        self.before = before
+
+    def __call__(self, driver):
+        return driver.find_element(By.TAG_NAME, 'body').text != self.before
+
+
+class text_outside_textarea:
+    """Condition: text is rendered somewhere other than the hand input textarea"""
+
+    def __init__(self, text: str):
+        self.locator = (By.XPATH, f"//body//*[not(self::textarea)][contains(text(), '{text}')]")
+
+    def __call__(self, driver):
+        elements = driver.find_elements(*self.locator)
+        return elements[0] if elements else False
+
+
+def pot_rendered(driver):
+    """Condition: a Total Pot element with a number is on screen; returns the amount"""
+    for element in driver.find_elements(By.XPATH, "//*[contains(text(), 'Total Pot')]"):
+        match = POT_PATTERN.search(element.text)
+        if match and element.is_displayed():
+            return int(match.group(1).replace(',', ''))
+    return False
+
+
+def build_timing_report(timings: List[Dict]) -> Dict:
+    """Per-step totals plus the raw step log"""
+    by_step = defaultdict(list)
+    for entry in timings:
+        by_step[entry['step']].append(entry['seconds'])
+
+    steps = {
+        step: {
+            'count': len(seconds),
+            'total_seconds': round(sum(seconds), 4),
+            'mean_seconds': round(sum(seconds) / len(seconds), 4),
+            'max_seconds': max(seconds)
+        }
+        for step, seconds in sorted(by_step.items(), key=lambda item: -sum(item[1]))
+    }
+    return {
+        'total_seconds': round(sum(entry['seconds'] for entry in timings), 4),
+        'steps': steps,
+        'log': timings
+    }
+
+
 class E2ETestRunner:
     """Automated E2E test runner using Selenium"""
 
-    def __init__(self, base_url: str = 'http://localhost:3001'):
+    def __init__(self, base_url: str = 'http://localhost:3001', timeout: float = WAIT_TIMEOUT):
         self.base_url = base_url
+        self.timeout = timeout
         self.driver = None
-
-    def setup(self):
+        self.wait = None
+        self.timings: List[Dict] = []
+        self.current_tc: Optional[int] = None
+
+    @contextmanager
+    def timed(self, step: str):
+        """Record the wall-clock latency of one step of the current test case"""
+        start = time.perf_counter()
+        error = None
+        try:
+            yield
+        except Exception as e:
+            error = type(e).__name__
+            raise
+        finally:
+            self.timings.append({
+                'tc_id': self.current_tc,
+                'step': step,
+                'seconds': round(time.perf_counter() - start, 4),
+                'error': error
+            })
+
+    def wait_for(self, condition, step: str):
+        """Block until condition holds (or the timeout expires) and return its value"""
+        with self.timed(step):
+            return self.wait.until(condition, message=f"Timed out waiting for: {step}")
+
+    def click_and_wait(self, locator, step: str):
+        """Click an element once clickable, then wait until the page reacts"""
+        button = self.wait_for(EC.element_to_be_clickable(locator), f"{step} (clickable)")
+        before = self.driver.find_element(By.TAG_NAME, 'body').text
+        button.click()
+        return self.wait_for(page_text_changed(before), step)
+
+    def timing_report(self) -> Dict:
+        """Per-step totals plus the raw step log"""
+        return build_timing_report(self.timings)
+
+    def setup(self, headless: bool = False, driver_path: Optional[str] = None):
         """Initialize Selenium WebDriver"""
         print("🚀 Initializing Chrome WebDriver...")
         options = webdriver.ChromeOptions()
-        # options.add_argument('--headless')  # Uncomment for headless mode
+        if headless:
+            options.add_argument('--headless=new')
+            options.add_argument('--disable-gpu')
+            options.add_argument('--disable-dev-shm-usage')
         options.add_argument('--window-size=1920,1080')
 
-        service = Service(ChromeDriverManager().install())
+        service = Service(driver_path or ChromeDriverManager().install())
         self.driver = webdriver.Chrome(service=service, options=options)
-        self.driver.implicitly_wait(10)
+        # Explicit waits only: an implicit wait would stretch every negative lookup
+        self.driver.implicitly_wait(0)
+        self.wait = WebDriverWait(self.driver, self.timeout, poll_frequency=POLL_FREQUENCY)
 
     def teardown(self):
         """Close WebDriver"""
         if self.driver:
             self.driver.quit()
 
+    def reset_session(self):
+        """Drop cookies and web storage so the next case starts from a clean app state"""
+        if not self.driver.current_url.startswith(self.base_url):
+            return
+        with self.timed('session reset'):
+            self.driver.delete_all_cookies()
+            self.driver.execute_script('window.localStorage.clear(); window.sessionStorage.clear();')
+
+    def run_shard(self, test_cases: List[TestCase]) -> List[Dict]:
+        """Run a worker's share of the test cases in one browser session"""
+        results = []
+        for tc in test_cases:
+            self.reset_session()
+            results.append(self.run_test_case(tc))
+        return results
+
     def run_test_case(self, tc: TestCase) -> Dict:
         """Run a single test case and return results"""
         print(f"\n🧪 Running TC-{tc.id}: {len(tc.players)} players, Expected Pot: ${tc.expected_pot:,}")
+        self.current_tc = tc.id
+        start = time.perf_counter()
 
         try:
             # Navigate to app
-            self.driver.get(self.base_url)
-            time.sleep(1)
+            with self.timed('navigate'):
+                self.driver.get(self.base_url)
+            self.wait_for(document_ready, 'page load')
+            self.wait_for(EC.presence_of_element_located((By.CSS_SELECTOR, 'textarea')), 'input ready')
 
             # Input hand data
             self._input_hand_data(tc)
@@ -239,7 +377,8 @@ class E2ETestRunner:
                 'passed': passed,
                 'expected_pot': tc.expected_pot,
                 'actual_pot': actual_pot,
-                'error': None
+                'error': None,
+                'seconds': round(time.perf_counter() - start, 4)
             }
 
             if passed:
@@ -256,7 +395,8 @@ class E2ETestRunner:
                 'passed': False,
                 'expected_pot': tc.expected_pot,
                 'actual_pot': 0,
-                'error': str(e)
+                'error': str(e),
+                'seconds': round(time.perf_counter() - start, 4)
             }
 
     def _input_hand_data(self, tc: TestCase):
@@ -270,58 +410,110 @@ class E2ETestRunner:
             hand_input += f"{player.name} {player.position} ${player.stack:,}\n"
 
         # Find and fill textarea
-        textarea = self.driver.find_element(By.CSS_SELECTOR, 'textarea')
-        textarea.clear()
-        textarea.send_keys(hand_input)
-
-        # Click Parse button
-        parse_button = self.driver.find_element(By.XPATH, "//button[contains(text(), 'Parse')]")
+        with self.timed('type hand'):
+            textarea = self.driver.find_element(By.CSS_SELECTOR, 'textarea')
+            textarea.clear()
+            textarea.send_keys(hand_input)
+
+        # Click Parse button; parsing is done once the players render outside the textarea
+        parse_button = self.wait_for(
+            EC.element_to_be_clickable((By.XPATH, "//button[contains(text(), 'Parse')]")), 'parse (clickable)'
+        )
         parse_button.click()
-        time.sleep(0.5)
+        if tc.players:
+            self.wait_for(text_outside_textarea(tc.players[0].name), 'parse')
 
     def _execute_preflop_actions(self, actions: List[Action]):
         """Execute preflop actions"""
-        # Navigate to Pre-Flop view
-        preflop_button = self.driver.find_element(By.XPATH, "//button[contains(text(), 'Pre-Flop')]")
+        # Navigate to Pre-Flop view; switched once an action button is clickable
+        preflop_button = self.wait_for(
+            EC.element_to_be_clickable((By.XPATH, "//button[contains(text(), 'Pre-Flop')]")), 'pre-flop (clickable)'
+        )
         preflop_button.click()
-        time.sleep(0.3)
+        self.wait_for(
+            EC.element_to_be_clickable((By.XPATH, "//button[contains(text(), 'Fold') or contains(text(), 'Call') "
+                                                  "or contains(text(), 'Check')]")),
+            'view switch: pre-flop'
+        )
 
         for action in actions:
             # Find player's action section (this selector may need adjustment based on your app's HTML structure)
             # For now, using a simplified approach
 
             if action.action == 'fold':
-                button = self.driver.find_element(By.XPATH, f"//button[contains(text(), 'Fold')]")
-                button.click()
+                self.click_and_wait((By.XPATH, "//button[contains(text(), 'Fold')]"), 'action: fold')
             elif action.action == 'call':
-                button = self.driver.find_element(By.XPATH, f"//button[contains(text(), 'Call')]")
-                button.click()
+                self.click_and_wait((By.XPATH, "//button[contains(text(), 'Call')]"), 'action: call')
             elif action.action == 'check':
-                button = self.driver.find_element(By.XPATH, f"//button[contains(text(), 'Check')]")
-                button.click()
+                self.click_and_wait((By.XPATH, "//button[contains(text(), 'Check')]"), 'action: check')
             elif action.action == 'raise' and action.amount:
                 # Input raise amount
                 # This needs to be adjusted based on your app's structure
                 pass
 
-            time.sleep(0.2)
-
     def _get_pot_calculation(self) -> int:
         """Get pot calculation from Pot view"""
         # Navigate to Pot view
-        pot_button = self.driver.find_element(By.XPATH, "//button[contains(text(), 'Pot')]")
+        pot_button = self.wait_for(
+            EC.element_to_be_clickable((By.XPATH, "//button[contains(text(), 'Pot')]")), 'pot view (clickable)'
+        )
         pot_button.click()
-        time.sleep(0.5)
 
-        # Extract total pot (this selector may need adjustment)
-        pot_text = self.driver.find_element(By.XPATH, "//*[contains(text(), 'Total Pot')]").text
-        match = re.search(r'[\d,]+', pot_text)
-        if match:
-            return int(match.group().replace(',', ''))
-        return 0
+        # Extract total pot once it has rendered (this selector may need adjustment)
+        return self.wait_for(pot_rendered, 'pot rendered')
+
+
+def run_worker(test_cases: List[TestCase], base_url: str, headless: bool,
+               driver_path: Optional[str]) -> tuple:
+    """Worker pool entry point: own WebDriver, own shard, returns (results, timings)"""
+    runner = E2ETestRunner(base_url)
+    runner.setup(headless=headless, driver_path=driver_path)
+    try:
+        return runner.run_shard(test_cases), runner.timings
+    finally:
+        runner.teardown()
+
+
+def run_parallel(test_cases: List[TestCase], workers: int, base_url: str = 'http://localhost:3001',
+                 headless: bool = True) -> tuple:
+    """
+    Shard test cases round-robin across workers Chrome sessions and merge the results.
+
+    Returns (results sorted by tc_id, timing report for all workers).
+    """
+    workers = max(1, min(workers, len(test_cases)))
+    shards = [test_cases[i::workers] for i in range(workers)]
+    # Resolve the driver once; concurrent installs race on the download cache
+    driver_path = ChromeDriverManager().install()
+
+    results, timings = [], []
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(run_worker, shard, base_url, headless, driver_path) for shard in shards]
+        for worker_id, future in enumerate(futures):
+            shard_results, shard_timings = future.result()
+            results.extend(shard_results)
+            timings.extend(dict(entry, worker=worker_id) for entry in shard_timings)
+
+    results.sort(key=lambda r: r['tc_id'])
+    return results, build_timing_report(timings)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Run the 40 QA test cases against the running app')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Parallel Chrome sessions (0 = one per CPU, default: 1)')
+    parser.add_argument('--limit', type=int, default=5,
+                        help='Number of test cases to run (0 = all, default: 5)')
+    parser.add_argument('--headless', action='store_true',
+                        help='Run Chrome headless (always on with more than one worker)')
+    parser.add_argument('--base-url', default='http://localhost:3001')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    workers = args.workers or os.cpu_count() or 1
 
-
-def main():
     print("="*80)
     print("🧪 AUTOMATED E2E TESTING - 40 QA TEST CASES")
     print("="*80)
@@ -332,19 +524,24 @@ def main():
     test_cases = parser.parse_all()
 
     print(f"\n📋 Loaded {len(test_cases)} test cases\n")
-
-    # Initialize test runner
-    runner = E2ETestRunner()
-    runner.setup()
+    if args.limit:
+        test_cases = test_cases[:args.limit]
 
     # Run tests
-    results = []
-    for tc in test_cases[:5]:  # Start with first 5 test cases
-        result = runner.run_test_case(tc)
-        results.append(result)
-
-    # Cleanup
-    runner.teardown()
+    start = time.perf_counter()
+    if workers > 1:
+        print(f"🧵 Sharding {len(test_cases)} test cases across {workers} headless workers")
+        results, timing_report = run_parallel(test_cases, workers, args.base_url)
+    else:
+        runner = E2ETestRunner(args.base_url)
+        runner.setup(headless=args.headless)
+        try:
+            results = runner.run_shard(test_cases)
+        finally:
+            runner.teardown()
+        timing_report = runner.timing_report()
+    timing_report['wall_seconds'] = round(time.perf_counter() - start, 4)
+    timing_report['workers'] = workers
 
     # Generate report
     print("\n" + "="*80)
@@ -358,6 +555,7 @@ def main():
     print(f"✅ Passed: {passed}")
     print(f"❌ Failed: {failed}")
     print(f"Pass Rate: {(passed/len(results)*100):.1f}%")
+    print(f"Wall time: {timing_report['wall_seconds']:.1f}s with {workers} worker(s)")
 
     # Save detailed results
     output_file = 'test-results/e2e-results.json'
@@ -367,6 +565,15 @@ def main():
 
     print(f"\n💾 Detailed results saved to: {output_file}")
 
+    # Save per-step latencies
+    timing_file = 'test-results/e2e-timings.json'
+    with open(timing_file, 'w') as f:
+        json.dump(timing_report, f, indent=2)
+
+    print(f"⏱️  Step timings saved to: {timing_file}")
+    for step, stats in list(timing_report['steps'].items())[:5]:
+        print(f"   {step}: {stats['total_seconds']:.2f}s total, {stats['mean_seconds']:.3f}s mean over {stats['count']}")
+
     return 0 if failed == 0 else 1
 
 
@@ -3,9 +3,13 @@
 Validates all 30 test cases against the 7 critical rules from TEST_CASE_GENERATION_SPEC.md
 """
 
-import re
-from typing import Dict, List, Tuple
+import sys
 from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterator, List, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent / 'docs' / 'QA'))
+from testcase_stream import TestCaseRecord, iter_test_cases, parse_number
 
 @dataclass
 class Player:
@@ -25,167 +29,52 @@ class ValidationResult:
     no_negative_stacks: Tuple[bool, str]
     contributions: Tuple[bool, str]
 
-def parse_html_file(filepath: str) -> str:
-    """Read the HTML file"""
-    with open(filepath, 'r', encoding='utf-8') as f:
-        return f.read()
-
-def extract_test_cases(html_content: str) -> List[Dict]:
-    """Extract all test cases from HTML"""
-    test_cases = []
-
-    # Split by test case markers
-    tc_pattern = r'<!-- TEST CASE (\d+) -->(.*?)(?=<!-- TEST CASE \d+ -->|</body>)'
-    matches = re.findall(tc_pattern, html_content, re.DOTALL)
-
-    for tc_num, tc_content in matches:
-        test_cases.append({
-            'id': f'TC-{tc_num}',
-            'content': tc_content
-        })
+def extract_test_cases(filepath: str) -> Iterator[TestCaseRecord]:
+    """Stream all test cases from the HTML file in a single pass"""
+    return iter_test_cases(filepath)
 
-    return test_cases
-
-def parse_stack_setup(content: str) -> List[Player]:
+def parse_stack_setup(tc: TestCaseRecord) -> List[Player]:
     """Extract stack setup players"""
-    players = []
-
-    # Find the Stack Setup section
-    setup_match = re.search(r'<div class="section-title">Stack Setup</div>.*?<div class="player-data-box">.*?<pre>(.*?)</pre>', content, re.DOTALL)
-    if not setup_match:
-        return players
-
-    setup_text = setup_match.group(1)
-    lines = setup_text.strip().split('\n')
+    return [Player(name=e.name, position=e.position, stack=e.stack) for e in tc.stack_setup]
 
-    # Skip header lines (Hand, timestamps, blinds, "Stack Setup:")
-    for line in lines:
-        line = line.strip()
-        if not line or 'Hand' in line or 'started_at' in line or ('SB ' in line and 'BB ' in line and 'Ante' in line) or line == 'Stack Setup:':
-            continue
-
-        # Parse player lines: "PlayerName Position Stack" or "PlayerName Stack"
-        parts = line.split()
-        if len(parts) >= 2:
-            name = parts[0]
-            # Check if second part is a position or a number
-            if parts[1].replace(',', '').isdigit():
-                # No position
-                position = ""
-                stack = int(parts[1].replace(',', ''))
-            else:
-                # Has position
-                position = parts[1]
-                stack = int(parts[2].replace(',', '')) if len(parts) > 2 else 0
-
-            players.append(Player(name=name, position=position, stack=stack))
-
-    return players
-
-def parse_next_hand(content: str) -> List[Player]:
+def parse_next_hand(tc: TestCaseRecord) -> List[Player]:
     """Extract next hand players"""
-    players = []
-
-    # Find the Next Hand Preview section
-    next_hand_match = re.search(r'<div class="next-hand-content"[^>]*>(.*?)</div>', content, re.DOTALL)
-    if not next_hand_match:
-        return players
+    return [Player(name=e.name, position=e.position, stack=e.stack) for e in tc.next_hand]
 
-    next_hand_text = next_hand_match.group(1).strip()
-    lines = next_hand_text.split('\n')
-
-    for line in lines:
-        line = line.strip()
-        if not line or 'Hand' in line or 'started_at' in line or ('SB ' in line and 'BB ' in line and 'Ante' in line) or line == 'Stack Setup:':
-            continue
-
-        # Parse player lines
-        parts = line.split()
-        if len(parts) >= 2:
-            name = parts[0]
-            if parts[1].replace(',', '').replace('-', '').isdigit():
-                position = ""
-                stack = int(parts[1].replace(',', ''))
-            else:
-                position = parts[1]
-                stack = int(parts[2].replace(',', '')) if len(parts) > 2 else 0
-
-            players.append(Player(name=name, position=position, stack=stack))
-
-    return players
-
-def parse_expected_results(content: str) -> Dict:
+def parse_expected_results(tc: TestCaseRecord) -> Dict:
     """Parse the expected results table"""
     results = {}
 
-    # Find the table
-    table_match = re.search(r'<table>(.*?)</table>', content, re.DOTALL)
-    if not table_match:
-        return results
-
-    table_html = table_match.group(1)
-
-    # Extract rows
-    row_pattern = r'<tr>(.*?)</tr>'
-    rows = re.findall(row_pattern, table_html, re.DOTALL)
-
-    for row in rows[1:]:  # Skip header
-        # Extract cells
-        cell_pattern = r'<td[^>]*>(.*?)</td>'
-        cells = re.findall(cell_pattern, row, re.DOTALL)
-
-        if len(cells) >= 4:
-            # Clean up HTML tags
-            player_cell = re.sub(r'<[^>]+>', '', cells[0]).strip()
-            # Extract player name and position
-            player_match = re.match(r'(\w+)\s*\(([^)]+)\)', player_cell)
-            if player_match:
-                player_name = player_match.group(1)
-                position = player_match.group(2)
-
-                starting = re.sub(r'[^\d]', '', cells[1])
-                final = re.sub(r'[^\d-]', '', cells[2])
-                contributed = re.sub(r'[^\d]', '', cells[3])
-
-                # Handle negative numbers for final stack
-                final_str = cells[2].strip()
-                if '-' in final_str or '−' in final_str:
-                    final_val = -int(re.sub(r'[^\d]', '', final_str))
-                else:
-                    final_val = int(final) if final else 0
-
-                results[player_name] = {
-                    'position': position,
-                    'starting': int(starting) if starting else 0,
-                    'final': final_val,
-                    'contributed': int(contributed) if contributed else 0
-                }
+    for row in tc.results:
+        results[row.name] = {
+            'position': row.position,
+            'starting': row.starting_stack,
+            'final': row.final_stack,
+            'contributed': row.contributed or 0
+        }
 
     return results
 
-def parse_pots_won(content: str) -> Dict[str, int]:
-    """Parse pots won by each player from winner badges"""
+def parse_pots_won(tc: TestCaseRecord) -> Dict[str, int]:
+    """Parse pots won by each player from winner badge breakdowns"""
     winners = {}
 
-    # Find all winner badge breakdowns with player names
-    # Pattern: id="PlayerName-breakdown"
-    breakdown_pattern = r'<div id="(\w+)-breakdown"[^>]*class="breakdown-details"[^>]*>(.*?)</div>\s*</div>'
-    breakdowns = re.findall(breakdown_pattern, content, re.DOTALL)
-
-    for player_name, breakdown_text in breakdowns:
-        # Extract total from breakdown
-        total_match = re.search(r'<div class="breakdown-line total">.*?Total:\s*\+\s*([\d,]+)', breakdown_text, re.DOTALL)
-        if total_match:
-            winners[player_name] = int(total_match.group(1).replace(',', ''))
+    for row in tc.results:
+        if not row.is_winner:
+            continue
+        # Breakdown lines look like "+ Main Pot: 16,500"
+        won = [parse_number(line.split(':', 1)[1]) for line in row.breakdown if line.startswith('+') and ':' in line]
+        if won:
+            winners[row.name] = sum(w for w in won if w is not None)
 
     return winners
 
-def validate_winner_stacks(tc_id: str, content: str) -> Tuple[bool, str]:
+def validate_winner_stacks(tc_id: str, tc: TestCaseRecord) -> Tuple[bool, str]:
     """Rule 1: Winners must show NEW Stack (Final Stack + Pots Won)"""
 
-    results = parse_expected_results(content)
-    pots_won = parse_pots_won(content)
-    next_hand = parse_next_hand(content)
+    results = parse_expected_results(tc)
+    pots_won = parse_pots_won(tc)
+    next_hand = parse_next_hand(tc)
 
     if not results or not next_hand:
         return (True, "Cannot validate - missing data")
@@ -206,11 +95,11 @@ def validate_winner_stacks(tc_id: str, content: str) -> Tuple[bool, str]:
         return (False, "; ".join(errors))
     return (True, "All winners show correct new stacks")
 
-def validate_all_players_present(tc_id: str, content: str) -> Tuple[bool, str]:
+def validate_all_players_present(tc_id: str, tc: TestCaseRecord) -> Tuple[bool, str]:
     """Rule 2: ALL players must appear in Next Hand Preview"""
 
-    results = parse_expected_results(content)
-    next_hand = parse_next_hand(content)
+    results = parse_expected_results(tc)
+    next_hand = parse_next_hand(tc)
 
     if not results or not next_hand:
         return (True, "Cannot validate - missing data")
@@ -225,11 +114,11 @@ def validate_all_players_present(tc_id: str, content: str) -> Tuple[bool, str]:
 
     return (True, f"All {len(result_players)} players present")
 
-def validate_position_labels(tc_id: str, content: str) -> Tuple[bool, str]:
+def validate_position_labels(tc_id: str, tc: TestCaseRecord) -> Tuple[bool, str]:
     """Rule 3: Only show Dealer, SB, BB positions"""
 
-    stack_setup = parse_stack_setup(content)
-    next_hand = parse_next_hand(content)
+    stack_setup = parse_stack_setup(tc)
+    next_hand = parse_next_hand(tc)
 
     all_players = stack_setup + next_hand
     forbidden_positions = ['UTG', 'UTG+1', 'UTG+2', 'MP', 'CO', 'HJ']
@@ -244,11 +133,11 @@ def validate_position_labels(tc_id: str, content: str) -> Tuple[bool, str]:
 
     return (True, "Only Dealer/SB/BB positions used")
 
-def validate_button_rotation(tc_id: str, content: str) -> Tuple[bool, str]:
+def validate_button_rotation(tc_id: str, tc: TestCaseRecord) -> Tuple[bool, str]:
     """Rule 4: Previous SB → New Dealer, Previous BB → New SB, Button moves clockwise"""
 
-    stack_setup = parse_stack_setup(content)
-    next_hand = parse_next_hand(content)
+    stack_setup = parse_stack_setup(tc)
+    next_hand = parse_next_hand(tc)
 
     if not stack_setup or not next_hand:
         return (True, "Cannot validate - missing data")
@@ -293,7 +182,7 @@ def validate_button_rotation(tc_id: str, content: str) -> Tuple[bool, str]:
         # 3-player: Dealer → BB
         if current_dealer and next_bb:
             if current_dealer.name != next_bb.name:
-                results = parse_expected_results(content)
+                results = parse_expected_results(tc)
                 if current_dealer.name in results and results[current_dealer.name]['final'] == 0:
                     # Dealer was eliminated
                     pass
@@ -307,7 +196,7 @@ def validate_button_rotation(tc_id: str, content: str) -> Tuple[bool, str]:
             expected_new_bb = stack_setup[bb_index + 1].name
             if next_bb and next_bb.name != expected_new_bb:
                 # Check if expected player was eliminated
-                results = parse_expected_results(content)
+                results = parse_expected_results(tc)
                 if expected_new_bb in results and results[expected_new_bb]['final'] == 0:
                     # Expected BB was eliminated, check next player
                     pass
@@ -319,10 +208,10 @@ def validate_button_rotation(tc_id: str, content: str) -> Tuple[bool, str]:
 
     return (True, "Button rotated correctly")
 
-def validate_stack_setup_order(tc_id: str, content: str) -> Tuple[bool, str]:
+def validate_stack_setup_order(tc_id: str, tc: TestCaseRecord) -> Tuple[bool, str]:
     """Rule 5: Must start with Dealer (except heads-up)"""
 
-    stack_setup = parse_stack_setup(content)
+    stack_setup = parse_stack_setup(tc)
 
     if not stack_setup:
         return (True, "Cannot validate - no stack setup")
@@ -340,10 +229,10 @@ def validate_stack_setup_order(tc_id: str, content: str) -> Tuple[bool, str]:
     else:
         return (False, f"Should start with Dealer, got {stack_setup[0].position or 'no position'}")
 
-def validate_no_negative_stacks(tc_id: str, content: str) -> Tuple[bool, str]:
+def validate_no_negative_stacks(tc_id: str, tc: TestCaseRecord) -> Tuple[bool, str]:
     """Rule 6: Final Stack can never be negative"""
 
-    results = parse_expected_results(content)
+    results = parse_expected_results(tc)
 
     errors = []
     for player, data in results.items():
@@ -355,15 +244,15 @@ def validate_no_negative_stacks(tc_id: str, content: str) -> Tuple[bool, str]:
 
     return (True, "No negative stacks")
 
-def validate_test_case(tc_id: str, content: str) -> ValidationResult:
+def validate_test_case(tc_id: str, tc: TestCaseRecord) -> ValidationResult:
     """Validate a single test case against all 7 rules"""
 
-    winner_stacks = validate_winner_stacks(tc_id, content)
-    all_players = validate_all_players_present(tc_id, content)
-    position_labels = validate_position_labels(tc_id, content)
-    button_rotation = validate_button_rotation(tc_id, content)
-    stack_setup_order = validate_stack_setup_order(tc_id, content)
-    no_negative_stacks = validate_no_negative_stacks(tc_id, content)
+    winner_stacks = validate_winner_stacks(tc_id, tc)
+    all_players = validate_all_players_present(tc_id, tc)
+    position_labels = validate_position_labels(tc_id, tc)
+    button_rotation = validate_button_rotation(tc_id, tc)
+    stack_setup_order = validate_stack_setup_order(tc_id, tc)
+    no_negative_stacks = validate_no_negative_stacks(tc_id, tc)
     contributions = (True, "Already validated")
 
     passed = all([
@@ -391,24 +280,18 @@ def validate_test_case(tc_id: str, content: str) -> ValidationResult:
 def main():
     filepath = r'C:\Apps\HUDR\HHTool_Modular\docs\QA\30_base_validated_cases.html'
 
-    print("Reading HTML file...")
-    html_content = parse_html_file(filepath)
-
-    print("Extracting test cases...")
-    test_cases = extract_test_cases(html_content)
-
-    print(f"Found {len(test_cases)} test cases\n")
+    print("Streaming test cases...")
     print("=" * 80)
 
     results = []
     failed_cases = []
     passed_cases = []
 
-    for tc in test_cases:
-        tc_id = tc['id']
+    for tc in extract_test_cases(filepath):
+        tc_id = tc.tc_id
         print(f"\nValidating {tc_id}...")
 
-        result = validate_test_case(tc_id, tc['content'])
+        result = validate_test_case(tc_id, tc)
         results.append(result)
 
         status = "PASS" if result.passed else "FAIL"
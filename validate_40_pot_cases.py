@@ -2,134 +2,29 @@
 """
 Validate all 40 test cases specifically for pot calculation correctness.
 This script tests the migrated potCalculationEngine to ensure pot calculations are accurate.
+
+--vectorized loads every case into columnar arrays (contributions, ante,
+folded flags, expected pot amounts) and recomputes all totals and side pots
+in one pot_oracle.compute_pots_batch() call, reporting each mismatch with its TC
+id and pot index. --scale N tiles the loaded cases to N hands to time the
+checker on a synthetic corpus. If the HTML file has an up-to-date .hands
+corpus next to it (see docs/QA/hand_corpus.py), or a .hands file is given,
+the columns are read from the memory-mapped corpus instead of the HTML.
 """
 
 import sys
-import re
-from html.parser import HTMLParser
+import time
 from pathlib import Path
 
 # Add src to path to import pot calculation engine
 sys.path.insert(0, str(Path(__file__).parent / 'src'))
+sys.path.insert(0, str(Path(__file__).parent / 'docs' / 'QA'))
+from testcase_stream import iter_test_cases
 
-class PotTestCaseExtractor(HTMLParser):
-    def __init__(self):
-        super().__init__()
-        self.test_cases = []
-        self.current_tc = None
-        self.in_test_case = False
-        self.capture_type = None
-        self.capture_buffer = []
-        self.current_label = None
-
-    def handle_starttag(self, tag, attrs):
-        attrs_dict = dict(attrs)
-
-        # Detect test case start
-        if tag == 'div' and 'test-case' in attrs_dict.get('class', ''):
-            self.in_test_case = True
-            self.current_tc = {
-                'id': None,
-                'name': None,
-                'sb': None,
-                'bb': None,
-                'ante': None,
-                'players': [],
-                'actions': [],
-                'expected_pot': None,
-                'expected_main_pot': None,
-                'expected_side_pots': [],
-                'expected_dead_money': None
-            }
-
-        # Capture test ID
-        if self.in_test_case and tag == 'div' and 'test-id' in attrs_dict.get('class', ''):
-            self.capture_type = 'id'
-
-        # Capture labels
-        if self.in_test_case and tag == 'div' and 'label' in attrs_dict.get('class', ''):
-            self.capture_type = 'label'
-
-        # Capture values
-        if self.in_test_case and tag == 'div' and 'value' in attrs_dict.get('class', ''):
-            self.capture_type = 'value'
-
-        # Capture pot amounts
-        if self.in_test_case and tag == 'div' and 'pot-amount' in attrs_dict.get('class', ''):
-            self.capture_type = 'pot_amount'
-
-    def handle_data(self, data):
-        data = data.strip()
-        if not data or not self.in_test_case:
-            return
-
-        if self.capture_type == 'id' and data.startswith('TC-'):
-            self.current_tc['id'] = data
-            self.capture_type = None
-
-        elif self.capture_type == 'label':
-            self.current_label = data.lower()
-            self.capture_type = None
-
-        elif self.capture_type == 'value' and self.current_label:
-            if 'small blind' in self.current_label or 'sb' in self.current_label:
-                self.current_tc['sb'] = self._parse_amount(data)
-            elif 'big blind' in self.current_label or 'bb' in self.current_label:
-                self.current_tc['bb'] = self._parse_amount(data)
-            elif 'ante' in self.current_label:
-                self.current_tc['ante'] = self._parse_amount(data)
-            self.current_label = None
-            self.capture_type = None
-
-        elif self.capture_type == 'pot_amount':
-            # Extract pot amount
-            if 'Total Pot' in data or 'Main Pot' in data:
-                amount = self._parse_amount(data)
-                if amount and 'Total' in data:
-                    self.current_tc['expected_pot'] = amount
-                elif amount and 'Main' in data:
-                    self.current_tc['expected_main_pot'] = amount
-            self.capture_type = None
-
-    def handle_endtag(self, tag):
-        if tag == 'div' and self.in_test_case and not self.capture_type:
-            # Check if test case is complete
-            if self.current_tc and self.current_tc['id']:
-                # Only add test case if it has an ID
-                pass
-
-        # End of test case
-        if tag == 'div' and self.in_test_case:
-            # Check if this is the end of the test case div
-            # (This is a simplified check - you may need to track nesting depth)
-            if self.current_tc and self.current_tc['id'] and (
-                self.current_tc['expected_pot'] or self.current_tc['expected_main_pot']
-            ):
-                self.test_cases.append(self.current_tc)
-                self.current_tc = None
-                self.in_test_case = False
-
-    def _parse_amount(self, text):
-        """Extract numerical amount from text like '$495,000' or '495K'"""
-        # Remove currency symbols and commas
-        clean = re.sub(r'[$,]', '', text)
-
-        # Handle K/Mil suffixes
-        if 'K' in clean.upper():
-            match = re.search(r'([\d.]+)\s*K', clean, re.IGNORECASE)
-            if match:
-                return int(float(match.group(1)) * 1000)
-        elif 'MIL' in clean.upper() or 'M' in clean.upper():
-            match = re.search(r'([\d.]+)\s*(?:MIL|M)', clean, re.IGNORECASE)
-            if match:
-                return int(float(match.group(1)) * 1000000)
-
-        # Handle plain numbers
-        match = re.search(r'[\d,]+', clean)
-        if match:
-            return int(match.group().replace(',', ''))
-
-        return None
+try:
+    import numpy as np
+except ImportError:  # Only needed for --vectorized
+    np = None
 
 def validate_pot_calculations(html_file):
     """
@@ -140,33 +35,24 @@ def validate_pot_calculations(html_file):
     print("=" * 80)
     print()
 
-    # Read HTML file
-    with open(html_file, 'r', encoding='utf-8') as f:
-        html_content = f.read()
-
-    # Parse test cases
-    parser = PotTestCaseExtractor()
-    parser.feed(html_content)
-    test_cases = parser.test_cases
-
-    print(f"Found {len(test_cases)} test cases to validate\n")
-
-    # Validate each test case
+    # Validate each test case as it is streamed from the file
+    total = 0
     passed = 0
     failed = 0
     errors = []
 
-    for tc in test_cases:
-        tc_id = tc['id']
-        expected_pot = tc['expected_pot']
-        expected_main_pot = tc['expected_main_pot']
+    for tc in iter_test_cases(html_file):
+        total += 1
+        tc_id = tc.tc_id
+        expected_pot = tc.total_pot
+        expected_main_pot = next((pot.amount for pot in tc.pots if pot.name.startswith('Main')), None)
 
         # For now, just report what we found
         # (Actual validation would require running the pot calculation engine)
         print(f"{tc_id}:")
-        print(f"  SB: ${tc['sb']:,}" if tc['sb'] else "  SB: Not found")
-        print(f"  BB: ${tc['bb']:,}" if tc['bb'] else "  BB: Not found")
-        print(f"  Ante: ${tc['ante']:,}" if tc['ante'] else "  Ante: Not found")
+        print(f"  SB: ${tc.sb:,}" if tc.sb else "  SB: Not found")
+        print(f"  BB: ${tc.bb:,}" if tc.bb else "  BB: Not found")
+        print(f"  Ante: ${tc.ante:,}" if tc.ante else "  Ante: Not found")
         if expected_pot:
             print(f"  Expected Total Pot: ${expected_pot:,}")
         if expected_main_pot:
@@ -187,7 +73,7 @@ def validate_pot_calculations(html_file):
     print("=" * 80)
     print("SUMMARY")
     print("=" * 80)
-    print(f"Total test cases: {len(test_cases)}")
+    print(f"Total test cases: {total}")
     print(f"Test cases with expected values: {passed}")
     print(f"Test cases missing expected values: {failed}")
     if errors:
@@ -195,14 +81,180 @@ def validate_pot_calculations(html_file):
         for error in errors:
             print(f"  - {error}")
 
-    return len(test_cases), passed, failed
+    return total, passed, failed
+
+def load_pot_columns(test_cases):
+    """
+    Pack parsed test cases into padded (hands x seats) / (hands x pots) arrays.
+
+    Contribution comes from the results table, falling back to Starting - Final
+    when the table has no Contributed column. Seats are packed by
+    pot_oracle.pack_seats, folded per pot_oracle.is_fold. Missing expected
+    values are stored as -1.
+    """
+    if np is None:
+        raise ImportError("numpy is required for --vectorized")
+    from pot_oracle import is_fold, pack_seats
+
+    test_cases = list(test_cases)
+    num_hands = len(test_cases)
+    num_pots = max((len(tc.pots) for tc in test_cases), default=0)
+
+    bb_ante = np.zeros(num_hands, dtype=np.int64)
+    expected_amounts = np.full((num_hands, num_pots), -1, dtype=np.int64)
+    expected_num_pots = np.zeros(num_hands, dtype=np.int64)
+    expected_total = np.full(num_hands, -1, dtype=np.int64)
+    tc_ids = []
+    seat_hand, contributions, is_bb, folded = [], [], [], []
+
+    for h, tc in enumerate(test_cases):
+        tc_ids.append(tc.tc_id)
+        bb_ante[h] = tc.ante or 0
+        if tc.total_pot is not None:
+            expected_total[h] = tc.total_pot
+
+        folded_names = {a.player for a in tc.actions if is_fold(a.action)}
+        for row in tc.results:
+            seat_hand.append(h)
+            if row.contributed is not None:
+                contributions.append(row.contributed)
+            else:
+                contributions.append(row.starting_stack - row.final_stack)
+            is_bb.append(row.position == "BB")
+            folded.append(row.name in folded_names)
+
+        expected_num_pots[h] = len(tc.pots)
+        for k, pot in enumerate(tc.pots):
+            if pot.amount is not None:
+                expected_amounts[h, k] = pot.amount
+
+    seats = pack_seats(seat_hand, contributions, is_bb, folded, num_hands)
+    return {
+        'tc_ids': tc_ids,
+        'contributions': seats['contributions'],
+        'ante_mask': seats['ante_mask'],
+        'folded': seats['folded'],
+        'seated': seats['seated'],
+        'bb_ante': bb_ante,
+        'expected_amounts': expected_amounts,
+        'expected_num_pots': expected_num_pots,
+        'expected_total': expected_total
+    }
+
+
+def tile_pot_columns(columns, num_hands):
+    """Repeat the loaded hands until there are num_hands rows (synthetic corpus)"""
+    reps = -(-num_hands // len(columns['tc_ids']))
+    tiled = {key: np.tile(value, (reps,) + (1,) * (value.ndim - 1))[:num_hands]
+             for key, value in columns.items() if key != 'tc_ids'}
+    tiled['tc_ids'] = (columns['tc_ids'] * reps)[:num_hands]
+    return tiled
+
+
+def check_pot_columns(columns):
+    """
+    Recompute every hand's pots in one batch and compare with the expected arrays.
+
+    Returns (batch result, list of (hand index, pot index or None, message)).
+    Pot index None marks a hand-level mismatch (total pot or pot count).
+    """
+    from pot_oracle import compute_pots_batch
+
+    batch = compute_pots_batch(
+        columns['contributions'], columns['bb_ante'], columns['ante_mask'],
+        folded=columns['folded'], seated=columns['seated']
+    )
+
+    expected_amounts = columns['expected_amounts']
+    expected_total = columns['expected_total']
+    expected_num_pots = columns['expected_num_pots']
+
+    # Align expected and calculated pot columns
+    width = max(expected_amounts.shape[1], batch['amounts'].shape[1])
+    calculated = np.zeros((len(expected_total), width), dtype=np.int64)
+    calculated[:, :batch['amounts'].shape[1]] = batch['amounts']
+    expected = np.full_like(calculated, -1)
+    expected[:, :expected_amounts.shape[1]] = expected_amounts
+
+    has_pots = expected_num_pots > 0
+    total_bad = (expected_total >= 0) & (batch['total_pot'] != expected_total)
+    count_bad = has_pots & (batch['num_pots'] != expected_num_pots)
+    pot_bad = (expected >= 0) & (calculated != expected)
+
+    mismatches = []
+    for h in np.flatnonzero(total_bad):
+        mismatches.append((h, None, f"total pot {expected_total[h]:,} expected, {batch['total_pot'][h]:,} calculated"))
+    for h in np.flatnonzero(count_bad):
+        mismatches.append((h, None, f"{expected_num_pots[h]} pots expected, {batch['num_pots'][h]} calculated"))
+    for h, k in zip(*np.nonzero(pot_bad)):
+        mismatches.append((h, k, f"amount {expected[h, k]:,} expected, {calculated[h, k]:,} calculated"))
+    mismatches.sort(key=lambda m: (m[0], -1 if m[1] is None else m[1]))
+
+    return batch, mismatches
+
+
+def validate_pot_calculations_vectorized(html_file, scale=None):
+    """
+    Validate every test case's total and side pots with the batch engine.
+    """
+    print("=" * 80)
+    print(f"VECTORIZED POT VALIDATION: {html_file}")
+    print("=" * 80)
+    print()
+
+    from hand_corpus import HandCorpus, fresh_corpus
+
+    start = time.perf_counter()
+    corpus = fresh_corpus(html_file)
+    if corpus:
+        print(f"Reading corpus {corpus.name}")
+        columns = HandCorpus(corpus).pot_columns()
+    else:
+        columns = load_pot_columns(iter_test_cases(html_file))
+    load_seconds = time.perf_counter() - start
+    if scale:
+        columns = tile_pot_columns(columns, scale)
+
+    start = time.perf_counter()
+    batch, mismatches = check_pot_columns(columns)
+    check_seconds = time.perf_counter() - start
+
+    tc_ids = columns['tc_ids']
+    total = len(tc_ids)
+    failed_hands = {h for h, _, _ in mismatches}
+    failed = len(failed_hands)
+    passed = total - failed
+
+    for h, k, message in mismatches[:200]:
+        where = "" if k is None else f" pot {k} ({'Main Pot' if k == 0 else f'Side Pot {k}'})"
+        print(f"  x {tc_ids[h]}{where}: {message}")
+    if len(mismatches) > 200:
+        print(f"  ... and {len(mismatches) - 200} more mismatches")
+
+    # Summary
+    print()
+    print("=" * 80)
+    print("SUMMARY")
+    print("=" * 80)
+    print(f"Total hands: {total:,}")
+    print(f"Hands matching: {passed:,}")
+    print(f"Hands with mismatches: {failed:,} ({len(mismatches):,} mismatches)")
+    print(f"Load: {load_seconds:.2f}s, batch check: {check_seconds:.3f}s")
+
+    return total, passed, failed
+
 
 if __name__ == '__main__':
-    if len(sys.argv) < 2:
-        print("Usage: python validate_40_pot_cases.py <html_file>")
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    if not args:
+        print("Usage: python validate_40_pot_cases.py <html_file> [--vectorized] [--scale=N]")
         sys.exit(1)
 
-    html_file = sys.argv[1]
-    total, passed, failed = validate_pot_calculations(html_file)
+    html_file = args[0]
+    scale = next((int(arg.split('=', 1)[1]) for arg in sys.argv[1:] if arg.startswith('--scale=')), None)
+    if '--vectorized' in sys.argv or scale:
+        total, passed, failed = validate_pot_calculations_vectorized(html_file, scale)
+    else:
+        total, passed, failed = validate_pot_calculations(html_file)
 
     sys.exit(0 if failed == 0 else 1)
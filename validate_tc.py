@@ -2,10 +2,14 @@
 """
 Validate all 13 test cases in pot-test-cases-final-v2.html against TEST_CASE_GENERATION_SPEC.md
 """
-import re
+import sys
 from dataclasses import dataclass
+from pathlib import Path
 from typing import List, Dict, Optional
 
+sys.path.insert(0, str(Path(__file__).parent / 'docs' / 'QA'))
+from testcase_stream import iter_test_cases, parse_number
+
 @dataclass
 class ValidationResult:
     test_case_id: str
@@ -19,153 +23,77 @@ class ValidationResult:
     comparison_feature: bool  # Simplified labels
     errors: List[str]
 
-def read_file(file_path):
-    with open(file_path, 'r', encoding='utf-8') as f:
-        return f.read()
-
-def extract_test_case_section(html, tc_id):
-    """Extract a test case section from HTML"""
-    # Find start of test case
-    pattern = rf'<div class="test-id">{re.escape(tc_id)}</div>'
-    match = re.search(pattern, html)
-    if not match:
-        return None
-
-    start_pos = match.start()
-    # Find next test case or end
-    next_tc = re.search(r'<div class="test-id">TC-\d+\.\d+</div>', html[start_pos + len(tc_id):])
-    if next_tc:
-        end_pos = start_pos + len(tc_id) + next_tc.start()
-    else:
-        # Find end of container
-        end_pos = html.find('</body>', start_pos)
-
-    return html[start_pos:end_pos]
-
-def validate_position_labels(tc_section, tc_id):
+def validate_position_labels(tc, tc_id):
     """Validation #1: Stack Setup should ONLY show Dealer, SB, BB positions"""
     errors = []
 
-    # Extract Stack Setup section
-    stack_setup_match = re.search(r'Stack Setup:\n(.*?)</pre>', tc_section, re.DOTALL)
-    if not stack_setup_match:
+    if not tc.stack_setup:
         return False, ["Could not find Stack Setup section"]
 
-    stack_setup = stack_setup_match.group(1)
-
     # Check for forbidden position labels (UTG, UTG+1, UTG+2, MP, CO, HJ)
     forbidden_positions = ['UTG', 'UTG+1', 'UTG+2', 'MP', 'CO', 'HJ']
     for pos in forbidden_positions:
-        # Match pattern: PlayerName POSITION Stack (where POSITION is the forbidden one)
-        if re.search(rf'\w+\s+{re.escape(pos)}\s+\d+', stack_setup):
+        if any(entry.position == pos for entry in tc.stack_setup):
             errors.append(f"Stack Setup contains forbidden position label '{pos}'")
 
     return len(errors) == 0, errors
 
-def validate_winner_stacks(tc_section, tc_id):
+def validate_winner_stacks(tc, tc_id):
     """Validation #2: Next Hand Preview - Winners must show NEW Stack (Final + Won)"""
     errors = []
 
-    # Extract winner information from results table
+    # Winner information from results table breakdowns
     winners = {}
-    table_matches = re.findall(r'<td>(\w+) \(([^)]+)\)</td><td>[\d,]+</td><td>([\d,]+)</td>.*?winner-badge[^>]*>.*?🏆([^<]+)', tc_section, re.DOTALL)
-
-    for match in table_matches:
-        name, position, final_stack, pot_info = match
-        final_stack = int(final_stack.replace(',', ''))
-
-        # Extract pots won from breakdown
-        breakdown_match = re.search(rf'{name}.*?breakdown-details.*?= New Stack: ([\d,]+)', tc_section, re.DOTALL)
-        if breakdown_match:
-            expected_new_stack = int(breakdown_match.group(1).replace(',', ''))
-            winners[name] = {
-                'position': position,
-                'final': final_stack,
-                'expected_new': expected_new_stack
+    for row in tc.results:
+        if not row.is_winner:
+            continue
+        new_stack_line = next((line for line in row.breakdown if line.startswith('= New Stack:')), None)
+        if new_stack_line:
+            winners[row.name] = {
+                'position': row.position,
+                'final': row.final_stack,
+                'expected_new': parse_number(new_stack_line)
             }
 
     # Now check Next Hand Preview
-    next_hand_match = re.search(r'<div class="next-hand-content">(.*?)</div>', tc_section, re.DOTALL)
-    if next_hand_match:
-        next_hand = next_hand_match.group(1)
-
+    if tc.next_hand:
         for name, info in winners.items():
-            # Find this player in next hand
-            pattern = rf'{name}\s+(?:Dealer|SB|BB)\s+([\d,]+)'
-            player_match = re.search(pattern, next_hand)
-            if player_match:
-                actual_stack = int(player_match.group(1).replace(',', ''))
-                if actual_stack != info['expected_new']:
-                    errors.append(f"{name} shows stack {actual_stack} in Next Hand, expected {info['expected_new']} (Final {info['final']} + Won)")
-            else:
-                # Try without position (for non-Dealer/SB/BB)
-                pattern2 = rf'{name}\s+([\d,]+)'
-                player_match2 = re.search(pattern2, next_hand)
-                if player_match2:
-                    actual_stack = int(player_match2.group(1).replace(',', ''))
-                    if actual_stack != info['expected_new']:
-                        errors.append(f"{name} shows stack {actual_stack} in Next Hand, expected {info['expected_new']}")
+            entry = next((e for e in tc.next_hand if e.name == name), None)
+            if entry and entry.stack != info['expected_new']:
+                if entry.position in ('Dealer', 'SB', 'BB'):
+                    errors.append(f"{name} shows stack {entry.stack} in Next Hand, expected {info['expected_new']} (Final {info['final']} + Won)")
+                else:
+                    errors.append(f"{name} shows stack {entry.stack} in Next Hand, expected {info['expected_new']}")
 
     return len(errors) == 0, errors
 
-def validate_all_players_in_next_hand(tc_section, tc_id):
+def validate_all_players_in_next_hand(tc, tc_id):
     """Validation #3: ALL players must appear in Next Hand Preview"""
     errors = []
 
-    # Extract all players from results table
-    all_players = set()
-    player_matches = re.findall(r'<td>(\w+) \(([^)]+)\)</td>', tc_section)
-    for name, pos in player_matches:
-        all_players.add(name)
+    # All players from results table
+    all_players = {row.name for row in tc.results}
 
     # Check Next Hand Preview
-    next_hand_match = re.search(r'<div class="next-hand-content">(.*?)</div>', tc_section, re.DOTALL)
-    if next_hand_match:
-        next_hand = next_hand_match.group(1)
-
+    if tc.next_hand:
+        next_names = {entry.name for entry in tc.next_hand}
         for player in all_players:
-            if player not in next_hand:
+            if player not in next_names:
                 errors.append(f"Player {player} missing from Next Hand Preview")
 
     return len(errors) == 0, errors
 
-def validate_button_rotation(tc_section, tc_id):
+def validate_button_rotation(tc, tc_id):
     """Validation #4: Button rotates clockwise - Previous SB → New Dealer"""
     errors = []
 
-    # Extract current hand positions
-    current_setup = re.search(r'Stack Setup:\n(.*?)</pre>', tc_section, re.DOTALL)
-    if not current_setup:
+    if not tc.stack_setup:
         return False, ["Could not find current Stack Setup"]
 
-    current_lines = current_setup.group(1).strip().split('\n')
-    current_positions = {}
-
-    for line in current_lines:
-        parts = line.strip().split()
-        if len(parts) >= 2:
-            if 'Dealer' in line:
-                current_positions['Dealer'] = parts[0]
-            elif 'SB' in line:
-                current_positions['SB'] = parts[0]
-            elif 'BB' in line:
-                current_positions['BB'] = parts[0]
-
-    # Extract next hand positions
-    next_hand_match = re.search(r'<div class="next-hand-content">\s*Hand.*?Stack Setup:\n(.*?)\s*</div>', tc_section, re.DOTALL)
-    if next_hand_match:
-        next_lines = next_hand_match.group(1).strip().split('\n')
-        next_positions = {}
-
-        for line in next_lines:
-            parts = line.strip().split()
-            if len(parts) >= 2:
-                if 'Dealer' in line:
-                    next_positions['Dealer'] = parts[0]
-                elif 'SB' in line:
-                    next_positions['SB'] = parts[0]
-                elif 'BB' in line:
-                    next_positions['BB'] = parts[0]
+    current_positions = {e.position: e.name for e in tc.stack_setup if e.position in ('Dealer', 'SB', 'BB')}
+
+    if tc.next_hand:
+        next_positions = {e.position: e.name for e in tc.next_hand if e.position in ('Dealer', 'SB', 'BB')}
 
         # Validate rotation
         if 'SB' in current_positions and 'Dealer' in next_positions:
@@ -182,85 +110,43 @@ def validate_button_rotation(tc_section, tc_id):
 
     return len(errors) == 0, errors
 
-def validate_stack_setup_order(tc_section, tc_id):
+def validate_stack_setup_order(tc, tc_id):
     """Validation #5: Stack Setup must start with Dealer (not SB or BB)"""
     errors = []
 
-    # Extract Stack Setup
-    stack_setup = re.search(r'Stack Setup:\n(.*?)</pre>', tc_section, re.DOTALL)
-    if not stack_setup:
+    if not tc.stack_setup:
         return False, ["Could not find Stack Setup"]
 
-    first_line = stack_setup.group(1).strip().split('\n')[0]
+    first = tc.stack_setup[0]
+    first_line = f"{first.name} {first.position} {first.stack}".replace('  ', ' ')
 
-    # Check if first line contains Dealer or SB
-    if 'SB' in first_line and 'Dealer' not in first_line:
-        # Check if this is heads-up (only 2 players)
-        lines = stack_setup.group(1).strip().split('\n')
-        if len(lines) == 2:
-            # Heads-up exception: starts with SB
+    if first.position == 'SB':
+        # Heads-up exception: starts with SB
+        if len(tc.stack_setup) == 2:
             return True, []
-        else:
-            errors.append(f"Stack Setup starts with SB instead of Dealer: {first_line}")
-    elif 'BB' in first_line and 'Dealer' not in first_line:
+        errors.append(f"Stack Setup starts with SB instead of Dealer: {first_line}")
+    elif first.position == 'BB':
         errors.append(f"Stack Setup starts with BB instead of Dealer: {first_line}")
-    elif 'Dealer' not in first_line:
-        # Check if heads-up
-        lines = stack_setup.group(1).strip().split('\n')
-        if len(lines) > 2:
-            errors.append(f"Stack Setup does not start with Dealer: {first_line}")
+    elif first.position != 'Dealer' and len(tc.stack_setup) > 2:
+        errors.append(f"Stack Setup does not start with Dealer: {first_line}")
 
     return len(errors) == 0, errors
 
-def validate_action_flow(tc_section, tc_id):
+def validate_action_flow(tc, tc_id):
     """Validation #6: EVERY player's FIRST action on each street must be in Base section"""
-    errors = []
-
-    # Extract all streets (Preflop, Flop, Turn, River)
-    streets = ['Preflop', 'Flop', 'Turn', 'River']
-
-    for street in streets:
-        # Find Base section for this street
-        base_pattern = rf'<div class="street-name">{street} Base.*?</div>(.*?)(?=<div class="street-block">|<div class="section-title">)'
-        base_match = re.search(base_pattern, tc_section, re.DOTALL)
-
-        if not base_match:
-            continue  # This street doesn't exist in this test case
-
-        base_section = base_match.group(1)
-
-        # Find More sections for this street
-        more_pattern = rf'<div class="street-name">{street} More \d+.*?</div>(.*?)(?=<div class="street-block">|<div class="section-title">)'
-        more_matches = re.finditer(more_pattern, tc_section, re.DOTALL)
-
-        # Extract players from Base
-        base_players = set()
-        for action in re.finditer(r'<span class="action-player">(\w+)', base_section):
-            base_players.add(action.group(1))
-
-        # Check More sections - no first-time players should be there
-        for more_match in more_matches:
-            more_section = more_match.group(0)
-            more_num = re.search(r'More (\d+)', more_section).group(1)
-
-            for action in re.finditer(r'<span class="action-player">(\w+)', more_section):
-                player = action.group(1)
-                # Players in More should have already acted in Base
-                # This is complex to validate without full context, so we'll do basic check
-                pass
-
-    # This validation is complex and requires full game state tracking
-    # For now, return True (would need more sophisticated parsing)
+    # Players in More should have already acted in Base, but checking that
+    # properly requires full game state tracking (all-ins, folds), so this
+    # stays a pass-through until the action model carries that state
     return True, []
 
-def validate_comparison_feature(tc_section, tc_id):
+def validate_comparison_feature(tc, tc_id):
     """Validation #7: Comparison feature must use simplified labels"""
     errors = []
 
     # Check if compareNextHand function exists and uses simplified format
-    if 'compareNextHand' in tc_section:
+    if 'compareNextHand' in tc.content:
         # The function should be in the global scope, but we can check the button exists
-        if 'Compare' in tc_section and 'comparison-section' in tc_section:
+        if 'Compare' in tc.content and 'comparison-section' in tc.content:
             return True, []
         else:
             errors.append("Comparison section missing")
@@ -269,10 +155,9 @@ def validate_comparison_feature(tc_section, tc_id):
 
     return len(errors) == 0, errors
 
-def validate_test_case(html, tc_id):
-    """Validate a single test case"""
-    tc_section = extract_test_case_section(html, tc_id)
-    if not tc_section:
+def validate_test_case(tc_id, tc):
+    """Validate a single test case record"""
+    if tc is None:
         return ValidationResult(
             test_case_id=tc_id,
             test_case_name="NOT FOUND",
@@ -286,32 +171,30 @@ def validate_test_case(html, tc_id):
             errors=[f"Test case {tc_id} not found in HTML"]
         )
 
-    # Extract test case name
-    name_match = re.search(r'<div class="test-name">([^<]+)</div>', tc_section)
-    tc_name = name_match.group(1) if name_match else "Unknown"
+    tc_name = tc.name or "Unknown"
 
     all_errors = []
 
     # Run all validations
-    pos_labels_ok, pos_errors = validate_position_labels(tc_section, tc_id)
+    pos_labels_ok, pos_errors = validate_position_labels(tc, tc_id)
     all_errors.extend([f"Position Labels: {e}" for e in pos_errors])
 
-    winner_stacks_ok, winner_errors = validate_winner_stacks(tc_section, tc_id)
+    winner_stacks_ok, winner_errors = validate_winner_stacks(tc, tc_id)
     all_errors.extend([f"Winner Stacks: {e}" for e in winner_errors])
 
-    all_players_ok, players_errors = validate_all_players_in_next_hand(tc_section, tc_id)
+    all_players_ok, players_errors = validate_all_players_in_next_hand(tc, tc_id)
     all_errors.extend([f"All Players: {e}" for e in players_errors])
 
-    button_ok, button_errors = validate_button_rotation(tc_section, tc_id)
+    button_ok, button_errors = validate_button_rotation(tc, tc_id)
     all_errors.extend([f"Button Rotation: {e}" for e in button_errors])
 
-    setup_order_ok, setup_errors = validate_stack_setup_order(tc_section, tc_id)
+    setup_order_ok, setup_errors = validate_stack_setup_order(tc, tc_id)
     all_errors.extend([f"Stack Setup Order: {e}" for e in setup_errors])
 
-    action_flow_ok, action_errors = validate_action_flow(tc_section, tc_id)
+    action_flow_ok, action_errors = validate_action_flow(tc, tc_id)
     all_errors.extend([f"Action Flow: {e}" for e in action_errors])
 
-    comparison_ok, comp_errors = validate_comparison_feature(tc_section, tc_id)
+    comparison_ok, comp_errors = validate_comparison_feature(tc, tc_id)
     all_errors.extend([f"Comparison: {e}" for e in comp_errors])
 
     return ValidationResult(
@@ -327,6 +210,17 @@ def validate_test_case(html, tc_id):
         errors=all_errors
     )
 
+def validate_file(html_file, tc_ids):
+    """Validate the requested test cases in one streaming pass over the file"""
+    wanted = set(tc_ids)
+    found = {}
+    for tc in iter_test_cases(html_file):
+        if tc.tc_id in wanted:
+            print(f"  Validating {tc.tc_id}...")
+            found[tc.tc_id] = validate_test_case(tc.tc_id, tc)
+
+    return [found.get(tc_id) or validate_test_case(tc_id, None) for tc_id in tc_ids]
+
 def generate_report(results):
     """Generate markdown report"""
     passed = sum(1 for r in results if len(r.errors) == 0)
@@ -385,15 +279,8 @@ def main():
         "TC-11.1", "TC-12.1", "TC-13.1"
     ]
 
-    print("Reading HTML file...")
-    html = read_file(html_file)
-
     print("Validating test cases...")
-    results = []
-    for tc_id in test_cases:
-        print(f"  Validating {tc_id}...")
-        result = validate_test_case(html, tc_id)
-        results.append(result)
+    results = validate_file(html_file, test_cases)
 
     print("\nGenerating report...")
     report = generate_report(results)